@@ -24,6 +24,11 @@ try:
     from features.ingestion.models import *
     from features.parsing.models import *
     from features.strategy.models import *
+    from features.strategy.confirmation_models import *
+    from features.market.models import *
+    from features.notifications.models import *
+    from features.management.models import *
+    from common.metrics.models import *
 except ImportError:
     pass
 
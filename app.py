@@ -11,9 +11,11 @@ print(f"▶️  Starting DiscordReader from {__file__}")
 import logging
 import os
 from datetime import datetime
-from flask import Flask, jsonify, render_template
+from flask import Flask, Response, jsonify, render_template
 from flask_socketio import SocketIO, emit
 from common.db import db, initialize_db
+from common.db.pool import engine_options, pool_profile
+from common.process_roles import active_roles, role_enabled
 from common.utils import format_timestamp_local, to_local
 import importlib
 import pkgutil
@@ -89,7 +91,40 @@ def register_web_routes(app):
     
     @app.route('/health')
     def health():
-        return jsonify({"status": "healthy", "timestamp": datetime.now().isoformat()})
+        from common.async_runtime import runtime
+        return jsonify({
+            "status": "healthy",
+            "timestamp": datetime.now().isoformat(),
+            "async_runtime": runtime.health()
+        })
+    
+    @app.route('/metrics')
+    def metrics():
+        from common.metrics import pipeline_metrics
+        from common.metrics.process_state import process_state
+        from features.parsing.work_queue import queue_metrics
+        from common.db.pool import pool_metrics
+        # Hops timed in worker processes are exported with a process label
+        others = [(published['instance'], published['state']['series'])
+                  for published in process_state.read('pipeline')]
+        body = (
+            pipeline_metrics.render_prometheus(others=others)
+            + queue_metrics.render_prometheus()
+            + pool_metrics.render_prometheus()
+        )
+        return Response(body, mimetype='text/plain; version=0.0.4')
+
+    @app.route('/metrics/db-pool')
+    def db_pool_metrics():
+        from common.db.pool import pool_metrics
+        from common.statements import statements
+        from common.events.publisher import connection_pool_stats
+        return jsonify({
+            "engine": pool_metrics.snapshot(),
+            "event_pools": connection_pool_stats(),
+            "statements": statements.snapshot(),
+            "timestamp": datetime.now().isoformat()
+        })
 
 def register_socketio_events():
     """Register Socket.IO event handlers"""
@@ -99,221 +134,105 @@ def register_socketio_events():
     def handle_connect():
         logging.info('Client connected')
         emit('status', {'msg': 'Connected to trading server'})
-        
-        # Start async services if they haven't been started yet
-        if hasattr(current_app, 'config') and not current_app.config.get('ASYNC_SERVICES_STARTED'):
-            starter = current_app.config.get('ASYNC_SERVICES_STARTER')
-            if starter:
-                starter()
-                current_app.config['ASYNC_SERVICES_STARTED'] = True
-                logging.info("✅ Async services triggered via SocketIO connect")
     
     @socketio.on('disconnect')
     def handle_disconnect():
+        from flask import request
+        from common.metrics import metrics_hub
+        metrics_hub.unsubscribe(request.sid)
         logging.info('Client disconnected')
 
-async def start_unified_async_services(app):
-    """Start Discord bot and PostgreSQL listener in unified async context."""
-    import asyncio
-    
-    try:
-        # Ensure we're in Flask context so services can access DB, events, etc.
-        with app.app_context():
-            # Gather credentials & early exit if missing
-            token = os.getenv("DISCORD_BOT_TOKEN")
-            if not token:
-                logging.warning("Discord token missing; bot disabled.")
-                return
-
-            # Build your vertical slices
-            try:
-                from common.plugin_loader import discover_class
-                from features.discord_channels.channel_manager import ChannelManager
-                from common.events.publisher import publish_event
-                from common.db import db
-
-                # Ingestion slice via plugin discovery
-                IngestionService = discover_class(
-                    "IngestionService", ["features.ingestion.service"]
-                )
-                if not IngestionService:
-                    logging.error("IngestionService plugin not found")
-                    return
-                ingestion_svc = IngestionService()
+def start_async_services(app):
+    """
+    Supervise this process's coroutine services on the shared async runtime.
+
+    The ingest role runs the ingestion listener and, with DISCORD_BOT_TOKEN set,
+    the Discord bot; the parse role runs the parsing listener. All of them share
+    one event loop (common.async_runtime) and restart with backoff when they exit.
+    A web process without the parse role follows setup.parsed and setups.changed
+    events so its setup snapshots pick up setup writes made by other processes.
+    A process without the web role publishes its bot, ingestion, pipeline and
+    profiler state (common.metrics.process_state) and follows profiler arm
+    requests, so the web process's dashboards cover it.
+    """
+    from common.async_runtime import ALWAYS, ON_FAILURE, runtime
+    from common.metrics.process_state import process_state
 
-                # Channel slice
-                channel_svc = ChannelManager()
-                
-                # Parsing slice
-                from features.parsing.service import start_parsing_service
-                parsing_service = start_parsing_service(app=app)
-                logging.info("Parsing service started successfully")
+    def in_app_context(factory):
+        async def run():
+            with app.app_context():
+                await factory()
+        return run
 
-                # Start PostgreSQL event listener in shared async context
-                from features.ingestion.listener import start_ingestion_listener
-                
-                # Create task for PostgreSQL listener
-                listener_task = asyncio.create_task(start_ingestion_listener())
-                logging.info("PostgreSQL ingestion listener started in shared async context")
+    if role_enabled("ingest"):
+        from features.ingestion.counters import ingestion_counters
+        from features.ingestion.listener import start_ingestion_listener
+        runtime.supervise("ingestion-listener", in_app_context(start_ingestion_listener), restart=ALWAYS)
+        process_state.register('ingestion', ingestion_counters.snapshot)
 
-                # Discord slice
+        token = os.getenv("DISCORD_BOT_TOKEN")
+        if token:
+            try:
                 from features.discord_bot.bot import TradingDiscordBot
-                bot = TradingDiscordBot(
-                    ingestion_service=ingestion_svc,
-                    channel_manager=channel_svc,
-                    flask_app=app
-                )
-                
-                # Store bot instance in app config for API access BEFORE starting
-                app.config['DISCORD_BOT'] = bot
-                logging.info("✅ Discord bot initialized and registered in app.config['DISCORD_BOT']")
-
-                logging.info("Starting Discord bot in shared async context...")
-                # Get token from environment
-                from features.discord_bot.config.settings import get_discord_token
-                token = get_discord_token()
-                
-                if not token:
-                    logging.error("Discord bot token not found in environment")
-                    return
-                
-                # Create task for Discord bot
-                bot_task = asyncio.create_task(bot.start(token))
-                logging.info("Discord bot task created in shared async context")
-                
-                # Wait for both tasks to complete
-                await asyncio.gather(listener_task, bot_task, return_exceptions=True)
-                
+                from features.discord_channels.channel_manager import ChannelManager
+                from features.ingestion.service import get_ingestion_service
             except ImportError as e:
                 logging.error(f"Discord bot import error: {e}")
                 logging.warning("Discord bot dependencies not available - bot disabled")
-                return
-
-    except Exception:
-        logging.exception("Unified async services startup failed")
-
-def initialize_async_services(app):
-    """Initialize async services and immediately create bot instance."""
-    try:
-        # Create and register Discord bot instance immediately
-        with app.app_context():
-            try:
-                # Get credentials early
-                token = os.getenv("DISCORD_BOT_TOKEN")
-                if not token:
-                    logging.warning("Discord token missing; bot registration skipped.")
-                    return
-                
-                logging.info("Creating Discord bot services...")
-                
-                # Create services
-                from common.plugin_loader import discover_class
-                from features.discord_channels.channel_manager import ChannelManager
-                
-                IngestionService = discover_class(
-                    "IngestionService", ["features.ingestion.service"]
-                )
-                if not IngestionService:
-                    logging.error("IngestionService plugin not found")
-                    return
-                ingestion_svc = IngestionService()
-                channel_svc = ChannelManager()
-                logging.info("Discord bot services created successfully")
-                
-                # Create bot instance
-                from features.discord_bot.bot import TradingDiscordBot
-                logging.info("Creating TradingDiscordBot instance...")
-                
+            else:
                 bot = TradingDiscordBot(
-                    ingestion_service=ingestion_svc,
-                    channel_manager=channel_svc,
+                    ingestion_service=get_ingestion_service(),
+                    channel_manager=ChannelManager(),
                     flask_app=app
                 )
-                
-                # Store bot immediately for API access
+                # Store bot instance in app config for API access
                 app.config['DISCORD_BOT'] = bot
-                logging.info("✅ Discord bot instance created and registered in app.config['DISCORD_BOT']")
-                
-                # Schedule background startup and start immediately
-                def start_services():
-                    try:
-                        # Use SocketIO's background task for async operations
-                        def async_wrapper():
-                            import asyncio
-                            try:
-                                # Create new event loop for background task
-                                loop = asyncio.new_event_loop()
-                                asyncio.set_event_loop(loop)
-                                
-                                # Start the Discord bot connection
-                                async def connect_bot():
-                                    try:
-                                        logging.info("Starting Discord bot connection...")
-                                        await bot.start(token)
-                                    except Exception as e:
-                                        logging.error(f"Discord bot connection failed: {e}")
-                                
-                                loop.run_until_complete(connect_bot())
-                            except Exception as e:
-                                logging.error(f"Error in async wrapper: {e}")
-                            finally:
-                                try:
-                                    loop.close()
-                                except:
-                                    pass
-                        
-                        socketio.start_background_task(async_wrapper)
-                        logging.info("Discord bot background startup scheduled and initiated")
-                    except Exception as e:
-                        logging.error(f"Failed to start async services: {e}")
-                
-                app.config['ASYNC_SERVICES_STARTER'] = start_services
-                
-                # Start services immediately during initialization
-                start_services()
-                
-            except ImportError as e:
-                logging.error(f"Discord bot import error during initialization: {e}")
-                logging.exception("Full import traceback:")
-            except Exception as e:
-                logging.error(f"Unexpected error during Discord bot initialization: {e}")
-                logging.exception("Full initialization traceback:")
-        
-    except Exception as e:
-        logging.error(f"Failed to initialize async services: {e}")
+                from features.discord_bot.api import collect_discord_metrics
+                process_state.register('discord', collect_discord_metrics)
 
-def run_async_services_safe(app):
-    """Safely run async services using SocketIO's event loop."""
-    import asyncio
-    
-    try:
-        # Run async services in the current event loop if available, otherwise schedule
-        loop = None
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            pass
-        
-        if loop:
-            # We're in an async context, create a task
-            async def run_services():
-                try:
-                    with app.app_context():
-                        await start_unified_async_services(app)
-                except Exception as e:
-                    logging.error(f"Error in async services: {e}")
-            
-            task = loop.create_task(run_services())
-            logging.info("✅ Discord bot async task created")
-            return task
+                async def run_bot():
+                    try:
+                        await bot.start(token)
+                    finally:
+                        if not bot.is_closed():
+                            await bot.close()
+                        # Reset the closed client so a restart can log in again
+                        bot.clear()
+
+                runtime.supervise("discord-bot", in_app_context(run_bot), restart=ON_FAILURE)
         else:
-            # No event loop, let SocketIO handle it
-            logging.info("No event loop available, services will start on SocketIO connect")
-            return None
-            
-    except Exception as e:
-        logging.error(f"Error setting up async services: {e}")
-        return None
+            logging.info("DISCORD_BOT_TOKEN not set - Discord bot disabled")
+
+    if role_enabled("parse"):
+        from features.parsing.listener import get_parsing_listener
+        listener = get_parsing_listener(app=app)
+        runtime.supervise("parsing-listener", in_app_context(listener.start_listening), restart=ALWAYS)
+    elif role_enabled("web"):
+        async def follow_setup_writes():
+            from common.events.publisher import listen_for_events
+            from features.parsing.store import handle_setup_event
+            # Setups are written by other processes; refresh this process's setup snapshots
+            await listen_for_events(handle_setup_event, channel='parsing:setup')
+
+        runtime.supervise("setup-snapshot-listener", follow_setup_writes, restart=ALWAYS)
+
+    if not role_enabled("web"):
+        from common.metrics import pipeline_metrics
+        from common.profiling import PROFILING_CHANNEL, profiler
+
+        process_state.register('pipeline', lambda: {
+            'summary': pipeline_metrics.snapshot(),
+            'series': pipeline_metrics.export()
+        })
+        process_state.register('profiling', profiler.status)
+        process_state.start(app)
+
+        async def follow_profiler_requests():
+            from common.events.publisher import listen_for_events
+            # Targets are armed from the dashboard served by the web process
+            await listen_for_events(profiler.handle_event, channel=PROFILING_CHANNEL)
+
+        runtime.supervise("profiler-control", follow_profiler_requests, restart=ALWAYS)
 
 def validate_environment():
     """
@@ -359,17 +278,20 @@ def create_app():
 
     # Database configuration
     app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL")
-    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-        "pool_recycle": 300,
-        "pool_pre_ping": True,
-    }
+    # Pool sizes and statement timeouts follow the roles this process hosts
+    app.config["DB_POOL_PROFILE"] = pool_profile(active_roles())
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(
+        app.config["SQLALCHEMY_DATABASE_URI"], app.config["DB_POOL_PROFILE"]
+    )
 
     app.config.update({
         "ALPACA_API_KEY": os.environ.get("ALPACA_API_KEY", ""),
         "ALPACA_API_SECRET": os.environ.get("ALPACA_API_SECRET", ""),
         "ALPACA_TRADING_URL": "https://paper-api.alpaca.markets",
         "ALPACA_DATA_URL": "https://data.alpaca.markets/v2",
-        "PAPER_TRADING": True
+        "PAPER_TRADING": True,
+        # "lazy" registers blueprints from features/route_manifest.json and imports them on first request
+        "FEATURE_LOADING": os.environ.get("FEATURE_LOADING", "eager").lower()
     })
 
 
@@ -388,62 +310,9 @@ def create_app():
         logging.warning(f"Could not import some models: {e}")
     
     # Initialize enhanced event system
-    from common.events.cleanup_service import cleanup_service
-    cleanup_service.start_cleanup_scheduler()
-    
-    # Start ingestion listener after database initialization
-    print("[init] About to attempt ingestion listener startup")
-    logging.info("[init] About to attempt ingestion listener startup")
-    
-    try:
-        print("[init] Importing required modules for ingestion listener")
-        import threading
-        import asyncio
-        from features.ingestion.listener import start_ingestion_listener
-        
-        print("[init] Modules imported successfully")
-        logging.info("[init] Modules imported successfully")
-        
-        def start_ingestion_background():
-            """Start ingestion listener in background thread."""
-            print("[init] Starting ingestion listener background thread execution...")
-            logging.info("[init] Starting ingestion listener background thread execution...")
-            try:
-                # Create new event loop for this thread
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                print("[init] Event loop created")
-                
-                # Start the ingestion listener
-                loop.run_until_complete(start_ingestion_listener())
-                print("✅ PostgreSQL ingestion listener started")
-                logging.info("✅ PostgreSQL ingestion listener started")
-                
-                # Keep the listener running
-                loop.run_forever()
-            except Exception as e:
-                print(f"Error in ingestion listener background thread: {e}")
-                logging.error(f"Error in ingestion listener background thread: {e}")
-                import traceback
-                logging.error(f"Traceback: {traceback.format_exc()}")
-            finally:
-                try:
-                    loop.close()
-                except:
-                    pass
-        
-        # Start in daemon thread to avoid blocking app startup
-        print("[init] Creating ingestion background thread")
-        ingestion_thread = threading.Thread(target=start_ingestion_background, daemon=True)
-        ingestion_thread.start()
-        print("[init] Ingestion listener background thread started")
-        logging.info("[init] Ingestion listener background thread started")
-        
-    except Exception as e:
-        print(f"Failed to start ingestion listener: {e}")
-        logging.error(f"Failed to start ingestion listener: {e}")
-        import traceback
-        logging.error(f"Traceback: {traceback.format_exc()}")
+    if role_enabled("web"):
+        from common.events.cleanup_service import cleanup_service
+        cleanup_service.start_cleanup_scheduler()
     
     # Initialize Alpaca WebSocket for real-time ticker prices (optional)
     # Use ENABLE_LIVE_PRICE_STREAM=true to enable (default: disabled)
@@ -511,63 +380,20 @@ def create_app():
             return str(utc_dt) if utc_dt else "N/A"
 
     socketio.init_app(app, cors_allowed_origins="*")
-    register_plugins(app)
+    from common.profiling import profiler
+    profiler.init_app(app)
+    from common.metrics import metrics_hub
+    metrics_hub.init_socketio(socketio, app)
+    if app.config["FEATURE_LOADING"] == "lazy":
+        from common.lazy_loading import register_lazy_blueprints
+        register_lazy_blueprints(app)
+    else:
+        register_plugins(app)
     register_web_routes(app)
     register_socketio_events()
     
-    # Start ingestion listener automatically during app creation (no curl dependency)
-    if os.getenv("DISCORD_BOT_TOKEN"):
-        print("[STARTUP] Starting PostgreSQL ingestion listener automatically...")
-        logging.info("[STARTUP] Starting PostgreSQL ingestion listener automatically...")
-        
-        try:
-            import threading
-            import asyncio
-            from features.ingestion.listener import start_ingestion_listener
-            
-            def start_ingestion_background():
-                """Start ingestion listener in background thread at app startup."""
-                print("[STARTUP] Starting ingestion listener background thread...")
-                logging.info("[STARTUP] Starting ingestion listener background thread...")
-                try:
-                    # Create new event loop for this thread
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    
-                    # Start the ingestion listener
-                    loop.run_until_complete(start_ingestion_listener())
-                    print("✅ PostgreSQL ingestion listener started at app startup")
-                    logging.info("✅ PostgreSQL ingestion listener started at app startup")
-                    
-                    # Keep the listener running
-                    loop.run_forever()
-                except Exception as e:
-                    print(f"Error in ingestion listener at startup: {e}")
-                    logging.error(f"Error in ingestion listener at startup: {e}")
-                    import traceback
-                    logging.error(f"Traceback: {traceback.format_exc()}")
-                finally:
-                    try:
-                        loop.close()
-                    except:
-                        pass
-            
-            # Start in daemon thread immediately during app creation
-            ingestion_thread = threading.Thread(target=start_ingestion_background, daemon=True)
-            ingestion_thread.start()
-            print("[STARTUP] Ingestion listener thread started automatically")
-            logging.info("[STARTUP] Ingestion listener thread started automatically")
-            
-        except Exception as e:
-            print(f"Failed to start ingestion listener at startup: {e}")
-            logging.error(f"Failed to start ingestion listener at startup: {e}")
-            import traceback
-            logging.error(f"Traceback: {traceback.format_exc()}")
-    else:
-        print("[STARTUP] Discord bot disabled - ingestion listener not started")
-        logging.info("[STARTUP] Discord bot disabled - ingestion listener not started")
+    start_async_services(app)
 
-    
     # Note: Feature dashboard blueprints are already registered through register_all_blueprints
 
     return app
@@ -577,72 +403,5 @@ print("[STARTUP] About to create Flask app...")
 app = create_app()
 print("[STARTUP] Flask app created successfully")
 
-# Initialize async services (Discord bot, event listeners) only if enabled
-print("[STARTUP] Checking DISCORD_BOT_TOKEN setting...")
-logging.info("[STARTUP] Checking DISCORD_BOT_TOKEN setting...")
-
-if os.getenv("DISCORD_BOT_TOKEN") is not None:
-    print("[STARTUP] Starting initialize_async_services...")
-    logging.info("[STARTUP] Starting initialize_async_services...")
-    initialize_async_services(app)
-    print("[STARTUP] Async services initialization enabled")
-    logging.info("[STARTUP] Async services initialization enabled")
-    
-    # Start ingestion listener immediately at module level
-    print("[STARTUP] Starting ingestion listener initialization...")
-    logging.info("[STARTUP] Starting ingestion listener initialization...")
-    
-    try:
-        import threading
-        import asyncio
-        from features.ingestion.listener import start_ingestion_listener
-        
-        print("[STARTUP] Successfully imported start_ingestion_listener")
-        logging.info("[STARTUP] Successfully imported start_ingestion_listener")
-        
-        def start_ingestion_background():
-            """Start ingestion listener in background thread at module level."""
-            print("[STARTUP] Starting ingestion listener background thread execution...")
-            logging.info("[STARTUP] Starting ingestion listener background thread execution...")
-            try:
-                # Create new event loop for this thread
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                print("[STARTUP] Event loop created for ingestion listener")
-                
-                # Start the ingestion listener
-                loop.run_until_complete(start_ingestion_listener())
-                print("✅ PostgreSQL ingestion listener started")
-                logging.info("✅ PostgreSQL ingestion listener started")
-                
-                # Keep the listener running
-                loop.run_forever()
-            except Exception as e:
-                print(f"Error in ingestion listener background thread: {e}")
-                logging.error(f"Error in ingestion listener background thread: {e}")
-                import traceback
-                logging.error(f"Traceback: {traceback.format_exc()}")
-            finally:
-                try:
-                    loop.close()
-                except:
-                    pass
-        
-        # Start in daemon thread at module level
-        print("[STARTUP] Creating ingestion background thread")
-        ingestion_thread = threading.Thread(target=start_ingestion_background, daemon=True)
-        ingestion_thread.start()
-        print("[STARTUP] Ingestion listener background thread started")
-        logging.info("[STARTUP] Ingestion listener background thread started")
-        
-    except Exception as e:
-        print(f"Failed to start ingestion listener: {e}")
-        logging.error(f"Failed to start ingestion listener: {e}")
-        import traceback
-        logging.error(f"Traceback: {traceback.format_exc()}")
-else:
-    print("[STARTUP] Discord bot disabled via ENABLE_DISCORD_BOT")
-    logging.info("[STARTUP] Discord bot disabled via ENABLE_DISCORD_BOT")
-
 if __name__ == '__main__':
     socketio.run(app, host='0.0.0.0', port=5000, debug=True, use_reloader=False, log_output=True)
@@ -0,0 +1,5 @@
+"""
+Performance benchmarks for parsing, ingestion and event hot paths.
+
+Run with ``python -m benchmarks.run``; see benchmarks/README.md.
+"""
@@ -0,0 +1,30 @@
+"""
+Market calendar benchmarks: clock and trading-day lookups from the cached
+session tables (built from the NYSE rules, so no Alpaca credentials needed).
+"""
+from .harness import benchmark
+
+
+def _calendar_setup():
+    from common.market_calendar import MarketCalendar
+    calendar = MarketCalendar(source=None)
+    # Load the current year's table outside the timed region
+    calendar.clock()
+    return calendar
+
+
+def _is_open(calendar):
+    calendar.is_open()
+
+
+def _clock(calendar):
+    calendar.clock()
+
+
+def _trading_day(calendar):
+    calendar.trading_day()
+
+
+benchmark("calendar.is_open", setup=_calendar_setup, number=1000)(_is_open)
+benchmark("calendar.clock", setup=_calendar_setup, number=1000)(_clock)
+benchmark("calendar.trading_day", setup=_calendar_setup, number=1000)(_trading_day)
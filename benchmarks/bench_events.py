@@ -0,0 +1,104 @@
+"""
+Event bus benchmarks: publishing to PostgreSQL and consumer dispatch.
+
+Publishing needs a real PostgreSQL with the events table at $DATABASE_URL and
+is skipped otherwise. Dispatch runs DurableConsumer.drain over an in-memory
+batch source so it measures handler dispatch and offset bookkeeping only.
+"""
+import asyncio
+import functools
+import os
+from datetime import datetime
+
+from .harness import SkipBenchmark, benchmark
+
+PAYLOAD = {
+    'message_id': '1377640123671515198',
+    'channel_id': '1372012942848954388',
+    'content': 'A+ Scalp Trade Setups — Thursday May 29\n\nNVDA\n🔼 Aggressive Breakout Above 144.02',
+}
+
+
+def _postgres_setup():
+    if not os.environ.get('DATABASE_URL', '').startswith('postgres'):
+        raise SkipBenchmark('needs PostgreSQL at DATABASE_URL')
+    return {'loop': asyncio.new_event_loop()}
+
+
+def _close_loop(fixture):
+    fixture['loop'].close()
+
+
+def _publish(fixture):
+    from common.events.publisher import publish_event_async
+    fixture['loop'].run_until_complete(
+        publish_event_async('benchmark.event', dict(PAYLOAD), channel='benchmarks', source='benchmarks')
+    )
+
+
+def _publish_batch(fixture):
+    from common.events.publisher import publish_event_batch_async
+    events = [{'event_type': 'benchmark.event', 'data': dict(PAYLOAD), 'channel': 'benchmarks'} for _ in range(50)]
+    fixture['loop'].run_until_complete(publish_event_batch_async(events, source='benchmarks'))
+
+
+benchmark("events.publish_event_async", setup=_postgres_setup, teardown=_close_loop, number=20)(_publish)
+benchmark("events.publish_event_batch_async[50 events]", setup=_postgres_setup, teardown=_close_loop, number=5)(_publish_batch)
+
+
+class _MemoryEvents:
+    """Serves events.id > offset from memory for the asyncpg calls drain() makes."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def acquire(self):
+        source = self
+
+        class _Acquire:
+            async def __aenter__(self):
+                return source
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Acquire()
+
+    async def fetch(self, sql, offset, limit):
+        return self.rows[offset:offset + limit]
+
+    async def fetchval(self, sql, *args):
+        return len(self.rows)
+
+    async def execute(self, sql, *args):
+        return None
+
+
+def _dispatch_setup(event_count):
+    created_at = datetime(2025, 5, 29, 13, 0)
+    rows = [
+        {'id': i, 'event_type': 'discord.message.new' if i % 2 else 'message.stored',
+         'channel': 'events', 'data': dict(PAYLOAD), 'correlation_id': None, 'created_at': created_at}
+        for i in range(1, event_count + 1)
+    ]
+    return {'loop': asyncio.new_event_loop(), 'source': _MemoryEvents(rows)}
+
+
+def _dispatch(fixture):
+    from common.events.offsets import DurableConsumer
+
+    async def handler(event_type, data):
+        return True
+
+    consumer = DurableConsumer('benchmarks', handler, event_types=['discord.message.new'], batch_size=200)
+    consumer.offset = 0
+    consumer.running = True
+    fixture['loop'].run_until_complete(consumer.drain(fixture['source']))
+
+
+benchmark(
+    "events.consumer_drain[1000 events]",
+    setup=functools.partial(_dispatch_setup, 1000),
+    teardown=_close_loop,
+    number=10
+)(_dispatch)
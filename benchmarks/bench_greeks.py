@@ -0,0 +1,30 @@
+"""
+Options Greeks benchmarks: Black-Scholes pricing and implied volatility.
+"""
+from .harness import SkipBenchmark, benchmark
+
+# A chain's worth of strikes around a 500 spot
+STRIKES = [480 + 2.5 * i for i in range(17)]
+
+
+def _greeks_setup():
+    try:
+        from features.options import greeks_calculator
+    except ImportError as e:
+        raise SkipBenchmark(f"greeks_calculator not importable: {e}")
+    return greeks_calculator
+
+
+def _black_scholes_chain(greeks):
+    for strike in STRIKES:
+        greeks.calculate_black_scholes('call', 500.0, strike, 7 / 365, 0.05, 0.22)
+        greeks.calculate_black_scholes('put', 500.0, strike, 7 / 365, 0.05, 0.22)
+
+
+def _implied_volatility_chain(greeks):
+    for strike in STRIKES:
+        greeks.calculate_implied_volatility('call', 6.5, 500.0, strike, 7 / 365, 0.05)
+
+
+benchmark("greeks.black_scholes[34 contracts]", setup=_greeks_setup, number=20)(_black_scholes_chain)
+benchmark("greeks.implied_volatility[17 contracts]", setup=_greeks_setup, number=5)(_implied_volatility_chain)
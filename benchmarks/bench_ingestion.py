@@ -0,0 +1,52 @@
+"""
+Ingestion benchmarks: validation, storage and event publishing for a batch.
+"""
+import asyncio
+import functools
+
+from .corpus import message_batch
+from .harness import bench_app, benchmark
+
+BATCH_SIZE = 25
+
+
+def _batch_setup(batch_size):
+    from common.models import DiscordMessageDTO
+    ctx = bench_app().app_context()
+    ctx.push()
+    batches = []
+    # One distinct batch per timed call so nothing is skipped as a duplicate
+    for batch in range(12):
+        batches.append([
+            DiscordMessageDTO(**fields)
+            for fields in message_batch(batch_size, start_id=1 + batch * batch_size)
+        ])
+    return {'ctx': ctx, 'batches': iter(batches), 'loop': asyncio.new_event_loop()}
+
+
+def _batch_teardown(fixture):
+    from common.db import db
+    from features.ingestion.models import DiscordMessageModel
+    db.session.rollback()
+    DiscordMessageModel.query.delete()
+    db.session.commit()
+    fixture['loop'].close()
+    fixture['ctx'].pop()
+
+
+def _process_batch(fixture):
+    from features.ingestion.service import IngestionService
+    # Fresh service per batch: the in-memory duplicate set would otherwise skip everything
+    service = IngestionService()
+    fixture['loop'].run_until_complete(service.process_batch(next(fixture['batches'])))
+
+
+# message.stored events go to $DATABASE_URL; without it publishing fails fast and
+# the numbers cover validation and storage only (see README)
+benchmark(
+    f"ingestion.process_batch[{BATCH_SIZE} messages]",
+    setup=functools.partial(_batch_setup, BATCH_SIZE),
+    teardown=_batch_teardown,
+    number=3,
+    repeat=3
+)(_process_batch)
@@ -0,0 +1,36 @@
+"""
+Instrumentation overhead benchmarks: the per-call cost added to hot paths by
+pipeline latency marks and disarmed profiling hooks.
+"""
+from .harness import benchmark
+
+
+def _metrics_setup():
+    from common.metrics.pipeline import PipelineMetrics
+    return {'metrics': PipelineMetrics(), 'next_id': iter(range(10 ** 9))}
+
+
+def _mark_pipeline(fixture):
+    metrics = fixture['metrics']
+    message_id = next(fixture['next_id'])
+    for stage in ('discord_received', 'ingestion_started', 'message_stored', 'parse_started', 'setups_stored'):
+        metrics.mark(message_id, stage)
+
+
+def _profiled_setup():
+    from common.profiling import profiled
+
+    @profiled('benchmarks.noop')
+    def noop():
+        return None
+
+    return noop
+
+
+def _call_disarmed(noop):
+    for _ in range(100):
+        noop()
+
+
+benchmark("instrumentation.pipeline_mark[5 stages]", setup=_metrics_setup, number=1000)(_mark_pipeline)
+benchmark("instrumentation.profiled_disarmed[100 calls]", setup=_profiled_setup, number=1000)(_call_disarmed)
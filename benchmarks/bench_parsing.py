@@ -0,0 +1,74 @@
+"""
+Parsing benchmarks: A+ message parsing and setup storage.
+"""
+import functools
+
+from .corpus import TICKER_COUNTS, aplus_message
+from .harness import bench_app, benchmark
+
+
+def _parser_setup(ticker_count):
+    from features.parsing.aplus_parser import APlusMessageParser
+    ctx = bench_app().app_context()
+    ctx.push()
+    return {'ctx': ctx, 'parser': APlusMessageParser(), 'content': aplus_message(ticker_count)}
+
+
+def _pop_context(fixture):
+    fixture['ctx'].pop()
+
+
+def _parse(fixture):
+    fixture['parser'].parse_message(fixture['content'], '1')
+
+
+for _count in TICKER_COUNTS:
+    benchmark(
+        f"parsing.parse_message[{_count} tickers]",
+        setup=functools.partial(_parser_setup, _count),
+        teardown=_pop_context,
+        number=20
+    )(_parse)
+
+
+STORE_NUMBER = 5
+STORE_REPEAT = 5
+
+
+def _store_setup(ticker_count):
+    from features.parsing.aplus_parser import APlusMessageParser
+    from features.parsing.store import ParsingStore
+    ctx = bench_app().app_context()
+    ctx.push()
+    parser = APlusMessageParser()
+    # Parse outside the timed region; every timed call stores a fresh message
+    messages = []
+    for message_id in range(1, STORE_NUMBER * STORE_REPEAT + 2):
+        result = parser.parse_message(aplus_message(ticker_count, seed=message_id), str(message_id))
+        messages.append((str(message_id), result['setups']))
+    return {'ctx': ctx, 'store': ParsingStore(), 'messages': iter(messages)}
+
+
+def _store_teardown(fixture):
+    from common.db import db
+    from features.parsing.models import ParsedLevel, TradeSetup
+    db.session.rollback()
+    ParsedLevel.query.delete()
+    TradeSetup.query.delete()
+    db.session.commit()
+    fixture['ctx'].pop()
+
+
+def _store(fixture):
+    message_id, setups = next(fixture['messages'])
+    fixture['store'].store_parsed_message(message_id, setups)
+
+
+for _count in (1, 6):
+    benchmark(
+        f"parsing.store_parsed_message[{_count} tickers]",
+        setup=functools.partial(_store_setup, _count),
+        teardown=_store_teardown,
+        number=STORE_NUMBER,
+        repeat=STORE_REPEAT
+    )(_store)
@@ -0,0 +1,115 @@
+"""
+Statement benchmarks: per-call latency of the hot raw SQL in the registry.
+
+Each query runs twice, as a ``text()`` clause built per call (what the call
+sites did before) and as the registered statement, over a seeded
+trade_setups table. The asyncpg pair needs PostgreSQL at BENCH_DATABASE_URL
+and compares a connection with asyncpg's per-connection statement cache
+disabled against the default one that prepares each statement once.
+"""
+import asyncio
+import functools
+import os
+from datetime import date, timedelta
+
+from .harness import SkipBenchmark, bench_app, benchmark, is_postgres
+
+SETUP_COUNT = 500
+TRADING_DAYS = 20
+
+
+def _seed_setups():
+    from common.db import db
+    from features.parsing.models import TradeSetup
+    first_day = date(2025, 5, 1)
+    for i in range(SETUP_COUNT):
+        db.session.add(TradeSetup(
+            id=f"bench_{i}",
+            # A few messages per day so the duplicate-day query has work to do
+            message_id=str(i % (TRADING_DAYS * 3)),
+            ticker=('SPY', 'QQQ', 'NVDA', 'TSLA')[i % 4],
+            trading_day=first_day + timedelta(days=i % TRADING_DAYS),
+            index=1,
+            trigger_level=100 + i % 50,
+            target_prices=[101, 102],
+            direction='long' if i % 2 else 'short',
+            raw_line='🔼 Aggressive Breakout Above 100',
+        ))
+    db.session.commit()
+
+
+def _store_setup():
+    from features.parsing import store  # noqa: F401 - registers the parsing statements
+    ctx = bench_app().app_context()
+    ctx.push()
+    _seed_setups()
+    from common.db import db
+    return {'ctx': ctx, 'session': db.session}
+
+
+def _store_teardown(fixture):
+    from common.db import db
+    from features.parsing.models import TradeSetup
+    db.session.rollback()
+    TradeSetup.query.delete()
+    db.session.commit()
+    fixture['ctx'].pop()
+
+
+def _run_text(name, fixture):
+    from sqlalchemy import text
+    from common.statements import statements
+    fixture['session'].execute(text(statements.get(name).sql)).fetchall()
+
+
+def _run_registered(name, fixture):
+    from common.statements import statements
+    statements.get(name).execute(fixture['session']).fetchall()
+
+
+for _name in ('parsing.duplicate_trading_days', 'parsing.trading_day_distribution', 'parsing.duplicate_group_count'):
+    benchmark(
+        f"statements.{_name}[text per call]", setup=_store_setup, teardown=_store_teardown, number=50
+    )(functools.partial(_run_text, _name))
+    benchmark(
+        f"statements.{_name}[registered]", setup=_store_setup, teardown=_store_teardown, number=50
+    )(functools.partial(_run_registered, _name))
+
+
+def _asyncpg_setup(statement_cache_size):
+    import asyncpg
+    fixture = _store_setup()
+    if not is_postgres(bench_app()):
+        _store_teardown(fixture)
+        raise SkipBenchmark('needs PostgreSQL at BENCH_DATABASE_URL')
+    # Rows are visible to the asyncpg connection only once committed (done by _seed_setups)
+    loop = asyncio.new_event_loop()
+    url = os.environ['BENCH_DATABASE_URL'].replace('postgresql+psycopg2://', 'postgresql://')
+    fixture.update({
+        'loop': loop,
+        'conn': loop.run_until_complete(asyncpg.connect(url, statement_cache_size=statement_cache_size)),
+    })
+    return fixture
+
+
+def _asyncpg_teardown(fixture):
+    fixture['loop'].run_until_complete(fixture['conn'].close())
+    fixture['loop'].close()
+    _store_teardown(fixture)
+
+
+def _asyncpg_fetch(fixture):
+    from common.statements import statements
+    # Same shape as the parsing statement, with a parameter so asyncpg uses the extended protocol
+    sql = statements.get('parsing.trading_day_distribution').sql.replace('IS NOT NULL', '>= $1')
+    fixture['loop'].run_until_complete(fixture['conn'].fetch(sql, date(2025, 5, 1)))
+
+
+benchmark(
+    "statements.asyncpg.trading_day_distribution[unprepared]",
+    setup=functools.partial(_asyncpg_setup, 0), teardown=_asyncpg_teardown, number=50
+)(_asyncpg_fetch)
+benchmark(
+    "statements.asyncpg.trading_day_distribution[prepared once]",
+    setup=functools.partial(_asyncpg_setup, 100), teardown=_asyncpg_teardown, number=50
+)(_asyncpg_fetch)
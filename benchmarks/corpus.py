@@ -0,0 +1,81 @@
+"""
+Synthetic A+ message corpus.
+
+Messages follow the layout of real "A+ Scalp Trade Setups" posts (see
+test_aplus_parser.py) with a configurable number of ticker sections, so
+parser cost can be measured as a function of message size.
+"""
+import random
+from datetime import date, datetime, timedelta
+from typing import List
+
+TICKERS = [
+    'SPY', 'QQQ', 'NVDA', 'TSLA', 'AAPL', 'AMD', 'MSFT', 'META', 'AMZN', 'GOOGL',
+    'NFLX', 'IWM', 'SMCI', 'COIN', 'PLTR', 'AVGO', 'MU', 'CRM', 'UBER', 'SHOP',
+]
+
+TICKER_COUNTS = (1, 3, 6, 12)
+
+
+def _targets(rng: random.Random, price: float, direction: int) -> str:
+    steps = sorted(rng.uniform(0.5, 4.0) for _ in range(3))
+    return ', '.join(f"{price + direction * price * step / 100:.2f}" for step in steps)
+
+
+def ticker_section(ticker: str, rng: random.Random) -> str:
+    """Build one ticker block with the six standard setups and a bias line."""
+    price = rng.uniform(20, 600)
+    low, high = price * 0.985, price * 1.012
+    return "\n".join([
+        ticker,
+        f"❌ Rejection Short Near {high:.2f} 🔻 {_targets(rng, high, -1)}",
+        f"🔻 Aggressive Breakdown Below {price:.2f} 🔻 {_targets(rng, price, -1)}",
+        f"🔻 Conservative Breakdown Below {low:.2f} 🔻 {_targets(rng, low, -1)}",
+        f"🔼 Aggressive Breakout Above {price * 1.004:.2f} 🔼 {_targets(rng, price * 1.004, 1)}",
+        f"🔼 Conservative Breakout Above {high:.2f} 🔼 {_targets(rng, high, 1)}",
+        f"🔄 Bounce Zone {low * 0.995:.2f}–{low:.2f} 🔼 {_targets(rng, low, 1)}",
+        f"⚠️ Bias — bearish below {price:.2f}, only bullish above {high:.2f}",
+    ])
+
+
+def aplus_message(ticker_count: int, trading_day: date = date(2025, 5, 29), seed: int = 0) -> str:
+    """
+    Build a synthetic A+ setups message.
+
+    Args:
+        ticker_count: Number of ticker sections (up to len(TICKERS))
+        trading_day: Date in the header
+        seed: Seed for reproducible prices
+
+    Returns:
+        str: Message content
+    """
+    rng = random.Random(seed)
+    header = f"A+ Scalp Trade Setups — {trading_day.strftime('%A %B')} {trading_day.day}"
+    sections = [ticker_section(ticker, rng) for ticker in TICKERS[:ticker_count]]
+    return "\n\n".join([header] + sections)
+
+
+def message_batch(size: int, ticker_count: int = 3, start_id: int = 1) -> List[dict]:
+    """
+    Build raw message fields for an ingestion batch.
+
+    Args:
+        size: Number of messages
+        ticker_count: Ticker sections per message
+        start_id: First message ID
+
+    Returns:
+        List of dicts with message_id, channel_id, author_id, content and timestamp
+    """
+    base = datetime(2025, 5, 29, 13, 0)
+    return [
+        {
+            'message_id': str(start_id + i),
+            'channel_id': '1372012942848954388',
+            'author_id': '1000',
+            'content': aplus_message(ticker_count, seed=start_id + i),
+            'timestamp': base + timedelta(seconds=i),
+        }
+        for i in range(size)
+    ]
@@ -0,0 +1,220 @@
+"""
+Benchmark Harness
+
+Minimal asv-style runner: benchmarks register with ``@benchmark``, get an
+optional setup that builds their fixtures outside the timed region, and are
+timed with ``time.perf_counter`` over several repeats. Results are compared
+against the committed baselines in ``baselines.json``.
+"""
+import json
+import logging
+import os
+import platform
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+DEFAULT_THRESHOLD = 0.25
+
+
+class SkipBenchmark(Exception):
+    """Raised by a setup when the benchmark cannot run in this environment."""
+
+
+@dataclass
+class Benchmark:
+    """A registered benchmark."""
+    name: str
+    func: Callable[[Any], Any]
+    setup: Optional[Callable[[], Any]] = None
+    teardown: Optional[Callable[[Any], None]] = None
+    number: int = 10
+    repeat: int = 5
+
+
+@dataclass
+class BenchmarkResult:
+    """Per-call timings of one benchmark in microseconds."""
+    name: str
+    median_us: Optional[float] = None
+    min_us: Optional[float] = None
+    stdev_us: Optional[float] = None
+    calls: int = 0
+    skipped: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.skipped:
+            return {'skipped': self.skipped}
+        return {
+            'median_us': round(self.median_us, 2),
+            'min_us': round(self.min_us, 2),
+            'stdev_us': round(self.stdev_us, 2),
+            'calls': self.calls
+        }
+
+
+_registry: List[Benchmark] = []
+
+
+def benchmark(name: str, setup: Optional[Callable[[], Any]] = None,
+              teardown: Optional[Callable[[Any], None]] = None,
+              number: int = 10, repeat: int = 5) -> Callable:
+    """
+    Register a benchmark function.
+
+    Args:
+        name: Unique dotted name, e.g. "parsing.parse_message[5 tickers]"
+        setup: Builds the fixture passed to the function (untimed)
+        teardown: Releases the fixture (untimed)
+        number: Calls per timed repeat
+        repeat: Timed repeats; the median per-call time is reported
+
+    Returns:
+        Decorator that registers and returns the function unchanged
+    """
+    def decorator(func: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        _registry.append(Benchmark(name, func, setup, teardown, number, repeat))
+        return func
+    return decorator
+
+
+def registered(pattern: Optional[str] = None) -> List[Benchmark]:
+    """Get registered benchmarks whose name contains pattern."""
+    return [b for b in _registry if not pattern or pattern in b.name]
+
+
+def run_benchmark(bench: Benchmark) -> BenchmarkResult:
+    """
+    Time one benchmark.
+
+    Args:
+        bench: Benchmark to run
+
+    Returns:
+        BenchmarkResult with per-call timings, or the skip reason
+    """
+    try:
+        fixture = bench.setup() if bench.setup else None
+    except SkipBenchmark as e:
+        return BenchmarkResult(bench.name, skipped=str(e))
+
+    try:
+        bench.func(fixture)  # warm-up: imports, caches, prepared statements
+        per_call = []
+        for _ in range(bench.repeat):
+            start = time.perf_counter()
+            for _ in range(bench.number):
+                bench.func(fixture)
+            per_call.append((time.perf_counter() - start) / bench.number * 1_000_000)
+    finally:
+        if bench.teardown:
+            bench.teardown(fixture)
+
+    return BenchmarkResult(
+        bench.name,
+        median_us=statistics.median(per_call),
+        min_us=min(per_call),
+        stdev_us=statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+        calls=bench.number * bench.repeat
+    )
+
+
+def load_baselines(path: str = BASELINE_PATH) -> Dict[str, Any]:
+    """Load committed baselines, or an empty set if none exist."""
+    if not os.path.exists(path):
+        return {'machine': {}, 'results': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baselines(results: List[BenchmarkResult], path: str = BASELINE_PATH) -> None:
+    """Write results as the new baselines, keeping entries for benchmarks not run."""
+    baselines = load_baselines(path)
+    baselines['machine'] = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'recorded_at': datetime.utcnow().isoformat(timespec='seconds')
+    }
+    for result in results:
+        # A skip here must not erase a number recorded where the benchmark could run
+        if result.skipped and 'median_us' in baselines['results'].get(result.name, {}):
+            continue
+        baselines['results'][result.name] = result.to_dict()
+    baselines['results'] = dict(sorted(baselines['results'].items()))
+    with open(path, 'w') as f:
+        json.dump(baselines, f, indent=2)
+        f.write('\n')
+
+
+def compare(result: BenchmarkResult, baselines: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD) -> Dict[str, Any]:
+    """
+    Compare a result against its baseline.
+
+    Args:
+        result: Fresh result
+        baselines: Loaded baselines
+        threshold: Relative slowdown of the median that counts as a regression
+
+    Returns:
+        Dict with the baseline median, ratio and regression flag
+    """
+    baseline = baselines.get('results', {}).get(result.name, {})
+    base_median = baseline.get('median_us')
+    if result.skipped or not base_median:
+        return {'baseline_us': base_median, 'ratio': None, 'regression': False}
+    ratio = result.median_us / base_median
+    return {'baseline_us': base_median, 'ratio': ratio, 'regression': ratio > 1 + threshold}
+
+
+def format_row(result: BenchmarkResult, comparison: Dict[str, Any]) -> str:
+    """Format one result line for the console."""
+    if result.skipped:
+        return f"{result.name:<48} skipped: {result.skipped}"
+    line = f"{result.name:<48} {result.median_us:>12.1f} µs  (min {result.min_us:.1f}, ±{result.stdev_us:.1f})"
+    if comparison['ratio'] is not None:
+        flag = '  REGRESSION' if comparison['regression'] else ''
+        line += f"  x{comparison['ratio']:.2f} vs {comparison['baseline_us']:.1f}{flag}"
+    return line
+
+
+_app = None
+
+
+def bench_app():
+    """
+    Get the shared Flask app bound to the benchmark database, with the pipeline tables created. bound to the benchmark database with the pipeline tables created.
+
+    Uses $BENCH_DATABASE_URL when set (point it at a scratch Postgres database
+    for production-like numbers), otherwise in-memory SQLite.
+
+    Returns:
+        Flask application
+    """
+    global _app
+    if _app is not None:
+        return _app
+
+    from flask import Flask
+    from common.db import db
+    import features.ingestion.models  # noqa: F401 - registers discord_messages
+    import features.parsing.models  # noqa: F401 - registers trade_setups / parsing_levels
+
+    app = Flask('benchmarks')
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('BENCH_DATABASE_URL', 'sqlite://')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    _app = app
+    return app
+
+
+def is_postgres(app) -> bool:
+    """Whether the benchmark app is backed by PostgreSQL."""
+    return app.config['SQLALCHEMY_DATABASE_URI'].startswith('postgres')
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark Runner
+
+Examples:
+    python -m benchmarks.run                      # run everything, compare with baselines
+    python -m benchmarks.run -k parsing           # only benchmarks whose name contains "parsing"
+    python -m benchmarks.run --save-baseline      # record new baselines.json
+    python -m benchmarks.run --threshold 0.1 --fail-on-regression
+"""
+import argparse
+import importlib
+import logging
+import sys
+
+from .harness import (
+    DEFAULT_THRESHOLD,
+    compare,
+    format_row,
+    load_baselines,
+    registered,
+    run_benchmark,
+    save_baselines,
+)
+
+BENCHMARK_MODULES = [
+    'benchmarks.bench_parsing',
+    'benchmarks.bench_ingestion',
+    'benchmarks.bench_events',
+    'benchmarks.bench_greeks',
+    'benchmarks.bench_instrumentation',
+    'benchmarks.bench_statements',
+    'benchmarks.bench_calendar',
+]
+
+
+def main(argv=None) -> int:
+    """Main script execution."""
+    parser = argparse.ArgumentParser(description='Run performance benchmarks')
+    parser.add_argument('-k', dest='pattern', help='Only run benchmarks whose name contains this')
+    parser.add_argument('--save-baseline', action='store_true', help='Write results to benchmarks/baselines.json')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Relative median slowdown reported as a regression (default: 0.25)')
+    parser.add_argument('--fail-on-regression', action='store_true', help='Exit 1 if any benchmark regressed')
+    args = parser.parse_args(argv)
+
+    # Application logging would dominate the timings
+    logging.disable(logging.CRITICAL)
+    for module in BENCHMARK_MODULES:
+        importlib.import_module(module)
+
+    baselines = load_baselines()
+    results = []
+    regressions = []
+    for bench in registered(args.pattern):
+        result = run_benchmark(bench)
+        comparison = compare(result, baselines, args.threshold)
+        print(format_row(result, comparison), flush=True)
+        results.append(result)
+        if comparison['regression']:
+            regressions.append(result.name)
+
+    if args.save_baseline:
+        save_baselines(results)
+        print(f"Saved {len(results)} baselines")
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        if args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,347 @@
+"""
+Async Runtime
+
+One long-lived event loop on a daemon thread hosts every coroutine service in
+the process: the Discord bot, the event listeners and async publishers.
+Services are registered with ``runtime.supervise`` and restarted according to
+their policy; sync code (Flask views, worker threads) hands coroutines to the
+loop with ``runtime.submit`` or ``runtime.run`` instead of creating a loop per
+call.
+
+asyncpg pools and discord.py clients are bound to the loop that created them,
+so keeping every coroutine on this loop also lets them share the event pool
+in common.events.publisher.
+"""
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Restart policies
+ALWAYS = 'always'          # restart when the service returns or raises
+ON_FAILURE = 'on_failure'  # restart only when it raises
+NEVER = 'never'
+RESTART_POLICIES = (ALWAYS, ON_FAILURE, NEVER)
+
+RESTART_BACKOFF_MAX = 30.0
+# A service that stays up this long gets its restart backoff reset
+STABLE_SECONDS = 60.0
+STOP_TIMEOUT = 10.0
+
+
+class SupervisedTask:
+    """A named coroutine service restarted according to its policy."""
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[], Awaitable[Any]],
+        restart: str = ALWAYS,
+        backoff: float = 1.0,
+        max_backoff: float = RESTART_BACKOFF_MAX
+    ):
+        """
+        Initialize the supervised task.
+
+        Args:
+            name: Unique service name, used in logs and health output
+            factory: Called with no arguments to get a fresh awaitable per run
+            restart: One of ALWAYS, ON_FAILURE or NEVER
+            backoff: Delay before the first restart, doubled per restart
+            max_backoff: Upper bound for the restart delay
+
+        Raises:
+            ValueError: If the restart policy is unknown
+        """
+        if restart not in RESTART_POLICIES:
+            raise ValueError(f"Unknown restart policy '{restart}' (expected {', '.join(RESTART_POLICIES)})")
+        self.name = name
+        self.factory = factory
+        self.restart = restart
+        self.initial_backoff = backoff
+        self.max_backoff = max_backoff
+        self.backoff = backoff
+
+        # pending -> running -> restarting -> running ... -> finished | failed | stopped
+        self.state = 'pending'
+        self.restarts = 0
+        self.last_error: Optional[str] = None
+        self.started_at: Optional[datetime] = None
+        self.exited_at: Optional[datetime] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.state in ('pending', 'running', 'restarting')
+
+    async def run(self) -> None:
+        """Run the service until its policy says stop or the task is cancelled."""
+        while True:
+            self.state = 'running'
+            self.started_at = datetime.utcnow()
+            started = time.monotonic()
+            failed = False
+            try:
+                await self.factory()
+            except asyncio.CancelledError:
+                self.state = 'stopped'
+                raise
+            except Exception as e:
+                failed = True
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.exception(f"Task '{self.name}' failed")
+            self.exited_at = datetime.utcnow()
+
+            if self.restart == NEVER or (self.restart == ON_FAILURE and not failed):
+                self.state = 'failed' if failed else 'finished'
+                logger.info(f"Task '{self.name}' {self.state}; not restarting ({self.restart})")
+                return
+
+            if time.monotonic() - started >= STABLE_SECONDS:
+                self.backoff = self.initial_backoff
+            self.state = 'restarting'
+            logger.warning(
+                f"Task '{self.name}' {'failed' if failed else 'exited'}; restarting in {self.backoff:.0f}s"
+            )
+            await asyncio.sleep(self.backoff)
+            self.backoff = min(self.backoff * 2, self.max_backoff)
+            self.restarts += 1
+
+    def health(self) -> Dict[str, Any]:
+        """Get the service state for health checks."""
+        return {
+            'state': self.state,
+            'restart': self.restart,
+            'restarts': self.restarts,
+            'last_error': self.last_error,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'exited_at': self.exited_at.isoformat() if self.exited_at else None
+        }
+
+
+class AsyncRuntime:
+    """The process-wide event loop thread and its supervised services."""
+
+    def __init__(self, name: str = 'async-runtime'):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.RLock()
+        self._tasks: Dict[str, SupervisedTask] = {}
+        # Fire-and-forget futures, referenced until done
+        self._background: set = set()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """
+        Start the loop thread if it is not running.
+
+        Returns:
+            asyncio.AbstractEventLoop: The runtime loop
+        """
+        with self._lock:
+            if self.running:
+                return self._loop
+
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                try:
+                    loop.run_forever()
+                finally:
+                    loop.run_until_complete(loop.shutdown_asyncgens())
+                    loop.close()
+
+            self._thread = threading.Thread(target=_run, name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+            self._loop = loop
+            logger.info(f"Async runtime started on thread '{self.name}'")
+            return loop
+
+    def in_runtime(self) -> bool:
+        """Check whether the caller runs on the runtime loop thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the runtime loop from any thread.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            concurrent.futures.Future: Resolves with the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.start())
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the runtime loop and wait for its result.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds to wait before giving up (None waits forever)
+
+        Returns:
+            Any: The coroutine's result
+
+        Raises:
+            RuntimeError: If called from the runtime loop itself, which would deadlock
+            concurrent.futures.TimeoutError: If the timeout expires
+        """
+        if self.in_runtime():
+            coro.close()
+            raise RuntimeError("runtime.run() called on the runtime loop; await the coroutine instead")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def spawn(self, coro: Coroutine, name: Optional[str] = None) -> concurrent.futures.Future:
+        """
+        Run a coroutine in the background, logging any exception it raises.
+
+        Args:
+            coro: Coroutine to run
+            name: Label for the error log
+
+        Returns:
+            concurrent.futures.Future: The scheduled future
+        """
+        future = self.submit(coro)
+        self._background.add(future)
+
+        def _done(done: concurrent.futures.Future) -> None:
+            self._background.discard(done)
+            if not done.cancelled() and done.exception() is not None:
+                logger.error(f"Background task {name or coro.__qualname__} failed: {done.exception()}")
+
+        future.add_done_callback(_done)
+        return future
+
+    def supervise(
+        self,
+        name: str,
+        factory: Callable[[], Awaitable[Any]],
+        restart: str = ALWAYS,
+        backoff: float = 1.0
+    ) -> SupervisedTask:
+        """
+        Run a long-lived service on the runtime loop under a restart policy.
+
+        Registering a name that is already alive returns the existing task, so
+        repeated startup paths do not start a service twice.
+
+        Args:
+            name: Unique service name
+            factory: Called with no arguments to get a fresh awaitable per run
+            restart: One of ALWAYS, ON_FAILURE or NEVER
+            backoff: Delay before the first restart, doubled up to 30 seconds
+
+        Returns:
+            SupervisedTask: The supervised service
+        """
+        with self._lock:
+            existing = self._tasks.get(name)
+            if existing is not None and existing.alive:
+                return existing
+
+            supervised = SupervisedTask(name, factory, restart=restart, backoff=backoff)
+            self._tasks[name] = supervised
+            loop = self.start()
+
+        def _create() -> None:
+            if supervised.state == 'pending':
+                supervised.task = loop.create_task(supervised.run(), name=name)
+
+        loop.call_soon_threadsafe(_create)
+        logger.info(f"Supervising task '{name}' (restart={restart})")
+        return supervised
+
+    def get_task(self, name: str) -> Optional[SupervisedTask]:
+        """Get a supervised service by name."""
+        return self._tasks.get(name)
+
+    def cancel(self, name: str, timeout: float = STOP_TIMEOUT) -> bool:
+        """
+        Cancel a supervised service and wait for it to unwind.
+
+        Args:
+            name: Service name
+            timeout: Seconds to wait for cleanup
+
+        Returns:
+            bool: True if the service is no longer running
+        """
+        supervised = self._tasks.get(name)
+        if supervised is None or not supervised.alive or not self.running:
+            return True
+
+        async def _cancel() -> None:
+            if supervised.task is None:
+                supervised.state = 'stopped'
+                return
+            supervised.task.cancel()
+            await asyncio.gather(supervised.task, return_exceptions=True)
+
+        if self.in_runtime():
+            self.spawn(_cancel(), name=f"cancel {name}")
+            return False
+        try:
+            self.run(_cancel(), timeout)
+        except concurrent.futures.TimeoutError:
+            logger.warning(f"Task '{name}' did not stop within {timeout:.0f}s")
+            return False
+        return True
+
+    def health(self) -> Dict[str, Any]:
+        """Get the runtime and per-service state for health checks."""
+        return {
+            'running': self.running,
+            'tasks': {name: task.health() for name, task in self._tasks.items()}
+        }
+
+    def stop(self, timeout: float = STOP_TIMEOUT) -> None:
+        """
+        Cancel every service and stop the loop thread.
+
+        Args:
+            timeout: Seconds to wait for services to unwind
+        """
+        with self._lock:
+            if not self.running:
+                return
+            loop, thread = self._loop, self._thread
+
+            async def _shutdown() -> None:
+                tasks = [t.task for t in self._tasks.values() if t.task is not None and not t.task.done()]
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            try:
+                self.run(_shutdown(), timeout)
+            except Exception as e:
+                logger.warning(f"Async runtime shutdown incomplete: {e}")
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            self._loop = None
+            self._thread = None
+            logger.info("Async runtime stopped")
+
+
+runtime = AsyncRuntime()
@@ -0,0 +1,358 @@
+"""
+Connection Pool Profiles and Metrics
+
+Sizes the SQLAlchemy engine pool (and the asyncpg event pool in
+common.events.publisher) from the roles a process hosts, so a web process and
+a parse worker no longer both get the library defaults. Server-side
+``statement_timeout`` and ``idle_in_transaction_session_timeout`` keep one
+stuck query or forgotten transaction from pinning a connection forever.
+Long streaming reads (message exports) raise both limits for their own
+transaction only, through ``transaction_timeouts``.
+
+PoolMetrics records how long callers waited for a connection and which
+threads hold one right now, which is what you need when the pool runs dry.
+
+Every profile value can be overridden through the environment:
+DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_STATEMENT_TIMEOUT_MS,
+DB_IDLE_TX_TIMEOUT_MS, DB_ASYNC_POOL_MIN and DB_ASYNC_POOL_MAX. The export
+limits read DB_EXPORT_STATEMENT_TIMEOUT_MS and DB_EXPORT_IDLE_TX_TIMEOUT_MS.
+"""
+import logging
+import os
+import threading
+import time
+import weakref
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import event, exc, text
+from sqlalchemy.pool import QueuePool
+
+from common.metrics.histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Seconds before a pooled connection is replaced, below common server/proxy idle limits
+POOL_RECYCLE = 300
+
+
+@dataclass(frozen=True)
+class PoolProfile:
+    """Connection budget for one process role."""
+    pool_size: int
+    max_overflow: int
+    # Seconds a checkout waits for a free connection before raising
+    pool_timeout: float
+    statement_timeout_ms: int
+    idle_in_transaction_timeout_ms: int
+    async_min_size: int
+    async_max_size: int
+
+
+# Sized so every role together stays well under Postgres' default max_connections (100)
+POOL_PROFILES: Dict[str, PoolProfile] = {
+    # Request handlers and dashboards: fail fast rather than queue behind slow queries
+    'web': PoolProfile(8, 8, 10, 15_000, 60_000, 1, 3),
+    # Discord bot and ingestion listener: few, short writes
+    'ingest': PoolProfile(3, 2, 30, 30_000, 60_000, 2, 5),
+    # Parse worker claims plus the listener's handler transactions
+    'parse': PoolProfile(4, 2, 30, 30_000, 60_000, 2, 4),
+    # Price monitor, candle/strategy detectors and historical loaders, one thread each
+    'market': PoolProfile(5, 5, 30, 30_000, 60_000, 1, 4),
+    # Exit rules, position snapshot and options trader
+    'execution': PoolProfile(4, 4, 30, 30_000, 60_000, 1, 3),
+}
+
+# Per-transaction limits for streaming exports: the cursor stays open for the
+# whole download and sits idle while a slow client drains the response
+EXPORT_STATEMENT_TIMEOUT_MS = 30 * 60_000
+EXPORT_IDLE_TX_TIMEOUT_MS = 5 * 60_000
+
+_ENV_OVERRIDES = {
+    'pool_size': ('DB_POOL_SIZE', int),
+    'max_overflow': ('DB_MAX_OVERFLOW', int),
+    'pool_timeout': ('DB_POOL_TIMEOUT', float),
+    'statement_timeout_ms': ('DB_STATEMENT_TIMEOUT_MS', int),
+    'idle_in_transaction_timeout_ms': ('DB_IDLE_TX_TIMEOUT_MS', int),
+    'async_min_size': ('DB_ASYNC_POOL_MIN', int),
+    'async_max_size': ('DB_ASYNC_POOL_MAX', int),
+}
+
+
+def pool_profile(roles: Iterable[str]) -> PoolProfile:
+    """
+    Combine the profiles of the roles one process hosts.
+
+    Pool sizes add up, since the roles' threads draw from one pool; timeouts
+    take the most lenient role's value. Environment overrides apply last.
+
+    Args:
+        roles: Role names from common.process_roles.ROLES
+
+    Returns:
+        PoolProfile: Budget for this process
+
+    Raises:
+        ValueError: If no known role is given
+    """
+    profiles = [POOL_PROFILES[role] for role in sorted(set(roles)) if role in POOL_PROFILES]
+    if not profiles:
+        raise ValueError(f"No pool profile for roles {sorted(roles)}")
+    profile = PoolProfile(
+        pool_size=sum(p.pool_size for p in profiles),
+        max_overflow=sum(p.max_overflow for p in profiles),
+        pool_timeout=max(p.pool_timeout for p in profiles),
+        statement_timeout_ms=max(p.statement_timeout_ms for p in profiles),
+        idle_in_transaction_timeout_ms=max(p.idle_in_transaction_timeout_ms for p in profiles),
+        async_min_size=sum(p.async_min_size for p in profiles),
+        async_max_size=sum(p.async_max_size for p in profiles),
+    )
+    overrides = {}
+    for field, (variable, cast) in _ENV_OVERRIDES.items():
+        value = os.environ.get(variable)
+        if value:
+            overrides[field] = cast(value)
+    return replace(profile, **overrides) if overrides else profile
+
+
+def _server_settings(profile: PoolProfile) -> Dict[str, str]:
+    return {
+        'statement_timeout': str(profile.statement_timeout_ms),
+        'idle_in_transaction_session_timeout': str(profile.idle_in_transaction_timeout_ms),
+    }
+
+
+def engine_options(database_url: Optional[str], profile: PoolProfile) -> Dict[str, Any]:
+    """
+    Build SQLALCHEMY_ENGINE_OPTIONS for a profile.
+
+    Pool sizing and server timeouts only apply to PostgreSQL; other URLs (the
+    sqlite test databases) keep Flask-SQLAlchemy's pool defaults.
+
+    Args:
+        database_url: SQLAlchemy database URL
+        profile: Connection budget for this process
+
+    Returns:
+        dict: Engine options
+    """
+    options: Dict[str, Any] = {
+        'pool_recycle': POOL_RECYCLE,
+        'pool_pre_ping': True,
+    }
+    if database_url and database_url.startswith(('postgres://', 'postgresql')):
+        options.update({
+            'poolclass': InstrumentedQueuePool,
+            'pool_size': profile.pool_size,
+            'max_overflow': profile.max_overflow,
+            'pool_timeout': profile.pool_timeout,
+            'connect_args': {
+                'options': ' '.join(f"-c {name}={value}" for name, value in _server_settings(profile).items())
+            },
+        })
+    return options
+
+
+def transaction_timeouts(session, statement_timeout_ms: int, idle_in_transaction_timeout_ms: int) -> bool:
+    """
+    Override the profile's server timeouts for the session's current transaction.
+
+    Uses SET LOCAL, so the connection goes back to the pool with its profile
+    limits once the transaction ends. Only applies to PostgreSQL.
+
+    Args:
+        session: SQLAlchemy session whose transaction gets the limits
+        statement_timeout_ms: statement_timeout for the transaction (0 disables it)
+        idle_in_transaction_timeout_ms: idle_in_transaction_session_timeout for the transaction
+
+    Returns:
+        bool: True if the limits were set
+    """
+    if session.get_bind().dialect.name != 'postgresql':
+        return False
+    session.execute(text(f"SET LOCAL statement_timeout = {int(statement_timeout_ms)}"))
+    session.execute(text(f"SET LOCAL idle_in_transaction_session_timeout = {int(idle_in_transaction_timeout_ms)}"))
+    return True
+
+
+def export_timeouts(session) -> bool:
+    """
+    Apply the streaming export limits to the session's current transaction.
+
+    Args:
+        session: SQLAlchemy session the export reads through
+
+    Returns:
+        bool: True if the limits were set
+    """
+    return transaction_timeouts(
+        session,
+        int(os.environ.get('DB_EXPORT_STATEMENT_TIMEOUT_MS') or EXPORT_STATEMENT_TIMEOUT_MS),
+        int(os.environ.get('DB_EXPORT_IDLE_TX_TIMEOUT_MS') or EXPORT_IDLE_TX_TIMEOUT_MS),
+    )
+
+
+def asyncpg_pool_options(profile: PoolProfile) -> Dict[str, Any]:
+    """
+    Build asyncpg.create_pool keyword arguments for a profile.
+
+    Args:
+        profile: Connection budget for this process
+
+    Returns:
+        dict: Pool options
+    """
+    return {
+        'min_size': profile.async_min_size,
+        'max_size': max(profile.async_max_size, profile.async_min_size),
+        'command_timeout': 60,
+        'server_settings': _server_settings(profile),
+    }
+
+
+class PoolMetrics:
+    """Checkout wait times and current holders for the engine pool of this process."""
+
+    def __init__(self):
+        # Time from asking the pool for a connection to getting one
+        self.wait = LatencyHistogram()
+        self.counters = {'checkouts': 0, 'timeouts': 0, 'connects': 0, 'invalidations': 0}
+        self.max_checked_out = 0
+        self.profile: Optional[PoolProfile] = None
+        # id(dbapi connection) -> (thread name, checkout time)
+        self._holders: Dict[int, tuple] = {}
+        self._engine_ref = None
+
+    def instrument(self, engine, profile: Optional[PoolProfile] = None) -> None:
+        """
+        Attach pool event listeners to an engine.
+
+        Listening on the engine rather than its pool keeps the listeners when
+        the pool is recreated (engine.dispose()).
+
+        Args:
+            engine: SQLAlchemy engine
+            profile: Profile the engine was built from, reported in snapshots
+        """
+        self._engine_ref = weakref.ref(engine)
+        self.profile = profile
+        if event.contains(engine, 'checkout', self._on_checkout):
+            return
+        event.listen(engine, 'connect', self._on_connect)
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'checkin', self._on_checkin)
+        event.listen(engine, 'invalidate', self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        self.counters['connects'] += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        self.counters['checkouts'] += 1
+        self._holders[id(dbapi_connection)] = (threading.current_thread().name, time.monotonic())
+        held = len(self._holders)
+        if held > self.max_checked_out:
+            self.max_checked_out = held
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        self._holders.pop(id(dbapi_connection), None)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        self.counters['invalidations'] += 1
+        self._holders.pop(id(dbapi_connection), None)
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        self.wait.record(seconds)
+        if timed_out:
+            self.counters['timeouts'] += 1
+
+    def holders(self) -> Dict[str, Dict[str, Any]]:
+        """Connections checked out right now, grouped by the holding thread."""
+        now = time.monotonic()
+        by_thread: Dict[str, Dict[str, Any]] = {}
+        for thread_name, since in list(self._holders.values()):
+            entry = by_thread.setdefault(thread_name, {'connections': 0, 'longest_held_seconds': 0.0})
+            entry['connections'] += 1
+            entry['longest_held_seconds'] = max(entry['longest_held_seconds'], round(now - since, 3))
+        return by_thread
+
+    def pool_state(self) -> Dict[str, Any]:
+        """Current size, checked-out and overflow counts of the instrumented pool."""
+        engine = self._engine_ref() if self._engine_ref else None
+        if engine is None:
+            return {}
+        pool = engine.pool
+        state = {'status': pool.status()}
+        if isinstance(pool, QueuePool):
+            state.update({
+                'size': pool.size(),
+                'checked_in': pool.checkedin(),
+                'checked_out': pool.checkedout(),
+                'overflow': max(pool.overflow(), 0),
+            })
+        else:
+            state['checked_out'] = len(self._holders)
+        return state
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'profile': asdict(self.profile) if self.profile else None,
+            'pool': self.pool_state(),
+            'max_checked_out': self.max_checked_out,
+            'wait': self.wait.snapshot(),
+            'holders': self.holders(),
+            **self.counters
+        }
+
+    def render_prometheus(self) -> str:
+        """Render pool gauges, the wait histogram and counters in the Prometheus text format."""
+        lines = []
+        state = self.pool_state()
+        for key, help_text in (
+            ('size', 'Connections kept open by the engine pool'),
+            ('checked_out', 'Engine pool connections currently checked out'),
+            ('overflow', 'Engine pool connections open beyond pool_size'),
+        ):
+            if key in state:
+                name = f"db_pool_{key}"
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {state[key]}")
+
+        name = 'db_pool_wait_seconds'
+        lines.append(f"# HELP {name} Time spent waiting for an engine pool connection")
+        lines.append(f"# TYPE {name} summary")
+        for q, seconds in self.wait.quantiles((0.5, 0.95, 0.99)).items():
+            if seconds is not None:
+                lines.append(f'{name}{{quantile="{q:g}"}} {seconds:.6f}')
+        lines.append(f"{name}_sum {self.wait.total_us / 1_000_000:.6f}")
+        lines.append(f"{name}_count {self.wait.count}")
+
+        lines.append("# HELP db_pool_events_total Engine pool events in this process")
+        lines.append("# TYPE db_pool_events_total counter")
+        for kind, count in self.counters.items():
+            lines.append(f'db_pool_events_total{{event="{kind}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        engine_ref, profile = self._engine_ref, self.profile
+        self.__init__()
+        self._engine_ref, self.profile = engine_ref, profile
+
+
+# Global metrics for this process
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            logger.error(f"Connection pool exhausted: {self.status()}; holders {pool_metrics.holders()}")
+            raise
+        pool_metrics.record_wait(time.perf_counter() - started)
+        return connection
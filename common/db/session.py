@@ -23,9 +23,12 @@ def initialize_db(app):
     Returns:
         bool: True if initialization successful, False otherwise
     """
+    from .pool import pool_metrics
+
     try:
         db.init_app(app)
         with app.app_context():
+            pool_metrics.instrument(db.engine, app.config.get('DB_POOL_PROFILE'))
             db.create_all()
         logger.info("Database initialized successfully")
         return True
@@ -2,6 +2,8 @@
 Event Cleanup Service
 
 Handles automated cleanup of events older than 90 days per retention policy.
+When the events table is partitioned, cleanup drops whole expired partitions
+and pre-creates upcoming ones; otherwise it falls back to deleting rows.
 Integrates with Flask application lifecycle for scheduled maintenance.
 """
 import logging
@@ -11,6 +13,8 @@ import time
 from datetime import datetime, timedelta
 
 from .query_service import EventQueryService
+from .partitions import partition_manager
+from .traces import cleanup_old_traces
 from .constants import EventChannels, EventTypes
 from common.events.publisher import publish_event_safe as publish_event
 
@@ -30,6 +34,13 @@ class EventCleanupService:
             logger.warning("Event cleanup scheduler already running")
             return
         
+        # Make sure today's partitions exist before the first scheduled run
+        try:
+            if partition_manager.is_partitioned():
+                partition_manager.ensure_partitions()
+        except Exception as e:
+            logger.error(f"Error ensuring event partitions: {e}")
+        
         # Schedule daily cleanup at 2 AM
         schedule.every().day.at("02:00").do(self.run_cleanup)
         
@@ -71,25 +82,50 @@ class EventCleanupService:
             logger.info("Starting scheduled event cleanup")
             
             start_time = datetime.utcnow()
-            deleted_count = EventQueryService.cleanup_old_events()
-            end_time = datetime.utcnow()
+            result = {'cleanup_completed': True, 'cleanup_date': start_time.isoformat()}
+            
+            if partition_manager.is_partitioned():
+                # Metadata-only: detach/drop expired partitions, create upcoming ones
+                maintenance = partition_manager.run_maintenance()
+                result['partitions_created'] = maintenance['created']
+                result['partitions_dropped'] = maintenance['dropped']
+                result['default_partition_rows'] = maintenance['default_rows']
+                result['default_partition_rows_deleted'] = maintenance['default_rows_deleted']
+                summary = f"{len(maintenance['dropped'])} partitions dropped, {len(maintenance['created'])} created"
+                if maintenance['default_rows']:
+                    # Events only reach the default partition when daily partitions were missing
+                    publish_event(
+                        event_type=EventTypes.WARNING,
+                        data={
+                            'service': 'event_cleanup',
+                            'default_partition_rows': maintenance['default_rows'],
+                            'partitions_created': maintenance['created']
+                        },
+                        channel=EventChannels.SYSTEM,
+                        source='event_cleanup_service'
+                    )
+            else:
+                deleted_count = EventQueryService.cleanup_old_events()
+                result['events_deleted'] = deleted_count
+                summary = f"{deleted_count} events deleted"
             
-            duration = (end_time - start_time).total_seconds()
+            # Traces follow the same retention as the events they summarize
+            cutoff = start_time - timedelta(days=partition_manager.retention_days)
+            result['traces_deleted'] = cleanup_old_traces(cutoff)
+            summary += f", {result['traces_deleted']} traces deleted"
+            
+            duration = (datetime.utcnow() - start_time).total_seconds()
+            result['duration_seconds'] = duration
             
             # Publish cleanup completion event
             publish_event(
                 event_type=EventTypes.INFO,
-                data={
-                    'cleanup_completed': True,
-                    'events_deleted': deleted_count,
-                    'duration_seconds': duration,
-                    'cleanup_date': start_time.isoformat()
-                },
+                data=result,
                 channel=EventChannels.SYSTEM,
                 source='event_cleanup_service'
             )
             
-            logger.info(f"Event cleanup completed: {deleted_count} events deleted in {duration:.2f}s")
+            logger.info(f"Event cleanup completed: {summary} in {duration:.2f}s")
             
         except Exception as e:
             logger.error(f"Error during scheduled event cleanup: {e}")
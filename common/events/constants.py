@@ -89,6 +89,7 @@ class EventTypes:
     SIGNAL_TRIGGERED = "signal.triggered"
     SIGNAL_COMPLETED = "signal.completed"
     SIGNAL_CREATED = "signal.created"
+    SIGNAL_TARGET_HIT = "signal.target_hit"
     
     # Trade events
     TRADE_EXECUTED = "trade.executed"
@@ -97,6 +98,7 @@ class EventTypes:
     # Market data events
     TICKER_DATA = "market.ticker.data"
     PRICE_UPDATE = "market.price.update"
+    CANDLE_CLOSED = "market.candle.closed"
     
     # System events
     ERROR = "system.error"
@@ -8,14 +8,48 @@ threading-based polling. Use PostgreSQL LISTEN/NOTIFY via common/events/publishe
 """
 
 import logging
-from datetime import datetime
 from typing import List, Dict, Any, Optional
 from flask import has_app_context
 
 logger = logging.getLogger(__name__)
 
 
-def get_events_by_channel(channel: str, since_timestamp=None, limit: int = 100) -> List[Dict[str, Any]]:
+def _event_to_dict(event) -> Dict[str, Any]:
+    """Convert an Event row to the dictionary shape these helpers return."""
+    return {
+        'id': event.id,
+        'event_type': event.event_type,
+        'channel': event.channel,
+        'payload': event.data,
+        'source': event.source,
+        'correlation_id': event.correlation_id,
+        'timestamp': event.timestamp,
+        'created_at': event.created_at
+    }
+
+
+def _get_events_page(since_timestamp=None, limit: int = 100, after_id: Optional[int] = None,
+                     **filters) -> List[Dict[str, Any]]:
+    """
+    Fetch one keyset page of events through EventQueryService.get_events_page.
+    
+    Without after_id the newest events come first; with it, events after that
+    ID come oldest first. since_timestamp bounds created_at (inclusive), which
+    also lets the planner prune daily partitions.
+    """
+    from .query_service import EventQueryService
+    
+    page = EventQueryService.get_events_page(
+        after_id=after_id,
+        limit=limit,
+        since=since_timestamp,
+        **filters
+    )
+    return [_event_to_dict(event) for event in page['events']]
+
+
+def get_events_by_channel(channel: str, since_timestamp=None, limit: int = 100,
+                          after_id: Optional[int] = None) -> List[Dict[str, Any]]:
     """
     Query events for a given channel.
     
@@ -23,6 +57,7 @@ def get_events_by_channel(channel: str, since_timestamp=None, limit: int = 100)
         channel: Event channel to query
         since_timestamp: Optional timestamp to get events since
         limit: Maximum number of events to return
+        after_id: Optional event ID cursor; only events with a greater ID are returned, oldest first
         
     Returns:
         List of event dictionaries
@@ -32,60 +67,21 @@ def get_events_by_channel(channel: str, since_timestamp=None, limit: int = 100)
         return []
     
     try:
-        from sqlalchemy import text
-        from common.db import db
-        
-        if since_timestamp:
-            query = text("""
-                SELECT * FROM events 
-                WHERE channel = :channel AND timestamp > :since_timestamp
-                ORDER BY timestamp DESC 
-                LIMIT :limit
-            """)
-            result = db.session.execute(query, {
-                'channel': channel,
-                'since_timestamp': since_timestamp,
-                'limit': limit
-            })
-        else:
-            query = text("""
-                SELECT * FROM events 
-                WHERE channel = :channel
-                ORDER BY timestamp DESC 
-                LIMIT :limit
-            """)
-            result = db.session.execute(query, {
-                'channel': channel,
-                'limit': limit
-            })
-        
-        events = []
-        for row in result:
-            events.append({
-                'id': row.id if hasattr(row, 'id') else None,
-                'event_type': row.event_type,
-                'channel': row.channel,
-                'payload': row.payload,
-                'source': row.source,
-                'correlation_id': row.correlation_id,
-                'timestamp': row.timestamp,
-                'created_at': row.created_at
-            })
-        
-        return events
-        
+        return _get_events_page(since_timestamp, limit, after_id, channel=channel)
     except Exception as e:
         logger.error(f"Failed to query events for channel {channel}: {e}")
         return []
 
 
-def get_latest_events(since_timestamp=None, limit: int = 100) -> List[Dict[str, Any]]:
+def get_latest_events(since_timestamp=None, limit: int = 100,
+                      after_id: Optional[int] = None) -> List[Dict[str, Any]]:
     """
     Query the latest events across all channels.
     
     Args:
         since_timestamp: Optional timestamp to get events since
         limit: Maximum number of events to return
+        after_id: Optional event ID cursor; only events with a greater ID are returned, oldest first
         
     Returns:
         List of event dictionaries
@@ -95,45 +91,7 @@ def get_latest_events(since_timestamp=None, limit: int = 100) -> List[Dict[str,
         return []
     
     try:
-        from sqlalchemy import text
-        from common.db import db
-        
-        if since_timestamp:
-            query = text("""
-                SELECT * FROM events 
-                WHERE timestamp > :since_timestamp
-                ORDER BY timestamp DESC 
-                LIMIT :limit
-            """)
-            result = db.session.execute(query, {
-                'since_timestamp': since_timestamp,
-                'limit': limit
-            })
-        else:
-            query = text("""
-                SELECT * FROM events 
-                ORDER BY timestamp DESC 
-                LIMIT :limit
-            """)
-            result = db.session.execute(query, {
-                'limit': limit
-            })
-        
-        events = []
-        for row in result:
-            events.append({
-                'id': row.id if hasattr(row, 'id') else None,
-                'event_type': row.event_type,
-                'channel': row.channel,
-                'payload': row.payload,
-                'source': row.source,
-                'correlation_id': row.correlation_id,
-                'timestamp': row.timestamp,
-                'created_at': row.created_at
-            })
-        
-        return events
-        
+        return _get_events_page(since_timestamp, limit, after_id)
     except Exception as e:
         logger.error(f"Failed to query latest events: {e}")
         return []
@@ -187,14 +145,19 @@ def get_events_by_correlation_id(correlation_id: str) -> List[Dict[str, Any]]:
         return []
 
 
-def poll_events(channels: List[str], since_timestamp=None, limit: int = 100) -> List[Dict[str, Any]]:
+def poll_events(channels: List[str], since_timestamp=None, limit: int = 100,
+                after_id: Optional[int] = None) -> List[Dict[str, Any]]:
     """
     Poll for new events across multiple channels.
     
+    Pass the highest event ID seen so far as after_id to page forward by ID
+    (oldest first) instead of re-reading an overlapping timestamp window.
+    
     Args:
         channels: List of channels to poll
         since_timestamp: Optional timestamp to get events since
         limit: Maximum number of events to return
+        after_id: Optional event ID cursor; only events with a greater ID are returned
         
     Returns:
         List of event dictionaries
@@ -203,48 +166,11 @@ def poll_events(channels: List[str], since_timestamp=None, limit: int = 100) ->
         logger.warning("Cannot poll events outside Flask application context")
         return []
     
+    if not channels:
+        return []
+    
     try:
-        from sqlalchemy import text
-        from common.db import db
-        
-        # Build IN clause for channels
-        channel_placeholders = ','.join([f':channel_{i}' for i in range(len(channels))])
-        channel_params = {f'channel_{i}': channel for i, channel in enumerate(channels)}
-        
-        if since_timestamp:
-            query = text(f"""
-                SELECT * FROM events 
-                WHERE channel IN ({channel_placeholders}) AND timestamp > :since_timestamp
-                ORDER BY timestamp DESC 
-                LIMIT :limit
-            """)
-            params = {**channel_params, 'since_timestamp': since_timestamp, 'limit': limit}
-        else:
-            query = text(f"""
-                SELECT * FROM events 
-                WHERE channel IN ({channel_placeholders})
-                ORDER BY timestamp DESC 
-                LIMIT :limit
-            """)
-            params = {**channel_params, 'limit': limit}
-        
-        result = db.session.execute(query, params)
-        
-        events = []
-        for row in result:
-            events.append({
-                'id': row.id if hasattr(row, 'id') else None,
-                'event_type': row.event_type,
-                'channel': row.channel,
-                'payload': row.payload,
-                'source': row.source,
-                'correlation_id': row.correlation_id,
-                'timestamp': row.timestamp,
-                'created_at': row.created_at
-            })
-        
-        return events
-        
+        return _get_events_page(since_timestamp, limit, after_id, channels=channels)
     except Exception as e:
         logger.error(f"Failed to poll events for channels {channels}: {e}")
         return []
@@ -4,8 +4,9 @@ Event System Database Models
 Single Event model for PostgreSQL event bus system.
 """
 
+import json
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
 from common.db.session import db
 
 
@@ -13,8 +14,17 @@ class Event(db.Model):
     """
     Single Event model for the PostgreSQL event bus.
     Stores all events across the trading application.
+    
+    In production the table is range-partitioned by day on created_at
+    (see common/events/partitions.py); the database primary key is
+    (id, created_at) while ids remain unique through the shared sequence.
     """
     __tablename__ = 'events'
+    __table_args__ = (
+        # Composite indexes backing keyset pagination (WHERE ... AND id > :cursor ORDER BY id)
+        Index('ix_events_channel_id', 'channel', 'id'),
+        Index('ix_events_correlation_id_id', 'correlation_id', 'id'),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     event_type = Column(String(100), nullable=False, index=True)
@@ -39,4 +49,146 @@ class Event(db.Model):
             'correlation_id': self.correlation_id,
             'timestamp': self.timestamp.isoformat() if self.timestamp else None,
             'created_at': self.created_at.isoformat() if self.created_at else None
-        }
\ No newline at end of file
+        }
+
+
+class EventReplayCheckpoint(db.Model):
+    """
+    Progress of a named event replay.
+    
+    last_event_id is a low watermark: every matching event with an ID at or
+    below it has been handled, so an interrupted replay resumes right after it.
+    Events at or below it whose handlers failed are listed in failed_event_ids
+    (a JSON array) and are retried first when the replay resumes.
+    """
+    __tablename__ = 'event_replay_checkpoints'
+    
+    name = Column(String(100), primary_key=True)
+    last_event_id = Column(Integer, nullable=False, default=0)
+    events_processed = Column(Integer, nullable=False, default=0)
+    events_failed = Column(Integer, nullable=False, default=0)
+    failed_event_ids = Column(Text, nullable=True)
+    status = Column(String(20), nullable=False, default='running')
+    filters = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def get_failed_event_ids(self):
+        """Get the IDs of failed events still to be retried."""
+        return json.loads(self.failed_event_ids) if self.failed_event_ids else []
+    
+    def __repr__(self):
+        return f"<EventReplayCheckpoint {self.name}: {self.last_event_id} ({self.status})>"
+    
+    def to_dict(self):
+        """Convert checkpoint to dictionary representation."""
+        return {
+            'name': self.name,
+            'last_event_id': self.last_event_id,
+            'events_processed': self.events_processed,
+            'events_failed': self.events_failed,
+            'failed_event_ids': self.get_failed_event_ids(),
+            'status': self.status,
+            'filters': self.filters,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+
+class EventConsumerOffset(db.Model):
+    """
+    Durable position of a consumer group in the events table.
+    
+    last_event_id only moves forward after the consumer has handled every
+    event up to it, giving at-least-once delivery across restarts.
+    """
+    __tablename__ = 'event_consumer_offsets'
+    
+    consumer_group = Column(String(100), primary_key=True)
+    last_event_id = Column(Integer, nullable=False, default=0)
+    events_handled = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<EventConsumerOffset {self.consumer_group}: {self.last_event_id}>"
+    
+    def to_dict(self):
+        """Convert offset to dictionary representation."""
+        return {
+            'consumer_group': self.consumer_group,
+            'last_event_id': self.last_event_id,
+            'events_handled': self.events_handled,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+
+class EventDeadLetter(db.Model):
+    """
+    Event a consumer group gave up on after its handler kept failing.
+    
+    The group's offset moves past the event only once this row is written;
+    the replay engine re-drives unresolved rows and stamps redriven_at.
+    """
+    __tablename__ = 'event_dead_letters'
+    
+    consumer_group = Column(String(100), primary_key=True)
+    event_id = Column(Integer, primary_key=True)
+    event_type = Column(String(100), nullable=False)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    redriven_at = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f"<EventDeadLetter {self.consumer_group}: {self.event_id} ({self.event_type})>"
+    
+    def to_dict(self):
+        """Convert dead letter to dictionary representation."""
+        return {
+            'consumer_group': self.consumer_group,
+            'event_id': self.event_id,
+            'event_type': self.event_type,
+            'error': self.error,
+            'attempts': self.attempts,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'redriven_at': self.redriven_at.isoformat() if self.redriven_at else None
+        }
+
+
+class EventTrace(db.Model):
+    """
+    Per-correlation pipeline trace, maintained by an AFTER INSERT trigger on events.
+    
+    Each stage column holds the earliest time an event for that stage was
+    published under the correlation ID.
+    """
+    __tablename__ = 'event_traces'
+    
+    correlation_id = Column(String(36), primary_key=True)
+    received_at = Column(DateTime(timezone=True), nullable=True)
+    stored_at = Column(DateTime(timezone=True), nullable=True)
+    parsed_at = Column(DateTime(timezone=True), nullable=True)
+    setup_created_at = Column(DateTime(timezone=True), nullable=True)
+    first_event_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    last_event_at = Column(DateTime(timezone=True), nullable=False)
+    event_count = Column(Integer, nullable=False, default=0)
+    last_event_type = Column(String(100), nullable=True)
+    
+    def __repr__(self):
+        return f"<EventTrace {self.correlation_id}: {self.event_count} events>"
+    
+    def to_dict(self):
+        """Convert trace to dictionary representation."""
+        return {
+            'correlation_id': self.correlation_id,
+            'received_at': self.received_at.isoformat() if self.received_at else None,
+            'stored_at': self.stored_at.isoformat() if self.stored_at else None,
+            'parsed_at': self.parsed_at.isoformat() if self.parsed_at else None,
+            'setup_created_at': self.setup_created_at.isoformat() if self.setup_created_at else None,
+            'first_event_at': self.first_event_at.isoformat() if self.first_event_at else None,
+            'last_event_at': self.last_event_at.isoformat() if self.last_event_at else None,
+            'event_count': self.event_count,
+            'last_event_type': self.last_event_type
+        }
@@ -0,0 +1,365 @@
+"""
+Durable Event Consumers
+
+NOTIFY is fire-and-forget: a listener that is down or slow misses events.
+DurableConsumer keeps a per-consumer-group offset in Postgres and reads the
+events table from that offset, using NOTIFY only as a wakeup signal. On
+(re)start it catches up in batches before idling on live notifications, and
+the offset only advances after events are handled (at-least-once delivery).
+
+An event whose handler keeps failing is written to ``event_dead_letters``
+before the offset moves past it, and the replay engine re-drives those rows
+(``ReplayRequest.dead_letter_group``). If the dead letter cannot be written
+either (e.g. the database is down), the offset holds and the consumer backs
+off until the event can be handled or recorded.
+"""
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+
+from common.db import db
+from .publisher import get_connection_pool
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str, Dict[str, Any]], Any]
+
+FETCH_EVENTS_SQL = """
+    SELECT id, event_type, channel, data, correlation_id, created_at
+    FROM events
+    WHERE id > $1
+    ORDER BY id
+    LIMIT $2
+"""
+
+SAVE_OFFSET_SQL = """
+    INSERT INTO event_consumer_offsets (consumer_group, last_event_id, events_handled, created_at, updated_at)
+    VALUES ($1, $2, $3, now(), now())
+    ON CONFLICT (consumer_group) DO UPDATE SET
+        last_event_id = GREATEST(event_consumer_offsets.last_event_id, EXCLUDED.last_event_id),
+        events_handled = event_consumer_offsets.events_handled + EXCLUDED.events_handled,
+        updated_at = now()
+"""
+
+DEAD_LETTER_SQL = """
+    INSERT INTO event_dead_letters (consumer_group, event_id, event_type, error, attempts, created_at)
+    VALUES ($1, $2, $3, $4, $5, now())
+    ON CONFLICT (consumer_group, event_id) DO UPDATE SET
+        error = EXCLUDED.error,
+        attempts = event_dead_letters.attempts + EXCLUDED.attempts,
+        created_at = now(),
+        redriven_at = NULL
+"""
+
+# Running consumers in this process, by group
+_consumers: Dict[str, 'DurableConsumer'] = {}
+
+
+def contiguous_prefix(
+    ids: List[int],
+    offset: int,
+    gap_first_seen: Dict[int, float],
+    now: float,
+    gap_timeout: float
+) -> int:
+    """
+    Count how many fetched events can be consumed without skipping a pending ID.
+
+    Event IDs come from a sequence, so a concurrent publisher can commit a
+    smaller ID after a larger one is already visible. A gap is therefore held
+    for up to ``gap_timeout`` seconds before it is treated as permanent (a
+    rolled-back insert).
+
+    Args:
+        ids: Fetched event IDs in ascending order
+        offset: Last consumed event ID
+        gap_first_seen: Missing ID -> monotonic time it was first noticed (updated in place)
+        now: Current monotonic time
+        gap_timeout: Seconds to wait for a missing ID
+
+    Returns:
+        int: Number of leading events safe to consume
+    """
+    expected = offset + 1
+    count = 0
+    for event_id in ids:
+        if event_id != expected:
+            first_seen = gap_first_seen.setdefault(expected, now)
+            if now - first_seen < gap_timeout:
+                break
+        count += 1
+        expected = event_id + 1
+    return count
+
+
+class DurableConsumer:
+    """At-least-once consumer of the events table for one consumer group."""
+
+    def __init__(
+        self,
+        group: str,
+        handler: Handler,
+        event_types: Optional[List[str]] = None,
+        channel: Optional[str] = None,
+        batch_size: int = 200,
+        poll_interval: float = 5.0,
+        gap_timeout: float = 5.0,
+        max_attempts: int = 3,
+        retry_delay: float = 1.0,
+        max_backoff: float = 60.0,
+        start_from_latest: bool = True
+    ):
+        """
+        Initialize the consumer.
+
+        Args:
+            group: Consumer group name; the offset is stored under it
+            handler: handler(event_type, data), sync or async; returning False counts as a failure
+            event_types: Only hand these event types to the handler (default: all)
+            channel: Only hand events from this channel to the handler (default: all)
+            batch_size: Events read per query while catching up
+            poll_interval: Seconds between safety polls when no NOTIFY arrives
+            gap_timeout: Seconds to wait for an uncommitted lower event ID
+            max_attempts: Handler attempts per event before it is dead-lettered
+            retry_delay: Base delay between handler attempts in seconds
+            max_backoff: Longest wait in seconds between drains while an event can
+                neither be handled nor dead-lettered
+            start_from_latest: Start a new group at the current head instead of the first event
+        """
+        self.group = group
+        self.handler = handler
+        self.event_types = set(event_types) if event_types else None
+        self.channel = channel
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.gap_timeout = gap_timeout
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.max_backoff = max_backoff
+        self.start_from_latest = start_from_latest
+
+        self.offset: Optional[int] = None
+        self.running = False
+        self._wakeup: Optional[asyncio.Event] = None
+        self._gaps: Dict[int, float] = {}
+        self._backoff = 0.0
+        self.stats = {
+            'events_handled': 0,
+            'events_skipped': 0,
+            'events_failed': 0,
+            'dead_lettered': 0,
+            'held_event_id': None,
+            'head_event_id': None,
+            'catching_up': False,
+            'last_event_at': None,
+            'last_batch_at': None,
+        }
+
+    def _matches(self, row) -> bool:
+        if self.event_types is not None and row['event_type'] not in self.event_types:
+            return False
+        if self.channel is not None and row['channel'] != self.channel:
+            return False
+        return True
+
+    async def _load_offset(self, conn) -> int:
+        offset = await conn.fetchval(
+            "SELECT last_event_id FROM event_consumer_offsets WHERE consumer_group = $1", self.group
+        )
+        if offset is None:
+            offset = await conn.fetchval("SELECT COALESCE(MAX(id), 0) FROM events") if self.start_from_latest else 0
+            await conn.execute(SAVE_OFFSET_SQL, self.group, offset, 0)
+            logger.info(f"Consumer group '{self.group}' created at event {offset}")
+        return offset
+
+    async def _handle(self, pool, row) -> bool:
+        """
+        Handle one event, dead-lettering it once every attempt failed.
+
+        Returns:
+            bool: False if the event was dead-lettered
+
+        Raises:
+            Exception: If the dead letter could not be written; the offset must not move
+        """
+        data = row['data']
+        if isinstance(data, str):
+            data = json.loads(data)
+        event_type = row['event_type']
+
+        error = None
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                result = self.handler(event_type, data)
+                if asyncio.iscoroutine(result):
+                    result = await result
+                if result is not False:
+                    return True
+                error = 'handler rejected the event'
+                logger.warning(f"[{self.group}] Handler rejected event {row['id']} (attempt {attempt})")
+            except Exception as e:
+                error = str(e)
+                logger.error(f"[{self.group}] Handler failed for event {row['id']} (attempt {attempt}): {e}")
+            self.stats['events_failed'] += 1
+            if attempt < self.max_attempts:
+                await asyncio.sleep(self.retry_delay * attempt)
+
+        # Record it for a re-drive so one poison event cannot block the group forever
+        async with pool.acquire() as conn:
+            await conn.execute(DEAD_LETTER_SQL, self.group, row['id'], event_type, error, self.max_attempts)
+        self.stats['dead_lettered'] += 1
+        logger.error(f"[{self.group}] Dead-lettered event {row['id']} ({event_type}) after {self.max_attempts} attempts")
+        return False
+
+    async def drain(self, pool) -> bool:
+        """
+        Consume every committed event after the current offset.
+
+        Args:
+            pool: asyncpg connection pool
+
+        Returns:
+            bool: True if consumption stopped at a gap that is still pending
+        """
+        while self.running:
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(FETCH_EVENTS_SQL, self.offset, self.batch_size)
+                self.stats['head_event_id'] = await conn.fetchval("SELECT MAX(id) FROM events")
+            if not rows:
+                self.stats['catching_up'] = False
+                return False
+
+            self.stats['catching_up'] = len(rows) == self.batch_size
+            ready = contiguous_prefix(
+                [row['id'] for row in rows], self.offset, self._gaps, time.monotonic(), self.gap_timeout
+            )
+            handled = 0
+            batch_offset = self.offset
+            try:
+                for row in rows[:ready]:
+                    if self._matches(row):
+                        try:
+                            await self._handle(pool, row)
+                        except Exception:
+                            self.stats['held_event_id'] = row['id']
+                            raise
+                        handled += 1
+                        self.stats['last_event_at'] = row['created_at'].isoformat() if row['created_at'] else None
+                    else:
+                        self.stats['events_skipped'] += 1
+                    self.offset = row['id']
+            finally:
+                # Persist the events handled before a held one
+                if self.offset != batch_offset:
+                    async with pool.acquire() as conn:
+                        await conn.execute(SAVE_OFFSET_SQL, self.group, self.offset, handled)
+                    self.stats['events_handled'] += handled
+                    self.stats['last_batch_at'] = datetime.utcnow().isoformat()
+                    self._gaps = {event_id: seen for event_id, seen in self._gaps.items() if event_id > self.offset}
+            self.stats['held_event_id'] = None
+
+            if ready < len(rows):
+                return True
+            if len(rows) < self.batch_size:
+                return False
+        return False
+
+    async def run(self, listen_channel: str = "events") -> None:
+        """
+        Catch up from the stored offset, then follow live notifications until stopped.
+
+        Args:
+            listen_channel: PostgreSQL NOTIFY channel used as the wakeup signal
+        """
+        pool = await get_connection_pool()
+        self._wakeup = asyncio.Event()
+        self.running = True
+        _consumers[self.group] = self
+
+        listener_conn = await pool.acquire()
+        notify = lambda *_: self._wakeup.set()
+        try:
+            self.offset = await self._load_offset(listener_conn)
+            await listener_conn.add_listener(listen_channel, notify)
+            logger.info(f"Consumer group '{self.group}' catching up from event {self.offset}")
+
+            while self.running:
+                self._wakeup.clear()
+                try:
+                    held = await self.drain(pool)
+                    self._backoff = 0.0
+                except Exception as e:
+                    # Keep the offset and retry the same event with exponential backoff
+                    self._backoff = min(self.max_backoff, max(self._backoff * 2, self.retry_delay, 1.0))
+                    logger.error(f"[{self.group}] Error consuming events, retrying in {self._backoff:.0f}s: {e}")
+                    await asyncio.sleep(self._backoff)
+                    continue
+                timeout = min(self.gap_timeout, self.poll_interval) / 2 if held else self.poll_interval
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.running = False
+            _consumers.pop(self.group, None)
+            try:
+                await listener_conn.remove_listener(listen_channel, notify)
+            finally:
+                await pool.release(listener_conn)
+            logger.info(f"Consumer group '{self.group}' stopped at event {self.offset}")
+
+    def stop(self) -> None:
+        """Stop consuming after the current event."""
+        self.running = False
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get consumer statistics including lag behind the newest event."""
+        stats = dict(self.stats)
+        stats['consumer_group'] = self.group
+        stats['offset'] = self.offset
+        stats['running'] = self.running
+        head = stats['head_event_id']
+        stats['lag_events'] = max(0, head - self.offset) if head is not None and self.offset is not None else None
+        return stats
+
+
+def get_running_consumers() -> Dict[str, Dict[str, Any]]:
+    """Get statistics for consumers running in this process."""
+    return {group: consumer.get_stats() for group, consumer in list(_consumers.items())}
+
+
+def get_consumer_lag() -> List[Dict[str, Any]]:
+    """
+    Get the stored offset and lag of every consumer group.
+
+    Requires a Flask application context.
+
+    Returns:
+        List of dictionaries with offset, head event ID and lag per group
+    """
+    result = db.session.execute(text("""
+        SELECT o.consumer_group, o.last_event_id, o.events_handled, o.updated_at,
+               (SELECT MAX(id) FROM events) AS head_event_id
+        FROM event_consumer_offsets o
+        ORDER BY o.consumer_group
+    """))
+    lag = []
+    for row in result:
+        head = row.head_event_id or 0
+        lag.append({
+            'consumer_group': row.consumer_group,
+            'last_event_id': row.last_event_id,
+            'events_handled': row.events_handled,
+            'head_event_id': head,
+            'lag_events': max(0, head - row.last_event_id),
+            'updated_at': row.updated_at.isoformat() if row.updated_at else None,
+            'running': row.consumer_group in _consumers
+        })
+    return lag
@@ -0,0 +1,258 @@
+"""
+Event Partition Manager
+
+Maintains the daily range partitions of the ``events`` table (partitioned on
+``created_at``). Future partitions are created ahead of time, and retention is
+enforced by detaching and dropping whole partitions instead of deleting rows.
+
+Rows that land in the DEFAULT partition (a missed pre-create window, clock
+skew) would make ``CREATE TABLE ... PARTITION OF`` fail for their day, so
+maintenance moves them into a freshly attached daily partition first, deletes
+the ones past retention and reports that the default partition was in use.
+
+The partitioned ``created_at`` column is ``timestamptz`` and partition bounds
+are UTC midnights, so a row's day is ``(created_at AT TIME ZONE 'UTC')::date``;
+a bare ``created_at::date`` would follow the session time zone instead.
+"""
+import logging
+import re
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from common.db import db
+
+logger = logging.getLogger(__name__)
+
+EVENTS_TABLE = 'events'
+DEFAULT_PARTITION = 'events_default'
+
+# Retention and look-ahead, in days
+DEFAULT_RETENTION_DAYS = 90
+DEFAULT_PREMAKE_DAYS = 7
+
+_PARTITION_NAME = re.compile(r'^events_p(\d{8})$')
+
+
+def partition_name(day: date) -> str:
+    """Name of the partition holding events created on ``day``."""
+    return f"{EVENTS_TABLE}_p{day.strftime('%Y%m%d')}"
+
+
+def partition_day(name: str) -> Optional[date]:
+    """Parse the day from a partition name, or None for non-daily partitions."""
+    match = _PARTITION_NAME.match(name)
+    if not match:
+        return None
+    return datetime.strptime(match.group(1), '%Y%m%d').date()
+
+
+def partition_bounds(day: date) -> Tuple[str, str]:
+    """Inclusive lower and exclusive upper bound of a daily partition (UTC)."""
+    return f"{day.isoformat()} 00:00:00+00", f"{(day + timedelta(days=1)).isoformat()} 00:00:00+00"
+
+
+def create_partition_sql(day: date) -> str:
+    """DDL creating the partition for ``day`` if it does not exist yet."""
+    lower, upper = partition_bounds(day)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(day)} PARTITION OF {EVENTS_TABLE} "
+        f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    )
+
+
+def attach_partition_sql(day: date) -> str:
+    """DDL attaching a standalone table as the partition for ``day``."""
+    lower, upper = partition_bounds(day)
+    return (
+        f"ALTER TABLE {EVENTS_TABLE} ATTACH PARTITION {partition_name(day)} "
+        f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    )
+
+
+def expired_partitions(names: List[str], today: date, retention_days: int) -> List[str]:
+    """
+    Select daily partitions whose whole range is older than the retention window.
+
+    Args:
+        names: Existing partition names
+        today: Current UTC day
+        retention_days: Days of events to keep
+
+    Returns:
+        List[str]: Partition names to drop, oldest first
+    """
+    cutoff = today - timedelta(days=retention_days)
+    expired = [(partition_day(name), name) for name in names]
+    return [name for day, name in sorted(e for e in expired if e[0] is not None) if day < cutoff]
+
+
+class EventPartitionManager:
+    """Creates upcoming event partitions and drops expired ones."""
+
+    def __init__(self, retention_days: int = DEFAULT_RETENTION_DAYS, premake_days: int = DEFAULT_PREMAKE_DAYS):
+        """
+        Initialize the partition manager.
+
+        Args:
+            retention_days: Days of events to keep
+            premake_days: Days of future partitions to keep ready
+        """
+        self.retention_days = retention_days
+        self.premake_days = premake_days
+
+    def is_partitioned(self) -> bool:
+        """Check whether the events table is a partitioned table."""
+        result = db.session.execute(text("""
+            SELECT 1 FROM pg_partitioned_table pt
+            JOIN pg_class c ON c.oid = pt.partrelid
+            WHERE c.relname = :table AND pg_table_is_visible(c.oid)
+        """), {'table': EVENTS_TABLE})
+        return result.first() is not None
+
+    def list_partitions(self) -> List[str]:
+        """List the partitions currently attached to the events table."""
+        result = db.session.execute(text("""
+            SELECT child.relname
+            FROM pg_inherits i
+            JOIN pg_class parent ON parent.oid = i.inhparent
+            JOIN pg_class child ON child.oid = i.inhrelid
+            WHERE parent.relname = :table AND pg_table_is_visible(parent.oid)
+            ORDER BY child.relname
+        """), {'table': EVENTS_TABLE})
+        return [row[0] for row in result]
+
+    def default_partition_days(self) -> Dict[date, int]:
+        """Count the rows in the DEFAULT partition per UTC day."""
+        result = db.session.execute(text(f"""
+            SELECT (created_at AT TIME ZONE 'UTC')::date AS day, COUNT(*) AS row_count
+            FROM {DEFAULT_PARTITION}
+            GROUP BY 1
+            ORDER BY 1
+        """))
+        return {row.day: row.row_count for row in result}
+
+    def _create_partition(self, day: date, stranded_rows: int) -> None:
+        if not stranded_rows:
+            db.session.execute(text(create_partition_sql(day)))
+            return
+        # PARTITION OF fails while the default partition holds rows of the range,
+        # so build the table aside, move the rows into it and attach it
+        name = partition_name(day)
+        lower, upper = partition_bounds(day)
+        db.session.execute(text(
+            f"CREATE TABLE {name} (LIKE {EVENTS_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ))
+        db.session.execute(text(f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE created_at >= :lower AND created_at < :upper
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+        """), {'lower': lower, 'upper': upper})
+        db.session.execute(text(attach_partition_sql(day)))
+        logger.warning(f"Moved {stranded_rows} events for {day} out of {DEFAULT_PARTITION} into {name}")
+
+    def ensure_partitions(self, today: Optional[date] = None) -> List[str]:
+        """
+        Create partitions from today through the look-ahead window.
+
+        Days inside the retention window that have rows stranded in the
+        DEFAULT partition also get a partition, with those rows moved into it.
+
+        Args:
+            today: Current UTC day (defaults to now)
+
+        Returns:
+            List[str]: Partitions that were created
+        """
+        today = today or datetime.utcnow().date()
+        cutoff = today - timedelta(days=self.retention_days)
+        existing = set(self.list_partitions())
+        stranded = {day: rows for day, rows in self.default_partition_days().items() if day >= cutoff}
+        days = {today + timedelta(days=offset) for offset in range(self.premake_days + 1)} | set(stranded)
+
+        created = []
+        for day in sorted(days):
+            name = partition_name(day)
+            if name in existing:
+                continue
+            self._create_partition(day, stranded.get(day, 0))
+            # Commit per day so the days already created survive a later failure
+            db.session.commit()
+            created.append(name)
+        if created:
+            logger.info(f"Created event partitions: {', '.join(created)}")
+        return created
+
+    def purge_default_partition(self, today: Optional[date] = None) -> int:
+        """
+        Delete rows older than the retention window from the DEFAULT partition.
+
+        Args:
+            today: Current UTC day (defaults to now)
+
+        Returns:
+            int: Number of rows deleted
+        """
+        today = today or datetime.utcnow().date()
+        cutoff, _ = partition_bounds(today - timedelta(days=self.retention_days))
+        result = db.session.execute(
+            text(f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at < :cutoff"), {'cutoff': cutoff}
+        )
+        db.session.commit()
+        if result.rowcount:
+            logger.info(f"Deleted {result.rowcount} expired events from {DEFAULT_PARTITION}")
+        return result.rowcount
+
+    def drop_expired_partitions(self, today: Optional[date] = None) -> List[str]:
+        """
+        Detach and drop partitions that fall entirely outside the retention window.
+
+        Args:
+            today: Current UTC day (defaults to now)
+
+        Returns:
+            List[str]: Partitions that were dropped
+        """
+        today = today or datetime.utcnow().date()
+        dropped = []
+        for name in expired_partitions(self.list_partitions(), today, self.retention_days):
+            db.session.execute(text(f"ALTER TABLE {EVENTS_TABLE} DETACH PARTITION {name}"))
+            db.session.execute(text(f"DROP TABLE {name}"))
+            db.session.commit()
+            dropped.append(name)
+        if dropped:
+            logger.info(f"Dropped expired event partitions: {', '.join(dropped)}")
+        return dropped
+
+    def run_maintenance(self, today: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Pre-create upcoming partitions and drop expired ones.
+
+        Args:
+            today: Current UTC day (defaults to now)
+
+        Returns:
+            Dict with the created and dropped partition names, the rows found
+            in the DEFAULT partition and the expired ones deleted from it
+        """
+        try:
+            default_rows = sum(self.default_partition_days().values())
+            if default_rows:
+                logger.warning(
+                    f"{default_rows} events found in {DEFAULT_PARTITION}; daily partitions were missing when they arrived"
+                )
+            created = self.ensure_partitions(today)
+            dropped = self.drop_expired_partitions(today)
+            purged = self.purge_default_partition(today)
+            return {'created': created, 'dropped': dropped, 'default_rows': default_rows, 'default_rows_deleted': purged}
+        except Exception:
+            db.session.rollback()
+            raise
+
+
+# Global partition manager instance
+partition_manager = EventPartitionManager()
@@ -15,34 +15,93 @@ import json
 import logging
 import os
 import uuid
+import weakref
 from datetime import datetime
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable
 from flask import current_app, has_app_context
 
+from common.async_runtime import runtime
+from common.statements import statements
+
 logger = logging.getLogger(__name__)
 
-# Global connection pool for PostgreSQL LISTEN/NOTIFY
-_connection_pool = None
+# Seconds a sync caller outside Flask waits for the runtime loop to publish
+PUBLISH_TIMEOUT = 10.0
+
+# asyncpg pools are bound to the event loop that created them, so keep one per loop
+_connection_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncpg.Pool]" = weakref.WeakKeyDictionary()
 _listener_connections = {}
+# Publishes and notification handlers scheduled without awaiting, referenced until done
+_background_tasks = set()
+
+# Insert and notify in one round trip; pg_notify runs once per inserted row
+PUBLISH_EVENT = statements.register_async('events.publish', """
+    WITH inserted AS (
+        INSERT INTO events (event_type, channel, data, source, correlation_id, created_at)
+        VALUES ($1, $2, $3, $4, $5, $6)
+        RETURNING id
+    )
+    SELECT pg_notify($2, $7) FROM inserted
+""")
+INSERT_EVENT = statements.register_async('events.insert', """
+    INSERT INTO events (event_type, channel, data, source, correlation_id, created_at)
+    VALUES ($1, $2, $3, $4, $5, $6)
+""")
+NOTIFY_EVENT = statements.register_async('events.notify', "SELECT pg_notify($1, $2)")
+PUBLISH_EVENT_SYNC = statements.register('events.publish.sync', """
+    WITH inserted AS (
+        INSERT INTO events (event_type, channel, data, source, correlation_id, created_at)
+        VALUES (:event_type, :channel, :data, :source, :correlation_id, :created_at)
+        RETURNING id
+    )
+    SELECT pg_notify(:channel, :payload) FROM inserted
+""")
+
+
+def _track(task: asyncio.Task) -> asyncio.Task:
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
 
 
 async def get_connection_pool():
-    """Get or create the PostgreSQL connection pool."""
-    global _connection_pool
-    if _connection_pool is None:
+    """
+    Get or create the PostgreSQL connection pool for the running event loop.
+
+    The pool is sized from the roles this process hosts (see common.db.pool).
+    """
+    loop = asyncio.get_running_loop()
+    pool = _connection_pools.get(loop)
+    if pool is None:
         database_url = os.environ.get('DATABASE_URL')
         if not database_url:
             raise RuntimeError("DATABASE_URL environment variable not set")
-        
-        _connection_pool = await asyncpg.create_pool(
-            database_url,
-            min_size=2,
-            max_size=10,
-            command_timeout=60
+
+        from common.db.pool import asyncpg_pool_options, pool_profile
+        from common.process_roles import active_roles
+        options = asyncpg_pool_options(pool_profile(active_roles()))
+        pool = await asyncpg.create_pool(database_url, **options)
+        _connection_pools[loop] = pool
+        logger.info(
+            f"PostgreSQL connection pool created for event system "
+            f"({options['min_size']}-{options['max_size']} connections)"
         )
-        logger.info("PostgreSQL connection pool created for event system")
     
-    return _connection_pool
+    return pool
+
+
+def connection_pool_stats() -> Dict[str, Dict[str, int]]:
+    """Get size and idle counts of the asyncpg pools, keyed by loop."""
+    stats = {}
+    for loop, pool in list(_connection_pools.items()):
+        if pool.is_closing():
+            continue
+        stats[f"loop-{id(loop):x}"] = {
+            'size': pool.get_size(),
+            'idle': pool.get_idle_size(),
+            'max_size': pool.get_max_size(),
+        }
+    return stats
 
 
 async def publish_event_async(
@@ -92,38 +151,70 @@ async def publish_event_async(
             'timestamp': datetime.utcnow().isoformat()
         }
         
-        # Use direct asyncpg connection to avoid pool conflicts
-        database_url = os.environ.get("DATABASE_URL")
-        if not database_url:
-            logger.error("No DATABASE_URL available for async event publishing")
-            return False
-        
-        # Create a new connection for this operation
-        conn = await asyncpg.connect(database_url)
-        
-        try:
-            # Insert into events table for persistence
-            await conn.execute("""
-                INSERT INTO events (event_type, channel, data, source, correlation_id, created_at)
-                VALUES ($1, $2, $3, $4, $5, $6)
-            """, event_type, channel, json.dumps(data), source, correlation_id, datetime.utcnow())
-            
-            # Send NOTIFY for real-time listeners using string interpolation
-            payload_str = json.dumps(event_payload)
-            notify_sql = f"NOTIFY \"{channel}\", '{payload_str}'"
-            await conn.execute(notify_sql)
-            
+        pool = await get_connection_pool()
+        async with pool.acquire() as conn:
+            # Persist for durable consumers and notify real-time listeners
+            await PUBLISH_EVENT.fetchval(
+                conn, event_type, channel, json.dumps(data), source, correlation_id,
+                datetime.utcnow(), json.dumps(event_payload)
+            )
+
             logger.info(f"📢 Published event: {event_type} on channel {channel} from {source}")
             return True
-            
-        finally:
-            await conn.close()
         
     except Exception as e:
         logger.error(f"Failed to publish event {event_type}: {e}")
         return False
 
 
+async def publish_event_batch_async(events: List[Dict[str, Any]], source: str = None) -> int:
+    """
+    Publish several events over one connection in a single transaction.
+
+    Args:
+        events: Dicts with 'event_type', 'data' and optional 'channel',
+            'source' and 'correlation_id' keys
+        source: Default source service/module for events without one
+
+    Returns:
+        int: Number of events published (0 on failure)
+    """
+    if not events:
+        return 0
+
+    rows = []
+    notifications = []
+    now = datetime.utcnow()
+    for event in events:
+        data = dict(event.get('data', {}))
+        correlation_id = event.get('correlation_id') or str(uuid.uuid4())
+        data["correlation_id"] = correlation_id
+        event_source = event.get('source') or source or 'unknown'
+        channel = event.get('channel', 'events')
+        rows.append((event['event_type'], channel, json.dumps(data), event_source, correlation_id, now))
+        notifications.append((channel, json.dumps({
+            'event_type': event['event_type'],
+            'data': data,
+            'source': event_source,
+            'correlation_id': correlation_id,
+            'timestamp': now.isoformat()
+        })))
+
+    try:
+        pool = await get_connection_pool()
+        async with pool.acquire() as conn, conn.transaction():
+            await INSERT_EVENT.executemany(conn, rows)
+            for channel, payload in notifications:
+                await NOTIFY_EVENT.execute(conn, channel, payload)
+
+        logger.info(f"📢 Published batch of {len(rows)} events from {source}")
+        return len(rows)
+
+    except Exception as e:
+        logger.error(f"Failed to publish batch of {len(rows)} events: {e}")
+        return 0
+
+
 def publish_event(
     event_type: str,
     data: dict,
@@ -148,7 +239,6 @@ def publish_event(
     try:
         # For synchronous Flask context, we'll use the database directly
         if has_app_context():
-            from sqlalchemy import text
             from common.db import db
             
             # Generate correlation ID if not provided
@@ -160,29 +250,23 @@ def publish_event(
             if meta:
                 data.update(meta)
             
-            # Insert into events table
-            db.session.execute(text("""
-                INSERT INTO events (event_type, channel, data, source, correlation_id, created_at)
-                VALUES (:event_type, :channel, :data, :source, :correlation_id, :created_at)
-            """), {
+            now = datetime.utcnow()
+            event_payload = {
                 'event_type': event_type,
-                'channel': channel,
                 'data': data,
                 'source': source or 'unknown',
                 'correlation_id': correlation_id,
-                'created_at': datetime.utcnow()
-            })
-            
-            # Use PostgreSQL NOTIFY via raw SQL
-            event_payload = {
+                'timestamp': now.isoformat()
+            }
+
+            # Persist and notify in one statement
+            PUBLISH_EVENT_SYNC.execute(db.session, {
                 'event_type': event_type,
-                'data': data,
+                'channel': channel,
+                'data': json.dumps(data),
                 'source': source or 'unknown',
                 'correlation_id': correlation_id,
-                'timestamp': datetime.utcnow().isoformat()
-            }
-            
-            db.session.execute(text(f"NOTIFY {channel}, :payload"), {
+                'created_at': now,
                 'payload': json.dumps(event_payload)
             })
             
@@ -191,15 +275,15 @@ def publish_event(
             logger.info(f"Published PostgreSQL event: {event_type} on channel {channel} from {source}")
             return True
         else:
-            # For async contexts, schedule the async version
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # Create task for async publishing
-                asyncio.create_task(publish_event_async(event_type, data, channel, source, correlation_id))
-                return True
-            else:
-                # Run async version
-                return loop.run_until_complete(publish_event_async(event_type, data, channel, source, correlation_id))
+            coro = publish_event_async(event_type, data, channel, source, correlation_id)
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                # Sync caller: publish on the shared runtime loop rather than a loop per call
+                return runtime.run(coro, timeout=PUBLISH_TIMEOUT)
+            # Called from a coroutine without awaiting: publish in the background
+            _track(asyncio.create_task(coro))
+            return True
         
     except Exception as e:
         logger.error(f"Failed to publish event {event_type}: {e}")
@@ -219,33 +303,38 @@ async def listen_for_events(handler: Callable, channel: str = "events"):
     Args:
         handler: Async function to handle events - handler(event_type, payload)
         channel: PostgreSQL channel to listen on (default: 'events')
+
+    Returns when the listener connection closes, so a supervised caller
+    (see common.async_runtime) reconnects with backoff; pool errors propagate.
     """
     global _listener_connections
-    
+
+    pool = await get_connection_pool()
+    conn = await pool.acquire()
+    _listener_connections[channel] = conn
+    closed = asyncio.Event()
+    notify = lambda conn, pid, channel, payload: _track(asyncio.create_task(_handle_notification(handler, payload)))
+
     try:
-        pool = await get_connection_pool()
-        conn = await pool.acquire()
-        _listener_connections[channel] = conn
-        
-        # Set up the listener
-        await conn.add_listener(channel, lambda conn, pid, channel, payload: 
-                               asyncio.create_task(_handle_notification(handler, payload)))
-        
+        conn.add_termination_listener(lambda _conn: closed.set())
+        await conn.add_listener(channel, notify)
         logger.info(f"PostgreSQL listener started for channel: {channel}")
-        
-        # Keep the connection alive
-        while True:
-            await asyncio.sleep(1)
-            
+
+        # Park until the connection drops; the runtime supervisor restarts the listener
+        await closed.wait()
+        logger.warning(f"PostgreSQL listener connection for channel {channel} closed")
+
     except Exception as e:
         logger.error(f"Error in PostgreSQL listener for channel {channel}: {e}")
-        # Clean up connection
-        if channel in _listener_connections:
-            try:
-                await _listener_connections[channel].close()
-                del _listener_connections[channel]
-            except:
-                pass
+    finally:
+        _listener_connections.pop(channel, None)
+        try:
+            if not conn.is_closed():
+                await conn.remove_listener(channel, notify)
+        except Exception:
+            pass
+        finally:
+            await pool.release(conn)
 
 
 async def _handle_notification(handler: Callable, payload: str):
@@ -5,16 +5,65 @@ Provides structured querying interface for the enhanced event system.
 Supports filtering by channel, type, time, and correlation tracking.
 """
 import uuid
+import base64
+import json
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 from datetime import datetime, timedelta
-from sqlalchemy import desc, and_, or_
+from sqlalchemy import desc, and_, or_, text
 
 from .models import Event
 from common.db import db
 
 logger = logging.getLogger(__name__)
 
+# Page sizes for keyset pagination
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Cursor directions: "after" walks forward (oldest first), "before" walks back
+CURSOR_AFTER = 'after'
+CURSOR_BEFORE = 'before'
+
+
+def encode_cursor(event_id: int, direction: str) -> str:
+    """
+    Encode an opaque continuation token for keyset pagination.
+    
+    Args:
+        event_id: Last event ID seen on the current page
+        direction: CURSOR_AFTER or CURSOR_BEFORE
+        
+    Returns:
+        str: URL-safe continuation token
+    """
+    raw = json.dumps({'id': int(event_id), 'd': direction}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str) -> Tuple[int, str]:
+    """
+    Decode a continuation token produced by encode_cursor.
+    
+    Args:
+        token: Continuation token
+        
+    Returns:
+        Tuple of (event_id, direction)
+        
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        event_id, direction = int(payload['id']), payload['d']
+    except Exception as e:
+        raise ValueError(f"Invalid event cursor: {token}") from e
+    if direction not in (CURSOR_AFTER, CURSOR_BEFORE):
+        raise ValueError(f"Invalid event cursor direction: {direction}")
+    return event_id, direction
+
 
 class EventQueryService:
     """Service for querying events with advanced filtering capabilities."""
@@ -244,11 +293,14 @@ class EventQueryService:
         """
         Clean up events older than 90 days per retention policy.
         
+        Row-by-row fallback for an unpartitioned events table; partitioned
+        tables are maintained by common.events.partitions instead.
+        
         Returns:
             int: Number of events deleted
         """
         try:
-            result = db.session.execute("SELECT cleanup_old_events()")
+            result = db.session.execute(text("SELECT cleanup_old_events()"))
             deleted_count = result.scalar()
             db.session.commit()
             
@@ -258,4 +310,159 @@ class EventQueryService:
         except Exception as e:
             logger.error(f"Error during event cleanup: {e}")
             db.session.rollback()
-            return 0
\ No newline at end of file
+            return 0
+    
+    @staticmethod
+    def _filtered_query(
+        channel: Optional[str] = None,
+        channels: Optional[List[str]] = None,
+        event_type: Optional[str] = None,
+        correlation_id: Optional[str] = None,
+        event_types: Optional[List[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ):
+        """Build an event query with equality filters that match the composite indexes."""
+        query = Event.query
+        if channel:
+            query = query.filter(Event.channel == channel)
+        elif channels:
+            query = query.filter(Event.channel.in_(channels))
+        if event_type:
+            query = query.filter(Event.event_type == event_type)
+        elif event_types:
+            query = query.filter(Event.event_type.in_(event_types))
+        if correlation_id:
+            query = query.filter(Event.correlation_id == str(correlation_id))
+        # created_at bounds also let the planner prune daily partitions
+        if since:
+            query = query.filter(Event.created_at >= since)
+        if until:
+            query = query.filter(Event.created_at < until)
+        return query
+    
+    @staticmethod
+    def get_events_page(
+        channel: Optional[str] = None,
+        channels: Optional[List[str]] = None,
+        event_type: Optional[str] = None,
+        correlation_id: Optional[str] = None,
+        after_id: Optional[int] = None,
+        before_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        event_types: Optional[List[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Get one page of events using keyset pagination on the event ID.
+        
+        With after_id (or a forward cursor) events are returned oldest first and
+        the next cursor always points past the last event seen, so pollers can
+        resume without re-reading overlapping windows. Otherwise events are
+        returned newest first, walking back from before_id.
+        
+        Args:
+            channel: Optional channel filter
+            channels: Optional list of channels (ignored when channel is given)
+            event_type: Optional event type filter
+            correlation_id: Optional correlation ID filter
+            after_id: Return events with a greater ID
+            before_id: Return events with a smaller ID
+            cursor: Continuation token from a previous page (overrides after_id/before_id)
+            limit: Maximum number of events to return
+            event_types: Optional list of event types (ignored when event_type is given)
+            since: Optional lower bound on created_at (inclusive)
+            until: Optional upper bound on created_at (exclusive)
+            
+        Returns:
+            Dict with 'events' (List[Event]), 'next_cursor' and 'has_more'
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        if cursor:
+            cursor_id, direction = decode_cursor(cursor)
+            if direction == CURSOR_AFTER:
+                after_id = cursor_id
+            else:
+                before_id = cursor_id
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        forward = after_id is not None
+        
+        query = EventQueryService._filtered_query(
+            channel, channels, event_type, correlation_id, event_types, since, until
+        )
+        if after_id is not None:
+            query = query.filter(Event.id > after_id)
+        if before_id is not None:
+            query = query.filter(Event.id < before_id)
+        query = query.order_by(Event.id.asc() if forward else Event.id.desc())
+        
+        # Fetch one extra row to learn whether another page exists
+        rows = query.limit(limit + 1).all()
+        has_more = len(rows) > limit
+        events = rows[:limit]
+        
+        if forward:
+            last_id = events[-1].id if events else after_id
+            next_cursor = encode_cursor(last_id, CURSOR_AFTER)
+        else:
+            next_cursor = encode_cursor(events[-1].id, CURSOR_BEFORE) if has_more else None
+        
+        return {'events': events, 'next_cursor': next_cursor, 'has_more': has_more}
+    
+    @staticmethod
+    def iter_events(
+        channel: Optional[str] = None,
+        channels: Optional[List[str]] = None,
+        event_type: Optional[str] = None,
+        correlation_id: Optional[str] = None,
+        after_id: Optional[int] = None,
+        before_id: Optional[int] = None,
+        page_size: int = 500,
+        event_types: Optional[List[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Iterator[Event]:
+        """
+        Stream events oldest first in keyset-paginated pages.
+        
+        Each page is a separate indexed range scan starting after the last ID
+        seen, so memory and query cost stay flat across arbitrarily large ranges.
+        
+        Args:
+            channel: Optional channel filter
+            channels: Optional list of channels (ignored when channel is given)
+            event_type: Optional event type filter
+            correlation_id: Optional correlation ID filter
+            after_id: Start after this event ID (default: from the beginning)
+            before_id: Stop before this event ID (default: no upper bound)
+            page_size: Events fetched per query
+            event_types: Optional list of event types (ignored when event_type is given)
+            since: Optional lower bound on created_at (inclusive)
+            until: Optional upper bound on created_at (exclusive)
+            
+        Yields:
+            Event: Matching events in ascending ID order
+        """
+        last_id = after_id if after_id is not None else 0
+        while True:
+            page = EventQueryService.get_events_page(
+                channel=channel,
+                channels=channels,
+                event_type=event_type,
+                correlation_id=correlation_id,
+                after_id=last_id,
+                before_id=before_id,
+                limit=page_size,
+                event_types=event_types,
+                since=since,
+                until=until
+            )
+            for event in page['events']:
+                yield event
+            if not page['has_more']:
+                return
+            last_id = page['events'][-1].id
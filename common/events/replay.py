@@ -0,0 +1,481 @@
+"""
+Event Replay Engine
+
+Re-drives stored events through registered handlers, e.g. to re-run the
+parsing listener over ``discord.message_received`` after a parser fix.
+
+Events are streamed from the events table in keyset pages, paced by a rate
+limit, and fanned out to worker threads by correlation_id so related events
+keep their order. Progress is checkpointed as a low watermark so an
+interrupted replay resumes where it left off; the IDs of events whose
+handlers failed are stored with the checkpoint and retried on resume.
+
+With ``dead_letter_group`` set, a replay re-drives only the events that
+durable consumer group dead-lettered (``event_dead_letters``) and stamps the
+ones handled successfully as redriven.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import queue
+import threading
+import time
+import zlib
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from flask import current_app, has_app_context
+
+from common.db import db
+from .constants import EventChannels, EventTypes
+from .models import Event, EventDeadLetter, EventReplayCheckpoint
+from .publisher import publish_event_safe
+from .query_service import EventQueryService
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str, Dict[str, Any]], Any]
+
+# Seconds between checkpoint writes while a replay is running
+CHECKPOINT_INTERVAL = 5.0
+
+# Number of failed event IDs kept for the status report (the checkpoint keeps all of them)
+MAX_FAILED_IDS = 100
+
+
+@dataclass
+class ReplayRequest:
+    """Parameters of a replay run."""
+    name: str
+    event_types: List[str] = field(default_factory=list)
+    channel: Optional[str] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    rate_limit: float = 50.0  # events per second, 0 for unlimited
+    concurrency: int = 4
+    page_size: int = 500
+    resume: bool = True
+    dead_letter_group: Optional[str] = None  # re-drive this consumer group's dead letters instead
+
+    def filters_json(self) -> str:
+        """Serialize the event filters stored with the checkpoint."""
+        filters = asdict(self)
+        for key in ('since', 'until'):
+            filters[key] = filters[key].isoformat() if filters[key] else None
+        return json.dumps(filters)
+
+
+class WatermarkTracker:
+    """
+    Tracks the highest event ID below which every dispatched event completed.
+
+    Events are dispatched in ascending ID order but may complete out of order
+    across workers; only the contiguous completed prefix advances the mark.
+    """
+
+    def __init__(self, start_id: int = 0):
+        self.watermark = start_id
+        self._in_flight = deque()
+        self._done = set()
+        self._lock = threading.Lock()
+
+    def dispatched(self, event_id: int) -> None:
+        """Record that an event was handed to a worker."""
+        with self._lock:
+            self._in_flight.append(event_id)
+
+    def completed(self, event_id: int) -> int:
+        """Record that an event finished and return the updated watermark."""
+        with self._lock:
+            self._done.add(event_id)
+            while self._in_flight and self._in_flight[0] in self._done:
+                self.watermark = self._in_flight.popleft()
+                self._done.discard(self.watermark)
+            return self.watermark
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._in_flight)
+
+
+class RateLimiter:
+    """Paces calls to at most ``rate`` per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next = time.monotonic()
+
+    def wait(self, stop_event: Optional[threading.Event] = None) -> None:
+        """Block until the next call is allowed."""
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if self._next > now:
+            delay = self._next - now
+            if stop_event is not None:
+                stop_event.wait(delay)
+            else:
+                time.sleep(delay)
+        self._next = max(self._next, now) + self.interval
+
+
+def worker_index(correlation_id: Optional[str], event_id: int, workers: int) -> int:
+    """Pick a worker so events sharing a correlation_id are handled in order."""
+    key = correlation_id or str(event_id)
+    return zlib.crc32(key.encode('utf-8')) % workers
+
+
+class EventReplayEngine:
+    """Replays stored events through registered handlers."""
+
+    def __init__(self, app=None):
+        """
+        Initialize the replay engine.
+
+        Args:
+            app: Flask application used for database access in worker threads
+        """
+        self.app = app
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats_lock = threading.Lock()
+        self._tracker: Optional[WatermarkTracker] = None
+        self._base_counts = (0, 0)
+        # Failed events not yet handled successfully, persisted on the checkpoint
+        self._failed_ids = set()
+        # Retried events handled successfully in the current run
+        self._retried_ids = set()
+        self._reset_stats(None)
+
+    def register(self, event_type: str, handler: Handler) -> None:
+        """
+        Register a handler for an event type.
+
+        Handlers use the same signature as LISTEN/NOTIFY handlers,
+        ``handler(event_type, data)``, and may be sync or async.
+        """
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    def _reset_stats(self, request: Optional[ReplayRequest]) -> None:
+        with self._stats_lock:
+            self.stats = {
+                'name': request.name if request else None,
+                'status': 'idle',
+                'start_id': None,
+                'end_id': None,
+                'checkpoint_id': None,
+                'dispatched': 0,
+                'processed': 0,
+                'failed': 0,
+                'failed_ids': [],
+                'started_at': None,
+                'finished_at': None,
+                'last_event_created_at': None,
+            }
+            self._started_monotonic = None
+
+    def is_running(self) -> bool:
+        """Check whether a replay is in progress."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, request: ReplayRequest) -> bool:
+        """
+        Run a replay in a background thread.
+
+        Returns:
+            bool: False if a replay is already running
+        """
+        if self.is_running():
+            logger.warning("Event replay already running")
+            return False
+        if self.app is None and has_app_context():
+            self.app = current_app._get_current_object()
+        self._thread = threading.Thread(target=self.run, args=(request,), daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Ask a running replay to stop after in-flight events and checkpoint."""
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Get replay progress, throughput and lag.
+
+        Returns:
+            Dict with counters, events/second and remaining lag in IDs and seconds
+        """
+        with self._stats_lock:
+            status = dict(self.stats)
+            status['failed_ids'] = list(self.stats['failed_ids'])
+            status['pending_retries'] = len(self._failed_ids)
+            started = self._started_monotonic
+        if self._tracker is not None:
+            status['checkpoint_id'] = self._tracker.watermark
+            status['in_flight'] = self._tracker.in_flight
+
+        elapsed = time.monotonic() - started if started else 0.0
+        status['elapsed_seconds'] = round(elapsed, 3)
+        status['events_per_second'] = round(status['processed'] / elapsed, 2) if elapsed else 0.0
+        if status['end_id'] is not None and status['checkpoint_id'] is not None:
+            status['lag_ids'] = max(0, status['end_id'] - status['checkpoint_id'])
+        last_created = status['last_event_created_at']
+        status['lag_seconds'] = (
+            round((datetime.utcnow() - last_created).total_seconds(), 3) if last_created else None
+        )
+        if last_created:
+            status['last_event_created_at'] = last_created.isoformat()
+        return status
+
+    def run(self, request: ReplayRequest) -> Dict[str, Any]:
+        """
+        Run a replay to completion (or until stopped) in the calling thread.
+
+        Args:
+            request: Replay parameters
+
+        Returns:
+            Dict: Final replay status
+        """
+        if self.app is not None and not has_app_context():
+            with self.app.app_context():
+                return self._run(request)
+        return self._run(request)
+
+    def _run(self, request: ReplayRequest) -> Dict[str, Any]:
+        if self.app is None:
+            self.app = current_app._get_current_object()
+        self._stop_event.clear()
+        self._reset_stats(request)
+
+        event_types = request.event_types or list(self._handlers)
+        # A dead-letter re-drive has no main pass, so nothing to resume from
+        checkpoint = None if request.dead_letter_group else self._load_checkpoint(request)
+        start_id = checkpoint.last_event_id if checkpoint else 0
+        self._base_counts = (checkpoint.events_processed, checkpoint.events_failed) if checkpoint else (0, 0)
+        failed_ids = checkpoint.get_failed_event_ids() if checkpoint else []
+        # Failures above the watermark are replayed by the main pass anyway
+        retry_ids = [event_id for event_id in failed_ids if event_id <= start_id]
+        with self._stats_lock:
+            self._failed_ids = set(failed_ids)
+            self._retried_ids = set()
+
+        # Snapshot the upper bound so events published by the handlers are not replayed
+        end_id = db.session.query(db.func.max(Event.id)).scalar() or 0
+        if request.dead_letter_group:
+            retry_ids = self._pending_dead_letters(request.dead_letter_group, event_types)
+            # Start the main pass at the upper bound so it replays nothing
+            start_id = end_id
+
+        self._tracker = WatermarkTracker(start_id)
+        with self._stats_lock:
+            self.stats.update({
+                'status': 'running',
+                'start_id': start_id,
+                'end_id': end_id,
+                'checkpoint_id': start_id,
+                'started_at': datetime.utcnow().isoformat(),
+            })
+            self._started_monotonic = time.monotonic()
+
+        logger.info(
+            f"Starting event replay '{request.name}' for {event_types} after id {start_id} up to {end_id}"
+            f" ({len(retry_ids)} failed events to retry)"
+        )
+
+        workers = max(1, request.concurrency)
+        queues = [queue.Queue(maxsize=request.page_size) for _ in range(workers)]
+        threads = [
+            threading.Thread(target=self._worker, args=(q,), daemon=True, name=f"replay-{request.name}-{i}")
+            for i, q in enumerate(queues)
+        ]
+        for thread in threads:
+            thread.start()
+
+        limiter = RateLimiter(request.rate_limit)
+        last_checkpoint = time.monotonic()
+        status = 'completed'
+        try:
+            events = EventQueryService.iter_events(
+                channel=request.channel,
+                event_types=event_types,
+                since=request.since,
+                until=request.until,
+                after_id=start_id,
+                before_id=end_id + 1,
+                page_size=request.page_size
+            )
+            # Earlier failures sit at or below the watermark, so they bypass the tracker
+            retries = ((event, True) for event in self._iter_failed_events(retry_ids, request.page_size))
+            for event, retry in itertools.chain(retries, ((event, False) for event in events)):
+                if self._stop_event.is_set():
+                    status = 'stopped'
+                    break
+                limiter.wait(self._stop_event)
+                item = (event.id, event.event_type, event.data, event.created_at, retry)
+                if not retry:
+                    self._tracker.dispatched(event.id)
+                queues[worker_index(event.correlation_id, event.id, workers)].put(item)
+                with self._stats_lock:
+                    self.stats['dispatched'] += 1
+
+                if time.monotonic() - last_checkpoint >= CHECKPOINT_INTERVAL:
+                    self._save_checkpoint(request, 'running')
+                    last_checkpoint = time.monotonic()
+        except Exception as e:
+            logger.error(f"Event replay '{request.name}' failed: {e}")
+            db.session.rollback()
+            status = 'failed'
+        finally:
+            for q in queues:
+                q.put(None)
+            for thread in threads:
+                thread.join()
+
+        if status == 'completed':
+            # Every matching event up to the snapshot has been handled
+            self._tracker.watermark = max(self._tracker.watermark, end_id)
+        with self._stats_lock:
+            self.stats['status'] = status
+            self.stats['finished_at'] = datetime.utcnow().isoformat()
+        if request.dead_letter_group:
+            self._mark_redriven(request.dead_letter_group)
+        else:
+            self._save_checkpoint(request, status)
+
+        final = self.status()
+        logger.info(
+            f"Event replay '{request.name}' {status}: {final['processed']} processed, "
+            f"{final['failed']} failed, {final['events_per_second']} events/s"
+        )
+        publish_event_safe(
+            event_type=EventTypes.INFO,
+            data={'service': 'event_replay', **{k: final[k] for k in (
+                'name', 'status', 'processed', 'failed', 'checkpoint_id', 'events_per_second')}},
+            channel=EventChannels.SYSTEM,
+            source='event_replay'
+        )
+        return final
+
+    def _worker(self, work: queue.Queue) -> None:
+        """Handle events from one partition in order."""
+        loop = asyncio.new_event_loop()
+        try:
+            with self.app.app_context():
+                while True:
+                    item = work.get()
+                    if item is None:
+                        break
+                    event_id, event_type, data, created_at, retry = item
+                    ok = self._dispatch(loop, event_id, event_type, data)
+                    # Record the outcome before the watermark can move past a failure
+                    with self._stats_lock:
+                        self.stats['processed'] += 1
+                        self.stats['last_event_created_at'] = created_at
+                        if ok:
+                            self._failed_ids.discard(event_id)
+                            if retry:
+                                self._retried_ids.add(event_id)
+                        else:
+                            self._failed_ids.add(event_id)
+                            self.stats['failed'] += 1
+                            if len(self.stats['failed_ids']) < MAX_FAILED_IDS:
+                                self.stats['failed_ids'].append(event_id)
+                    if not retry:
+                        self._tracker.completed(event_id)
+                db.session.remove()
+        finally:
+            loop.close()
+
+    def _dispatch(self, loop, event_id: int, event_type: str, data: Any) -> bool:
+        """Call every handler registered for the event type."""
+        if isinstance(data, str):
+            try:
+                data = json.loads(data)
+            except ValueError:
+                pass
+        ok = True
+        for handler in self._handlers.get(event_type, []):
+            try:
+                result = handler(event_type, data)
+                if asyncio.iscoroutine(result):
+                    loop.run_until_complete(result)
+            except Exception as e:
+                ok = False
+                logger.error(f"Replay handler failed for event {event_id} ({event_type}): {e}")
+        return ok
+
+    @staticmethod
+    def _iter_failed_events(event_ids: List[int], chunk_size: int):
+        """Yield the stored events with the given IDs in ID order."""
+        for start in range(0, len(event_ids), chunk_size):
+            chunk = event_ids[start:start + chunk_size]
+            yield from db.session.query(Event).filter(Event.id.in_(chunk)).order_by(Event.id).all()
+
+    @staticmethod
+    def _pending_dead_letters(group: str, event_types: List[str]) -> List[int]:
+        """Get the IDs of a consumer group's dead letters not yet re-driven, in ID order."""
+        query = db.session.query(EventDeadLetter.event_id).filter(
+            EventDeadLetter.consumer_group == group,
+            EventDeadLetter.redriven_at.is_(None)
+        )
+        if event_types:
+            query = query.filter(EventDeadLetter.event_type.in_(event_types))
+        return [row.event_id for row in query.order_by(EventDeadLetter.event_id)]
+
+    def _mark_redriven(self, group: str) -> None:
+        """Stamp the dead letters handled successfully in this run."""
+        with self._stats_lock:
+            redriven = sorted(self._retried_ids)
+        if not redriven:
+            return
+        try:
+            db.session.query(EventDeadLetter).filter(
+                EventDeadLetter.consumer_group == group,
+                EventDeadLetter.event_id.in_(redriven)
+            ).update({EventDeadLetter.redriven_at: datetime.utcnow()}, synchronize_session=False)
+            db.session.commit()
+            logger.info(f"Re-drove {len(redriven)} dead letters of consumer group '{group}'")
+        except Exception as e:
+            logger.error(f"Failed to mark dead letters of '{group}' as redriven: {e}")
+            db.session.rollback()
+
+    def _load_checkpoint(self, request: ReplayRequest) -> Optional[EventReplayCheckpoint]:
+        checkpoint = db.session.get(EventReplayCheckpoint, request.name)
+        if checkpoint and not request.resume:
+            db.session.delete(checkpoint)
+            db.session.commit()
+            return None
+        if checkpoint:
+            logger.info(f"Resuming event replay '{request.name}' after event {checkpoint.last_event_id}")
+        return checkpoint
+
+    def _save_checkpoint(self, request: ReplayRequest, status: str) -> None:
+        try:
+            # Read the watermark first: a failure is recorded before its event completes,
+            # so every failure at or below this mark is already in _failed_ids
+            watermark = self._tracker.watermark
+            with self._stats_lock:
+                processed, failed = self.stats['processed'], self.stats['failed']
+                failed_ids = sorted(self._failed_ids)
+            base_processed, base_failed = self._base_counts
+            checkpoint = db.session.get(EventReplayCheckpoint, request.name)
+            if checkpoint is None:
+                checkpoint = EventReplayCheckpoint(name=request.name, filters=request.filters_json())
+                db.session.add(checkpoint)
+            checkpoint.last_event_id = watermark
+            checkpoint.events_processed = base_processed + processed
+            checkpoint.events_failed = base_failed + failed
+            checkpoint.failed_event_ids = json.dumps(failed_ids) if failed_ids else None
+            checkpoint.status = status
+            db.session.commit()
+        except Exception as e:
+            logger.error(f"Failed to save replay checkpoint '{request.name}': {e}")
+            db.session.rollback()
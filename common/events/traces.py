@@ -0,0 +1,159 @@
+"""
+Event Trace Service
+
+Reads the per-correlation trace table (``event_traces``) that an AFTER INSERT
+trigger on ``events`` keeps up to date. Each trace stores the first time each
+pipeline stage was reached, so flows for many messages can be fetched in one
+query and stage latencies aggregated in SQL instead of rebuilding stage maps
+from raw events.
+
+The event type -> stage mapping lives in the trigger function
+``record_event_trace()`` (migrations/events/e41c7b9a5d23_add_event_traces.py).
+"""
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+
+from common.db import db
+from .models import EventTrace
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages in order, matching the EventTrace columns
+TRACE_STAGES = ('received', 'stored', 'parsed', 'setup_created')
+
+# Stage transitions reported by get_stage_latencies
+STAGE_TRANSITIONS = (
+    ('received', 'stored'),
+    ('stored', 'parsed'),
+    ('parsed', 'setup_created'),
+    ('received', 'setup_created'),
+)
+
+
+def _stage_time(trace: EventTrace, stage: str) -> Optional[datetime]:
+    return getattr(trace, f"{stage}_at")
+
+
+def trace_latencies(trace: EventTrace) -> Dict[str, Optional[float]]:
+    """
+    Compute stage-to-stage latencies for one trace.
+
+    Args:
+        trace: Trace row
+
+    Returns:
+        Dict mapping "from_to_to" to milliseconds (None when a stage is missing)
+    """
+    latencies = {}
+    for start, end in STAGE_TRANSITIONS:
+        started, finished = _stage_time(trace, start), _stage_time(trace, end)
+        key = f"{start}_to_{end}"
+        latencies[key] = (finished - started).total_seconds() * 1000 if started and finished else None
+    return latencies
+
+
+def trace_status(trace: EventTrace) -> str:
+    """Summarize how far a trace got through the pipeline."""
+    if trace.setup_created_at:
+        return 'completed'
+    if trace.received_at or trace.stored_at or trace.parsed_at:
+        return 'in_progress'
+    return 'unknown'
+
+
+def serialize_trace(trace: EventTrace) -> Dict[str, Any]:
+    """Convert a trace to a dictionary with stage status and latencies."""
+    data = trace.to_dict()
+    data['completed_stages'] = [stage for stage in TRACE_STAGES if _stage_time(trace, stage)]
+    data['status'] = trace_status(trace)
+    data['latencies_ms'] = trace_latencies(trace)
+    return data
+
+
+def get_traces(correlation_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Look up traces for many correlation IDs in one query.
+
+    Args:
+        correlation_ids: Correlation IDs to fetch
+
+    Returns:
+        Dict mapping correlation ID to its serialized trace (missing IDs are omitted)
+    """
+    ids = list({str(cid) for cid in correlation_ids if cid})
+    if not ids:
+        return {}
+    traces = EventTrace.query.filter(EventTrace.correlation_id.in_(ids)).all()
+    return {trace.correlation_id: serialize_trace(trace) for trace in traces}
+
+
+def get_recent_traces(since: Optional[datetime] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    """
+    Get the most recently started traces.
+
+    Args:
+        since: Optional lower bound on first_event_at
+        limit: Maximum number of traces
+
+    Returns:
+        List of serialized traces, newest first
+    """
+    query = EventTrace.query
+    if since:
+        query = query.filter(EventTrace.first_event_at >= since)
+    traces = query.order_by(EventTrace.first_event_at.desc()).limit(limit).all()
+    return [serialize_trace(trace) for trace in traces]
+
+
+def get_stage_latencies(since: Optional[datetime] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Aggregate p50/p95 stage latencies across traces in SQL.
+
+    Args:
+        since: Optional lower bound on first_event_at
+
+    Returns:
+        Dict mapping "from_to_to" to count, p50_ms and p95_ms
+    """
+    columns = []
+    for start, end in STAGE_TRANSITIONS:
+        key = f"{start}_to_{end}"
+        delta = f"EXTRACT(EPOCH FROM ({end}_at - {start}_at)) * 1000"
+        present = f"{start}_at IS NOT NULL AND {end}_at IS NOT NULL"
+        columns.extend([
+            f"COUNT(*) FILTER (WHERE {present}) AS {key}_count",
+            f"percentile_cont(0.5) WITHIN GROUP (ORDER BY {delta}) FILTER (WHERE {present}) AS {key}_p50",
+            f"percentile_cont(0.95) WITHIN GROUP (ORDER BY {delta}) FILTER (WHERE {present}) AS {key}_p95",
+        ])
+    where = "WHERE first_event_at >= :since" if since else ""
+    sql = f"SELECT {', '.join(columns)} FROM event_traces {where}"
+
+    row = db.session.execute(text(sql), {'since': since} if since else {}).mappings().first() or {}
+    latencies = {}
+    for start, end in STAGE_TRANSITIONS:
+        key = f"{start}_to_{end}"
+        p50, p95 = row.get(f"{key}_p50"), row.get(f"{key}_p95")
+        latencies[key] = {
+            'count': row.get(f"{key}_count") or 0,
+            'p50_ms': round(float(p50), 2) if p50 is not None else None,
+            'p95_ms': round(float(p95), 2) if p95 is not None else None,
+        }
+    return latencies
+
+
+def cleanup_old_traces(before: datetime) -> int:
+    """
+    Delete traces whose last event is older than the cutoff.
+
+    Args:
+        before: Retention cutoff
+
+    Returns:
+        int: Number of traces deleted
+    """
+    deleted = EventTrace.query.filter(EventTrace.last_event_at < before).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
@@ -0,0 +1,262 @@
+"""
+Lazy Feature Loading
+
+Registers feature blueprints from a static route manifest instead of importing
+every feature module at boot. Each manifest blueprint is registered as a
+placeholder with the same name, URL prefix and template/static folders, and
+each route points at a ``LazyView`` that imports the real module on its first
+request. Processes that only serve one dashboard never import alpaca-py,
+pandas, discord.py and the rest of the trading stack.
+
+The manifest (features/route_manifest.json) is built from the blueprint
+registry by reading each module's source with ``ast``, so building it imports
+nothing. Regenerate it after adding or changing routes::
+
+    python -m common.lazy_loading
+
+Enable with ``FEATURE_LOADING=lazy``; the default ``eager`` keeps plugin
+discovery.
+"""
+import ast
+import importlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from flask import Blueprint, Flask, current_app
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MANIFEST_PATH = os.path.join(BASE_DIR, 'features', 'route_manifest.json')
+
+BLUEPRINT_OPTIONS = ('url_prefix', 'template_folder', 'static_folder', 'static_url_path', 'subdomain')
+ROUTE_SHORTCUTS = ('get', 'post', 'put', 'delete', 'patch')
+# Blueprint hooks a placeholder cannot reproduce; modules using them are registered eagerly
+EAGER_HOOKS = (
+    'add_url_rule', 'before_request', 'after_request', 'teardown_request', 'errorhandler',
+    'context_processor', 'url_value_preprocessor', 'url_defaults', 'record', 'record_once',
+    'register_blueprint', 'before_app_request', 'app_errorhandler', 'app_context_processor',
+    'app_template_filter', 'app_template_global',
+)
+
+
+class ManifestError(Exception):
+    """Raised when a blueprint module cannot be described statically."""
+
+
+def _literal(node: ast.AST, what: str) -> Any:
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        raise ManifestError(f"{what} is not a literal (line {node.lineno})")
+
+
+def _is_blueprint_call(node: ast.AST) -> bool:
+    if not isinstance(node, ast.Call):
+        return False
+    func = node.func
+    return (isinstance(func, ast.Name) and func.id == 'Blueprint') or \
+        (isinstance(func, ast.Attribute) and func.attr == 'Blueprint')
+
+
+def describe_blueprint(source: str, module_path: str, attr: str) -> Dict[str, Any]:
+    """
+    Describe one module-level blueprint and its routes from source.
+
+    Args:
+        source: Module source code
+        module_path: Dotted module path
+        attr: Name of the blueprint variable
+
+    Returns:
+        Dict with the blueprint name, options, routes and whether it can load lazily
+
+    Raises:
+        ManifestError: If the blueprint or a route uses non-literal arguments
+    """
+    tree = ast.parse(source)
+    entry: Optional[Dict[str, Any]] = None
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and _is_blueprint_call(node.value) and \
+                any(isinstance(t, ast.Name) and t.id == attr for t in node.targets):
+            call = node.value
+            if not call.args:
+                raise ManifestError(f"{module_path}.{attr}: blueprint name must be positional")
+            entry = {
+                'module': module_path,
+                'attr': attr,
+                'blueprint': _literal(call.args[0], f"{module_path}.{attr} name"),
+                'lazy': True,
+                'routes': []
+            }
+            for keyword in call.keywords:
+                if keyword.arg in BLUEPRINT_OPTIONS:
+                    entry[keyword.arg] = _literal(keyword.value, f"{module_path}.{attr} {keyword.arg}")
+    if entry is None:
+        raise ManifestError(f"{module_path}: no module-level Blueprint assigned to {attr}")
+
+    for node in tree.body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for decorator in node.decorator_list:
+            if not (isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Attribute)
+                    and isinstance(decorator.func.value, ast.Name) and decorator.func.value.id == attr):
+                continue
+            method = decorator.func.attr
+            if method not in ('route',) + ROUTE_SHORTCUTS:
+                continue
+            options = {kw.arg: _literal(kw.value, f"{module_path}.{node.name} {kw.arg}") for kw in decorator.keywords}
+            if method == 'route':
+                methods = options.pop('methods', None) or ['GET']
+            else:
+                methods = [method.upper()]
+            entry['routes'].append({
+                'rule': _literal(decorator.args[0], f"{module_path}.{node.name} rule"),
+                'endpoint': options.pop('endpoint', node.name),
+                'methods': sorted(m.upper() for m in methods),
+                **({'options': options} if options else {})
+            })
+
+    # Hooks and rules added outside decorators only exist once the module runs
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and \
+                node.value.id == attr and node.attr in EAGER_HOOKS:
+            entry['lazy'] = False
+            break
+    return entry
+
+
+def build_route_manifest(registry: Optional[List] = None, base_dir: str = BASE_DIR) -> Dict[str, Any]:
+    """
+    Build the route manifest for the blueprint registry without importing it.
+
+    Args:
+        registry: (name, module_path, attr) tuples (default: BLUEPRINT_REGISTRY + SPECIAL_BLUEPRINTS)
+        base_dir: Repository root the module paths are relative to
+
+    Returns:
+        Dict with a 'blueprints' list in registry order
+    """
+    if registry is None:
+        from features.blueprint_registry import BLUEPRINT_REGISTRY, SPECIAL_BLUEPRINTS
+        registry = BLUEPRINT_REGISTRY + SPECIAL_BLUEPRINTS
+
+    blueprints = []
+    for name, module_path, attr in registry:
+        path = os.path.join(base_dir, *module_path.split('.')) + '.py'
+        with open(path, encoding='utf-8') as f:
+            entry = describe_blueprint(f.read(), module_path, attr)
+        blueprints.append({'name': name, **entry})
+    return {'blueprints': blueprints}
+
+
+def load_route_manifest(path: str = MANIFEST_PATH) -> Dict[str, Any]:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_route_manifest(path: str = MANIFEST_PATH) -> Dict[str, Any]:
+    """Rebuild the manifest from source and write it to disk."""
+    manifest = build_route_manifest()
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+        f.write('\n')
+    return manifest
+
+
+_views_lock = threading.Lock()
+_blueprint_views: Dict[str, Dict[str, Callable]] = {}
+
+
+def _resolve_views(module_path: str, attr: str) -> Dict[str, Callable]:
+    # Registering the real blueprint on a scratch app yields its view functions
+    # exactly as Flask would wrap them, keyed by full endpoint name
+    key = f"{module_path}:{attr}"
+    views = _blueprint_views.get(key)
+    if views is None:
+        with _views_lock:
+            views = _blueprint_views.get(key)
+            if views is None:
+                module = importlib.import_module(module_path)
+                scratch = Flask(__name__)
+                scratch.register_blueprint(getattr(module, attr))
+                views = dict(scratch.view_functions)
+                _blueprint_views[key] = views
+                logger.info(f"Loaded {module_path} on first request")
+    return views
+
+
+class LazyView:
+    """View that imports its blueprint module on first call."""
+
+    def __init__(self, module_path: str, attr: str, endpoint: str):
+        """
+        Initialize the lazy view.
+
+        Args:
+            module_path: Module defining the blueprint
+            attr: Blueprint variable name
+            endpoint: Full endpoint name, e.g. 'parsing_dashboard.overview'
+        """
+        self.module_path = module_path
+        self.attr = attr
+        self.endpoint = endpoint
+        self.__name__ = endpoint.rsplit('.', 1)[-1]
+        self.__module__ = module_path
+        self._view: Optional[Callable] = None
+
+    def resolve(self) -> Callable:
+        if self._view is None:
+            self._view = _resolve_views(self.module_path, self.attr)[self.endpoint]
+        return self._view
+
+    def __call__(self, *args, **kwargs):
+        return current_app.ensure_sync(self.resolve())(*args, **kwargs)
+
+
+def _register_eagerly(app: Flask, entry: Dict[str, Any]) -> None:
+    module = importlib.import_module(entry['module'])
+    app.register_blueprint(getattr(module, entry['attr']))
+
+
+def register_lazy_blueprints(app: Flask, manifest: Optional[Dict[str, Any]] = None) -> List[str]:
+    """
+    Register placeholder blueprints whose views load their module on first request.
+
+    Args:
+        app: Flask application
+        manifest: Route manifest (default: features/route_manifest.json)
+
+    Returns:
+        List of registered blueprint names
+    """
+    manifest = manifest or load_route_manifest()
+    registered = []
+    for entry in manifest['blueprints']:
+        try:
+            if not entry.get('lazy', True):
+                _register_eagerly(app, entry)
+            else:
+                blueprint = Blueprint(
+                    entry['blueprint'], entry['module'],
+                    root_path=os.path.join(app.root_path, *entry['module'].split('.')[:-1]),
+                    **{option: entry[option] for option in BLUEPRINT_OPTIONS if entry.get(option) is not None}
+                )
+                for route in entry['routes']:
+                    view = LazyView(entry['module'], entry['attr'], f"{entry['blueprint']}.{route['endpoint']}")
+                    blueprint.add_url_rule(route['rule'], route['endpoint'], view,
+                                           methods=route['methods'], **route.get('options', {}))
+                app.register_blueprint(blueprint)
+            registered.append(entry['name'])
+        except Exception as e:
+            logger.warning(f"Failed to register {entry['name']} blueprint: {e}")
+    logger.info(f"Registered {len(registered)} blueprints from route manifest")
+    return registered
+
+
+if __name__ == '__main__':
+    written = write_route_manifest()
+    print(f"Wrote {len(written['blueprints'])} blueprints to {MANIFEST_PATH}")
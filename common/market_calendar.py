@@ -0,0 +1,315 @@
+"""
+Market Calendar
+
+Answers "is the market open", "when does it next open/close" and "which
+trading day is this" from per-year session tables instead of calling the
+Alpaca clock endpoint or rebuilding timezones on every request.
+
+A year's table is loaded once, from Alpaca's calendar endpoint when a
+trading client is configured (which also covers unscheduled closures) and
+otherwise from the NYSE holiday and early-close rules below. A year built
+from the rules because Alpaca was unreachable is retried after
+SOURCE_RETRY_SECONDS. Lookups take no lock.
+"""
+import bisect
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, time as dt_time, timedelta
+from typing import Callable, Dict, Iterator, List, Optional
+
+import pytz
+
+logger = logging.getLogger(__name__)
+
+EASTERN = pytz.timezone("America/New_York")
+
+REGULAR_OPEN = dt_time(9, 30)
+REGULAR_CLOSE = dt_time(16, 0)
+EARLY_CLOSE = dt_time(13, 0)
+
+# Seconds before a year built from the rules (Alpaca unavailable) is reloaded
+SOURCE_RETRY_SECONDS = 600
+
+
+@dataclass(frozen=True)
+class Session:
+    """One regular trading session; open and close are UTC."""
+    day: date
+    open: datetime
+    close: datetime
+
+    @classmethod
+    def at(cls, day: date, open_time: dt_time, close_time: dt_time) -> 'Session':
+        """Build a session from Eastern wall-clock open and close times."""
+        return cls(
+            day=day,
+            open=EASTERN.localize(datetime.combine(day, open_time)).astimezone(pytz.UTC),
+            close=EASTERN.localize(datetime.combine(day, close_time)).astimezone(pytz.UTC),
+        )
+
+    @property
+    def early_close(self) -> bool:
+        return self.close.astimezone(EASTERN).time() < REGULAR_CLOSE
+
+
+def _easter(year: int) -> date:
+    # Anonymous Gregorian algorithm
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    first = date(year, month, 1)
+    return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def _last_weekday(year: int, month: int, weekday: int) -> date:
+    last = date(year, month + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(day: date) -> date:
+    # Saturday holidays close the Friday before, Sunday holidays the Monday after
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def nyse_holidays(year: int) -> List[date]:
+    """
+    Full-day NYSE closures of a year under the current holiday rules.
+
+    Args:
+        year: Calendar year
+
+    Returns:
+        List[date]: Weekday closures, sorted
+    """
+    holidays = [
+        _nth_weekday(year, 1, 0, 3),    # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),    # Washington's Birthday
+        _easter(year) - timedelta(days=2),  # Good Friday
+        _last_weekday(year, 5, 0),      # Memorial Day
+        _observed(date(year, 7, 4)),    # Independence Day
+        _nth_weekday(year, 9, 0, 1),    # Labor Day
+        _nth_weekday(year, 11, 3, 4),   # Thanksgiving
+        _observed(date(year, 12, 25)),  # Christmas
+    ]
+    # New Year's Day on a Saturday is not moved into the previous year
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays.append(_observed(new_year))
+    if year >= 2022:
+        holidays.append(_observed(date(year, 6, 19)))  # Juneteenth
+    return sorted(holidays)
+
+
+def nyse_sessions(year: int) -> List[Session]:
+    """
+    Regular NYSE sessions of a year, with the 1 PM early closes.
+
+    Args:
+        year: Calendar year
+
+    Returns:
+        List[Session]: Sessions in date order
+    """
+    holidays = set(nyse_holidays(year))
+    early_closes = {_nth_weekday(year, 11, 3, 4) + timedelta(days=1)}
+    for day in (date(year, 7, 3), date(year, 12, 24)):
+        if day.weekday() < 4:
+            early_closes.add(day)
+
+    sessions = []
+    day = date(year, 1, 1)
+    while day.year == year:
+        if day.weekday() < 5 and day not in holidays:
+            close = EARLY_CLOSE if day in early_closes else REGULAR_CLOSE
+            sessions.append(Session.at(day, REGULAR_OPEN, close))
+        day += timedelta(days=1)
+    return sessions
+
+
+def _alpaca_sessions(year: int) -> Optional[List[Session]]:
+    # Imported lazily: alpaca-py is heavy and absent from some processes
+    try:
+        from features.alpaca.client import get_calendar_sessions
+    except ImportError:
+        return None
+    return get_calendar_sessions(date(year, 1, 1), date(year, 12, 31))
+
+
+@dataclass(frozen=True)
+class _YearTable:
+    sessions: Dict[date, Session]
+    days: List[date]
+    source: str
+    loaded_at: float
+
+
+class MarketCalendar:
+    """Exchange sessions by day, loaded one calendar year at a time."""
+
+    def __init__(self, source: Optional[Callable[[int], Optional[List[Session]]]] = _alpaca_sessions):
+        """
+        Initialize the calendar.
+
+        Args:
+            source: Callable returning a year's sessions, or None when it
+                cannot (the NYSE rules are used instead)
+        """
+        self.source = source
+        self._years: Dict[int, _YearTable] = {}
+        self._lock = threading.Lock()
+
+    def _table(self, year: int) -> _YearTable:
+        table = self._years.get(year)
+        if table is not None and not self._should_retry(table):
+            return table
+        with self._lock:
+            table = self._years.get(year)
+            if table is None or self._should_retry(table):
+                table = self._load(year)
+                self._years = {**self._years, year: table}
+        return table
+
+    def _should_retry(self, table: _YearTable) -> bool:
+        return table.source == 'fallback' and time.monotonic() - table.loaded_at >= SOURCE_RETRY_SECONDS
+
+    def _load(self, year: int) -> _YearTable:
+        sessions, source = None, 'rules'
+        if self.source is not None:
+            try:
+                sessions = self.source(year)
+            except Exception as e:
+                logger.warning(f"Market calendar source failed for {year}, using NYSE rules: {e}")
+                source = 'fallback'
+        if sessions:
+            source = 'source'
+        else:
+            sessions = nyse_sessions(year)
+        by_day = {session.day: session for session in sessions}
+        logger.info(f"Loaded {len(by_day)} market sessions for {year} ({source})")
+        return _YearTable(by_day, sorted(by_day), source, time.monotonic())
+
+    @staticmethod
+    def _now(dt: Optional[datetime]) -> datetime:
+        if dt is None:
+            return datetime.now(tz=pytz.UTC)
+        if dt.tzinfo is None:
+            # Assume naive datetime is UTC
+            return pytz.UTC.localize(dt)
+        return dt
+
+    def session(self, day: date) -> Optional[Session]:
+        """Get the session on a day, or None when the market is closed all day."""
+        return self._table(day.year).sessions.get(day)
+
+    def is_trading_day(self, day: date) -> bool:
+        return self.session(day) is not None
+
+    def _sessions_from(self, day: date) -> Iterator[Session]:
+        year = day.year
+        table = self._table(year)
+        index = bisect.bisect_left(table.days, day)
+        # Two years ahead is always enough to find a session
+        while year <= day.year + 2:
+            for session_day in table.days[index:]:
+                yield table.sessions[session_day]
+            year += 1
+            table, index = self._table(year), 0
+
+    def trading_day(self, dt: Optional[datetime] = None) -> Optional[date]:
+        """
+        Get the trading day a moment belongs to.
+
+        That is the Eastern date when it is a session day, otherwise the most
+        recent session day before it (a weekend maps to the Friday before).
+
+        Args:
+            dt: Moment to look up (naive means UTC); defaults to now
+
+        Returns:
+            date: Session day
+        """
+        day = self._now(dt).astimezone(EASTERN).date()
+        for year in (day.year, day.year - 1):
+            table = self._table(year)
+            index = bisect.bisect_right(table.days, day)
+            if index:
+                return table.days[index - 1]
+        return None
+
+    def is_open(self, dt: Optional[datetime] = None) -> bool:
+        """Check whether the regular session is open at a moment (default now)."""
+        now = self._now(dt)
+        session = self.session(now.astimezone(EASTERN).date())
+        return session is not None and session.open <= now < session.close
+
+    def current_session(self, dt: Optional[datetime] = None) -> Optional[Session]:
+        """Get the session open at a moment, or None when the market is closed."""
+        now = self._now(dt)
+        session = self.session(now.astimezone(EASTERN).date())
+        if session is not None and session.open <= now < session.close:
+            return session
+        return None
+
+    def next_open(self, dt: Optional[datetime] = None) -> datetime:
+        """Get the next session open strictly after a moment (default now), in UTC."""
+        now = self._now(dt)
+        for session in self._sessions_from(now.astimezone(EASTERN).date()):
+            if session.open > now:
+                return session.open
+        raise LookupError(f"No market session after {now.isoformat()}")
+
+    def next_close(self, dt: Optional[datetime] = None) -> datetime:
+        """Get the next session close strictly after a moment (default now), in UTC."""
+        now = self._now(dt)
+        for session in self._sessions_from(now.astimezone(EASTERN).date()):
+            if session.close > now:
+                return session.close
+        raise LookupError(f"No market session after {now.isoformat()}")
+
+    def clock(self, dt: Optional[datetime] = None) -> Dict[str, object]:
+        """
+        Get a market clock in the shape of features.alpaca.client.get_market_clock.
+
+        Args:
+            dt: Moment to describe (default now)
+
+        Returns:
+            dict: timestamp, is_open, next_open and next_close (ISO strings)
+        """
+        now = self._now(dt)
+        return {
+            'timestamp': now.isoformat(),
+            'is_open': self.is_open(now),
+            'next_open': self.next_open(now).isoformat(),
+            'next_close': self.next_close(now).isoformat()
+        }
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        """Get the loaded years, their session counts and where they came from."""
+        return {
+            str(year): {'sessions': len(table.days), 'source': table.source}
+            for year, table in sorted(self._years.items())
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._years = {}
+
+
+# Global calendar for this process
+market_calendar = MarketCalendar()
@@ -0,0 +1,9 @@
+"""
+In-process metrics: latency histograms, their Prometheus exposition and the
+Socket.IO hub that pushes dashboard payloads.
+"""
+from .histogram import LatencyHistogram
+from .hub import MetricsHub, metrics_hub
+from .pipeline import STAGES, PipelineMetrics, pipeline_metrics
+
+__all__ = ['LatencyHistogram', 'MetricsHub', 'PipelineMetrics', 'STAGES', 'metrics_hub', 'pipeline_metrics']
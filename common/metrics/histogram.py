@@ -0,0 +1,148 @@
+"""
+Latency Histogram
+
+Fixed-size log-linear histogram in the style of HdrHistogram: every power of
+two is split into SUB_BUCKETS equal buckets, so any recorded value is known to
+within ~1/SUB_BUCKETS of its size while the whole range (1µs to ~19h) fits in a
+few hundred integer counters.
+
+Recording takes no lock. Under the GIL a concurrent increment can very rarely
+be lost, which is acceptable for monitoring and keeps the hot path to a couple
+of list operations.
+"""
+from typing import Dict, List, Optional
+
+SUB_BUCKET_BITS = 3
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+# Values are recorded in microseconds; 2**36 µs is about 19 hours
+MAX_VALUE_BITS = 36
+NUM_BUCKETS = (MAX_VALUE_BITS - SUB_BUCKET_BITS + 1) * SUB_BUCKETS
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+def bucket_index(value_us: int) -> int:
+    """
+    Map a value in microseconds to its bucket.
+
+    Args:
+        value_us: Non-negative value in microseconds
+
+    Returns:
+        int: Bucket index, clamped to the last bucket
+    """
+    if value_us < SUB_BUCKETS:
+        return max(value_us, 0)
+    exponent = value_us.bit_length() - SUB_BUCKET_BITS - 1
+    index = (exponent + 1) * SUB_BUCKETS + (value_us >> exponent) - SUB_BUCKETS
+    return min(index, NUM_BUCKETS - 1)
+
+
+def bucket_lower_bound(index: int) -> int:
+    """
+    Smallest value in microseconds that falls into a bucket.
+
+    Args:
+        index: Bucket index
+
+    Returns:
+        int: Lower bound in microseconds
+    """
+    if index < SUB_BUCKETS:
+        return index
+    exponent = index // SUB_BUCKETS - 1
+    return (index % SUB_BUCKETS + SUB_BUCKETS) << exponent
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram with approximate quantiles."""
+
+    def __init__(self):
+        self._counts: List[int] = [0] * NUM_BUCKETS
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    def record(self, seconds: float) -> None:
+        """
+        Record one latency.
+
+        Args:
+            seconds: Latency in seconds (negative values are recorded as zero)
+        """
+        value_us = int(seconds * 1_000_000) if seconds > 0 else 0
+        self._counts[bucket_index(value_us)] += 1
+        self.count += 1
+        self.total_us += value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Approximate quantile in seconds.
+
+        Returns the upper edge of the bucket holding the quantile, capped at the
+        largest recorded value, so the estimate never understates latency.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            float: Latency in seconds, or None when nothing has been recorded
+        """
+        return self.quantiles((q,))[q]
+
+    def quantiles(self, qs=DEFAULT_QUANTILES) -> Dict[float, Optional[float]]:
+        """
+        Approximate several quantiles from one pass over the buckets.
+
+        Args:
+            qs: Quantiles between 0 and 1
+
+        Returns:
+            Dict mapping each quantile to seconds (None when empty)
+        """
+        counts = list(self._counts)
+        total = sum(counts)
+        if not total:
+            return {q: None for q in qs}
+
+        result = {}
+        targets = sorted(qs)
+        seen = 0
+        position = 0
+        for index, bucket_count in enumerate(counts):
+            seen += bucket_count
+            while position < len(targets) and seen >= max(1, targets[position] * total):
+                upper = bucket_lower_bound(index + 1) - 1 if index + 1 < NUM_BUCKETS else self.max_us
+                result[targets[position]] = min(upper, self.max_us) / 1_000_000
+                position += 1
+            if position == len(targets):
+                break
+        for q in targets[position:]:
+            result[q] = self.max_us / 1_000_000
+        return result
+
+    def snapshot(self, qs=DEFAULT_QUANTILES) -> Dict[str, Optional[float]]:
+        """
+        Summarize the histogram in milliseconds.
+
+        Returns:
+            Dict with count, mean_ms, max_ms and p<NN>_ms per quantile
+        """
+        count = self.count
+        summary = {
+            'count': count,
+            'mean_ms': round(self.total_us / count / 1000, 3) if count else None,
+            'max_ms': round(self.max_us / 1000, 3) if count else None,
+        }
+        for q, seconds in self.quantiles(qs).items():
+            summary[f"p{q * 100:g}_ms"] = round(seconds * 1000, 3) if seconds is not None else None
+        return summary
+
+    def reset(self) -> None:
+        """Clear all recorded values."""
+        self._counts = [0] * NUM_BUCKETS
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
@@ -0,0 +1,258 @@
+"""
+Dashboard Metrics Hub
+
+Computes each dashboard payload once per interval (or as soon as a slice
+reports a change) and pushes it to the Socket.IO room of its topic, so the
+database work behind a dashboard no longer scales with the number of open
+browser tabs.
+
+Protocol (Socket.IO events):
+    client -> server  metrics_subscribe    {'topic': 'ingestion'}
+    client -> server  metrics_unsubscribe  {'topic': 'ingestion'}
+    server -> client  metrics_snapshot     {'topic', 'payload'}           full payload on subscribe
+    server -> client  metrics_update       {'topic', 'changed', 'removed'} top-level keys that changed
+
+Slices register a builder for their topic at import time; builders run inside
+an application context and return a JSON-serializable dict.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 5.0
+TICK_SECONDS = 1.0
+
+Builder = Callable[[], Dict[str, Any]]
+
+
+def diff_payload(old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compare two payloads at the top level.
+
+    Args:
+        old: Previously pushed payload (None if there was none)
+        new: Freshly built payload
+
+    Returns:
+        Dict with 'changed' (key -> new value) and 'removed' (list of keys)
+    """
+    old = old or {}
+    changed = {key: value for key, value in new.items() if key not in old or old[key] != value}
+    removed = [key for key in old if key not in new]
+    return {'changed': changed, 'removed': removed}
+
+
+def room_for(topic: str) -> str:
+    """Socket.IO room that receives a topic's updates."""
+    return f"metrics:{topic}"
+
+
+@dataclass
+class _Topic:
+    builder: Builder
+    interval: float
+    payload: Optional[Dict[str, Any]] = None
+    built_at: float = 0.0
+    dirty: bool = False
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class MetricsHub:
+    """Shared producer of dashboard payloads pushed over Socket.IO."""
+
+    def __init__(self):
+        self._topics: Dict[str, _Topic] = {}
+        self._subscribers: Dict[str, Set[str]] = {}
+        self._socketio = None
+        self._app = None
+        self._task_started = False
+        self._lock = threading.Lock()
+        self.stats = {'builds': 0, 'build_errors': 0, 'updates_pushed': 0}
+
+    def register(self, topic: str, builder: Builder, interval: float = DEFAULT_INTERVAL) -> None:
+        """
+        Register the payload builder for a topic.
+
+        Args:
+            topic: Topic name clients subscribe to
+            builder: Returns the topic payload; runs inside an app context
+            interval: Seconds between rebuilds while the topic has subscribers
+        """
+        self._topics[topic] = _Topic(builder, interval)
+
+    def topics(self) -> List[str]:
+        """Get registered topic names."""
+        return sorted(self._topics)
+
+    def notify_changed(self, topic: str) -> None:
+        """Rebuild a topic on the next tick instead of waiting for its interval."""
+        state = self._topics.get(topic)
+        if state is not None:
+            state.dirty = True
+
+    def subscriber_count(self, topic: str) -> int:
+        return len(self._subscribers.get(topic, ()))
+
+    def subscribe(self, sid: str, topic: str) -> Optional[Dict[str, Any]]:
+        """
+        Add a client to a topic.
+
+        Args:
+            sid: Socket.IO session ID
+            topic: Topic name
+
+        Returns:
+            Current payload for the topic (built now if missing or stale), or None for unknown topics
+        """
+        state = self._topics.get(topic)
+        if state is None:
+            return None
+        with self._lock:
+            self._subscribers.setdefault(topic, set()).add(sid)
+        if state.payload is None or time.monotonic() - state.built_at >= state.interval:
+            self.refresh(topic)
+        self._ensure_task()
+        return state.payload
+
+    def unsubscribe(self, sid: str, topic: Optional[str] = None) -> None:
+        """Remove a client from one topic, or from all topics when none is given."""
+        with self._lock:
+            for name, sids in self._subscribers.items():
+                if topic is None or name == topic:
+                    sids.discard(sid)
+
+    def refresh(self, topic: str) -> Optional[Dict[str, Any]]:
+        """
+        Rebuild a topic payload and remember it.
+
+        Concurrent callers for the same topic share one build.
+
+        Args:
+            topic: Topic name
+
+        Returns:
+            Diff against the previous payload, or None if the build failed or was shared
+        """
+        state = self._topics[topic]
+        if not state.lock.acquire(blocking=False):
+            # Another caller is building; wait for its result instead of building twice
+            with state.lock:
+                return None
+        try:
+            try:
+                payload = state.builder()
+            except Exception as e:
+                self.stats['build_errors'] += 1
+                logger.error(f"Error building metrics for topic {topic}: {e}")
+                return None
+            self.stats['builds'] += 1
+            diff = diff_payload(state.payload, payload)
+            state.payload = payload
+            state.built_at = time.monotonic()
+            state.dirty = False
+            return diff
+        finally:
+            state.lock.release()
+
+    def due_topics(self, now: float) -> List[str]:
+        """Topics with subscribers whose interval elapsed or that were marked changed."""
+        return [
+            topic for topic, state in self._topics.items()
+            if self.subscriber_count(topic)
+            and (state.dirty or now - state.built_at >= state.interval)
+        ]
+
+    def tick(self, now: Optional[float] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Rebuild due topics and push what changed.
+
+        Args:
+            now: Monotonic time (default: now)
+
+        Returns:
+            List of (topic, diff) pairs that were pushed
+        """
+        pushed = []
+        for topic in self.due_topics(time.monotonic() if now is None else now):
+            diff = self.refresh(topic)
+            if not diff or not (diff['changed'] or diff['removed']):
+                continue
+            if self._socketio is not None:
+                self._socketio.emit('metrics_update', {'topic': topic, **diff}, to=room_for(topic))
+            self.stats['updates_pushed'] += 1
+            pushed.append((topic, diff))
+        return pushed
+
+    def _run(self) -> None:
+        logger.info("Metrics hub started")
+        while True:
+            try:
+                with self._app.app_context():
+                    self.tick()
+            except Exception as e:
+                logger.error(f"Metrics hub tick failed: {e}")
+            self._socketio.sleep(TICK_SECONDS)
+
+    def _ensure_task(self) -> None:
+        # Started on first subscription so scripts and tests never spawn it
+        if self._socketio is None or self._task_started:
+            return
+        with self._lock:
+            if self._task_started:
+                return
+            self._task_started = True
+        self._socketio.start_background_task(self._run)
+
+    def init_socketio(self, socketio, app) -> None:
+        """
+        Register the subscribe/unsubscribe handlers on the app's Socket.IO server.
+
+        The existing disconnect handler must call ``unsubscribe(request.sid)``.
+
+        Args:
+            socketio: flask_socketio.SocketIO instance
+            app: Flask application used for builder app contexts
+        """
+        from flask import request
+        from flask_socketio import emit, join_room, leave_room
+
+        self._socketio = socketio
+        self._app = app
+
+        @socketio.on('metrics_subscribe')
+        def handle_metrics_subscribe(data):
+            topic = (data or {}).get('topic')
+            if topic not in self._topics:
+                emit('metrics_error', {'topic': topic, 'error': 'unknown topic'})
+                return
+            join_room(room_for(topic))
+            payload = self.subscribe(request.sid, topic)
+            emit('metrics_snapshot', {'topic': topic, 'payload': payload})
+
+        @socketio.on('metrics_unsubscribe')
+        def handle_metrics_unsubscribe(data):
+            topic = (data or {}).get('topic')
+            leave_room(room_for(topic))
+            self.unsubscribe(request.sid, topic)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get build/push counters and subscribers per topic."""
+        return {
+            **self.stats,
+            'topics': {
+                topic: {
+                    'subscribers': self.subscriber_count(topic),
+                    'interval': state.interval,
+                    'age_seconds': round(time.monotonic() - state.built_at, 1) if state.built_at else None
+                }
+                for topic, state in self._topics.items()
+            }
+        }
+
+
+# Global hub for this process
+metrics_hub = MetricsHub()
@@ -0,0 +1,27 @@
+"""
+Process State Model
+
+One row per running worker process holding the in-process state it publishes
+for the dashboards served by the web process (see process_state.py).
+"""
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, Integer, String
+
+from common.db.session import db
+
+
+class ProcessStateModel(db.Model):
+    """Latest published state of one process."""
+    __tablename__ = 'process_state'
+
+    # "<roles>@<hostname>:<pid>"
+    instance = Column(String(255), primary_key=True)
+    roles = Column(String(100), nullable=False)
+    hostname = Column(String(255), nullable=False)
+    pid = Column(Integer, nullable=False)
+    state = Column(JSON, nullable=False, default=dict)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f"<ProcessStateModel {self.instance} at {self.updated_at}>"
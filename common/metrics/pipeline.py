@@ -0,0 +1,239 @@
+"""
+Pipeline Latency Metrics
+
+Timestamps each hop a Discord message takes on its way to a stored trade
+setup and keeps per-hop latency histograms in process. Hops are keyed by the
+Discord message ID, which every stage already has in hand, so instrumented
+code only calls ``mark(message_id, stage)``.
+
+Stages, in pipeline order:
+    discord_posted     message.created_at as reported by Discord
+    discord_received   TradingDiscordBot.on_message
+    ingestion_started  IngestionService.process_message
+    message_stored     row written to discord_messages
+    parse_started      ParsingListener._handle_message_stored
+    setups_stored      ParsingStore.store_parsed_message committed
+    setup_published    setup.parsed published by ParsingStore.store_parsed_message
+
+The bot, ingestion and parsing may run in different processes (launcher.py),
+so the stage times seen so far travel with the events that hand a message on:
+publishers attach ``handoff(message_id)`` and the parsing listener ``adopt``s
+them before marking parse_started.
+"""
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .histogram import DEFAULT_QUANTILES, LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+STAGES = (
+    'discord_posted',
+    'discord_received',
+    'ingestion_started',
+    'message_stored',
+    'parse_started',
+    'setups_stored',
+    'setup_published',
+)
+_STAGE_ORDER = {stage: position for position, stage in enumerate(STAGES)}
+
+# Measured from the first stage seen for a message to this one
+END_TO_END_STAGE = 'setups_stored'
+END_TO_END = 'end_to_end'
+
+DEFAULT_MAX_IN_FLIGHT = 10000
+
+
+class PipelineMetrics:
+    """Per-hop latency histograms for the Discord -> setup pipeline."""
+
+    def __init__(self, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+        """
+        Initialize the tracker.
+
+        Args:
+            max_in_flight: Messages whose stage timestamps are kept; the oldest are evicted
+        """
+        self.max_in_flight = max_in_flight
+        self._in_flight: Dict[str, Dict[str, float]] = {}
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self.started_at = time.time()
+
+    def _histogram(self, name: str) -> LatencyHistogram:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            # setdefault keeps the first histogram if two threads race here
+            histogram = self._histograms.setdefault(name, LatencyHistogram())
+        return histogram
+
+    def _evict(self) -> None:
+        while len(self._in_flight) > self.max_in_flight:
+            try:
+                self._in_flight.pop(next(iter(self._in_flight)), None)
+            except (StopIteration, RuntimeError):
+                return
+
+    def mark(self, message_id: Any, stage: str, at: Optional[float] = None) -> None:
+        """
+        Record that a message reached a stage.
+
+        The latency from the closest earlier stage seen for the message is
+        recorded under ``"<previous>-><stage>"``. Never raises.
+
+        Args:
+            message_id: Discord message ID
+            stage: One of STAGES
+            at: Epoch seconds (default: now)
+        """
+        if message_id is None or stage not in _STAGE_ORDER:
+            return
+        try:
+            now = time.time() if at is None else at
+            key = str(message_id)
+            stages = self._in_flight.get(key)
+            if stages is None:
+                stages = self._in_flight.setdefault(key, {})
+                self._evict()
+            if stage in stages:
+                return  # keep the first time a stage is reached (retries, replays)
+            stages[stage] = now
+
+            position = _STAGE_ORDER[stage]
+            previous = None
+            for earlier in reversed(STAGES[:position]):
+                if earlier in stages:
+                    previous = earlier
+                    break
+            if previous is not None:
+                self._histogram(f"{previous}->{stage}").record(now - stages[previous])
+            if stage == END_TO_END_STAGE:
+                first = min(stages.values())
+                self._histogram(END_TO_END).record(now - first)
+            if position == len(STAGES) - 1:
+                self._in_flight.pop(key, None)
+        except Exception as e:
+            logger.debug(f"Pipeline metric for {message_id}/{stage} not recorded: {e}")
+
+    def handoff(self, message_id: Any, keep: bool = False) -> Dict[str, float]:
+        """
+        Get the stage times of a message for the process that handles it next.
+
+        Args:
+            message_id: Discord message ID
+            keep: Keep tracking the message here (the next stage may run in this process)
+
+        Returns:
+            Dict mapping stage to epoch seconds (empty if the message was not tracked)
+        """
+        if message_id is None:
+            return {}
+        key = str(message_id)
+        stages = self._in_flight.get(key) if keep else self._in_flight.pop(key, None)
+        return dict(stages or {})
+
+    def adopt(self, message_id: Any, stages: Optional[Dict[str, float]]) -> None:
+        """
+        Continue tracking a message whose earlier stages were seen by another process.
+
+        The hops between those stages were recorded there, so only the stage
+        times are kept. Never raises.
+
+        Args:
+            message_id: Discord message ID
+            stages: Stage times returned by ``handoff``
+        """
+        if message_id is None or not stages:
+            return
+        try:
+            key = str(message_id)
+            tracked = self._in_flight.get(key)
+            if tracked is None:
+                tracked = self._in_flight.setdefault(key, {})
+                self._evict()
+            for stage, at in stages.items():
+                if stage in _STAGE_ORDER:
+                    tracked.setdefault(stage, float(at))
+        except Exception as e:
+            logger.debug(f"Pipeline stages for {message_id} not adopted: {e}")
+
+    def mark_posted(self, message_id: Any, created_at: Optional[datetime]) -> None:
+        """Record the Discord post time of a message."""
+        if created_at is not None:
+            self.mark(message_id, 'discord_posted', at=created_at.timestamp())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Summarize every hop histogram.
+
+        Returns:
+            Dict with per-hop summaries in milliseconds and the in-flight count
+        """
+        hops = {name: histogram.snapshot() for name, histogram in sorted(self._histograms.items())}
+        return {
+            'hops': hops,
+            'in_flight': len(self._in_flight),
+            'since': datetime.utcfromtimestamp(self.started_at).isoformat()
+        }
+
+    def export(self) -> Dict[str, Any]:
+        """
+        Get the Prometheus series of every hop as plain data.
+
+        Returns:
+            Dict with per-hop quantiles (seconds, keyed by quantile), sum and
+            count, and the in-flight count
+        """
+        hops = {}
+        for hop, histogram in sorted(self._histograms.items()):
+            hops[hop] = {
+                'quantiles': {
+                    f"{q:g}": seconds
+                    for q, seconds in histogram.quantiles(DEFAULT_QUANTILES).items() if seconds is not None
+                },
+                'sum': histogram.total_us / 1_000_000,
+                'count': histogram.count
+            }
+        return {'hops': hops, 'in_flight': len(self._in_flight)}
+
+    def render_prometheus(self, others: Iterable[Tuple[str, Dict[str, Any]]] = ()) -> str:
+        """
+        Render the histograms in the Prometheus text exposition format.
+
+        Args:
+            others: (process name, ``export()`` result) of other processes,
+                rendered with a ``process`` label
+
+        Returns:
+            str: Summary metrics with quantiles, sum and count per hop
+        """
+        series = [('', self.export())] + [(f'process="{process}",', exported) for process, exported in others]
+        name = 'pipeline_hop_latency_seconds'
+        lines = [
+            f"# HELP {name} Latency between Discord message pipeline stages",
+            f"# TYPE {name} summary",
+        ]
+        for labels, exported in series:
+            for hop, values in exported['hops'].items():
+                for q, seconds in values['quantiles'].items():
+                    lines.append(f'{name}{{{labels}hop="{hop}",quantile="{q}"}} {seconds:.6f}')
+                lines.append(f'{name}_sum{{{labels}hop="{hop}"}} {values["sum"]:.6f}')
+                lines.append(f'{name}_count{{{labels}hop="{hop}"}} {values["count"]}')
+        lines.append("# HELP pipeline_messages_in_flight Messages with an unfinished pipeline trace")
+        lines.append("# TYPE pipeline_messages_in_flight gauge")
+        for labels, exported in series:
+            label_set = f"{{{labels.rstrip(',')}}}" if labels else ''
+            lines.append(f"pipeline_messages_in_flight{label_set} {exported['in_flight']}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Drop all histograms and in-flight messages."""
+        self._in_flight = {}
+        self._histograms = {}
+        self.started_at = time.time()
+
+
+# Global tracker for this process
+pipeline_metrics = PipelineMetrics()
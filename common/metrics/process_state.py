@@ -0,0 +1,173 @@
+"""
+Process State
+
+In role-split mode (launcher.py) the Discord bot, the ingestion counters, the
+pipeline histograms and the profiler windows live in worker processes, while
+the web process serves the dashboards. Every worker upserts its in-process
+state into one ``process_state`` row every few seconds, and the web process
+reads the rows that are still fresh.
+
+Slices register a builder per section, like metrics hub topics; builders run
+inside an application context and return a JSON-serializable dict (or None
+when they have nothing to report).
+"""
+import logging
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from common.db import db
+from common.process_roles import active_roles
+from .models import ProcessStateModel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 5.0
+# Rows older than this belong to processes that stopped or hung
+STALE_SECONDS = 30.0
+
+Builder = Callable[[], Optional[Dict[str, Any]]]
+
+
+def instance_name() -> str:
+    """Name of this process: "<roles>@<hostname>:<pid>"."""
+    return f"{','.join(sorted(active_roles()))}@{socket.gethostname()}:{os.getpid()}"
+
+
+class ProcessStateReporter:
+    """Publishes this process's state and reads the state of the others."""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, stale_after: float = STALE_SECONDS):
+        """
+        Initialize the reporter.
+
+        Args:
+            interval: Seconds between publishes
+            stale_after: Age in seconds after which another process's row is ignored
+        """
+        self.interval = interval
+        self.stale_after = stale_after
+        self._sections: Dict[str, Builder] = {}
+        self._stopped = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.published_at: Optional[datetime] = None
+
+    def register(self, section: str, builder: Builder) -> None:
+        """
+        Register the state builder for a section.
+
+        Args:
+            section: Section name readers ask for
+            builder: Returns the section state; runs inside an app context
+        """
+        self._sections[section] = builder
+
+    def build(self) -> Dict[str, Any]:
+        """Build every section, skipping the ones that fail or report nothing."""
+        state = {}
+        for section, builder in self._sections.items():
+            try:
+                value = builder()
+            except Exception as e:
+                logger.error(f"Error building process state section {section}: {e}")
+                continue
+            if value is not None:
+                state[section] = value
+        return state
+
+    def publish(self) -> bool:
+        """
+        Upsert this process's row. Requires an application context.
+
+        Returns:
+            bool: True if the row was written
+        """
+        try:
+            db.session.merge(ProcessStateModel(
+                instance=instance_name(),
+                roles=','.join(sorted(active_roles())),
+                hostname=socket.gethostname(),
+                pid=os.getpid(),
+                state=self.build(),
+                updated_at=datetime.utcnow()
+            ))
+            db.session.commit()
+            self.published_at = datetime.utcnow()
+            return True
+        except Exception as e:
+            logger.error(f"Error publishing process state: {e}")
+            db.session.rollback()
+            return False
+
+    def read(self, section: str) -> List[Dict[str, Any]]:
+        """
+        Get a section as published by the other live processes, newest first.
+
+        Requires an application context.
+
+        Args:
+            section: Section name
+
+        Returns:
+            List of dicts with instance, roles, updated_at and the section state
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=self.stale_after)
+        try:
+            rows = (
+                ProcessStateModel.query
+                .filter(ProcessStateModel.updated_at >= cutoff)
+                .filter(ProcessStateModel.instance != instance_name())
+                .order_by(ProcessStateModel.updated_at.desc())
+                .all()
+            )
+        except Exception as e:
+            logger.error(f"Error reading process state: {e}")
+            db.session.rollback()
+            return []
+        return [
+            {
+                'instance': row.instance,
+                'roles': row.roles.split(','),
+                'updated_at': row.updated_at.isoformat(),
+                'state': row.state[section]
+            }
+            for row in rows if section in (row.state or {})
+        ]
+
+    def latest(self, section: str) -> Optional[Dict[str, Any]]:
+        """Get the most recently published state of a section, or None."""
+        states = self.read(section)
+        return states[0] if states else None
+
+    def _run(self, app) -> None:
+        logger.info(f"Publishing process state as {instance_name()} every {self.interval:.0f}s")
+        while not self._stopped.is_set():
+            with app.app_context():
+                self.publish()
+            self._stopped.wait(self.interval)
+
+    def start(self, app) -> threading.Thread:
+        """
+        Publish this process's state on a background thread.
+
+        Args:
+            app: Flask application used for the publishing app context
+        """
+        if self.thread and self.thread.is_alive():
+            return self.thread
+        self._stopped.clear()
+        self.thread = threading.Thread(target=self._run, args=(app,), daemon=True, name="ProcessStateThread")
+        self.thread.start()
+        return self.thread
+
+    def stop(self) -> None:
+        """Stop publishing."""
+        self._stopped.set()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+
+
+# Shared reporter for this process
+process_state = ProcessStateReporter()
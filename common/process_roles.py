@@ -0,0 +1,64 @@
+"""
+Process Roles
+
+The application can run as one process (development) or as one process per
+role, started by ``launcher.py``. Roles only talk to each other through the
+Postgres event bus, so each one can be restarted or scaled on its own.
+
+``APP_ROLES`` (comma-separated, default ``all``) tells a process which roles
+it hosts; app.py only starts the Discord bot and listeners when their role is
+enabled.
+
+In-process state the web dashboards show (bot metrics, ingestion counters,
+pipeline histograms, profiler windows) reaches the web process through
+``common.metrics.process_state``.
+"""
+import os
+from typing import Dict, FrozenSet, Optional
+
+ROLES: Dict[str, str] = {
+    'web': 'Flask app: dashboards, REST API, Socket.IO and event cleanup',
+    'ingest': 'Discord bot and ingestion listener',
+    'parse': 'Parsing listener (discord.message_received -> setups)',
+    'market': 'Market data feed, price monitor, candle and strategy detectors, setup monitor',
+    'execution': 'Exit rules engine, position snapshot and options trader',
+}
+
+ALL = 'all'
+
+# Roles that may run as several processes at once; parse workers share the
+# parse_jobs queue by claiming rows with FOR UPDATE SKIP LOCKED
+SCALABLE_ROLES = frozenset({'parse'})
+
+
+def parse_roles(value: Optional[str]) -> FrozenSet[str]:
+    """
+    Parse an APP_ROLES value.
+
+    Args:
+        value: Comma-separated role names, or "all" (empty means all)
+
+    Returns:
+        frozenset: Role names
+
+    Raises:
+        ValueError: If a role name is unknown
+    """
+    names = {name.strip().lower() for name in (value or ALL).split(',') if name.strip()}
+    if not names or ALL in names:
+        return frozenset(ROLES)
+    unknown = names - set(ROLES)
+    if unknown:
+        raise ValueError(f"Unknown roles: {', '.join(sorted(unknown))} (expected {', '.join(ROLES)})")
+    return frozenset(names)
+
+
+def active_roles() -> FrozenSet[str]:
+    """Get the roles hosted by this process from APP_ROLES."""
+    return parse_roles(os.environ.get('APP_ROLES'))
+
+
+def role_enabled(role: str) -> bool:
+    """Check whether this process hosts a role."""
+    return role in active_roles()
+
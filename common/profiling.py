@@ -0,0 +1,319 @@
+"""
+Sampling Profiler Hooks
+
+On-demand stack sampling for hot entry points and dashboard requests. A
+target (a decorated function or a Flask endpoint) is *armed* for a bounded
+window; while armed, each call is sampled from a background thread via
+``sys._current_frames()`` and written as a folded-stack file that
+flamegraph.pl, speedscope and inferno read directly.
+
+When nothing is armed the decorator costs one dict truthiness check per call.
+
+Enable per request with ``X-Profile: <PROFILING_TOKEN>``, or arm a target
+through ``/dashboard/profiling/arm``. The endpoint also publishes the request
+on the ``profiling`` channel, so worker processes started by launcher.py arm
+their own profiler (see ``Profiler.handle_event``).
+"""
+import asyncio
+import functools
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 0.005
+DEFAULT_WINDOW_SECONDS = 60
+DEFAULT_MAX_CALLS = 20
+MAX_CONCURRENT_SESSIONS = 4
+# Hard cap on samples per call so a stuck call cannot grow a profile forever
+MAX_SAMPLES = 20000
+PROFILE_HEADER = 'X-Profile'
+
+# Arm/disarm requests forwarded to worker processes
+PROFILING_CHANNEL = 'profiling'
+ARM_EVENT = 'profiling.armed'
+DISARM_EVENT = 'profiling.disarmed'
+
+_FILENAME_UNSAFE = re.compile(r'[^A-Za-z0-9_.-]+')
+
+
+def fold_stack(frame) -> str:
+    """
+    Fold a frame chain into a ``root;...;leaf`` line.
+
+    Args:
+        frame: Innermost frame
+
+    Returns:
+        str: Semicolon-separated frames, outermost first
+    """
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ';'.join(reversed(frames))
+
+
+class StackSampler:
+    """Samples one thread's stack at a fixed interval from a helper thread."""
+
+    def __init__(self, thread_id: int, interval: float = DEFAULT_INTERVAL, max_samples: int = MAX_SAMPLES):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_samples = max_samples
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.started_at: Optional[float] = None
+        self.duration = 0.0
+
+    def _run(self) -> None:
+        taken = 0
+        while not self._stop.wait(self.interval) and taken < self.max_samples:
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                break
+            self.samples[fold_stack(frame)] += 1
+            taken += 1
+
+    def start(self) -> 'StackSampler':
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+        self.duration = time.perf_counter() - self.started_at if self.started_at else 0.0
+        return self.samples
+
+
+class Profiler:
+    """Registry of armed targets and writer of folded-stack profiles."""
+
+    def __init__(self, output_dir: Optional[str] = None, interval: float = DEFAULT_INTERVAL):
+        """
+        Initialize the profiler.
+
+        Args:
+            output_dir: Directory for profile files (default: $PROFILE_DIR or ./profiles)
+            interval: Seconds between stack samples
+        """
+        self.output_dir = output_dir or os.environ.get('PROFILE_DIR', 'profiles')
+        self.interval = interval
+        self.token = os.environ.get('PROFILING_TOKEN')
+        self.targets: set = set()
+        # target -> {'until': epoch seconds, 'remaining': calls left}
+        self._armed: Dict[str, Dict[str, Any]] = {}
+        self._active = 0
+        self._lock = threading.Lock()
+        self.recent: List[Dict[str, Any]] = []
+
+    def register(self, target: str) -> None:
+        """Make a target name visible to the admin endpoint."""
+        self.targets.add(target)
+
+    def arm(self, target: str, seconds: float = DEFAULT_WINDOW_SECONDS, max_calls: int = DEFAULT_MAX_CALLS) -> Dict[str, Any]:
+        """
+        Profile calls to a target for a bounded window.
+
+        Args:
+            target: Decorated function name or Flask endpoint
+            seconds: Window length
+            max_calls: Calls to profile before disarming
+
+        Returns:
+            Dict describing the armed window
+        """
+        window = {'until': time.time() + seconds, 'remaining': max_calls}
+        self._armed[target] = window
+        logger.info(f"Profiling armed for {target}: {max_calls} calls within {seconds}s")
+        return {'target': target, **window}
+
+    def disarm(self, target: Optional[str] = None) -> None:
+        """Disarm one target, or all targets when none is given."""
+        if target is None:
+            self._armed = {}
+        else:
+            self._armed.pop(target, None)
+
+    def armed(self) -> Dict[str, Dict[str, Any]]:
+        """Get armed targets, dropping expired windows."""
+        now = time.time()
+        for target, window in list(self._armed.items()):
+            if window['until'] < now or window['remaining'] <= 0:
+                self._armed.pop(target, None)
+        return dict(self._armed)
+
+    def handle_event(self, event_type: str, data: Dict[str, Any]) -> None:
+        """Event handler that applies arm/disarm requests made in another process."""
+        if event_type == ARM_EVENT and data.get('target'):
+            self.arm(
+                data['target'],
+                seconds=float(data.get('seconds', DEFAULT_WINDOW_SECONDS)),
+                max_calls=int(data.get('max_calls', DEFAULT_MAX_CALLS))
+            )
+        elif event_type == DISARM_EVENT:
+            self.disarm(data.get('target'))
+
+    def should_profile(self, target: str) -> bool:
+        """
+        Claim one profiling slot for a call to target if it is armed.
+
+        Returns:
+            bool: True if the caller must profile this call and then call release()
+        """
+        window = self._armed.get(target)
+        if window is None:
+            return False
+        with self._lock:
+            if window['until'] < time.time() or window['remaining'] <= 0:
+                self._armed.pop(target, None)
+                return False
+            if self._active >= MAX_CONCURRENT_SESSIONS:
+                return False
+            window['remaining'] -= 1
+            self._active += 1
+        return True
+
+    def claim(self) -> bool:
+        """Claim a profiling slot for an explicitly requested profile."""
+        with self._lock:
+            if self._active >= MAX_CONCURRENT_SESSIONS:
+                return False
+            self._active += 1
+        return True
+
+    def release(self) -> None:
+        with self._lock:
+            self._active = max(0, self._active - 1)
+
+    def start(self) -> StackSampler:
+        """Start sampling the calling thread."""
+        return StackSampler(threading.get_ident(), self.interval).start()
+
+    def finish(self, target: str, sampler: StackSampler) -> Optional[str]:
+        """
+        Stop a sampler and write its folded stacks.
+
+        Args:
+            target: Target name used in the file name
+            sampler: Running sampler
+
+        Returns:
+            str: Path of the written profile, or None if nothing was sampled
+        """
+        samples = sampler.stop()
+        self.release()
+        if not samples:
+            return None
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            stamp = datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')
+            name = f"{_FILENAME_UNSAFE.sub('_', target)}-{stamp}-{sampler.duration * 1000:.0f}ms.folded"
+            path = os.path.join(self.output_dir, name)
+            with open(path, 'w') as f:
+                for stack, count in samples.most_common():
+                    f.write(f"{stack} {count}\n")
+            self.recent = ([{
+                'target': target,
+                'file': name,
+                'duration_ms': round(sampler.duration * 1000, 1),
+                'samples': sum(samples.values()),
+                'written_at': datetime.utcnow().isoformat()
+            }] + self.recent)[:50]
+            logger.info(f"Wrote profile for {target} to {path}")
+            return path
+        except OSError as e:
+            logger.error(f"Could not write profile for {target}: {e}")
+            return None
+
+    def status(self) -> Dict[str, Any]:
+        """Get targets, armed windows and recently written profiles."""
+        return {
+            'targets': sorted(self.targets),
+            'armed': self.armed(),
+            'active_sessions': self._active,
+            'output_dir': os.path.abspath(self.output_dir),
+            'recent': list(self.recent)
+        }
+
+    def init_app(self, app) -> None:
+        """
+        Profile Flask requests whose endpoint is armed or that carry the profile header.
+
+        Args:
+            app: Flask application
+        """
+        from flask import g, request
+
+        @app.before_request
+        def _start_request_profile():
+            endpoint = request.endpoint or request.path
+            requested = bool(self.token) and request.headers.get(PROFILE_HEADER) == self.token
+            if (requested and self.claim()) or self.should_profile(endpoint):
+                g._profile = (endpoint, self.start())
+
+        @app.after_request
+        def _finish_request_profile(response):
+            session = g.pop('_profile', None)
+            if session is not None:
+                path = self.finish(*session)
+                if path:
+                    response.headers['X-Profile-Output'] = os.path.basename(path)
+            return response
+
+
+# Global profiler for this process
+profiler = Profiler()
+
+
+def profiled(target: Optional[str] = None) -> Callable:
+    """
+    Decorate a hot entry point so it can be profiled on demand.
+
+    Args:
+        target: Name used to arm the function (default: module.qualname)
+
+    Returns:
+        Decorator for sync or async functions
+    """
+    def decorator(func: Callable) -> Callable:
+        name = target or f"{func.__module__}.{func.__qualname__}"
+        profiler.register(name)
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not profiler._armed or not profiler.should_profile(name):
+                    return await func(*args, **kwargs)
+                # Samples the event loop thread, so other tasks may show up in the profile
+                sampler = profiler.start()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    profiler.finish(name, sampler)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler._armed or not profiler.should_profile(name):
+                return func(*args, **kwargs)
+            sampler = profiler.start()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.finish(name, sampler)
+        return wrapper
+
+    return decorator
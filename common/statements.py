@@ -0,0 +1,148 @@
+"""
+Statement Registry
+
+Hot raw SQL is declared once, at import, as a named statement instead of a
+``text()`` built on every call:
+
+- ``Statement`` wraps a SQLAlchemy ``TextClause``. Bind parameters are parsed
+  once, and because the clause is the same object every time, the engine's
+  compiled cache serves every call after the first.
+- ``AsyncStatement`` holds asyncpg SQL with ``$n`` parameters. asyncpg
+  prepares a parameterized statement the first time a connection runs it and
+  keeps it in that connection's statement cache, so with pooled connections
+  each statement is parsed and planned once per connection instead of once
+  per call. (An explicit ``conn.prepare()`` per proxy would duplicate that
+  cache without its automatic re-prepare after schema changes.)
+
+Each statement keeps a latency histogram; ``statements.snapshot()`` reports
+them and /metrics/db-pool includes them.
+"""
+import time
+from typing import Any, Dict, Optional, Union
+
+from sqlalchemy import text
+
+from common.metrics.histogram import LatencyHistogram
+
+
+class Statement:
+    """A named SQLAlchemy text statement built once."""
+
+    def __init__(self, name: str, sql: str):
+        self.name = name
+        self.sql = sql
+        self.clause = text(sql)
+        self.latency = LatencyHistogram()
+
+    def execute(self, session, params: Optional[Dict[str, Any]] = None):
+        """
+        Execute the statement on a session or connection.
+
+        Args:
+            session: SQLAlchemy session or connection
+            params: Bind parameters
+
+        Returns:
+            The SQLAlchemy result
+        """
+        started = time.perf_counter()
+        try:
+            return session.execute(self.clause, params or {})
+        finally:
+            self.latency.record(time.perf_counter() - started)
+
+
+class AsyncStatement:
+    """A named asyncpg statement, prepared once per pooled connection by asyncpg's statement cache."""
+
+    def __init__(self, name: str, sql: str):
+        self.name = name
+        self.sql = sql
+        self.latency = LatencyHistogram()
+
+    async def _timed(self, method, *args):
+        started = time.perf_counter()
+        try:
+            return await method(self.sql, *args)
+        finally:
+            self.latency.record(time.perf_counter() - started)
+
+    async def execute(self, conn, *args) -> str:
+        return await self._timed(conn.execute, *args)
+
+    async def executemany(self, conn, args) -> None:
+        return await self._timed(conn.executemany, args)
+
+    async def fetch(self, conn, *args):
+        return await self._timed(conn.fetch, *args)
+
+    async def fetchval(self, conn, *args):
+        return await self._timed(conn.fetchval, *args)
+
+
+class StatementRegistry:
+    """Named hot statements of this process."""
+
+    def __init__(self):
+        self._statements: Dict[str, Union[Statement, AsyncStatement]] = {}
+
+    def _register(self, statement_class, name: str, sql: str):
+        existing = self._statements.get(name)
+        if existing is not None:
+            if existing.sql != sql or not isinstance(existing, statement_class):
+                raise ValueError(f"Statement '{name}' is already registered with different SQL")
+            return existing
+        statement = statement_class(name, sql)
+        self._statements[name] = statement
+        return statement
+
+    def register(self, name: str, sql: str) -> Statement:
+        """
+        Register a SQLAlchemy statement with :name bind parameters.
+
+        Args:
+            name: Dotted name, e.g. "parsing.duplicate_trading_days"
+            sql: SQL text
+
+        Returns:
+            Statement: The registered statement (the existing one on re-import)
+
+        Raises:
+            ValueError: If the name is taken by different SQL
+        """
+        return self._register(Statement, name, sql)
+
+    def register_async(self, name: str, sql: str) -> AsyncStatement:
+        """
+        Register an asyncpg statement with $n parameters.
+
+        Args:
+            name: Dotted name, e.g. "events.publish"
+            sql: SQL text
+
+        Returns:
+            AsyncStatement: The registered statement
+
+        Raises:
+            ValueError: If the name is taken by different SQL
+        """
+        return self._register(AsyncStatement, name, sql)
+
+    def get(self, name: str) -> Optional[Union[Statement, AsyncStatement]]:
+        return self._statements.get(name)
+
+    def snapshot(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Latency of every statement that has run, by name."""
+        return {
+            name: statement.latency.snapshot()
+            for name, statement in sorted(self._statements.items())
+            if statement.latency.count
+        }
+
+    def reset(self) -> None:
+        for statement in self._statements.values():
+            statement.latency.reset()
+
+
+# Global registry for this process
+statements = StatementRegistry()
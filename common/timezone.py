@@ -8,6 +8,10 @@ from datetime import datetime, date
 import pytz
 from typing import Optional
 
+from common.market_calendar import market_calendar
+
+CENTRAL = pytz.timezone("America/Chicago")
+
 
 def get_central_trading_day(dt: Optional[datetime] = None) -> date:
     """
@@ -19,28 +23,26 @@ def get_central_trading_day(dt: Optional[datetime] = None) -> date:
     Returns:
         date: The trading day in Central Time
     """
-    central = pytz.timezone("America/Chicago")
     if dt is None:
         dt = datetime.now(tz=pytz.UTC)
     elif dt.tzinfo is None:
         # Assume naive datetime is UTC
         dt = pytz.UTC.localize(dt)
     
-    return dt.astimezone(central).date()
+    return dt.astimezone(CENTRAL).date()
 
 
 def is_trading_day(dt: Optional[datetime] = None) -> bool:
     """
-    Check if the given datetime falls on a trading day (Monday-Friday in Central Time).
+    Check if the given datetime falls on a trading day in Central Time.
     
     Args:
         dt: Optional datetime to check. If None, uses current UTC time.
         
     Returns:
-        bool: True if it's a trading day (weekday), False if weekend
+        bool: True if the exchange has a session that day, False on weekends and holidays
     """
-    day = get_central_trading_day(dt).weekday()
-    return day < 5  # Monday=0, Sunday=6
+    return market_calendar.is_trading_day(get_central_trading_day(dt))
 
 
 def get_central_datetime(dt: Optional[datetime] = None) -> datetime:
@@ -53,11 +55,10 @@ def get_central_datetime(dt: Optional[datetime] = None) -> datetime:
     Returns:
         datetime: The datetime in Central Time
     """
-    central = pytz.timezone("America/Chicago")
     if dt is None:
         dt = datetime.now(tz=pytz.UTC)
     elif dt.tzinfo is None:
         # Assume naive datetime is UTC
         dt = pytz.UTC.localize(dt)
     
-    return dt.astimezone(central)
\ No newline at end of file
+    return dt.astimezone(CENTRAL)
\ No newline at end of file
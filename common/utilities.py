@@ -65,12 +65,13 @@ class AsyncUtils:
     def run_in_background(coro):
         """Run a coroutine in background without blocking."""
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                task = asyncio.create_task(coro)
-                return task
-            else:
-                return asyncio.run(coro)
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                # Sync caller: hand the coroutine to the shared runtime loop
+                from common.async_runtime import runtime
+                return runtime.spawn(coro)
+            return asyncio.create_task(coro)
         except Exception as e:
             logger.error(f"Error running async task in background: {e}")
             return None
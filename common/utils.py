@@ -5,6 +5,7 @@ Centralized utilities for timezone handling, data formatting, and other shared f
 Provides consistent timezone normalization and display formatting across all features.
 """
 
+import functools
 import json
 from datetime import datetime, date, timezone as dt_timezone
 from typing import Any, Dict, Optional, Union
@@ -17,6 +18,12 @@ EASTERN = timezone("US/Eastern")
 UTC_TZ = UTC
 
 
+@functools.lru_cache(maxsize=None)
+def _zone(tz_name: str):
+    # pytz.timezone normalizes and validates the name on every call
+    return timezone(tz_name)
+
+
 def ensure_utc(dt: Optional[datetime]) -> Optional[datetime]:
     """
     Ensure datetime is timezone-aware in UTC.
@@ -55,7 +62,7 @@ def to_local(dt: Optional[datetime], tz_name: str = "America/Chicago") -> Option
     utc_dt = ensure_utc(dt)
     if utc_dt is None:
         return None
-    local_tz = timezone(tz_name)
+    local_tz = _zone(tz_name)
     return utc_dt.astimezone(local_tz)
 
 
@@ -105,6 +112,22 @@ def format_timestamp_local(dt: Optional[datetime], tz_name: str = "America/Chica
         return local_dt.strftime('%b %d, %Y %I:%M %p %Z')
 
 
+def format_currency(amount: Optional[Union[int, float]]) -> str:
+    """
+    Format a dollar amount for display, e.g. -1234.5 -> "-$1,234.50".
+    
+    Args:
+        amount: Dollar amount
+        
+    Returns:
+        str: Formatted amount, or "N/A" when missing
+    """
+    if amount is None:
+        return "N/A"
+    sign = "-" if amount < 0 else ""
+    return f"{sign}${abs(amount):,.2f}"
+
+
 def safe_json_serialize(data: Any) -> str:
     """
     Safely serialize data to JSON, handling datetime objects.
@@ -7,10 +7,10 @@ for trading, market data, and account management.
 import os
 import logging
 from typing import Dict, List, Optional, Union, Any
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 
 from alpaca.trading.client import TradingClient
-from alpaca.trading.requests import GetAssetsRequest, GetOrdersRequest
+from alpaca.trading.requests import GetAssetsRequest, GetCalendarRequest, GetOrdersRequest
 from alpaca.trading.enums import AssetClass, AssetStatus, OrderStatus, OrderSide, OrderType, TimeInForce
 from alpaca.data.historical import StockHistoricalDataClient, OptionHistoricalDataClient, CryptoHistoricalDataClient
 from alpaca.data.requests import StockBarsRequest, StockLatestBarRequest, StockLatestQuoteRequest
@@ -265,27 +265,42 @@ def get_orders(status: Optional[str] = None, limit: int = 100) -> List[Dict]:
 def get_market_clock() -> Optional[Dict]:
     """
     Get market clock information.
+
+    Answered from the cached exchange calendar (common.market_calendar), which
+    is loaded from Alpaca once per year, so refreshes cost no API calls.
     
     Returns:
         Market clock information or None if error
     """
-    client = get_trading_client()
-    if not client:
-        logger.warning("Trading client not initialized")
-        return None
-        
+    from common.market_calendar import market_calendar
+
     try:
-        clock = client.get_clock()
-        return {
-            'timestamp': clock.timestamp.isoformat() if clock.timestamp else None,
-            'is_open': clock.is_open,
-            'next_open': clock.next_open.isoformat() if clock.next_open else None,
-            'next_close': clock.next_close.isoformat() if clock.next_close else None
-        }
+        return market_calendar.clock()
     except Exception as e:
         logger.error(f"Error getting market clock: {e}")
         return None
 
+def get_calendar_sessions(start: date, end: date):
+    """
+    Get exchange sessions between two days from the Alpaca calendar.
+
+    Args:
+        start: First day
+        end: Last day
+
+    Returns:
+        List of common.market_calendar.Session, or None if the trading client
+        is not initialized
+    """
+    from common.market_calendar import Session
+
+    client = get_trading_client()
+    if not client:
+        return None
+    days = client.get_calendar(GetCalendarRequest(start=start, end=end))
+    # Alpaca reports open and close as Eastern wall-clock times
+    return [Session.at(day.date, day.open.time(), day.close.time()) for day in days]
+
 def get_latest_bars(symbols: Union[str, List[str]], timeframe: str = '1Min') -> Dict[str, Dict]:
     """
     Get the latest bars for one or more symbols.
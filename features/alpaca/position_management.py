@@ -7,9 +7,10 @@ including end-of-day position cleanup and position sizing.
 import logging
 import time
 import threading
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional
 
+from common.market_calendar import market_calendar
 from .client import get_positions, submit_market_order, get_account_info, get_trading_client
 
 # Configure logger
@@ -57,7 +58,7 @@ def close_all_positions() -> bool:
         return False
 
 def _cleanup_thread_func() -> None:
-    """Thread function for end-of-day position cleanup using Alpaca market clock."""
+    """Thread function for end-of-day position cleanup using the market calendar."""
     global _thread_running
     
     logger.info("Position cleanup thread started")
@@ -73,10 +74,11 @@ def _cleanup_thread_func() -> None:
                     time.sleep(60)
                     continue
                     
-                clock = trading_client.get_clock()
+                # Session boundaries (early closes included) come from the cached calendar
+                session = market_calendar.current_session()
                 
                 # If market is open and within 5 minutes of close
-                if clock.is_open and (clock.next_close - clock.timestamp).total_seconds() < 300:
+                if session and (session.close - datetime.now(tz=timezone.utc)).total_seconds() < 300:
                     logger.info("Market close approaching, closing all positions")
                     close_all_positions()
                     
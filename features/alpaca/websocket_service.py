@@ -16,6 +16,7 @@ import pytz
 
 from flask_socketio import emit
 from common.events import EventChannels, EventTypes, publish_event_safe
+from common.market_calendar import market_calendar
 
 logger = logging.getLogger(__name__)
 
@@ -48,13 +49,12 @@ class AlpacaWebSocketService:
             bool: True if within trading hours, False otherwise
         """
         now_et = datetime.now(self.timezone)
-        current_time = now_et.time()
         
-        # Skip weekends
-        if now_et.weekday() >= 5:  # Saturday = 5, Sunday = 6
+        # Skip weekends and exchange holidays
+        if not market_calendar.is_trading_day(now_et.date()):
             return False
         
-        return self.start_time <= current_time <= self.end_time
+        return self.start_time <= now_et.time() <= self.end_time
     
     def start_price_streaming(self, tickers: List[str] = None):
         """
@@ -11,6 +11,7 @@ from typing import Dict, Any, List
 
 from common.events.query_service import EventQueryService
 from common.events.constants import EventChannels, EventTypes
+from common.metrics import metrics_hub
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +19,21 @@ logger = logging.getLogger(__name__)
 dashboard_api = Blueprint('dashboard_api', __name__, url_prefix='/dashboard')
 
 
+def _events_head_payload() -> Dict[str, Any]:
+    """Newest event ID; status pages reload their event table when it moves."""
+    from common.db import db
+    from common.events.models import Event
+    
+    row = db.session.query(Event.id, Event.created_at).order_by(Event.id.desc()).first()
+    return {
+        'latest_event_id': row.id if row else None,
+        'latest_event_at': row.created_at.isoformat() if row and row.created_at else None
+    }
+
+
+metrics_hub.register('events', _events_head_payload, interval=10.0)
+
+
 @dashboard_api.route('/events', methods=['GET'])
 def get_events():
     """
@@ -29,6 +45,8 @@ def get_events():
         - source: Filter by event source
         - hours: Hours to look back (default: 24)
         - limit: Maximum events to return (default: 100)
+        - cursor / after_id / before_id: Keyset pagination by event ID; the
+          response then carries a next_cursor token for the following page
     """
     try:
         # Parse query parameters
@@ -37,6 +55,36 @@ def get_events():
         source = request.args.get('source')
         hours = int(request.args.get('hours', 24))
         limit = int(request.args.get('limit', 100))
+        cursor = request.args.get('cursor')
+        after_id = request.args.get('after_id', type=int)
+        before_id = request.args.get('before_id', type=int)
+        
+        if cursor or after_id is not None or before_id is not None:
+            try:
+                page = EventQueryService.get_events_page(
+                    channel=channel,
+                    event_type=event_type,
+                    after_id=after_id,
+                    before_id=before_id,
+                    cursor=cursor,
+                    limit=limit
+                )
+            except ValueError as e:
+                return jsonify({'success': False, 'error': str(e)}), 400
+            
+            event_data = [event.to_dict() for event in page['events']]
+            return jsonify({
+                'success': True,
+                'events': event_data,
+                'count': len(event_data),
+                'next_cursor': page['next_cursor'],
+                'has_more': page['has_more'],
+                'filters': {
+                    'channel': channel,
+                    'event_type': event_type,
+                    'limit': limit
+                }
+            })
         
         # Get events based on filters
         if channel:
@@ -83,6 +131,26 @@ def get_events():
         }), 500
 
 
+@dashboard_api.route('/events/consumers', methods=['GET'])
+def get_event_consumers():
+    """Get stored offsets and lag for every durable event consumer group."""
+    try:
+        from common.events.offsets import get_consumer_lag, get_running_consumers
+        
+        return jsonify({
+            'success': True,
+            'consumers': get_consumer_lag(),
+            'running': get_running_consumers()
+        })
+        
+    except Exception as e:
+        logger.error(f"Error retrieving consumer offsets: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @dashboard_api.route('/events/correlation/<correlation_id>', methods=['GET'])
 def get_correlation_flow(correlation_id: str):
     """
@@ -336,4 +404,188 @@ def get_correlation_flows():
         return jsonify({
             'success': False,
             'error': str(e)
-        }), 500
\ No newline at end of file
+        }), 500
+
+@dashboard_api.route('/traces', methods=['GET'])
+def get_traces():
+    """
+    Get materialized pipeline traces, by correlation ID or most recent first.
+    
+    Query parameters:
+        - ids: Comma-separated correlation IDs to look up in one query
+        - hours: Hours to look back when no IDs are given (default: 24)
+        - limit: Maximum traces when no IDs are given (default: 50)
+    """
+    try:
+        from common.events.traces import get_recent_traces, get_traces as lookup_traces
+        
+        ids = [cid.strip() for cid in request.args.get('ids', '').split(',') if cid.strip()]
+        if ids:
+            traces = lookup_traces(ids)
+            return jsonify({
+                'success': True,
+                'traces': traces,
+                'missing': [cid for cid in ids if cid not in traces],
+                'count': len(traces)
+            })
+        
+        hours = int(request.args.get('hours', 24))
+        limit = min(int(request.args.get('limit', 50)), 500)
+        traces = get_recent_traces(datetime.utcnow() - timedelta(hours=hours), limit)
+        return jsonify({
+            'success': True,
+            'traces': traces,
+            'count': len(traces)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error retrieving traces: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@dashboard_api.route('/traces/latency', methods=['GET'])
+def get_trace_latency():
+    """
+    Get p50/p95 pipeline stage latencies from the trace table.
+    
+    Query parameters:
+        - hours: Hours to calculate latencies for (default: 24)
+    """
+    try:
+        from common.events.traces import get_stage_latencies
+        
+        hours = int(request.args.get('hours', 24))
+        return jsonify({
+            'success': True,
+            'latencies': get_stage_latencies(datetime.utcnow() - timedelta(hours=hours)),
+            'timeframe_hours': hours
+        })
+        
+    except Exception as e:
+        logger.error(f"Error calculating stage latencies: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@dashboard_api.route('/pipeline/latency', methods=['GET'])
+def get_pipeline_latency():
+    """Get per-hop latency histograms for the Discord -> setup pipeline, per process."""
+    try:
+        from common.metrics import pipeline_metrics
+        from common.metrics.process_state import process_state
+        
+        return jsonify({
+            'success': True,
+            'pipeline': pipeline_metrics.snapshot(),
+            # Hops timed by the bot, ingest and parse worker processes
+            'processes': {
+                published['instance']: published['state']['summary']
+                for published in process_state.read('pipeline')
+            }
+        })
+        
+    except Exception as e:
+        logger.error(f"Error retrieving pipeline latency: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@dashboard_api.route('/profiling', methods=['GET'])
+def get_profiling_status():
+    """Get profilable targets, armed windows and recently written profiles, per process."""
+    from common.metrics.process_state import process_state
+    from common.profiling import profiler
+    
+    return jsonify({
+        'success': True,
+        'profiling': profiler.status(),
+        'processes': {
+            published['instance']: published['state']
+            for published in process_state.read('profiling')
+        }
+    })
+
+
+@dashboard_api.route('/profiling/arm', methods=['POST'])
+def arm_profiling():
+    """
+    Profile a function or endpoint for a bounded window.
+    
+    JSON body:
+        - target: Profiling target or Flask endpoint name (required)
+        - seconds: Window length (default: 60, max: 600)
+        - max_calls: Calls to profile (default: 20, max: 200)
+    """
+    try:
+        from common.events.publisher import publish_event_safe
+        from common.profiling import ARM_EVENT, PROFILING_CHANNEL, profiler
+        
+        body = request.get_json(silent=True) or {}
+        target = body.get('target')
+        if not target:
+            return jsonify({
+                'success': False,
+                'error': 'target is required'
+            }), 400
+        
+        seconds = min(float(body.get('seconds', 60)), 600)
+        max_calls = min(int(body.get('max_calls', 20)), 200)
+        window = profiler.arm(target, seconds=seconds, max_calls=max_calls)
+        # Worker processes arm their own profiler for targets that run there
+        publish_event_safe(
+            ARM_EVENT,
+            {'target': target, 'seconds': seconds, 'max_calls': max_calls},
+            channel=PROFILING_CHANNEL,
+            source='dashboard'
+        )
+        return jsonify({
+            'success': True,
+            'armed': window
+        })
+        
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+
+@dashboard_api.route('/profiling/disarm', methods=['POST'])
+def disarm_profiling():
+    """Disarm one profiling target (JSON body 'target') or all of them, in every process."""
+    from common.events.publisher import publish_event_safe
+    from common.profiling import DISARM_EVENT, PROFILING_CHANNEL, profiler
+    
+    body = request.get_json(silent=True) or {}
+    profiler.disarm(body.get('target'))
+    publish_event_safe(DISARM_EVENT, {'target': body.get('target')}, channel=PROFILING_CHANNEL, source='dashboard')
+    return jsonify({
+        'success': True,
+        'armed': profiler.armed()
+    })
+
+
+@dashboard_api.route('/profiling/profiles/<path:filename>', methods=['GET'])
+def download_profile(filename: str):
+    """Download a folded-stack profile for flamegraph tooling."""
+    import os
+    from flask import send_from_directory
+    from common.profiling import profiler
+    
+    return send_from_directory(os.path.abspath(profiler.output_dir), filename, mimetype='text/plain')
+
+
+@dashboard_api.route('/metrics-hub', methods=['GET'])
+def get_metrics_hub_stats():
+    """Get Socket.IO metrics hub topics, subscribers and build counters."""
+    return jsonify({
+        'success': True,
+        'hub': metrics_hub.get_stats()
+    })
@@ -109,17 +109,19 @@ def get_setup_data() -> Dict[str, Any]:
     """
     try:
         # Import necessary services
-        from features.setups.service import get_active_setups
+        from common.timezone import get_central_trading_day
+        from features.parsing.store import get_parsing_store
         from features.strategy.monitor import get_active_signals
         
-        # Get active setups
-        setups = get_active_setups()
+        # Active setups of the current trading day, from the shared snapshot
+        snapshot = get_parsing_store().get_setup_snapshot(get_central_trading_day())
+        setups = snapshot.to_dicts()
         
         # Get active signals
         signals = get_active_signals()
         
         # Get active tickers
-        tickers = list(set([setup['symbol'] for setup in setups]))
+        tickers = snapshot.tickers
         
         # Get market data for active tickers
         from features.market.api import get_latest_prices
@@ -3,55 +3,90 @@ Discord Bot API Endpoints
 
 Provides live metrics and status endpoints for the Discord bot slice.
 Stays within vertical slice boundaries - only exposes Discord bot data.
+
+When the bot runs in the ingest process (launcher.py), that process publishes
+the bot metrics through common.metrics.process_state; the metrics and status
+endpoints serve them here, while a manual history sync needs the bot itself.
 """
 from flask import Blueprint, jsonify, current_app, request
 import logging
-import asyncio
 from datetime import datetime
 
+from common.async_runtime import runtime
+from common.metrics import metrics_hub
+from common.metrics.process_state import process_state
+
 logger = logging.getLogger(__name__)
 
+# Seconds a manual history sync may run before the request gives up
+SYNC_TIMEOUT = 120.0
+
 discord_api_bp = Blueprint('discord_api', __name__, url_prefix='/api/discord')
 
 
+def collect_discord_metrics():
+    """
+    Collect live counters from the bot instance.
+    
+    Without a bot in this process, the metrics published by the process
+    running it are returned, with its name and publish time.
+    
+    Returns:
+        Dict of bot metrics, or None if no process runs the bot
+    """
+    bot = current_app.config.get('DISCORD_BOT')
+    if not bot:
+        published = process_state.latest('discord')
+        if not published:
+            return None
+        return {**published['state'], 'process': published['instance'], 'reported_at': published['updated_at']}
+    
+    latency_ms = None
+    if bot.latency is not None and not (isinstance(bot.latency, float) and (bot.latency != bot.latency)):  # Check for NaN
+        try:
+            latency_ms = round(bot.latency * 1000)
+        except (ValueError, TypeError):
+            latency_ms = None
+    
+    return {
+        'connected': bot.is_ready(),
+        'latency_ms': latency_ms,
+        'live_messages_today': bot._messages_today,
+        'triggers_today': bot._triggers_today,
+        'uptime_seconds': bot.get_uptime_seconds(),
+        'target_channel_id': bot.aplus_setups_channel_id,
+        'last_reset_date': bot._last_reset_date.isoformat() if bot._last_reset_date else None,
+        'storage_errors_today': getattr(bot, '_storage_errors_today', 0),
+        'user': str(bot.user) if bot.user else None
+    }
+
+
+def _discord_metrics_payload():
+    return collect_discord_metrics() or {
+        'error': 'Discord bot not initialized',
+        'connected': False,
+        'live_messages_today': 0,
+        'triggers_today': 0,
+        'latency_ms': None
+    }
+
+
+# Pushed to dashboards over Socket.IO; the bot marks the topic changed on every message
+metrics_hub.register('discord', _discord_metrics_payload, interval=5.0)
+
+
 @discord_api_bp.route('/metrics', methods=['GET'])
 def get_discord_metrics():
     """
     Get live Discord bot metrics.
     
-    Returns real-time counters from the bot instance without database dependency.
-    This ensures metrics show actual bot activity regardless of storage issues.
+    Returns real-time counters from the bot instance without database dependency,
+    or the counters published by the ingest process when the bot runs there.
     """
     try:
-        # Get bot instance from app config
-        bot = current_app.config.get('DISCORD_BOT')
-        
-        if not bot:
-            return jsonify({
-                'error': 'Discord bot not initialized',
-                'connected': False,
-                'live_messages_today': 0,
-                'triggers_today': 0,
-                'latency_ms': None
-            }), 503
-        
-        # Collect live metrics from bot instance
-        latency_ms = None
-        if bot.latency is not None and not (isinstance(bot.latency, float) and (bot.latency != bot.latency)):  # Check for NaN
-            try:
-                latency_ms = round(bot.latency * 1000)
-            except (ValueError, TypeError):
-                latency_ms = None
-        
-        metrics = {
-            'connected': bot.is_ready(),
-            'latency_ms': latency_ms,
-            'live_messages_today': bot._messages_today,
-            'triggers_today': bot._triggers_today,
-            'uptime_seconds': bot.get_uptime_seconds(),
-            'target_channel_id': bot.aplus_setups_channel_id,
-            'last_reset_date': bot._last_reset_date.isoformat() if bot._last_reset_date else None
-        }
+        metrics = collect_discord_metrics()
+        if metrics is None:
+            return jsonify(_discord_metrics_payload()), 503
         
         return jsonify(metrics)
         
@@ -73,7 +108,16 @@ def get_discord_status():
         bot = current_app.config.get('DISCORD_BOT')
         
         if not bot:
-            return jsonify({'status': 'not_initialized'}), 503
+            published = collect_discord_metrics()
+            if not published:
+                return jsonify({'status': 'not_initialized'}), 503
+            return jsonify({
+                'status': 'connected' if published.get('connected') else 'disconnected',
+                'user': published.get('user'),
+                'latency_ms': published.get('latency_ms'),
+                'uptime_seconds': published.get('uptime_seconds', 0),
+                'process': published.get('process')
+            })
         
         # Handle latency safely
         latency_ms = None
@@ -108,9 +152,14 @@ def sync_message_history():
         bot = current_app.config.get('DISCORD_BOT')
         
         if not bot:
+            # The sync needs the bot's client, which lives in the process hosting the ingest role
+            published = process_state.latest('discord')
             return jsonify({
                 'success': False,
-                'error': 'Discord bot not initialized'
+                'error': (
+                    f"Discord bot runs in process {published['instance']}; run the sync there"
+                    if published else 'Discord bot not initialized'
+                )
             }), 503
             
         if not bot.is_ready():
@@ -145,24 +194,14 @@ def sync_message_history():
             source="discord_bot"
         )
         
-        # Use SocketIO background task instead of new event loop
-        from flask import current_app
-        socketio = current_app.extensions.get('socketio')
-        
-        if socketio:
-            # Run async operation in background task
-            def sync_task():
-                try:
-                    result = asyncio.run(bot._manual_sync_history(limit=limit, before_id=before_id))
-                    return result
-                except Exception as e:
-                    logger.error(f"Background sync task failed: {e}")
-                    return {"error": str(e), "synced": 0}
-            
-            result = socketio.start_background_task(sync_task)
-        else:
-            # Fallback to asyncio.run for environments without SocketIO
-            result = asyncio.run(bot._manual_sync_history(limit=limit, before_id=before_id))
+        # The bot's HTTP session belongs to the shared async runtime loop, so run the sync there
+        try:
+            result = runtime.run(
+                bot._manual_sync_history(limit=limit, before_id=before_id), timeout=SYNC_TIMEOUT
+            )
+        except Exception as e:
+            logger.error(f"Manual sync failed: {e}")
+            result = {"error": str(e), "synced": 0}
         
         # Publish completion event
         publish_event_safe(
@@ -18,6 +18,7 @@ from .config.settings import (
 from features.discord_bot.services.correlation_service import DiscordCorrelationService
 # PostgreSQL event system - imports handled in methods
 from features.ingestion.service import IngestionService
+from common.metrics import metrics_hub, pipeline_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -174,6 +175,9 @@ class TradingDiscordBot(discord.Client):
         
         # Count all messages in target channel (live metrics)
         self._messages_today += 1
+        pipeline_metrics.mark_posted(message.id, message.created_at)
+        pipeline_metrics.mark(message.id, 'discord_received')
+        metrics_hub.notify_changed('discord')
         
         # Count trigger messages separately
         if self._is_trigger_message(message):
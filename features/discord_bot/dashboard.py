@@ -16,12 +16,32 @@ discord_bp = Blueprint('discord_dashboard', __name__,
                        url_prefix='/dashboard/discord')
 
 def get_bot_metrics():
-    """Get bot metrics directly from the bot instance in app config."""
+    """Get bot metrics from the bot instance in app config, or as published by the process running it."""
     try:
         from flask import current_app
         bot = current_app.config.get('DISCORD_BOT')
         
         if not bot:
+            # The bot may run in the ingest process, which publishes its metrics
+            from .api import collect_discord_metrics
+            published = collect_discord_metrics()
+            if published:
+                connected = bool(published.get('connected'))
+                return {
+                    'status': 'connected' if connected else 'disconnected',
+                    'uptime_seconds': published.get('uptime_seconds', 0),
+                    'messages_processed_today': published.get('live_messages_today', 0),
+                    'messages_per_minute': 0,
+                    'channels_monitored': 1 if published.get('target_channel_id') else 0,
+                    'error_count_last_hour': published.get('storage_errors_today', 0),
+                    'storage_errors_today': published.get('storage_errors_today', 0),
+                    'last_storage_error': None,
+                    'last_activity': published.get('reported_at'),
+                    'connection_attempts': 1,
+                    'successful_connections': 1 if connected else 0,
+                    'last_ready': published.get('reported_at') if connected else None,
+                    'error_message': None
+                }
             return {
                 'status': 'disconnected',
                 'uptime_seconds': 0,
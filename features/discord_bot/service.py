@@ -12,6 +12,7 @@ from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 
 # Legacy import removed - now using PostgreSQL NOTIFY events only
+from common.metrics import pipeline_metrics
 from common.models import DiscordMessageDTO
 
 logger = logging.getLogger(__name__)
@@ -92,7 +93,9 @@ class BotService:
                         "channel_name": message_dto.channel_name,
                         "attachments": message_dto.attachments,
                         "embeds": message_dto.embeds
-                    }
+                    },
+                    # Stage times for the parsing listener's latency trace
+                    "pipeline": pipeline_metrics.handoff(message_dto.message_id, keep=True)
                 },
                 channel="events",
                 source="discord_bot"
@@ -6,7 +6,7 @@ the complete ingestion and parsing pipeline.
 """
 import uuid
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 from common.events.constants import EventChannels, EventTypes
@@ -294,4 +294,39 @@ class DiscordCorrelationService:
                 'flow': [],
                 'status': 'error',
                 'error': str(e)
-            }
\ No newline at end of file
+            }
+    
+    @staticmethod
+    def get_message_correlation_flows(correlation_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get pipeline traces for many Discord messages in one query.
+        
+        Uses the materialized trace table rather than loading every event.
+        
+        Args:
+            correlation_ids: Correlation UUIDs to trace
+            
+        Returns:
+            Dict mapping correlation ID to its trace; unknown IDs get status 'not_found'
+        """
+        try:
+            from common.events.traces import get_traces
+            
+            traces = get_traces(correlation_ids)
+            for correlation_id in correlation_ids:
+                traces.setdefault(correlation_id, {
+                    'correlation_id': correlation_id,
+                    'status': 'not_found'
+                })
+            return traces
+            
+        except Exception as e:
+            logger.error(f"Error getting correlation flows: {e}")
+            return {
+                correlation_id: {
+                    'correlation_id': correlation_id,
+                    'status': 'error',
+                    'error': str(e)
+                }
+                for correlation_id in correlation_ids
+            }
@@ -1,20 +1,41 @@
 """Export API Blueprint
 
-Provides endpoints for downloading ingested Discord messages as JSON
-filtered by channel, author, and date range.
+Provides endpoints for downloading ingested Discord messages filtered by
+channel, author, and date range. Downloads are streamed from a server-side
+cursor as JSON, NDJSON or CSV, or written to a Parquet archive.
 """
-import io
-import json
 import logging
+import tempfile
 from datetime import datetime
-from flask import Blueprint, request, send_file, jsonify
-
-from .service import get_messages
+from flask import Blueprint, Response, request, send_file, jsonify, stream_with_context
+
+from .service import (
+    DEFAULT_CHUNK_SIZE,
+    EXPORT_FORMATS,
+    get_messages,
+    iter_csv,
+    iter_json_array,
+    iter_messages,
+    iter_ndjson,
+    write_parquet,
+)
 
 logger = logging.getLogger(__name__)
 
 export_bp = Blueprint('export_api', __name__, url_prefix='/api/export')
 
+STREAM_MIMETYPES = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+STREAM_ENCODERS = {
+    'json': iter_json_array,
+    'ndjson': iter_ndjson,
+    'csv': iter_csv,
+}
+
 
 def parse_date(value: str) -> datetime | None:
     """Parse ISO date string to datetime."""
@@ -26,28 +47,51 @@ def parse_date(value: str) -> datetime | None:
 
 @export_bp.route('/messages', methods=['GET'])
 def export_messages():
-    """Download messages filtered by query parameters as a JSON file."""
+    """
+    Download messages filtered by query parameters.
+
+    Query parameters:
+        format: json (default), ndjson, csv or parquet
+        limit: Maximum rows to export; 0 exports the whole range
+    """
     channel = request.args.get('channel')
     author = request.args.get('author')
     start_str = request.args.get('start')
     end_str = request.args.get('end')
     limit = int(request.args.get('limit', '1000'))
+    fmt = request.args.get('format', 'json').lower()
+
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f"Unsupported format '{fmt}'", 'formats': list(EXPORT_FORMATS)}), 400
 
     start = parse_date(start_str) if start_str else None
     end = parse_date(end_str) if end_str else None
 
-    messages = get_messages(channel, author, start, end, limit)
-
-    buffer = io.BytesIO()
-    buffer.write(json.dumps(messages, indent=2).encode('utf-8'))
-    buffer.seek(0)
-
-    filename = f"messages_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
-    return send_file(
-        buffer,
-        as_attachment=True,
-        download_name=filename,
-        mimetype='application/json'
+    records = iter_messages(channel, author, start, end, limit, chunk_size=DEFAULT_CHUNK_SIZE)
+    filename = f"messages_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{fmt}"
+
+    if fmt == 'parquet':
+        # Row groups are spooled to disk so the archive never sits in memory
+        archive = tempfile.TemporaryFile()
+        try:
+            count = write_parquet(records, archive)
+        except RuntimeError as e:
+            archive.close()
+            return jsonify({'error': str(e)}), 501
+        archive.seek(0)
+        logger.info(f"Exported {count} messages to {filename}")
+        return send_file(
+            archive,
+            as_attachment=True,
+            download_name=filename,
+            mimetype='application/vnd.apache.parquet'
+        )
+
+    encoder = STREAM_ENCODERS[fmt]
+    return Response(
+        stream_with_context(encoder(records)),
+        mimetype=STREAM_MIMETYPES[fmt],
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
     )
 
 
@@ -1,9 +1,23 @@
 """Simple CLI for exporting messages."""
 import argparse
-import json
+import os
 from datetime import datetime
 
-from .service import get_messages
+from .service import (
+    DEFAULT_CHUNK_SIZE,
+    EXPORT_FORMATS,
+    iter_csv,
+    iter_json_array,
+    iter_messages,
+    iter_ndjson,
+    write_parquet,
+)
+
+TEXT_ENCODERS = {
+    'json': iter_json_array,
+    'ndjson': iter_ndjson,
+    'csv': iter_csv,
+}
 
 
 def parse_date(text: str) -> datetime | None:
@@ -13,25 +27,46 @@ def parse_date(text: str) -> datetime | None:
         return None
 
 
+def infer_format(outfile: str) -> str:
+    """Pick an export format from the output file extension, defaulting to JSON."""
+    extension = os.path.splitext(outfile)[1].lstrip('.').lower()
+    return extension if extension in EXPORT_FORMATS else 'json'
+
+
 def main():
-    parser = argparse.ArgumentParser(description="Export Discord messages to JSON")
+    parser = argparse.ArgumentParser(description="Export Discord messages to JSON, NDJSON, CSV or Parquet")
     parser.add_argument('--channel', help='Channel ID')
     parser.add_argument('--author', help='Author ID')
     parser.add_argument('--start', help='Start datetime (ISO format)')
     parser.add_argument('--end', help='End datetime (ISO format)')
-    parser.add_argument('--limit', type=int, default=1000, help='Max messages')
+    parser.add_argument('--limit', type=int, default=1000, help='Max messages (0 for no limit)')
+    parser.add_argument('--format', choices=EXPORT_FORMATS, help='Output format (default: from file extension)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Rows fetched per cursor batch')
     parser.add_argument('outfile', help='Output file path')
     args = parser.parse_args()
 
     start = parse_date(args.start) if args.start else None
     end = parse_date(args.end) if args.end else None
+    fmt = args.format or infer_format(args.outfile)
+
+    count = 0
+
+    def counted(records):
+        nonlocal count
+        for record in records:
+            count += 1
+            yield record
 
-    messages = get_messages(args.channel, args.author, start, end, args.limit)
+    records = counted(iter_messages(args.channel, args.author, start, end, args.limit, args.chunk_size))
 
-    with open(args.outfile, 'w', encoding='utf-8') as f:
-        json.dump(messages, f, indent=2)
+    if fmt == 'parquet':
+        write_parquet(records, args.outfile, chunk_size=args.chunk_size)
+    else:
+        with open(args.outfile, 'w', encoding='utf-8', newline='') as f:
+            for chunk in TEXT_ENCODERS[fmt](records):
+                f.write(chunk)
 
-    print(f"Exported {len(messages)} messages to {args.outfile}")
+    print(f"Exported {count} messages to {args.outfile}")
 
 
 if __name__ == '__main__':
@@ -1,12 +1,109 @@
+import csv
+import io
+import json
 import logging
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional
 
 from common.db import db
+from common.db.pool import export_timeouts
 from features.ingestion.models import DiscordMessageModel
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round trip from the server-side cursor
+DEFAULT_CHUNK_SIZE = 1000
+
+EXPORT_FORMATS = ('json', 'ndjson', 'csv', 'parquet')
+
+# Columns written by the streaming exporters (raw_data is deliberately excluded)
+EXPORT_COLUMNS = [
+    'id',
+    'message_id',
+    'channel_id',
+    'author_id',
+    'content',
+    'timestamp',
+    'is_forwarded',
+    'is_processed',
+    'has_embeds',
+    'has_attachments',
+    'embed_data',
+    'attachment_data',
+    'created_at',
+    'updated_at',
+]
+
+# Columns holding JSON documents; flattened to strings for CSV and Parquet
+JSON_COLUMNS = ('embed_data', 'attachment_data')
+DATETIME_COLUMNS = ('timestamp', 'created_at', 'updated_at')
+
+
+def _build_query(
+    channel_id: Optional[str] = None,
+    author_id: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: Optional[int] = None,
+):
+    """Build the filtered, timestamp-ordered column query used by every exporter."""
+    columns = [getattr(DiscordMessageModel, name) for name in EXPORT_COLUMNS]
+    query = db.session.query(*columns)
+    if channel_id:
+        query = query.filter(DiscordMessageModel.channel_id == str(channel_id))
+    if author_id:
+        query = query.filter(DiscordMessageModel.author_id == str(author_id))
+    if start:
+        query = query.filter(DiscordMessageModel.timestamp >= start)
+    if end:
+        query = query.filter(DiscordMessageModel.timestamp <= end)
+    query = query.order_by(DiscordMessageModel.timestamp.asc(), DiscordMessageModel.id.asc())
+    if limit:
+        query = query.limit(limit)
+    return query
+
+
+def _row_to_dict(row) -> Dict[str, Any]:
+    """Convert a column row into the same shape as ``DiscordMessageModel.to_dict``."""
+    record = dict(zip(EXPORT_COLUMNS, row))
+    for name in DATETIME_COLUMNS:
+        value = record.get(name)
+        record[name] = value.isoformat() if value else None
+    return record
+
+
+def iter_messages(
+    channel_id: Optional[str] = None,
+    author_id: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream messages matching the filters using a server-side cursor.
+
+    Rows are fetched ``chunk_size`` at a time and never materialised as ORM
+    objects, so memory stays flat regardless of how many rows match. The
+    transaction runs with the export timeouts rather than the pool profile's,
+    which would cancel a long download partway through.
+
+    Args:
+        channel_id: Optional channel filter
+        author_id: Optional author filter
+        start: Optional lower bound on message timestamp
+        end: Optional upper bound on message timestamp
+        limit: Optional maximum number of rows (None or 0 for no limit)
+        chunk_size: Rows fetched per cursor round trip
+
+    Yields:
+        Dict[str, Any]: One message dictionary per row
+    """
+    query = _build_query(channel_id, author_id, start, end, limit)
+    export_timeouts(db.session)
+    for row in query.yield_per(chunk_size):
+        yield _row_to_dict(row)
+
 
 def get_messages(
     channel_id: Optional[str] = None,
@@ -17,20 +114,139 @@ def get_messages(
 ) -> List[Dict[str, any]]:
     """Retrieve messages filtered by channel, author, and date range."""
     try:
-        query = db.session.query(DiscordMessageModel)
-        if channel_id:
-            query = query.filter(DiscordMessageModel.channel_id == str(channel_id))
-        if author_id:
-            query = query.filter(DiscordMessageModel.author_id == str(author_id))
-        if start:
-            query = query.filter(DiscordMessageModel.timestamp >= start)
-        if end:
-            query = query.filter(DiscordMessageModel.timestamp <= end)
-        query = query.order_by(DiscordMessageModel.timestamp.asc())
-        if limit:
-            query = query.limit(limit)
-        messages = query.all()
-        return [m.to_dict() for m in messages]
+        return list(iter_messages(channel_id, author_id, start, end, limit))
     except Exception as e:
         logger.error(f"Error exporting messages: {e}")
         return []
+
+
+def iter_json_array(records: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """
+    Encode records as a single JSON array, one element at a time.
+
+    Args:
+        records: Message dictionaries
+
+    Yields:
+        str: Chunks of the JSON document
+    """
+    yield '['
+    first = True
+    for record in records:
+        yield ('' if first else ',') + '\n' + json.dumps(record, default=str)
+        first = False
+    yield '\n]\n'
+
+
+def iter_ndjson(records: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """
+    Encode records as newline-delimited JSON.
+
+    Args:
+        records: Message dictionaries
+
+    Yields:
+        str: One JSON line per record
+    """
+    for record in records:
+        yield json.dumps(record, default=str) + '\n'
+
+
+def _flatten_json_columns(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Serialize nested JSON columns so they fit in a flat row."""
+    flat = dict(record)
+    for name in JSON_COLUMNS:
+        value = flat.get(name)
+        flat[name] = json.dumps(value, default=str) if value is not None else None
+    return flat
+
+
+def iter_csv(records: Iterable[Dict[str, Any]], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Encode records as CSV with a header row.
+
+    Args:
+        records: Message dictionaries
+        chunk_size: Rows buffered before a chunk is emitted
+
+    Yields:
+        str: CSV text chunks
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, extrasaction='ignore')
+    writer.writeheader()
+    pending = 0
+    for record in records:
+        writer.writerow(_flatten_json_columns(record))
+        pending += 1
+        if pending >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+    remaining = buffer.getvalue()
+    if remaining:
+        yield remaining
+
+
+def _parquet_schema(pa):
+    """Arrow schema for exported messages."""
+    return pa.schema([
+        ('id', pa.int64()),
+        ('message_id', pa.string()),
+        ('channel_id', pa.string()),
+        ('author_id', pa.string()),
+        ('content', pa.string()),
+        ('timestamp', pa.string()),
+        ('is_forwarded', pa.bool_()),
+        ('is_processed', pa.bool_()),
+        ('has_embeds', pa.bool_()),
+        ('has_attachments', pa.bool_()),
+        ('embed_data', pa.string()),
+        ('attachment_data', pa.string()),
+        ('created_at', pa.string()),
+        ('updated_at', pa.string()),
+    ])
+
+
+def write_parquet(
+    records: Iterable[Dict[str, Any]],
+    target: BinaryIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Write records to a Parquet file, one row group per chunk.
+
+    Requires the optional ``pyarrow`` dependency.
+
+    Args:
+        records: Message dictionaries
+        target: Path or writable binary file object
+        chunk_size: Rows per row group
+
+    Returns:
+        int: Number of rows written
+
+    Raises:
+        RuntimeError: If pyarrow is not installed
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Parquet export requires pyarrow; install the 'export' extra") from e
+
+    schema = _parquet_schema(pa)
+    total = 0
+    batch: List[Dict[str, Any]] = []
+    with pq.ParquetWriter(target, schema, compression='snappy') as writer:
+        for record in records:
+            batch.append(_flatten_json_columns(record))
+            if len(batch) >= chunk_size:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                total += len(batch)
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            total += len(batch)
+    return total
@@ -8,23 +8,14 @@ Monitors ingestion metrics and logs warnings for critical conditions:
 """
 import logging
 from datetime import datetime, timedelta
-import pytz
+
+from common.market_calendar import market_calendar
 
 logger = logging.getLogger(__name__)
 
 def is_trading_hours():
-    """Check if current time is within trading hours (9:30 AM - 4:00 PM ET)."""
-    et_tz = pytz.timezone('US/Eastern')
-    now_et = datetime.now(et_tz)
-    
-    # Monday = 0, Sunday = 6
-    if now_et.weekday() >= 5:  # Weekend
-        return False
-    
-    trading_start = now_et.replace(hour=9, minute=30, second=0, microsecond=0)
-    trading_end = now_et.replace(hour=16, minute=0, second=0, microsecond=0)
-    
-    return trading_start <= now_et <= trading_end
+    """Check if the regular session is open (9:30 AM ET to the close, holidays excluded)."""
+    return market_calendar.is_open()
 
 def check_ingestion_alerts(metrics):
     """
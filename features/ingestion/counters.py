@@ -0,0 +1,196 @@
+"""
+Ingestion Counters
+
+Process-wide ingestion counters for the dashboards. They are seeded from one
+aggregate query over discord_messages, bumped on every insert, and reconciled
+against the database every few minutes (other processes and deletes also
+change the table), so reading metrics never runs COUNT(*) per request.
+
+When ingestion runs in its own process (launcher.py), that process publishes
+its counters through common.metrics.process_state and the web process reads
+them with ``current_ingestion_counters``.
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import case, func
+
+from common.db import db
+from common.metrics import LatencyHistogram
+from common.metrics.process_state import process_state
+from common.process_roles import role_enabled
+from .models import DiscordMessageModel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RECONCILE_SECONDS = 300
+
+
+def _utc_day_start(now: Optional[datetime] = None) -> datetime:
+    now = now or datetime.utcnow()
+    return now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class IngestionCounters:
+    """Thread-safe stored-message counters with periodic DB reconciliation."""
+
+    def __init__(self, reconcile_seconds: float = DEFAULT_RECONCILE_SECONDS):
+        """
+        Initialize the counters.
+
+        Args:
+            reconcile_seconds: Seconds between reconciliations against the database
+        """
+        self.reconcile_seconds = reconcile_seconds
+        self._lock = threading.Lock()
+        self.total_stored = 0
+        self.stored_today = 0
+        self.last_stored_at: Optional[datetime] = None
+        self.stored_since_start = 0
+        self.duplicates_skipped = 0
+        self.validation_failures = 0
+        self.errors = 0
+        self.queue_depth = 0
+        self.processing = LatencyHistogram()
+        self._day = _utc_day_start()
+        self._seeded_at: Optional[float] = None
+        self.reconciliations = 0
+        self.last_drift = 0
+
+    def _roll_day(self) -> None:
+        day = _utc_day_start()
+        if day != self._day:
+            self._day = day
+            self.stored_today = 0
+
+    def seed(self) -> bool:
+        """
+        Load totals from one aggregate query. Requires an application context.
+
+        Returns:
+            bool: True if the counters were loaded
+        """
+        day_start = _utc_day_start()
+        try:
+            total, today, latest = db.session.query(
+                func.count(DiscordMessageModel.id),
+                func.coalesce(func.sum(case((DiscordMessageModel.created_at >= day_start, 1), else_=0)), 0),
+                func.max(DiscordMessageModel.created_at)
+            ).one()
+        except Exception as e:
+            logger.error(f"Error seeding ingestion counters: {e}")
+            return False
+
+        with self._lock:
+            if self._seeded_at is not None:
+                self.last_drift = int(total) - self.total_stored
+                self.reconciliations += 1
+            self._day = day_start
+            self.total_stored = int(total)
+            self.stored_today = int(today)
+            self.last_stored_at = latest
+            self._seeded_at = time.monotonic()
+        if self.last_drift:
+            logger.info(f"Ingestion counters reconciled, drift {self.last_drift:+d} messages")
+        return True
+
+    def maybe_reconcile(self) -> None:
+        """Seed on first use and re-seed once the reconcile interval has passed."""
+        seeded_at = self._seeded_at
+        if seeded_at is None or time.monotonic() - seeded_at >= self.reconcile_seconds:
+            self.seed()
+
+    def record_stored(self, created_at: Optional[datetime] = None) -> None:
+        """Count one inserted message."""
+        with self._lock:
+            self._roll_day()
+            self.total_stored += 1
+            self.stored_today += 1
+            self.stored_since_start += 1
+            self.last_stored_at = created_at or datetime.now(timezone.utc)
+
+    def record_duplicate(self) -> None:
+        with self._lock:
+            self.duplicates_skipped += 1
+
+    def record_validation_failure(self) -> None:
+        with self._lock:
+            self.validation_failures += 1
+
+    def record_error(self) -> None:
+        with self._lock:
+            self.errors += 1
+
+    def record_processing(self, seconds: float) -> None:
+        """Record the wall time of one process_message call."""
+        self.processing.record(seconds)
+
+    def enqueue(self, count: int = 1) -> None:
+        """Mark messages as accepted but not yet processed."""
+        with self._lock:
+            self.queue_depth += count
+
+    def dequeue(self, count: int = 1) -> None:
+        with self._lock:
+            self.queue_depth = max(0, self.queue_depth - count)
+
+    def reset(self) -> None:
+        """Zero the stored-message counters, e.g. after the table was cleared."""
+        with self._lock:
+            self.total_stored = 0
+            self.stored_today = 0
+            self.last_stored_at = None
+            self._seeded_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get counter values, reconciling first if due. Requires an application context.
+
+        Returns:
+            Dict of counters and processing-time statistics in milliseconds
+        """
+        self.maybe_reconcile()
+        timings = self.processing.snapshot((0.5, 0.95))
+        with self._lock:
+            self._roll_day()
+            return {
+                'total_stored': self.total_stored,
+                'stored_today': self.stored_today,
+                'last_stored_at': self.last_stored_at.isoformat() if self.last_stored_at else None,
+                'stored_since_start': self.stored_since_start,
+                'duplicates_skipped': self.duplicates_skipped,
+                'validation_failures': self.validation_failures,
+                'errors': self.errors,
+                'queue_depth': self.queue_depth,
+                'processing_count': timings['count'],
+                'avg_processing_time_ms': timings['mean_ms'],
+                'p50_processing_time_ms': timings['p50_ms'],
+                'p95_processing_time_ms': timings['p95_ms'],
+                'reconciliations': self.reconciliations,
+                'last_drift': self.last_drift
+            }
+
+
+# Shared by every IngestionService instance in this process
+ingestion_counters = IngestionCounters()
+
+
+def current_ingestion_counters() -> Dict[str, Any]:
+    """
+    Get the counters of the process that runs ingestion. Requires an application context.
+
+    A process without the ingest role reads the counters published by the
+    ingest process, and falls back to its own (seeded from the database) when
+    none were published recently.
+
+    Returns:
+        Dict in the shape of ``IngestionCounters.snapshot``
+    """
+    if not role_enabled('ingest'):
+        published = process_state.latest('ingestion')
+        if published:
+            return published['state']
+    return ingestion_counters.snapshot()
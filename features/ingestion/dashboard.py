@@ -8,6 +8,7 @@ from flask import Blueprint, render_template, jsonify, request
 from datetime import datetime, timedelta
 import logging
 from common.utils import utc_now
+from common.metrics import metrics_hub
 
 logger = logging.getLogger(__name__)
 
@@ -81,6 +82,17 @@ def overview():
         logger.error(f"Error loading ingestion dashboard: {e}")
         return render_template('ingest/error.html', error=str(e)), 500
 
+def _ingestion_metrics_payload():
+    """Payload pushed to the 'ingestion' metrics topic."""
+    service = get_ingestion_service()
+    if not service:
+        return {'error': 'Ingestion service unavailable'}
+    return {'metrics': service.get_metrics()}
+
+
+metrics_hub.register('ingestion', _ingestion_metrics_payload, interval=10.0)
+
+
 @ingest_bp.route('/metrics.json')
 def metrics():
     """API endpoint for ingestion metrics."""
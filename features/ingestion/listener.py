@@ -3,16 +3,21 @@ Ingestion Listener Module
 
 PostgreSQL LISTEN/NOTIFY based listener for cross-feature communication.
 Clean separation between listening and business logic.
+
+Events are consumed through a durable consumer group, so messages published
+while the listener was down are picked up from the events table on restart.
 """
 import asyncio
 import logging
 from typing import Dict, Any, Optional
 from datetime import datetime
 
-from common.events.publisher import listen_for_events
+from common.events.offsets import DurableConsumer
 
 logger = logging.getLogger(__name__)
 
+CONSUMER_GROUP = 'ingestion'
+
 
 class IngestionListener:
     """
@@ -24,6 +29,7 @@ class IngestionListener:
         """Initialize the ingestion listener."""
         self.ingestion_service = ingestion_service
         self.running = False
+        self.consumer: Optional[DurableConsumer] = None
         self.stats = {
             'events_received': 0,
             'events_processed': 0,
@@ -41,8 +47,14 @@ class IngestionListener:
         logger.info("Ingestion listener starting - subscribing to PostgreSQL events channel")
         
         try:
-            # Start PostgreSQL LISTEN/NOTIFY listener
-            await listen_for_events(self._handle_event, "events")
+            # Catch up from the stored offset, then follow PostgreSQL NOTIFY
+            self.consumer = DurableConsumer(
+                CONSUMER_GROUP,
+                self._handle_event,
+                event_types=["discord.message.new"],
+                poll_interval=poll_interval
+            )
+            await self.consumer.run("events")
             
         except Exception as e:
             logger.error(f"Error setting up PostgreSQL listener: {e}")
@@ -51,6 +63,8 @@ class IngestionListener:
     def stop_listening(self):
         """Stop the listener."""
         self.running = False
+        if self.consumer:
+            self.consumer.stop()
         logger.info("Ingestion listener stopped")
 
     async def _handle_event(self, event_type: str, data: Dict[str, Any]) -> bool:
@@ -140,7 +154,10 @@ class IngestionListener:
     
     def get_stats(self) -> Dict[str, Any]:
         """Get current listener statistics."""
-        return self.stats.copy()
+        stats = self.stats.copy()
+        if self.consumer:
+            stats['consumer'] = self.consumer.get_stats()
+        return stats
 
 
 # Global listener instance
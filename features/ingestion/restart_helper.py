@@ -5,42 +5,49 @@ Provides functionality to restart the ingestion listener for watchdog and recove
 """
 import asyncio
 import logging
+import time
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Name of the ingestion listener task on the shared async runtime (see app.start_async_services)
+LISTENER_TASK = "ingestion-listener"
+# Seconds to wait for the supervisor to bring a fresh listener up
+RESTART_TIMEOUT = 30.0
+
+
 async def restart_ingestion_listener() -> bool:
     """
     Restart the ingestion listener service.
+
+    Stops the current listener and lets the async runtime supervisor start a
+    fresh one, supervising it first if nothing in this process does yet.
     
     Returns:
         bool: True if restart was successful, False otherwise
     """
     try:
-        # Import listener module
+        from common.async_runtime import runtime
         from . import listener
         
         # Stop existing listener if running
-        if hasattr(listener, '_global_listener') and listener._global_listener:
-            if hasattr(listener._global_listener, 'running') and listener._global_listener.running:
-                logger.info("Stopping existing ingestion listener")
-                listener._global_listener.stop_listening()
-                await asyncio.sleep(2)  # Allow cleanup time
+        if listener._global_listener and listener._global_listener.running:
+            logger.info("Stopping existing ingestion listener")
+            listener.stop_ingestion_listener()
         
-        # Start fresh listener
         logger.info("Starting fresh ingestion listener")
-        await listener.start_ingestion_listener()
+        runtime.supervise(LISTENER_TASK, listener.start_ingestion_listener)
         
         # Verify it started
-        await asyncio.sleep(2)
-        stats = listener.get_listener_stats()
-        
-        if stats.get('status') != 'not_running':
-            logger.info("Ingestion listener restart successful")
-            return True
-        else:
-            logger.error("Failed to restart ingestion listener")
-            return False
+        deadline = time.monotonic() + RESTART_TIMEOUT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(1)
+            if listener.get_listener_stats().get('status') != 'not_running':
+                logger.info("Ingestion listener restart successful")
+                return True
+
+        logger.error("Failed to restart ingestion listener")
+        return False
             
     except Exception as e:
         logger.error(f"Error during ingestion listener restart: {e}")
@@ -53,19 +60,14 @@ def restart_listener() -> bool:
     Returns:
         bool: True if restart was successful, False otherwise
     """
+    from common.async_runtime import runtime
+
     try:
-        # Get or create event loop
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # If we're in an async context, create a task
-                task = loop.create_task(restart_ingestion_listener())
-                return True  # Return immediately, check status later
-            else:
-                return loop.run_until_complete(restart_ingestion_listener())
-        except RuntimeError:
-            # No event loop exists, create one
-            return asyncio.run(restart_ingestion_listener())
+        if runtime.in_runtime():
+            # Called from a coroutine on the runtime loop: restart in the background
+            runtime.spawn(restart_ingestion_listener())
+            return True
+        return runtime.run(restart_ingestion_listener(), timeout=RESTART_TIMEOUT + 5)
     except Exception as e:
         logger.error(f"Failed to restart listener: {e}")
-        return False
\ No newline at end of file
+        return False
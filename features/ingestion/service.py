@@ -5,15 +5,20 @@ Orchestrates message ingestion workflow: validation -> storage -> event publishi
 Focuses on business logic coordination without direct validation or storage implementation.
 """
 import logging
+import time
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 
 # PostgreSQL event system - imports handled in methods
 from common.models import DiscordMessageDTO
+from common.metrics import pipeline_metrics
+from common.process_roles import role_enabled
+from common.profiling import profiled
 from .validator import MessageValidator, ValidationResult
 from .store import MessageStore
 from .processor import MessageProcessor
+from .counters import current_ingestion_counters, ingestion_counters
 
 logger = logging.getLogger(__name__)
 
@@ -54,17 +59,21 @@ class IngestionService:
         Returns:
             True if message was processed successfully
         """
+        pipeline_metrics.mark(message_dto.message_id, 'ingestion_started')
+        started = time.perf_counter()
         try:
             # Check if already processed
             if message_dto.message_id in self._processed_messages:
                 logger.debug(f"Message {message_dto.message_id} already processed, skipping")
                 self.duplicates_skipped += 1
+                ingestion_counters.record_duplicate()
                 return True
                 
             # Validate message using consolidated validator
             validation_result = self.validator.validate_message_dto(message_dto)
             if not validation_result.is_valid:
                 logger.warning(f"Message {message_dto.message_id} validation failed: {validation_result.error_message}")
+                ingestion_counters.record_validation_failure()
                 return False
                 
             # Prepare message for storage using processor
@@ -76,6 +85,7 @@ class IngestionService:
             
             # Mark as processed
             self._processed_messages.add(message_dto.message_id)
+            pipeline_metrics.mark(message_dto.message_id, 'message_stored')
             
             # Update metrics
             self.messages_ingested += 1
@@ -97,7 +107,9 @@ class IngestionService:
                     "channel_id": message_dto.channel_id,
                     "content": message_dto.content,
                     "timestamp": message_dto.timestamp.isoformat(),
-                    "processed_at": datetime.now().isoformat()
+                    "processed_at": datetime.now().isoformat(),
+                    # Parsing in another process continues the latency trace from these
+                    "pipeline": pipeline_metrics.handoff(message_dto.message_id, keep=role_enabled("parse"))
                 },
                 channel="events",
                 source="ingestion",
@@ -110,8 +122,12 @@ class IngestionService:
         except Exception as e:
             logger.error(f"Error processing message {message_dto.message_id}: {e}")
             self.ingestion_errors += 1
+            ingestion_counters.record_error()
             return False
+        finally:
+            ingestion_counters.record_processing(time.perf_counter() - started)
             
+    @profiled('ingestion.process_batch')
     async def process_batch(self, messages: List[DiscordMessageDTO]) -> IngestionResult:
         """
         Process a batch of Discord messages.
@@ -128,6 +144,7 @@ class IngestionService:
         errors = 0
         errors_list = []
         
+        ingestion_counters.enqueue(total)
         for message_dto in messages:
             try:
                 if message_dto.message_id in self._processed_messages:
@@ -144,6 +161,8 @@ class IngestionService:
             except Exception as e:
                 errors += 1
                 errors_list.append(f"Error processing message {message_dto.message_id}: {str(e)}")
+            finally:
+                ingestion_counters.dequeue()
                 
         result = IngestionResult(
             total=total,
@@ -368,30 +387,15 @@ class IngestionService:
         Returns:
             Dict containing ingestion metrics
         """
-        try:
-            from features.ingestion.models import DiscordMessageModel
-            from common.db import db
-            
-            # Get actual database counts
-            total_stored = db.session.query(DiscordMessageModel).count()
-            processed_today = db.session.query(DiscordMessageModel)\
-                .filter(DiscordMessageModel.created_at >= datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0))\
-                .count()
-            
-            # Get latest message timestamp
-            latest_message = db.session.query(DiscordMessageModel)\
-                .order_by(DiscordMessageModel.created_at.desc())\
-                .first()
-            last_processed = latest_message.created_at.isoformat() if latest_message else None
-            
-        except Exception as e:
-            logger.error(f"Error querying database metrics: {e}")
-            total_stored = len(self._processed_messages)
-            processed_today = self.messages_ingested
-            last_processed = self.last_ingestion_time.isoformat() if self.last_ingestion_time else None
+        # Counters of the ingesting process, seeded and periodically reconciled from the database
+        counters = current_ingestion_counters()
+        total_stored = counters['total_stored']
+        processed_today = counters['stored_today']
+        last_processed = counters['last_stored_at']
         
-        total_messages = self.messages_ingested + self.ingestion_errors
-        success_rate = 100.0 if total_messages == 0 else (self.messages_ingested / total_messages) * 100
+        failures = counters['validation_failures'] + counters['errors']
+        total_messages = counters['stored_since_start'] + failures
+        success_rate = 100.0 if total_messages == 0 else (counters['stored_since_start'] / total_messages) * 100
         
         # Ensure all numeric values are properly typed
         return {
@@ -405,15 +409,16 @@ class IngestionService:
             'messages_processed_today': int(processed_today),
             'total_messages_stored': int(total_stored),
             'validation_success_rate': float(success_rate),
-            'queue_depth': 0,
-            'avg_processing_time_ms': 25,
-            'validation_failures_today': int(self.ingestion_errors),
+            'queue_depth': int(counters['queue_depth']),
+            'avg_processing_time_ms': round(counters['avg_processing_time_ms'] or 0, 1),
+            'p95_processing_time_ms': round(counters['p95_processing_time_ms'] or 0, 1),
+            'validation_failures_today': int(failures),
             'last_processed_message': last_processed,
             # New metrics for uptime and duplicate handling
             'uptime_seconds': self.get_uptime_seconds(),
             'messages_ingested_today': int(processed_today),  # Alias for compatibility
-            'duplicates_skipped': int(self.duplicates_skipped),
-            'duplicates_skipped_today': int(self.duplicates_skipped)
+            'duplicates_skipped': int(counters['duplicates_skipped']),
+            'duplicates_skipped_today': int(counters['duplicates_skipped'])
         }
     
     def clear_all_messages(self) -> int:
@@ -10,6 +10,7 @@ from datetime import datetime
 from sqlalchemy.exc import IntegrityError
 
 from .models import DiscordMessageModel
+from .counters import ingestion_counters
 from common.db import db
 
 logger = logging.getLogger(__name__)
@@ -57,6 +58,7 @@ class MessageStore:
             # Insert into database
             db.session.add(message_model)
             db.session.commit()
+            ingestion_counters.record_stored(message_model.created_at)
             
             logger.debug(f"Successfully inserted message {message.get('id')}")
             return True
@@ -181,6 +183,7 @@ class MessageStore:
             # Delete all messages
             DiscordMessageModel.query.delete()
             db.session.commit()
+            ingestion_counters.reset()
             
             logger.info(f"Cleared {count} messages from database")
             return count
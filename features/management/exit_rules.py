@@ -13,21 +13,69 @@ from datetime import datetime, timedelta
 import time
 import threading
 
-from flask import current_app
+from sqlalchemy import column, select, table
+from sqlalchemy.sql import Select
+
+from common.async_runtime import runtime
 from common.db import db
-from common.db_models import (
-    PositionModel, OrderModel, SignalModel, NotificationModel,
-    OptionsContractModel, MarketDataModel, TickerSetupModel, BiasModel
-)
 from common.events import publish_event
+from common.events.publisher import listen_for_events
 from common.events.constants import EventTypes
-from features.management.position_manager import get_position, close_position, close_position_partial
+from common.profiling import profiled
+from features.market.models import MarketDataModel
+from features.notifications.models import NotificationModel
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Supervised task feeding bar closes (market.candle.closed on "events") into the engine
+PRICE_LISTENER_TASK = "exit-rules-prices"
+# Only the finest polled bars are used as prices; coarser bars close later with older closes
+PRICE_TIMEFRAME = "1Min"
+
+# Lightweight views of the strategy tables; the rules only read a few columns
+_ticker_setups = table('ticker_setups', column('id'), column('symbol'))
+_signals = table('signals', column('ticker_setup_id'), column('targets'), column('created_at'))
+_biases = table('biases', column('id'), column('ticker_setup_id'), column('created_at'))
+_bias_flips = table('bias_flips', column('bias_id'), column('direction'), column('price_level'))
+
+def latest_per_symbol(query: Select, symbol_column, order_column) -> Dict[str, Any]:
+    """
+    Run a query and keep the newest row per symbol.
+
+    PostgreSQL does the reduction with DISTINCT ON (symbol); other dialects
+    return every row in the same order and the first one per symbol is kept.
+
+    Args:
+        query: Select whose rows expose a ``symbol`` attribute
+        symbol_column: Column to group by
+        order_column: Column whose highest value marks the newest row
+
+    Returns:
+        Dict mapping symbol to its newest row
+    """
+    if db.session.get_bind().dialect.name == 'postgresql':
+        query = query.distinct(symbol_column)
+    rows = db.session.execute(query.order_by(symbol_column, order_column.desc()))
+    latest: Dict[str, Any] = {}
+    for row in rows:
+        latest.setdefault(row.symbol, row)
+    return latest
+
+def _underlying(symbol: str) -> str:
+    """Extract the underlying from an option symbol (e.g. "SPY" from "SPY 05/17 400C")."""
+    return symbol.split()[0] if " " in symbol else symbol
+
 class ExitRule:
     """Base class for exit rules."""
+    def prepare(self, underlyings: List[str]) -> None:
+        """Preload per-underlying data for a batch evaluation pass (optional)."""
+        pass
+
+    def reset(self) -> None:
+        """Drop data preloaded by prepare()."""
+        pass
+
     def should_exit(self, position: Dict[str, Any], market_data: Dict[str, Any]) -> Tuple[bool, str]:
         """Check if position should be exited based on this rule."""
         raise NotImplementedError("Subclasses must implement should_exit")
@@ -56,19 +104,38 @@ class StopLossRule(ExitRule):
 
 class SignalTargetRule(ExitRule):
     """Exit rule for predefined signal targets."""
+    def __init__(self):
+        self._latest_signals: Optional[Dict[str, Any]] = None
+
+    @staticmethod
+    def load_latest_signals(underlyings: List[str]) -> Dict[str, Any]:
+        """Load the latest signal targets for each underlying in one query."""
+        if not underlyings:
+            return {}
+        query = (
+            select(_ticker_setups.c.symbol, _signals.c.targets)
+            .join(_signals, _signals.c.ticker_setup_id == _ticker_setups.c.id)
+            .where(_ticker_setups.c.symbol.in_(underlyings))
+        )
+        return latest_per_symbol(query, _ticker_setups.c.symbol, _signals.c.created_at)
+
+    def prepare(self, underlyings: List[str]) -> None:
+        """Load the latest signal for every underlying in one DISTINCT ON query."""
+        self._latest_signals = self.load_latest_signals(underlyings)
+
+    def reset(self) -> None:
+        self._latest_signals = None
+
     def should_exit(self, position: Dict[str, Any], market_data: Dict[str, Any]) -> Tuple[bool, str]:
         """Check if position has reached a predefined signal target."""
-        symbol = position.get("symbol", "")
+        underlying = _underlying(position.get("symbol", ""))
         current_price = market_data.get("price", 0)
         
         # Get the latest signal for this symbol
-        signal = (
-            SignalModel.query
-            .join(TickerSetupModel, SignalModel.ticker_setup_id == TickerSetupModel.id)
-            .filter(TickerSetupModel.symbol == symbol.split()[0])  # Extract underlying from option symbol
-            .order_by(SignalModel.created_at.desc())
-            .first()
-        )
+        if self._latest_signals is not None:
+            signal = self._latest_signals.get(underlying)
+        else:
+            signal = self.load_latest_signals([underlying]).get(underlying)
         
         if not signal or not signal.targets:
             return False, ""
@@ -89,36 +156,61 @@ class SignalTargetRule(ExitRule):
 
 class BiasFlipRule(ExitRule):
     """Exit rule for bias flips."""
+    def __init__(self):
+        self._latest_biases: Optional[Dict[str, Any]] = None
+
+    @staticmethod
+    def load_latest_biases(underlyings: List[str]) -> Dict[str, Any]:
+        """Load the latest bias of each underlying with its flip level, in one query."""
+        if not underlyings:
+            return {}
+        query = (
+            select(
+                _ticker_setups.c.symbol,
+                _bias_flips.c.direction.label('flip_direction'),
+                _bias_flips.c.price_level.label('flip_price_level')
+            )
+            .join(_biases, _biases.c.ticker_setup_id == _ticker_setups.c.id)
+            .outerjoin(_bias_flips, _bias_flips.c.bias_id == _biases.c.id)
+            .where(_ticker_setups.c.symbol.in_(underlyings))
+        )
+        return latest_per_symbol(query, _ticker_setups.c.symbol, _biases.c.created_at)
+
+    def prepare(self, underlyings: List[str]) -> None:
+        """Load the latest bias for every underlying in one DISTINCT ON query."""
+        self._latest_biases = self.load_latest_biases(underlyings)
+
+    def reset(self) -> None:
+        self._latest_biases = None
+
     def should_exit(self, position: Dict[str, Any], market_data: Dict[str, Any]) -> Tuple[bool, str]:
         """Check if market bias has flipped against position."""
         symbol = position.get("symbol", "")
         current_price = market_data.get("price", 0)
         position_side = position.get("side")
         
-        # Extract underlying from option symbol (e.g., "SPY" from "SPY 05/17 400C")
-        underlying = symbol.split()[0] if " " in symbol else symbol
+        underlying = _underlying(symbol)
         
         # Get the latest bias for this symbol
-        bias = (
-            BiasModel.query
-            .join(TickerSetupModel, BiasModel.ticker_setup_id == TickerSetupModel.id)
-            .filter(TickerSetupModel.symbol == underlying)
-            .order_by(BiasModel.created_at.desc())
-            .first()
-        )
+        if self._latest_biases is not None:
+            bias = self._latest_biases.get(underlying)
+        else:
+            bias = self.load_latest_biases([underlying]).get(underlying)
         
         if not bias:
             return False, ""
         
-        # Check for bias flip
+        # Check for bias flip (bias_flips.direction is the BULLISH/BEARISH enum)
         if bias.flip_price_level is not None and bias.flip_direction:
+            flip_direction = str(bias.flip_direction).lower()
+            flip_level = float(bias.flip_price_level)
             # Long position with bearish flip
-            if position_side == "long" and bias.flip_direction == "bearish" and current_price <= bias.flip_price_level:
-                return True, f"Bias flipped bearish below {bias.flip_price_level:.2f}"
+            if position_side == "long" and flip_direction == "bearish" and current_price <= flip_level:
+                return True, f"Bias flipped bearish below {flip_level:.2f}"
             
             # Short position with bullish flip
-            if position_side == "short" and bias.flip_direction == "bullish" and current_price >= bias.flip_price_level:
-                return True, f"Bias flipped bullish above {bias.bias_flip.price_level:.2f}"
+            if position_side == "short" and flip_direction == "bullish" and current_price >= flip_level:
+                return True, f"Bias flipped bullish above {flip_level:.2f}"
         
         return False, ""
 
@@ -147,8 +239,17 @@ class TimeBasedRule(ExitRule):
 
 class ExitRulesEngine:
     """Engine to evaluate exit rules and execute position exits."""
-    def __init__(self):
-        """Initialize the exit rules engine with default rules."""
+    def __init__(self, interval: float = 60.0, price_cache_ttl: float = 180.0,
+                 min_event_interval: float = 1.0):
+        """
+        Initialize the exit rules engine with default rules.
+
+        Args:
+            interval: Seconds between evaluation passes when no price updates arrive
+            price_cache_ttl: Seconds a pushed price is trusted before falling back to the DB;
+                1-minute bars arrive up to two minutes after they open
+            min_event_interval: Minimum seconds between passes triggered by price updates
+        """
         self.rules = [
             ProfitTargetRule(target_percent=20.0),
             StopLossRule(stop_percent=-10.0),
@@ -158,49 +259,151 @@ class ExitRulesEngine:
         ]
         self.running = False
         self.thread = None
+        self.interval = interval
+        self.price_cache_ttl = price_cache_ttl
+        self.min_event_interval = min_event_interval
+        self.event_driven = False
+        self._price_cache: Dict[str, Dict[str, Any]] = {}
+        self._price_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self.last_run_at: Optional[datetime] = None
+        self.last_run_duration_ms: Optional[float] = None
     
     def add_rule(self, rule: ExitRule):
         """Add a new exit rule to the engine."""
         self.rules.append(rule)
+
+    def notify_price_update(self, symbol: str, price: float, timestamp: Optional[datetime] = None):
+        """
+        Record a pushed price and, in event-driven mode, wake the exit loop.
+
+        Args:
+            symbol: Underlying symbol
+            price: Latest trade price
+            timestamp: Price timestamp (defaults to now)
+        """
+        with self._price_lock:
+            self._price_cache[symbol] = {
+                "symbol": symbol,
+                "price": price,
+                "timestamp": timestamp or datetime.utcnow(),
+                "received_at": time.monotonic()
+            }
+        if self.event_driven:
+            self._wakeup.set()
+
+    def handle_event(self, event_type: str, data: Dict[str, Any]):
+        """Event handler for listen_for_events that feeds 1-minute bar closes into the engine."""
+        if event_type != EventTypes.CANDLE_CLOSED or data.get("timeframe") != PRICE_TIMEFRAME:
+            return
+        symbol = data.get("ticker") or data.get("symbol")
+        price = data.get("close")
+        if symbol and price is not None:
+            self.notify_price_update(symbol, float(price))
+
+    def load_market_data(self, underlyings: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the latest price for each underlying.
+
+        Fresh pushed prices are used directly; the rest are loaded from
+        market_data with one DISTINCT ON (symbol) query.
+
+        Args:
+            underlyings: Underlying symbols
+
+        Returns:
+            Dict mapping underlying to market data dict (symbol, price, timestamp)
+        """
+        market_data: Dict[str, Dict[str, Any]] = {}
+        cutoff = time.monotonic() - self.price_cache_ttl
+        with self._price_lock:
+            for symbol in underlyings:
+                cached = self._price_cache.get(symbol)
+                if cached and cached["received_at"] >= cutoff:
+                    market_data[symbol] = cached
+
+        missing = [symbol for symbol in underlyings if symbol not in market_data]
+        if missing:
+            query = select(
+                MarketDataModel.symbol, MarketDataModel.price, MarketDataModel.timestamp
+            ).where(MarketDataModel.symbol.in_(missing))
+            latest = latest_per_symbol(query, MarketDataModel.symbol, MarketDataModel.timestamp)
+            for row in latest.values():
+                market_data[row.symbol] = {
+                    "symbol": row.symbol,
+                    "price": row.price,
+                    "timestamp": row.timestamp
+                }
+
+        return market_data
+
+    def _apply_rules(self, position: Dict[str, Any], market_data: Dict[str, Any]) -> List[Tuple[bool, str]]:
+        results = []
+        for rule in self.rules:
+            should_exit, reason = rule.should_exit(position, market_data)
+            if should_exit:
+                results.append((True, reason))
+        return results
     
     def evaluate_position(self, position: Dict[str, Any]) -> List[Tuple[bool, str]]:
         """Evaluate a position against all exit rules."""
         if not position:
             return []
         
-        symbol = position.get("symbol", "")
-        
         # Get latest market data for the symbol
-        underlying = symbol.split()[0] if " " in symbol else symbol
-        market_data = MarketDataModel.query.filter_by(symbol=underlying).order_by(MarketDataModel.timestamp.desc()).first()
+        underlying = _underlying(position.get("symbol", ""))
+        market_data = self.load_market_data([underlying]).get(underlying)
         
         if not market_data:
             return []
         
-        market_data_dict = {
-            "symbol": market_data.symbol,
-            "price": market_data.price,
-            "timestamp": market_data.timestamp
-        }
-        
         # Evaluate each rule
-        results = []
+        return self._apply_rules(position, market_data)
+
+    def evaluate_positions(self, positions: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], List[Tuple[bool, str]]]]:
+        """
+        Evaluate all positions against all rules in one pass.
+
+        Prices and per-rule data (latest signal, latest bias) are loaded once
+        for every held underlying instead of once per position.
+
+        Args:
+            positions: Position dictionaries
+
+        Returns:
+            List of (position, exit results) for positions with market data
+        """
+        underlyings = sorted({_underlying(p.get("symbol", "")) for p in positions if p})
+        if not underlyings:
+            return []
+
+        market_data = self.load_market_data(underlyings)
         for rule in self.rules:
-            should_exit, reason = rule.should_exit(position, market_data_dict)
-            if should_exit:
-                results.append((True, reason))
-        
-        return results
+            rule.prepare(underlyings)
+
+        try:
+            evaluated = []
+            for position in positions:
+                if not position:
+                    continue
+                data = market_data.get(_underlying(position.get("symbol", "")))
+                if data:
+                    evaluated.append((position, self._apply_rules(position, data)))
+            return evaluated
+        finally:
+            for rule in self.rules:
+                rule.reset()
     
+    @profiled('management.exit_rules.process_exits')
     def process_exits(self):
         """Process exits for all open positions."""
-        from features.management.position_manager import get_all_positions
+        from features.management.position_manager import close_position, get_all_positions
         
         positions = get_all_positions()
+        notifications = []
+        exit_events = []
         
-        for position in positions:
-            exit_results = self.evaluate_position(position)
-            
+        for position, exit_results in self.evaluate_positions(positions):
             # If any exit rule triggers, close the position
             if any(should_exit for should_exit, _ in exit_results):
                 reasons = [reason for _, reason in exit_results if reason]
@@ -225,49 +428,80 @@ class ExitRulesEngine:
                     })
                     notification.read = False
                     notification.created_at = datetime.utcnow()
-                    db.session.add(notification)
-                    db.session.commit()
+                    notifications.append(notification)
                     
-                    # Publish to PostgreSQL event system for real-time updates
-                    exit_event_data = {
+                    exit_events.append({
                         "event_type": EventTypes.TRADE_EXECUTED,
                         "symbol": position["symbol"],
                         "reason": combined_reason,
                         "timestamp": datetime.utcnow().isoformat()
-                    }
-                    publish_event("position_exits", exit_event_data)
+                    })
                 else:
                     logger.error(f"Failed to exit position {position['symbol']}: {result['message']}")
+
+        if notifications:
+            # Insert all exit notifications in one transaction
+            db.session.add_all(notifications)
+            db.session.commit()
+
+        for exit_event_data in exit_events:
+            # Publish to PostgreSQL event system for real-time updates
+            publish_event("position_exits", exit_event_data)
+
+        return len(exit_events)
     
     def run_exit_rules_job(self):
-        """Run the exit rules job continuously."""
+        """Run the exit rules job until stopped, waking early on price updates in event-driven mode."""
         # Import Flask app here to avoid circular imports
         from app import app
         
         while self.running:
+            started = time.monotonic()
             try:
                 # Use Flask application context for database operations
                 with app.app_context():
                     self.process_exits()
             except Exception as e:
                 logger.error(f"Error in exit rules job: {str(e)}")
+            self.last_run_at = datetime.utcnow()
+            self.last_run_duration_ms = (time.monotonic() - started) * 1000
             
-            # Sleep for 60 seconds
-            time.sleep(60)
+            # Wait for the next pass: a price update (event-driven) or the interval
+            self._wakeup.wait(timeout=self.interval)
+            self._wakeup.clear()
+            if self.event_driven and self.running:
+                # Coalesce bursts of price updates into one pass
+                time.sleep(self.min_event_interval)
     
-    def start(self):
-        """Start the exit rules engine."""
+    def start(self, event_driven: bool = False):
+        """
+        Start the exit rules engine.
+
+        Bar closes feed the price cache in both modes.
+
+        Args:
+            event_driven: Re-evaluate on each bar close instead of only every interval
+        """
         if self.running:
             return
         
+        self.event_driven = event_driven
         self.running = True
+        self._wakeup.clear()
+        runtime.supervise(PRICE_LISTENER_TASK, self._listen_for_prices)
         self.thread = threading.Thread(target=self.run_exit_rules_job, daemon=True)
         self.thread.start()
-        logger.info("Exit rules engine started")
+        logger.info(f"Exit rules engine started ({'event-driven' if event_driven else f'every {self.interval:.0f}s'})")
     
+    async def _listen_for_prices(self) -> None:
+        """LISTEN for bar closes until cancelled."""
+        await listen_for_events(self.handle_event, "events")
+
     def stop(self):
         """Stop the exit rules engine."""
         self.running = False
+        self._wakeup.set()
+        runtime.cancel(PRICE_LISTENER_TASK)
         if self.thread:
             self.thread.join(timeout=2.0)
             logger.info("Exit rules engine stopped")
@@ -275,9 +509,9 @@ class ExitRulesEngine:
 # Global exit rules engine instance
 exit_rules_engine = ExitRulesEngine()
 
-def start_exit_rules_engine():
+def start_exit_rules_engine(event_driven: bool = False):
     """Start the exit rules engine."""
-    exit_rules_engine.start()
+    exit_rules_engine.start(event_driven=event_driven)
     return exit_rules_engine
 
 def stop_exit_rules_engine():
@@ -288,6 +522,9 @@ def get_exit_rules_status():
     """Get the status of the exit rules engine."""
     return {
         "running": exit_rules_engine.running,
+        "event_driven": exit_rules_engine.event_driven,
+        "last_run_at": exit_rules_engine.last_run_at.isoformat() if exit_rules_engine.last_run_at else None,
+        "last_run_duration_ms": exit_rules_engine.last_run_duration_ms,
         "rule_count": len(exit_rules_engine.rules),
         "rules": [rule.__class__.__name__ for rule in exit_rules_engine.rules]
     }
@@ -307,7 +544,8 @@ def register_exit_rules_routes(app):
     @exit_rules_routes.route('/api/exit-rules/start', methods=['POST'])
     def start_exit_rules_api():
         """Start the exit rules engine."""
-        start_exit_rules_engine()
+        data = request.get_json(silent=True) or {}
+        start_exit_rules_engine(event_driven=bool(data.get("event_driven", False)))
         return jsonify({
             "success": True,
             "message": "Exit rules engine started"
@@ -0,0 +1,50 @@
+"""
+Management Models Module
+
+Database model for open and closed positions mirrored from Alpaca.
+"""
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import Column, DateTime, Float, Integer, String
+
+from common.db import db
+
+
+class PositionModel(db.Model):
+    """A broker position; closed_at is set once it disappears from Alpaca."""
+    __tablename__ = 'positions'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    symbol = Column(String(32), nullable=False, index=True)
+    quantity = Column(Integer, nullable=False, default=0)
+    avg_entry_price = Column(Float, nullable=True)
+    side = Column(String(10), nullable=False, default='long')
+    market_value = Column(Float, nullable=True)
+    cost_basis = Column(Float, nullable=True)
+    unrealized_pl = Column(Float, nullable=True)
+    unrealized_plpc = Column(Float, nullable=True)
+    current_price = Column(Float, nullable=True)
+    lastday_price = Column(Float, nullable=True)
+    change_today = Column(Float, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=True)
+    closed_at = Column(DateTime, nullable=True, index=True)
+
+    def __repr__(self) -> str:
+        return f"<PositionModel(symbol={self.symbol}, quantity={self.quantity}, closed_at={self.closed_at})>"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert model instance to dictionary."""
+        return {
+            'id': self.id,
+            'symbol': self.symbol,
+            'quantity': self.quantity,
+            'avg_entry_price': self.avg_entry_price,
+            'side': self.side,
+            'market_value': self.market_value,
+            'unrealized_pl': self.unrealized_pl,
+            'unrealized_plpc': self.unrealized_plpc,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'closed_at': self.closed_at.isoformat() if self.closed_at else None
+        }
@@ -22,14 +22,12 @@ import math
 import threading
 from decimal import Decimal
 
-from app import app, db
-from common.db_models import (
-    PositionModel, OrderModel, SignalModel, NotificationModel,
-    OptionsContractModel, MarketDataModel
-)
-from common.events import EventChannels
-from common.db import db, publish_event
-from common.db_models import PositionModel
+from common.async_runtime import runtime
+from common.db import db
+from common.events import EventChannels, EventTypes
+from common.events.publisher import listen_for_events
+from features.management.models import PositionModel
+from features.notifications.models import NotificationModel
 
 # Type variable for SQLAlchemy model instance
 Model = TypeVar('Model')
@@ -84,9 +82,7 @@ def safe_attr(obj: Any, attr_name: str, default: Any = None) -> Any:
 
     return default
 
-from common.utils import format_currency, calculate_risk_reward
-from common.events import publish_event
-from common.event_constants import EventType
+from common.utils import format_currency
 
 # Type alias for SQLAlchemy models
 Model = TypeVar('Model')
@@ -146,105 +142,271 @@ def initialize_position_manager():
         logger.error(f"Error initializing Alpaca Trading client: {str(e)}")
         return False
 
-def get_all_positions() -> List[Dict[str, Any]]:
-    """Get all positions from Alpaca and local database."""
-    positions = []
+# Position fields mirrored from Alpaca into PositionModel rows
+SYNCED_POSITION_FIELDS = (
+    "quantity", "avg_entry_price", "side", "market_value", "cost_basis",
+    "unrealized_pl", "unrealized_plpc", "current_price", "lastday_price", "change_today"
+)
 
-    # Get positions from database
-    db_positions = PositionModel.query.filter_by(closed_at=None).all()
-    for position in db_positions:
-        positions.append({
-            "id": position.id,
-            "symbol": position.symbol,
-            "quantity": position.quantity,
-            "avg_entry_price": position.avg_entry_price,
-            "side": position.side,
-            "market_value": position.market_value,
-            "cost_basis": position.cost_basis,
-            "unrealized_pl": position.unrealized_pl,
-            "unrealized_plpc": position.unrealized_plpc,
-            "current_price": position.current_price,
-            "lastday_price": position.lastday_price,
-            "change_today": position.change_today,
-            "created_at": position.created_at.isoformat() if position.created_at else None
-        })
+def _position_model_to_dict(position: Any) -> Dict[str, Any]:
+    """Convert an open PositionModel row to the position dictionary shape."""
+    return {
+        "id": position.id,
+        "symbol": position.symbol,
+        "quantity": position.quantity,
+        "avg_entry_price": position.avg_entry_price,
+        "side": position.side,
+        "market_value": position.market_value,
+        "cost_basis": position.cost_basis,
+        "unrealized_pl": position.unrealized_pl,
+        "unrealized_plpc": position.unrealized_plpc,
+        "current_price": position.current_price,
+        "lastday_price": position.lastday_price,
+        "change_today": position.change_today,
+        "created_at": position.created_at.isoformat() if position.created_at else None
+    }
+
+def _alpaca_position_values(ap: Any) -> Optional[Dict[str, Any]]:
+    """Extract the synced fields from an Alpaca position, or None if it is unusable."""
+    symbol = safe_attr(ap, 'symbol')
+    if not symbol:
+        logger.warning(f"Position object missing symbol attribute: {ap}")
+        return None
+
+    try:
+        qty_value = safe_attr(ap, 'qty')
+        side_value = safe_attr(ap, 'side', 'long')  # Default to long
+        return {
+            "symbol": str(symbol),
+            "quantity": int(qty_value) if qty_value is not None else 0,
+            "avg_entry_price": safe_float(safe_attr(ap, 'avg_entry_price')),
+            "side": "long" if str(side_value).lower() == "long" else "short",
+            "market_value": safe_float(safe_attr(ap, 'market_value')),
+            "cost_basis": safe_float(safe_attr(ap, 'cost_basis')),
+            "unrealized_pl": safe_float(safe_attr(ap, 'unrealized_pl')),
+            "unrealized_plpc": safe_float(safe_attr(ap, 'unrealized_plpc')),
+            "current_price": safe_float(safe_attr(ap, 'current_price')),
+            "lastday_price": safe_float(safe_attr(ap, 'lastday_price')),
+            "change_today": safe_float(safe_attr(ap, 'change_today')),
+        }
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Error parsing position data for {symbol}: {str(e)}")
+        return None
+
+def _value_changed(old: Any, new: Any) -> bool:
+    """Compare a stored column value with a fresh one, tolerating float noise."""
+    if isinstance(new, float) and old is not None:
+        return not math.isclose(safe_float(old), new, rel_tol=1e-9, abs_tol=1e-9)
+    return old != new
+
+def _load_positions_from_alpaca(db_positions: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Sync Alpaca positions into the database and merge them into db_positions."""
+    alpaca_positions = trading_client.get_all_positions()
+    synced = sync_positions_from_alpaca(alpaca_positions)
+
+    if synced is not None:
+        # Rows now mirror Alpaca; re-read them so ids and created_at are included
+        return {
+            position.symbol: _position_model_to_dict(position)
+            for position in PositionModel.query.filter_by(closed_at=None).all()
+        }
+
+    # Sync failed: fall back to merging Alpaca positions missing from the DB
+    for ap in alpaca_positions:
+        values = _alpaca_position_values(ap)
+        if values and values["symbol"] not in db_positions:
+            db_positions[values["symbol"]] = {**values, "created_at": None}
+    return db_positions
+
+def load_positions() -> Dict[str, Dict[str, Any]]:
+    """
+    Load open positions from the database and Alpaca, keyed by symbol.
+
+    Returns:
+        Dict mapping symbol to position dictionary
+    """
+    positions = {
+        position.symbol: _position_model_to_dict(position)
+        for position in PositionModel.query.filter_by(closed_at=None).all()
+    }
 
     # Get positions from Alpaca if available
     if trading_client:
         try:
-            alpaca_positions = trading_client.get_all_positions()
-            # Sync positions from Alpaca to our database
-            sync_positions_from_alpaca(alpaca_positions)
-
-            # Add any positions from Alpaca that are not in our list
-            for ap in alpaca_positions:
-                # Extract required attributes safely with type checking
-                try:
-                    # Get symbol safely using safe_attr helper
-                    symbol = safe_attr(ap, 'symbol')
-                    if not symbol:
-                        logger.warning(f"Position object missing symbol attribute: {ap}")
-                        continue
-
-                    # Convert to string
-                    symbol = str(symbol)
-
-                    if not any(p["symbol"] == symbol for p in positions):
-                        # Extract and convert other attributes safely
-                        try:
-                            # Extract quantity using helper function
-                            qty_value = safe_attr(ap, 'qty')
-                            qty = int(qty_value) if qty_value is not None else 0
-
-                            # Extract avg_entry_price using helper function
-                            avg_entry_price = safe_float(safe_attr(ap, 'avg_entry_price'))
-
-                            # Extract side using helper function
-                            side_value = safe_attr(ap, 'side', 'long')  # Default to long
-                            side = "long" if str(side_value).lower() == "long" else "short"
-
-                            # Use the module-level safe_float function
-
-                            # Build position dictionary with safe attribute access using helper functions
-                            position_data = {
-                                "symbol": symbol,
-                                "quantity": qty,
-                                "avg_entry_price": avg_entry_price,
-                                "side": side,
-                                "market_value": safe_float(safe_attr(ap, 'market_value')),
-                                "cost_basis": safe_float(safe_attr(ap, 'cost_basis')),
-                                "unrealized_pl": safe_float(safe_attr(ap, 'unrealized_pl')),
-                                "unrealized_plpc": safe_float(safe_attr(ap, 'unrealized_plpc')),
-                                "current_price": safe_float(safe_attr(ap, 'current_price')),
-                                "lastday_price": safe_float(safe_attr(ap, 'lastday_price')),
-                                "change_today": safe_float(safe_attr(ap, 'change_today')),
-                                "created_at": None
-                            }
-
-                            positions.append(position_data)
-                        except Exception as e:
-                            logger.error(f"Error processing position {symbol}: {str(e)}")
-                except Exception as e:
-                    logger.error(f"Error extracting data from Alpaca position: {str(e)}")
+            positions = _load_positions_from_alpaca(positions)
         except Exception as e:
             logger.error(f"Error fetching positions from Alpaca: {str(e)}")
 
     return positions
 
-def sync_positions_from_alpaca(alpaca_positions: Union[List[Position], RawData, List[Any]]) -> None:
+class PositionSnapshotService:
+    """
+    In-memory snapshot of open positions keyed by symbol.
+
+    The snapshot is rebuilt on a schedule and whenever a trade-update event
+    arrives; readers get O(1) lookups and a staleness timestamp instead of
+    hitting the database and Alpaca on every call.
+    """
+
+    # Event types that mean positions have changed at the broker; the trade
+    # workflow publishes the channel names and the exit rules engine publishes
+    # "position_exits" as event types
+    REFRESH_EVENT_TYPES = frozenset({
+        EventTypes.TRADE_EXECUTED,
+        EventTypes.TRADE_FILLED,
+        EventChannels.TRADE_EXECUTED,
+        EventChannels.TRADE_FILLED,
+        "trade_updates",
+        "position_exits",
+    })
+
+    def __init__(self, refresh_interval: float = 60.0, max_age: float = 90.0):
+        """
+        Initialize the snapshot service.
+
+        Args:
+            refresh_interval: Seconds between scheduled refreshes
+            max_age: Age in seconds after which readers trigger a synchronous refresh
+        """
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self._positions: Dict[str, Dict[str, Any]] = {}
+        self._refresh_lock = threading.Lock()
+        self._refresh_requested = threading.Event()
+        self.refreshed_at: Optional[datetime] = None
+        self._refreshed_monotonic: Optional[float] = None
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def age_seconds(self) -> Optional[float]:
+        """Seconds since the last refresh, or None if never refreshed."""
+        if self._refreshed_monotonic is None:
+            return None
+        return time.monotonic() - self._refreshed_monotonic
+
+    @property
+    def is_stale(self) -> bool:
+        """True if the snapshot was never built or is older than max_age."""
+        age = self.age_seconds
+        return age is None or age > self.max_age
+
+    def refresh(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Rebuild the snapshot from the database and Alpaca.
+
+        Requires a Flask application context.
+
+        Returns:
+            The new symbol-keyed snapshot
+        """
+        with self._refresh_lock:
+            positions = load_positions()
+            # Swap in a new dict so concurrent readers never see a partial snapshot
+            self._positions = positions
+            self.refreshed_at = datetime.utcnow()
+            self._refreshed_monotonic = time.monotonic()
+            return positions
+
+    def _ensure_fresh(self) -> Dict[str, Dict[str, Any]]:
+        if self.is_stale:
+            return self.refresh()
+        return self._positions
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Get a position by symbol from the snapshot."""
+        return self._ensure_fresh().get(symbol)
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Get all positions in the snapshot."""
+        return list(self._ensure_fresh().values())
+
+    def discard(self, symbol: str) -> None:
+        """Drop a symbol from the snapshot after it was closed locally."""
+        positions = dict(self._positions)
+        if positions.pop(symbol, None) is not None:
+            self._positions = positions
+
+    def status(self) -> Dict[str, Any]:
+        """Snapshot metadata for status endpoints."""
+        age = self.age_seconds
+        return {
+            "positions": len(self._positions),
+            "refreshed_at": self.refreshed_at.isoformat() if self.refreshed_at else None,
+            "age_seconds": round(age, 3) if age is not None else None,
+            "stale": self.is_stale,
+            "running": self.running
+        }
+
+    def request_refresh(self) -> None:
+        """Ask the background thread to refresh as soon as possible."""
+        self._refresh_requested.set()
+
+    def handle_event(self, event_type: str, data: Dict[str, Any]) -> None:
+        """Event handler that refreshes the snapshot on trade updates."""
+        if event_type in self.REFRESH_EVENT_TYPES:
+            self.request_refresh()
+
+    def _run(self) -> None:
+        # Import Flask app here to avoid circular imports
+        from app import app
+
+        while self.running:
+            try:
+                # Use Flask application context for database operations
+                with app.app_context():
+                    positions = self.refresh()
+                    logger.debug(f"Position snapshot refreshed with {len(positions)} positions")
+            except Exception as e:
+                logger.error(f"Error refreshing position snapshot: {str(e)}")
+
+            self._refresh_requested.wait(timeout=self.refresh_interval)
+            self._refresh_requested.clear()
+
+    def start(self) -> threading.Thread:
+        """Start the background refresh thread."""
+        if self.running and self.thread and self.thread.is_alive():
+            return self.thread
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True, name="PositionSnapshotThread")
+        self.thread.start()
+        logger.info("Position snapshot thread started")
+        return self.thread
+
+    def stop(self) -> None:
+        """Stop the background refresh thread."""
+        self.running = False
+        self._refresh_requested.set()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+
+# Shared position snapshot
+position_snapshot = PositionSnapshotService()
+
+def get_all_positions() -> List[Dict[str, Any]]:
+    """Get all open positions from the shared snapshot, refreshing it if stale."""
+    return position_snapshot.all()
+
+def sync_positions_from_alpaca(alpaca_positions: Union[List[Position], RawData, List[Any]]) -> Optional[int]:
     """Sync positions from Alpaca to our local database.
 
+    Only rows whose values changed are written; nothing is committed when
+    the database already matches Alpaca.
+
     Args:
         alpaca_positions: List of position objects from Alpaca API or raw data.
             Each position object has attributes like symbol, qty, avg_entry_price, etc.
+
+    Returns:
+        Number of rows inserted, updated or closed, or None if the sync failed
     """
     try:
-        # Get current positions from our database
-        db_positions = PositionModel.query.filter_by(closed_at=None).all()
-        db_position_symbols = {p.symbol for p in db_positions}
+        # Get current positions from our database, keyed by symbol
+        db_positions = {p.symbol: p for p in PositionModel.query.filter_by(closed_at=None).all()}
 
-        # Initialize list of alpaca symbols for tracking closed positions
+        # Initialize set of alpaca symbols for tracking closed positions
         alpaca_symbols = set()
+        writes = 0
 
         # Process Alpaca positions
         for ap in alpaca_positions:
@@ -253,75 +415,46 @@ def sync_positions_from_alpaca(alpaca_positions: Union[List[Position], RawData,
                 logger.warning(f"Skipping invalid position object: {ap}")
                 continue
 
-            # Get position symbol and add to our tracking set
-            symbol = str(ap.symbol)
-            alpaca_symbols.add(symbol)
-
-            # Type-safe attribute access with defaults
-            try:
-                qty = int(ap.qty) if hasattr(ap, 'qty') else 0
-                avg_entry_price = float(ap.avg_entry_price) if hasattr(ap, 'avg_entry_price') else 0.0
-                side_value = str(ap.side) if hasattr(ap, 'side') else "long"
-                side = "long" if side_value == "long" else "short"
-                market_value = float(ap.market_value) if hasattr(ap, 'market_value') else 0.0
-                cost_basis = float(ap.cost_basis) if hasattr(ap, 'cost_basis') else 0.0
-                unrealized_pl = float(ap.unrealized_pl) if hasattr(ap, 'unrealized_pl') else 0.0
-                unrealized_plpc = float(ap.unrealized_plpc) if hasattr(ap, 'unrealized_plpc') else 0.0
-                current_price = float(ap.current_price) if hasattr(ap, 'current_price') else 0.0
-                lastday_price = float(ap.lastday_price) if hasattr(ap, 'lastday_price') else 0.0
-                change_today = float(ap.change_today) if hasattr(ap, 'change_today') else 0.0
-            except (ValueError, TypeError) as e:
-                logger.warning(f"Error parsing position data for {symbol}: {str(e)}")
+            values = _alpaca_position_values(ap)
+            if values is None:
                 continue
+            symbol = values.pop("symbol")
+            alpaca_symbols.add(symbol)
 
-            # Check if we already have this position in our DB
-            if symbol in db_position_symbols:
-                # Update existing position
-                position = next(p for p in db_positions if p.symbol == symbol)
-                # Use setattr for SQLAlchemy models to avoid type checking issues
-                setattr(position, 'quantity', qty)
-                setattr(position, 'avg_entry_price', avg_entry_price)
-                setattr(position, 'side', side)
-                setattr(position, 'market_value', market_value)
-                setattr(position, 'cost_basis', cost_basis)
-                setattr(position, 'unrealized_pl', unrealized_pl)
-                setattr(position, 'unrealized_plpc', unrealized_plpc)
-                setattr(position, 'current_price', current_price)
-                setattr(position, 'lastday_price', lastday_price)
-                setattr(position, 'change_today', change_today)
-                setattr(position, 'updated_at', datetime.utcnow())
-
-                # Remove from set to track remaining positions
-                db_position_symbols.remove(symbol)
+            position = db_positions.get(symbol)
+            if position is not None:
+                # Update only the columns that changed
+                changed = {
+                    field: value for field, value in values.items()
+                    if _value_changed(getattr(position, field, None), value)
+                }
+                if changed:
+                    for field, value in changed.items():
+                        # Use setattr for SQLAlchemy models to avoid type checking issues
+                        setattr(position, field, value)
+                    setattr(position, 'updated_at', datetime.utcnow())
+                    writes += 1
             else:
                 # Create new position entry using helper function
                 new_position = create_model(PositionModel,
                     symbol=symbol,
-                    quantity=qty,
-                    avg_entry_price=avg_entry_price,
-                    side=side,
-                    market_value=market_value,
-                    cost_basis=cost_basis,
-                    unrealized_pl=unrealized_pl,
-                    unrealized_plpc=unrealized_plpc,
-                    current_price=current_price,
-                    lastday_price=lastday_price,
-                    change_today=change_today,
                     created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow()
+                    updated_at=datetime.utcnow(),
+                    **values
                 )
                 db.session.add(new_position)
+                writes += 1
 
                 # Create notification for new position with helper function
                 notification = create_model(NotificationModel,
                     type="position",
                     title=f"New Position: {symbol}",
-                    message=f"New position opened: {qty} {symbol} at {format_currency(avg_entry_price)}",
+                    message=f"New position opened: {values['quantity']} {symbol} at {format_currency(values['avg_entry_price'])}",
                     meta_data=json.dumps({
                         "symbol": symbol,
-                        "quantity": qty,
-                        "price": avg_entry_price,
-                        "side": side
+                        "quantity": values["quantity"],
+                        "price": values["avg_entry_price"],
+                        "side": values["side"]
                     }),
                     read=False,
                     created_at=datetime.utcnow()
@@ -329,9 +462,11 @@ def sync_positions_from_alpaca(alpaca_positions: Union[List[Position], RawData,
                 db.session.add(notification)
 
         # Mark positions not in Alpaca as closed
-        for symbol in db_position_symbols:
-            position = next(p for p in db_positions if p.symbol == symbol)
+        for symbol, position in db_positions.items():
+            if symbol in alpaca_symbols:
+                continue
             position.closed_at = datetime.utcnow()
+            writes += 1
 
             # Create notification for closed position using helper function
             notification = create_model(NotificationModel,
@@ -349,33 +484,28 @@ def sync_positions_from_alpaca(alpaca_positions: Union[List[Position], RawData,
             )
             db.session.add(notification)
 
-        # Commit all changes
-        db.session.commit()
+        # Commit only when something changed
+        if writes:
+            db.session.commit()
+        return writes
 
     except Exception as e:
         logger.error(f"Error syncing positions from Alpaca: {str(e)}")
         db.session.rollback()
+        return None
 
 def get_position(symbol: str) -> Optional[Dict[str, Any]]:
     """Get a specific position by symbol."""
-    # Try to get from database first
+    # Serve from the snapshot while it is fresh
+    if not position_snapshot.is_stale:
+        cached = position_snapshot.get(symbol)
+        if cached:
+            return cached
+
+    # Try to get from database next
     position = PositionModel.query.filter_by(symbol=symbol, closed_at=None).first()
     if position:
-        return {
-            "id": position.id,
-            "symbol": position.symbol,
-            "quantity": position.quantity,
-            "avg_entry_price": position.avg_entry_price,
-            "side": position.side,
-            "market_value": position.market_value,
-            "cost_basis": position.cost_basis,
-            "unrealized_pl": position.unrealized_pl,
-            "unrealized_plpc": position.unrealized_plpc,
-            "current_price": position.current_price,
-            "lastday_price": position.lastday_price,
-            "change_today": position.change_today,
-            "created_at": position.created_at.isoformat() if position.created_at else None
-        }
+        return _position_model_to_dict(position)
 
     # If not in database, try getting from Alpaca
     if trading_client:
@@ -443,6 +573,7 @@ def close_position(symbol: str) -> Dict[str, Any]:
 
         # Mark as closed in our database
         position = PositionModel.query.filter_by(symbol=symbol, closed_at=None).first()
+        position_snapshot.discard(symbol)
         if position:
             position.closed_at = datetime.utcnow()
             db.session.commit()
@@ -511,9 +642,12 @@ def close_position_partial(symbol: str, quantity: int) -> Dict[str, Any]:
         # If full position is closed, mark as closed
         if quantity == current_qty:
             db_position = PositionModel.query.filter_by(symbol=symbol, closed_at=None).first()
+            position_snapshot.discard(symbol)
             if db_position:
                 db_position.closed_at = datetime.utcnow()
                 db.session.commit()
+        else:
+            position_snapshot.request_refresh()
 
         # Create notification using helper function
         notification = create_model(NotificationModel,
@@ -586,6 +720,7 @@ def scale_position(symbol: str, additional_quantity: int) -> Dict[str, Any]:
         )
         db.session.add(notification)
         db.session.commit()
+        position_snapshot.request_refresh()
 
         return {
             "success": True,
@@ -719,34 +854,22 @@ def get_position_history(days: int = 30) -> List[Dict[str, Any]]:
 
     return results
 
-def start_position_update_thread():
-    """Start a background thread to update positions periodically."""
-    # Import Flask app here to avoid circular imports
-    from app import app
+# Supervised task that refreshes the snapshot on trade events
+TRADE_LISTENER_TASK = "position-snapshot-trades"
 
-    def update_positions_job():
-        """Run position updates with Flask application context."""
-        while True:
-            try:
-                # Use Flask application context for database operations
-                with app.app_context():
-                    # Sync positions from Alpaca
-                    if trading_client:
-                        alpaca_positions = trading_client.get_all_positions()
-                        sync_positions_from_alpaca(alpaca_positions)
-                        logger.debug(f"Updated {len(alpaca_positions)} positions from Alpaca")
-            except Exception as e:
-                logger.error(f"Error in position update thread: {str(e)}")
-
-            # Sleep for 60 seconds
-            time.sleep(60)
+async def _listen_for_trade_events() -> None:
+    """LISTEN for trade events until the connection drops or the task is cancelled."""
+    await listen_for_events(position_snapshot.handle_event, "events")
 
-    # Start thread
-    update_thread = threading.Thread(target=update_positions_job, daemon=True)
-    update_thread.start()
-    logger.info("Position update thread started")
+def start_position_update_thread():
+    """Start the background thread that keeps the position snapshot fresh, refreshing it on trade events."""
+    runtime.supervise(TRADE_LISTENER_TASK, _listen_for_trade_events)
+    return position_snapshot.start()
 
-    return update_thread
+def stop_position_update_thread():
+    """Stop the trade listener and the snapshot refresh thread."""
+    runtime.cancel(TRADE_LISTENER_TASK)
+    position_snapshot.stop()
 
 # Initialize position manager
 initialize_position_manager()
@@ -763,6 +886,11 @@ def register_position_routes(app):
         positions = get_all_positions()
         return jsonify(positions)
 
+    @position_routes.route('/api/positions/snapshot/status', methods=['GET'])
+    def position_snapshot_status_api():
+        """Get freshness of the in-memory position snapshot."""
+        return jsonify(position_snapshot.status())
+
     @position_routes.route('/api/positions/<symbol>', methods=['GET'])
     def get_position_api(symbol):
         """Get a specific position by symbol."""
@@ -12,6 +12,7 @@ import datetime
 import logging
 from flask import Blueprint, jsonify, request
 from features.alpaca.client import get_trading_client
+from common.market_calendar import market_calendar
 from common.events import publish_event, EventChannels
 from common.db import db
 # MarketDataModel moved to feature-specific location
@@ -37,17 +38,17 @@ def get_market_status():
                 'message': 'Trading client not initialized'
             }), 500
 
-        # Get market clock
-        clock = client.get_clock()
+        # Market clock from the cached exchange calendar (no API call)
+        clock = market_calendar.clock()
 
         # Get account status
         account = client.get_account()
 
         return jsonify({
             'status': 'success',
-            'is_open': clock.is_open,
-            'next_open': clock.next_open.isoformat() if clock.next_open else None,
-            'next_close': clock.next_close.isoformat() if clock.next_close else None,
+            'is_open': clock['is_open'],
+            'next_open': clock['next_open'],
+            'next_close': clock['next_close'],
             'current_time': datetime.datetime.now(datetime.timezone.utc).isoformat(),
             'trading_blocked': account.trading_blocked,
             'account_blocked': account.account_blocked
@@ -1,46 +1,65 @@
 """
 Historical Data Provider Module
 
-This module provides historical market data for tracked symbols
-and publishes candle updates using PostgreSQL events.
+This module polls bars for tracked symbols and publishes each bar once its
+interval has ended as a ``market.candle.closed`` event on the ``events``
+channel, where the candle detector listens for bar closes. Each closed bar is
+also recorded in ``market_data``, which price readers without a pushed price
+(e.g. the exit rules engine) fall back to.
 """
 import logging
 import threading
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any, Optional
 
+from flask import current_app, has_app_context
+
 from common.db import db
-from common.db_models import MarketDataModel
+from common.events.constants import EventTypes
 from common.events.publisher import publish_event
-from common.event_constants import EventChannels
-from features.alpaca.client import get_latest_bars, alpaca_market_client
+from features.alpaca.client import get_bars, get_stock_data_client
+from features.market.models import MarketDataModel
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Bar length per polled timeframe; a bar is closed once its interval has ended
+TIMEFRAME_DURATIONS = {
+    '1Min': timedelta(minutes=1),
+    '5Min': timedelta(minutes=5),
+    '15Min': timedelta(minutes=15),
+    '1Hour': timedelta(hours=1),
+    '1Day': timedelta(days=1),
+}
+
 # Thread control variables
 _data_thread = None
 _thread_running = False
 
-# Candle cache to avoid redundant updates
-_candle_cache: Dict[str, Dict[str, Any]] = {}
+# Start of the last bar published per symbol and timeframe
+_last_closed: Dict[str, datetime] = {}
 
 def init_historical_data_provider() -> bool:
-    """Initialize the historical data provider."""
+    """Initialize the historical data provider (call inside an app context)."""
     global _data_thread, _thread_running
 
     try:
-        if not alpaca_market_client:
+        if not get_stock_data_client():
             logger.warning("Alpaca market client not initialized")
             return False
 
+        if not has_app_context():
+            logger.error("Historical data provider needs an app context to publish events")
+            return False
+
         if _data_thread and _data_thread.is_alive():
             logger.info("Historical data thread already running")
             return True
 
         _data_thread = threading.Thread(
             target=_historical_data_thread,
+            args=(current_app._get_current_object(),),
             daemon=True,
             name="HistoricalDataThread"
         )
@@ -59,7 +78,7 @@ def init_historical_data_provider() -> bool:
         logger.error(f"Error initializing historical data provider: {e}")
         return False
 
-def _historical_data_thread() -> None:
+def _historical_data_thread(app) -> None:
     """Historical data thread function."""
     global _thread_running
 
@@ -87,25 +106,27 @@ def _historical_data_thread() -> None:
 
             now = datetime.now()
 
-            if now - last_check['1Min'] >= timedelta(minutes=1):
-                _update_candles(symbols, '1Min', 10)
-                last_check['1Min'] = now
+            # Events are written through the app's session
+            with app.app_context():
+                if now - last_check['1Min'] >= timedelta(minutes=1):
+                    _update_candles(symbols, '1Min', 10)
+                    last_check['1Min'] = now
 
-            if now - last_check['5Min'] >= timedelta(minutes=5):
-                _update_candles(symbols, '5Min', 12)
-                last_check['5Min'] = now
+                if now - last_check['5Min'] >= timedelta(minutes=5):
+                    _update_candles(symbols, '5Min', 12)
+                    last_check['5Min'] = now
 
-            if now - last_check['15Min'] >= timedelta(minutes=15):
-                _update_candles(symbols, '15Min', 16)
-                last_check['15Min'] = now
+                if now - last_check['15Min'] >= timedelta(minutes=15):
+                    _update_candles(symbols, '15Min', 16)
+                    last_check['15Min'] = now
 
-            if now - last_check['1Hour'] >= timedelta(hours=1):
-                _update_candles(symbols, '1Hour', 24)
-                last_check['1Hour'] = now
+                if now - last_check['1Hour'] >= timedelta(hours=1):
+                    _update_candles(symbols, '1Hour', 24)
+                    last_check['1Hour'] = now
 
-            if now - last_check['1Day'] >= timedelta(hours=6):
-                _update_candles(symbols, '1Day', 30)
-                last_check['1Day'] = now
+                if now - last_check['1Day'] >= timedelta(hours=6):
+                    _update_candles(symbols, '1Day', 30)
+                    last_check['1Day'] = now
 
             time.sleep(30)
         except Exception as e:
@@ -114,76 +135,130 @@ def _historical_data_thread() -> None:
 
     logger.info("Historical data thread stopped")
 
-def _update_candles(symbols: List[str], timeframe: str, limit: int) -> None:
-    """Update candles for the given symbols and timeframe."""
+def _bar_start(bar: Dict[str, Any]) -> Optional[datetime]:
+    timestamp = bar.get('timestamp')
+    if not timestamp:
+        return None
+    start = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    return start if start.tzinfo else start.replace(tzinfo=timezone.utc)
+
+def closed_bars(
+    bars: List[Dict[str, Any]],
+    timeframe: str,
+    since: Optional[datetime],
+    now: datetime
+) -> List[Dict[str, Any]]:
+    """
+    Select the bars that closed after the last published one.
+
+    Args:
+        bars: Bars oldest first, as returned by get_bars
+        timeframe: Bar timeframe (a TIMEFRAME_DURATIONS key)
+        since: Start of the last published bar, or None on the first poll
+        now: Current time (timezone-aware)
+
+    Returns:
+        List of closed, unpublished bars oldest first; only the latest one
+        on the first poll, so a restart does not replay history
+    """
+    duration = TIMEFRAME_DURATIONS[timeframe]
+    closed = []
+    for bar in bars:
+        start = _bar_start(bar)
+        # The newest bar is still forming until its interval has ended
+        if start is None or start + duration > now:
+            continue
+        if since is not None and start <= since:
+            continue
+        closed.append(bar)
+    return closed if since is not None else closed[-1:]
+
+def publish_candle_closed(symbol: str, timeframe: str, bar: Dict[str, Any]) -> bool:
+    """
+    Publish a closed bar for the candle detector.
+
+    Args:
+        symbol: Ticker symbol
+        timeframe: Bar timeframe
+        bar: Bar dictionary with timestamp and OHLCV values
+
+    Returns:
+        bool: Success status
+    """
+    candle = {
+        'ticker': symbol,
+        'timeframe': timeframe,
+        'timestamp': bar.get('timestamp'),
+        'open': bar.get('open'),
+        'high': bar.get('high'),
+        'low': bar.get('low'),
+        'close': bar.get('close'),
+        'volume': bar.get('volume'),
+        'is_closed': True
+    }
+    return publish_event(
+        event_type=EventTypes.CANDLE_CLOSED,
+        data=candle,
+        channel="events",
+        source="historical_data_provider"
+    )
+
+def record_closed_bar(symbol: str, timeframe: str, bar: Dict[str, Any]) -> bool:
+    """
+    Store the close of a bar in market_data, stamped with the end of its interval.
+
+    Args:
+        symbol: Ticker symbol
+        timeframe: Bar timeframe (a TIMEFRAME_DURATIONS key)
+        bar: Bar dictionary with timestamp and OHLCV values
+
+    Returns:
+        bool: Success status
+    """
     try:
-        alpaca_timeframe = timeframe
-        bars = get_latest_bars(symbols, alpaca_timeframe, limit)
+        closed_at = _bar_start(bar) + TIMEFRAME_DURATIONS[timeframe]
+        db.session.add(MarketDataModel(
+            symbol=symbol,
+            price=bar.get('close'),
+            volume=bar.get('volume'),
+            timestamp=closed_at.astimezone(timezone.utc).replace(tzinfo=None)
+        ))
+        db.session.commit()
+        return True
+    except Exception as e:
+        logger.error(f"Error storing {timeframe} bar for {symbol}: {e}")
+        db.session.rollback()
+        return False
 
-        for symbol, symbol_bars in bars.items():
-            if not symbol_bars:
-                continue
+def _update_candles(symbols: List[str], timeframe: str, limit: int, now: Optional[datetime] = None) -> int:
+    """
+    Publish and record the bars of the given symbols and timeframe that closed since the last poll.
 
-            latest_candle = symbol_bars[-1]
+    Returns:
+        int: Number of bar closes published
+    """
+    now = now or datetime.now(timezone.utc)
+    published = 0
+    for symbol in symbols:
+        try:
             cache_key = f"{symbol}_{timeframe}"
-
-            if (
-                cache_key in _candle_cache and
-                _candle_cache[cache_key].get('timestamp') == latest_candle.get('timestamp')
-            ):
-                continue
-
-            _candle_cache[cache_key] = latest_candle
-
-            # Store in database
-            market_data = MarketDataModel(
-                symbol=symbol,
-                price=latest_candle.get('close'),
-                previous_close=latest_candle.get('open'),
-                volume=latest_candle.get('volume'),
-                timestamp=datetime.fromisoformat(latest_candle.get('timestamp'))
-            )
-
-            try:
-                db.session.add(market_data)
-                db.session.commit()
-            except Exception as e:
-                logger.error(f"Error storing market data: {e}")
-                db.session.rollback()
-                continue
-
-            # Publish event
-            candle_update = {
-                'ticker': symbol,
-                'timeframe': timeframe,
-                'timestamp': latest_candle.get('timestamp'),
-                'open': latest_candle.get('open'),
-                'high': latest_candle.get('high'),
-                'low': latest_candle.get('low'),
-                'close': latest_candle.get('close'),
-                'volume': latest_candle.get('volume'),
-                'event_type': 'candle_update',
-                'is_closed': True
-            }
-
-            publish_event(
-                event_type="market.bars.updated",
-                data=candle_update,
-                channel=EventChannels.MARKET_BARS_UPDATE,
-                source="historical_data_provider"
-            )
-
-            logger.debug(f"Published {timeframe} candle update for {symbol}")
-    except Exception as e:
-        logger.error(f"Error updating {timeframe} candles: {e}")
+            for bar in closed_bars(get_bars(symbol, timeframe, limit=limit), timeframe, _last_closed.get(cache_key), now):
+                if not publish_candle_closed(symbol, timeframe, bar):
+                    # Retry from this bar on the next poll
+                    break
+                _last_closed[cache_key] = _bar_start(bar)
+                record_closed_bar(symbol, timeframe, bar)
+                published += 1
+        except Exception as e:
+            logger.error(f"Error updating {timeframe} candles for {symbol}: {e}")
+    if published:
+        logger.debug(f"Published {published} {timeframe} bar closes")
+    return published
 
 def get_historical_data(symbol: str, timeframe: str = '1Day', limit: int = 30) -> List[Dict[str, Any]]:
     """Get historical data for a symbol."""
     try:
-        bars = get_latest_bars([symbol], timeframe, limit)
-        if symbol in bars:
-            return bars[symbol]
-        return []
+        return get_bars(symbol, timeframe, limit=limit)
     except Exception as e:
         logger.error(f"Error getting historical data for {symbol}: {e}")
         return []
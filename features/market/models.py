@@ -0,0 +1,42 @@
+"""
+Market Models Module
+
+Database model for the closed bars recorded by the historical data provider.
+Readers that have not received a pushed price (e.g. the exit rules engine)
+fall back to the latest row per symbol.
+"""
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import BigInteger, Column, DateTime, Float, Index, Integer, String
+
+from common.db import db
+
+
+class MarketDataModel(db.Model):
+    """Closing price and volume of one bar of a symbol."""
+    __tablename__ = 'market_data'
+    __table_args__ = (
+        # Backs the latest-row-per-symbol lookup (DISTINCT ON (symbol) ... ORDER BY symbol, timestamp DESC)
+        Index('ix_market_data_symbol_timestamp', 'symbol', 'timestamp'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    symbol = Column(String(16), nullable=False)
+    price = Column(Float, nullable=False)
+    previous_close = Column(Float, nullable=True)
+    volume = Column(BigInteger, nullable=True)
+    timestamp = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return f"<MarketDataModel(symbol={self.symbol}, price={self.price}, timestamp={self.timestamp})>"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert model instance to dictionary."""
+        return {
+            'symbol': self.symbol,
+            'price': self.price,
+            'previous_close': self.previous_close,
+            'volume': self.volume,
+            'timestamp': self.timestamp.isoformat() if self.timestamp else None
+        }
@@ -6,16 +6,23 @@ for market status, quotes, candles, and real-time data without exposing
 implementation details to API routes.
 """
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, time
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 
+import pytz
+
+from common.market_calendar import EASTERN, market_calendar
 from features.market.history import get_history_provider
 from features.market.feed import get_market_feed
 from common.events.publisher import publish_event
 
 logger = logging.getLogger(__name__)
 
+# Extended-hours sessions around the regular session (Eastern)
+EXTENDED_OPEN = time(4, 0)
+EXTENDED_CLOSE = time(20, 0)
+
 
 @dataclass
 class MarketStatusData:
@@ -76,43 +83,24 @@ class MarketService:
             MarketStatusData with current market state
         """
         try:
-            now = datetime.now()
+            now = datetime.now(tz=pytz.UTC)
             
-            # Basic market hours logic (9:30 AM - 4:00 PM ET, Mon-Fri)
-            is_weekday = now.weekday() < 5
-            is_market_hours = 9.5 <= now.hour + now.minute/60 <= 16
-            is_open = is_weekday and is_market_hours
+            # Sessions, holidays and early closes come from the cached exchange calendar
+            is_open = market_calendar.is_open(now)
+            next_open = None if is_open else market_calendar.next_open(now)
+            next_close = market_calendar.next_close(now) if is_open else None
             
-            # Calculate next open/close times
+            # Determine session type
+            eastern_now = now.astimezone(EASTERN)
+            session_today = market_calendar.session(eastern_now.date())
             if is_open:
-                # Market is open, next event is close at 4 PM
-                next_close = datetime(now.year, now.month, now.day, 16, 0)
-                next_open = None
                 session = 'market'
+            elif session_today and now < session_today.open and eastern_now.time() >= EXTENDED_OPEN:
+                session = 'pre'
+            elif session_today and now >= session_today.close and eastern_now.time() < EXTENDED_CLOSE:
+                session = 'post'
             else:
-                # Market is closed, calculate next open
-                if now.hour >= 16 or not is_weekday:
-                    # After hours or weekend
-                    days_ahead = (7 - now.weekday()) % 7
-                    if days_ahead == 0 and now.hour < 9.5:
-                        # It's Monday before market open
-                        next_open = datetime(now.year, now.month, now.day, 9, 30)
-                    else:
-                        next_day = now + timedelta(days=days_ahead if days_ahead > 0 else 1)
-                        next_open = datetime(next_day.year, next_day.month, next_day.day, 9, 30)
-                else:
-                    # Before market open today
-                    next_open = datetime(now.year, now.month, now.day, 9, 30)
-                
-                next_close = None
-                
-                # Determine session type
-                if is_weekday and 4 <= now.hour < 9.5:
-                    session = 'pre'
-                elif is_weekday and 16 <= now.hour < 20:
-                    session = 'post'
-                else:
-                    session = 'closed'
+                session = 'closed'
             
             status = MarketStatusData(
                 is_open=is_open,
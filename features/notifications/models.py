@@ -0,0 +1,41 @@
+"""
+Notification Models Module
+
+Database model for user-facing notifications (position opens and closes,
+automatic exits, ...).
+"""
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text
+
+from common.db import db
+
+
+class NotificationModel(db.Model):
+    """One notification shown on the dashboard."""
+    __tablename__ = 'notifications'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    type = Column(String(50), nullable=False, index=True)
+    title = Column(String(255), nullable=True)
+    message = Column(Text, nullable=True)
+    # JSON-encoded details
+    meta_data = Column(Text, nullable=True)
+    read = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    def __repr__(self) -> str:
+        return f"<NotificationModel(id={self.id}, type={self.type}, title={self.title})>"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert model instance to dictionary."""
+        return {
+            'id': self.id,
+            'type': self.type,
+            'title': self.title,
+            'message': self.message,
+            'meta_data': self.meta_data,
+            'read': self.read,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
@@ -16,6 +16,7 @@ from scipy.stats import norm
 from flask import current_app
 from common.db import db
 from common.db_models import OptionsContractModel
+from common.profiling import profiled
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -296,6 +297,7 @@ def update_option_greeks(option_id: int, market_price: float) -> bool:
         db.session.rollback()
         return False
 
+@profiled('options.update_all_options_greeks')
 def update_all_options_greeks() -> Tuple[int, int]:
     """
     Update Greeks for all options contracts in the database.
@@ -65,58 +65,23 @@ def get_setups():
         
         store = get_parsing_store()
         
-        if trading_day:
-            setups = store.get_active_setups_for_day(trading_day)
-        else:
-            setups = store.get_active_setups_for_day(date.today())
-        
-        # Apply filters
-        if ticker:
-            setups = [setup for setup in setups if setup.ticker.upper() == ticker.upper()]
+        # Ticker and direction come from the snapshot's indexes
+        snapshot = store.get_setup_snapshot(trading_day or date.today())
+        setups = snapshot.to_dicts(ticker=ticker, direction=direction)
         
         if label:
-            setups = [setup for setup in setups if setup.label and setup.label.lower() == label.lower()]
-        
-        if direction:
-            setups = [setup for setup in setups if setup.direction and setup.direction.lower() == direction.lower()]
+            setups = [setup for setup in setups if setup['label'] and setup['label'].lower() == label.lower()]
         
         if index is not None:
-            setups = [setup for setup in setups if setup.index == index]
+            setups = [setup for setup in setups if setup['index'] == index]
         
         if active_only:
-            setups = [setup for setup in setups if setup.active]
-        
-        # Convert to dict format with updated field mappings
-        setup_list = []
-        for setup in setups:
-            setup_dict = {
-                'id': setup.id,
-                'message_id': setup.message_id,
-                'ticker': setup.ticker,
-                'trading_day': setup.trading_day.isoformat(),
-                'index': setup.index,
-                'trigger_level': float(setup.trigger_level) if setup.trigger_level else None,
-                'target_prices': setup.target_prices,  # New field: list of target prices
-                'direction': setup.direction,  # Updated field mapping
-                'label': setup.label,  # New field: was setup_type
-                'keywords': setup.keywords,  # New field: list of keywords
-                'emoji_hint': setup.emoji_hint,  # New field: emoji hint
-                'raw_line': setup.raw_line,
-                'active': setup.active,
-                'confidence_score': setup.confidence_score,
-                'created_at': setup.created_at.isoformat() if hasattr(setup, 'created_at') else None,
-                'updated_at': setup.updated_at.isoformat() if hasattr(setup, 'updated_at') else None
-            }
-            
-            # Get levels for this setup
-            levels = store.get_levels_by_setup(setup.id)
-            setup_dict['levels'] = [level.to_dict() for level in levels]
-            setup_list.append(setup_dict)
+            setups = [setup for setup in setups if setup['active']]
         
         return jsonify({
             'success': True,
-            'setups': setup_list,
-            'count': len(setup_list),
+            'setups': setups,
+            'count': len(setups),
             'filters': {
                 'trading_day': trading_day.isoformat() if trading_day else None,
                 'ticker': ticker,
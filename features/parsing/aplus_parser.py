@@ -18,6 +18,7 @@ from datetime import date, datetime
 from typing import List, Dict, Optional, Tuple, Any
 from dataclasses import dataclass
 
+from common.profiling import profiled
 from .failure_tracker import record_parsing_failure, FailureReason
 
 logger = logging.getLogger(__name__)
@@ -495,6 +496,7 @@ class APlusMessageParser:
         
         return setups, bias_note
 
+    @profiled('parsing.aplus.parse_message')
     def parse_message(self, content: str, message_id: Optional[str] = None, message_timestamp: Optional[datetime] = None, **kwargs) -> Dict[str, Any]:
         """
         Parse complete A+ scalp setups message with duplicate trading day resolution.
@@ -4,13 +4,16 @@ Parsing Dashboard Module
 Operational dashboard for monitoring parsing service health, performance metrics,
 and managing parsed trade setups. Follows the discord_channels feature slice pattern.
 """
+import json
 import logging
 from datetime import date, datetime
-from flask import Blueprint, render_template, request, jsonify
+from flask import Blueprint, current_app, render_template, request, jsonify
 from common.utils import utc_now
+from common.metrics import metrics_hub
 
 from .service import get_parsing_service
 from .store import get_parsing_store
+from .setup_cache import get_setup_view_cache
 from .events import trigger_backlog_parsing
 
 logger = logging.getLogger(__name__)
@@ -70,6 +73,20 @@ def overview():
         logger.error(f"Error loading parsing dashboard: {e}")
         return render_template('parsing/error.html', error=str(e)), 500
 
+def _parsing_metrics_payload():
+    """Payload pushed to the 'parsing' metrics topic."""
+    service = get_parsing_service_safe()
+    if not service:
+        return {'error': 'Parsing service unavailable'}
+    stats = service.get_service_stats()
+    # A fresh timestamp on every build would make every push look like a change
+    stats.pop('timestamp', None)
+    return stats
+
+
+metrics_hub.register('parsing', _parsing_metrics_payload, interval=30.0)
+
+
 @parsing_dashboard_bp.route('/metrics.json')
 def metrics():
     """Get parsing service metrics as JSON for AJAX updates."""
@@ -90,7 +107,11 @@ def metrics():
 
 @parsing_dashboard_bp.route('/setups.json')
 def setups_json():
-    """Get parsed setups as JSON with available trading days"""
+    """Get parsed setups as JSON with available trading days.
+
+    Responses are cached per (trading_day, ticker) and carry an ETag, so
+    polling clients that send If-None-Match get a 304 until setups change.
+    """
     try:
         trading_day_str = request.args.get('trading_day')
         ticker = request.args.get('ticker')
@@ -99,11 +120,12 @@ def setups_json():
         if not service:
             return jsonify({'success': False, 'error': 'Parsing service unavailable'}), 503
         
-        # Get available trading days from database
+        store = get_parsing_store()
+        cache = get_setup_view_cache()
+        
+        # Get available trading days (cached until setups change)
         try:
-            from features.parsing.store import get_parsing_store
-            store = get_parsing_store()
-            available_days = store.get_available_trading_days()
+            available_days = cache.available_days(store.get_available_trading_days)
         except Exception as e:
             logger.error(f"Error getting available trading days: {e}")
             available_days = []
@@ -122,49 +144,23 @@ def setups_json():
         elif not trading_day:
             trading_day = date.today()
         
-        # Get setups for the selected day using store directly to ensure new field mappings
-        store = get_parsing_store()
-        setups_query = store.get_active_setups_for_day(trading_day)
-        
-        # Filter by ticker if specified
-        if ticker:
-            setups_query = [setup for setup in setups_query if setup.ticker.upper() == ticker.upper()]
-        
-        # Convert setups to dict format with new field mappings
-        setups = []
-        for setup in setups_query:
-            setup_dict = {
-                'id': setup.id,
-                'message_id': setup.message_id,
-                'ticker': setup.ticker,
-                'trading_day': setup.trading_day.isoformat(),
-                'index': setup.index,
-                'trigger_level': float(setup.trigger_level) if setup.trigger_level else None,
-                'target_prices': setup.target_prices,  # New field: list of target prices
-                'direction': setup.direction,  # Updated field mapping
-                'label': setup.label,  # New field: was setup_type/profile_name
-                'keywords': setup.keywords,  # New field: list of keywords
-                'emoji_hint': setup.emoji_hint,  # New field: emoji hint
-                'raw_line': setup.raw_line,
-                'active': setup.active,
-                'confidence_score': setup.confidence_score,
-                'created_at': setup.created_at.isoformat() if hasattr(setup, 'created_at') else None,
-                'updated_at': setup.updated_at.isoformat() if hasattr(setup, 'updated_at') else None
-            }
-            
-            # Get levels for this setup
-            levels = store.get_levels_by_setup(setup.id)
-            setup_dict['levels'] = [level.to_dict() for level in levels]
-            setups.append(setup_dict)
-        
-        return jsonify({
-            'success': True,
-            'setups': setups,
-            'count': len(setups),
-            'available_days': [day.isoformat() for day in available_days],
-            'selected_day': trading_day.isoformat(),
-            'ticker': ticker
-        })
+        def build_body() -> bytes:
+            # Serialized from the day's shared setup snapshot
+            setups = store.get_setup_snapshot(trading_day).to_dicts(ticker=ticker)
+            return json.dumps({
+                'success': True,
+                'setups': setups,
+                'count': len(setups),
+                'available_days': [day.isoformat() for day in available_days],
+                'selected_day': trading_day.isoformat(),
+                'ticker': ticker
+            }).encode('utf-8')
+        
+        view = cache.get_or_build(trading_day, ticker, build_body)
+        response = current_app.response_class(view.body, mimetype='application/json')
+        response.set_etag(view.etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
             
     except Exception as e:
         logger.error(f"Error getting setups JSON: {e}")
@@ -314,6 +310,21 @@ def backlog_status():
         logger.error(f"Error getting backlog status: {e}")
         return jsonify({'error': str(e)}), 500
 
+@parsing_dashboard_bp.route('/queue.json')
+def work_queue_status():
+    """Get parse job queue depth, expired leases and claim latency across workers"""
+    try:
+        from .work_queue import ParseWorkQueue, queue_metrics, work_queue_enabled
+        return jsonify({
+            'enabled': work_queue_enabled(),
+            **ParseWorkQueue().status(),
+            'this_process': queue_metrics.snapshot(),
+            'timestamp': utc_now().isoformat()
+        })
+    except Exception as e:
+        logger.error(f"Error getting parse queue status: {e}")
+        return jsonify({'error': str(e)}), 500
+
 @parsing_dashboard_bp.route('/duplicates.json')
 def duplicates_audit():
     """Get duplicate trading days audit data"""
@@ -4,18 +4,22 @@ Parsing Listener Module
 Event listener for the parsing vertical slice.
 Subscribes to ingestion events and processes Discord messages for trading setups.
 """
+import asyncio
 import logging
 from datetime import datetime, date
-from typing import Dict, Any, List
+from typing import Dict, Any
 
 # EventConsumer removed - using PostgreSQL LISTEN/NOTIFY via common.events.publisher
-from common.events.publisher import publish_event
+from common.events.offsets import DurableConsumer
+from common.metrics import pipeline_metrics
 from .parser import MessageParser
 from .store import ParsingStore, get_parsing_store
-from .models import TradeSetup, ParsedLevel
+from .work_queue import ParseWorker, work_queue_enabled
 
 logger = logging.getLogger(__name__)
 
+CONSUMER_GROUP = 'parsing'
+
 
 class ParsingListener:
     """
@@ -36,61 +40,96 @@ class ParsingListener:
             'last_processed': None
         }
         
-        # PostgreSQL LISTEN/NOTIFY used instead of legacy EventConsumer
+        # Durable consumer group over the events table, woken by PostgreSQL NOTIFY
         self.app = app
-        logger.info("Parsing listener initialized")
+        self.consumer = None
+        # In work-queue mode events are only enqueued; the worker claims and parses them
+        self.worker = ParseWorker(self._handle_message_stored) if work_queue_enabled() else None
+        self._worker_task = None
+        logger.info(f"Parsing listener initialized ({'work queue' if self.worker else 'direct'} mode)")
     
     async def start_listening(self):
         """Start listening for ingestion events using PostgreSQL LISTEN/NOTIFY."""
         try:
             logger.info("📢 Starting PostgreSQL-based parsing listener...")
-            from common.events.publisher import listen_for_events
             
-            # Start PostgreSQL LISTEN/NOTIFY listener
-            await listen_for_events(self._handle_event, "events")
-            logger.info("📢 Parsing listener started successfully with PostgreSQL NOTIFY")
+            # Catch up from the stored offset, then follow PostgreSQL NOTIFY
+            self.consumer = DurableConsumer(
+                CONSUMER_GROUP,
+                self._handle_event,
+                event_types=["discord.message_received"]
+            )
+            if self.worker:
+                self._worker_task = asyncio.create_task(self.worker.run())
+            try:
+                await self.consumer.run("events")
+            finally:
+                # The worker lives and dies with the consumer, so a supervised restart starts one worker
+                if self._worker_task:
+                    self._worker_task.cancel()
+                    self._worker_task = None
+            logger.info("📢 Parsing listener stopped following PostgreSQL NOTIFY")
         except Exception as e:
             logger.error(f"Error starting parsing listener: {e}")
             raise
     
-    async def _handle_event(self, event_type: str, payload: dict):
-        """Handle PostgreSQL NOTIFY events."""
-        try:
-            logger.info(f"📥 Received event: {event_type}")
-            
-            if event_type == "discord.message_received":
-                # Extract message data from payload and process
-                message_data = payload.get('message', {})
-                if message_data:
-                    # Convert to event format expected by existing handler
-                    event_data = {
-                        'message_id': message_data.get('message_id'),
-                        'content': message_data.get('content'),
-                        'channel_id': message_data.get('channel_id'),
-                        'timestamp': message_data.get('timestamp')
-                    }
-                    # Call existing message handler with converted data
-                    self._handle_message_stored({'data': event_data})
-            else:
-                logger.debug(f"Ignoring unhandled event type: {event_type}")
-                
-        except Exception as e:
-            logger.error(f"Error handling event {event_type}: {e}")
+    async def _handle_event(self, event_type: str, payload: dict) -> bool:
+        """
+        Handle an event delivered by the durable consumer.
+
+        Failures are not caught here: a False result or an exception makes the
+        consumer retry the event instead of committing the offset past it.
+
+        Returns:
+            bool: False if the message was not parsed/stored (or enqueued) and should be retried
+        """
+        logger.info(f"📥 Received event: {event_type}")
+
+        if event_type != "discord.message_received":
+            logger.debug(f"Ignoring unhandled event type: {event_type}")
+            return True
+
+        # Extract message data from payload and process
+        message_data = payload.get('message', {})
+        if not message_data:
+            return True
+
+        # Convert to event format expected by existing handler
+        event_data = {
+            'message_id': message_data.get('message_id'),
+            'pipeline': payload.get('pipeline'),
+            'content': message_data.get('content'),
+            'channel_id': message_data.get('channel_id'),
+            'timestamp': message_data.get('timestamp')
+        }
+        if self.worker:
+            # False only means the message is already queued; a failed insert raises
+            if self.worker.queue.enqueue(event_data['message_id'], {'data': event_data}):
+                self.worker.wake()
+            return True
+        # Call existing message handler with converted data
+        return self._handle_message_stored({'data': event_data})
     
     def stop_listening(self):
         """Stop listening for events."""
         try:
-            self.consumer.stop()
+            if self.consumer:
+                self.consumer.stop()
+            if self.worker:
+                self.worker.stop()
             logger.info("Parsing listener stopped")
         except Exception as e:
             logger.error(f"Error stopping parsing listener: {e}")
     
-    def _handle_message_stored(self, event_data: Dict[str, Any]):
+    def _handle_message_stored(self, event_data: Dict[str, Any]) -> bool:
         """
         Handle MESSAGE_STORED event from ingestion.
         
         Args:
             event_data: Event data containing message information
+            
+        Returns:
+            bool: False if parsing or storing failed and the message should be retried
         """
         try:
             logger.debug(f"Processing message stored event: {event_data.get('correlation_id', 'unknown')}")
@@ -99,15 +138,18 @@ class ParsingListener:
             message_info = self._extract_message_info(event_data)
             if not message_info:
                 logger.warning("Could not extract message info from event")
-                return
+                return True
             
             message_id = message_info['message_id']
             content = message_info['content']
+            # Earlier stages may have been timed by the bot/ingestion process
+            pipeline_metrics.adopt(message_id, (event_data.get('data') or {}).get('pipeline'))
+            pipeline_metrics.mark(message_id, 'parse_started')
             
             # Skip if message content is empty or too short
             if not content or len(content.strip()) < 10:
                 logger.debug(f"Skipping message {message_id}: content too short")
-                return
+                return True
             
             # Check if this is an A+ message and route to specialized service
             from .aplus_parser import get_aplus_parser
@@ -118,7 +160,9 @@ class ParsingListener:
                 # Use specialized A+ service to preserve individual setups
                 from .service import ParsingService
                 service = ParsingService()
-                result = service.parse_aplus_message(content, message_id)
+                result = service.parse_aplus_message(
+                    content, message_id, correlation_id=event_data.get('correlation_id')
+                )
                 
                 if result.get('success'):
                     setups_created = result.get('setups_created', 0)
@@ -131,7 +175,7 @@ class ParsingListener:
                     self.stats['last_processed'] = datetime.utcnow().isoformat()
                     
                     logger.info(f"A+ message {message_id} processed: {setups_created} setups, {levels_created} levels")
-                    return
+                    return True
                 else:
                     logger.warning(f"A+ service failed to process message {message_id}: {result.get('error')}")
                     # Fall through to generic parsing
@@ -148,7 +192,7 @@ class ParsingListener:
             if not parse_result.get('success') or not parse_result.get('setups'):
                 logger.debug(f"No setups found in message {message_id}")
                 self.stats['messages_processed'] += 1
-                return
+                return True
             
             setups = parse_result['setups']
             all_levels = parse_result['levels']
@@ -174,7 +218,8 @@ class ParsingListener:
                     message_id=message_id,
                     parsed_setups=setups,  # Direct pass-through of TradeSetup instances
                     trading_day=trading_day,
-                    ticker_bias_notes={}  # Extract from levels if needed
+                    ticker_bias_notes={},  # Extract from levels if needed
+                    correlation_id=event_data.get('correlation_id')  # The store emits SETUP_PARSED per setup
                 )
                 
                 # Update stats
@@ -183,21 +228,19 @@ class ParsingListener:
                 self.stats['levels_created'] += len(created_levels)
                 self.stats['last_processed'] = datetime.utcnow().isoformat()
                 
-                # Emit SETUP_PARSED event for each created setup
-                for setup in created_setups:
-                    setup_levels = [level for level in created_levels if level.setup_id == setup.id]
-                    self._emit_setup_parsed_event(setup, setup_levels, event_data.get('correlation_id'))
-                
                 logger.info(f"Successfully processed message {message_id}: "
                           f"{len(created_setups)} setups, {len(created_levels)} levels")
+                return True
                 
             except Exception as e:
                 logger.error(f"Error storing parsed data for message {message_id}: {e}")
                 self.stats['storage_errors'] += 1
+                return False
             
         except Exception as e:
             logger.error(f"Error processing message stored event: {e}")
             self.stats['parsing_errors'] += 1
+            return False
     
     def _extract_message_info(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract message information from event data."""
@@ -267,61 +310,13 @@ class ParsingListener:
             from common.timezone import get_central_trading_day
             return get_central_trading_day()
     
-    def _emit_setup_parsed_event(self, setup: TradeSetup, levels: List[ParsedLevel], correlation_id: str = None):
-        """
-        Emit SETUP_PARSED event for downstream consumers.
-        
-        Args:
-            setup: Created TradeSetup instance
-            levels: Associated ParsedLevel instances
-            correlation_id: Event correlation ID for tracing
-        """
-        try:
-            event_data = {
-                'setup_id': setup.id,
-                'ticker': setup.ticker,
-                'label': setup.label,  # Updated field mapping
-                'keywords': setup.keywords,  # Updated field mapping
-                'direction': setup.direction,
-                'confidence_score': setup.confidence_score,
-                'trading_day': setup.trading_day.isoformat(),
-                'message_id': setup.message_id,
-                'levels_count': len(levels),
-                'levels': [
-                    {
-                        'id': level.id,
-                        'level_type': level.level_type,
-                        'trigger_price': float(level.trigger_price),
-                        'direction': level.direction,
-                        'strategy': level.strategy
-                    }
-                    for level in levels
-                ],
-                'metadata': {
-                    'parsed_at': datetime.utcnow().isoformat(),
-                    'parser_version': '2.0',  # Updated version for new field mappings
-                    'confidence_threshold': 0.5
-                }
-            }
-            
-            publish_event(
-                channel='parsing:setup',
-                event_type='setup.parsed',
-                data=event_data,
-                source='parsing_listener',
-                correlation_id=correlation_id
-            )
-            
-            logger.debug(f"Emitted SETUP_PARSED event for setup {setup.id}")
-            
-        except Exception as e:
-            logger.error(f"Error emitting setup parsed event: {e}")
-    
     def get_stats(self) -> Dict[str, Any]:
         """Get parsing listener statistics."""
         return {
             **self.stats,
-            'status': 'active' if self.consumer.is_running() else 'stopped',
+            'status': 'active' if self.consumer and self.consumer.running else 'stopped',
+            'consumer': self.consumer.get_stats() if self.consumer else None,
+            'work_queue': self.worker.get_stats() if self.worker else None,
             'parser_type': 'consolidated',
             'service_type': 'parsing'
         }
@@ -185,5 +185,53 @@ class ParsedLevel(db.Model):
         return query.order_by(cls.created_at.desc()).all()
 
 
+class ParseJob(db.Model):
+    """
+    One message waiting to be parsed in work-queue mode.
+
+    Workers claim pending jobs (or jobs whose lease expired) with
+    SELECT ... FOR UPDATE SKIP LOCKED, so parse workers on any number of
+    hosts share the queue without parsing a message twice.
+    """
+    __tablename__ = "parse_jobs"
+    __table_args__ = (
+        db.Index('ix_parse_jobs_status_id', 'status', 'id'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    message_id = Column(String(64), nullable=False, unique=True)
+    payload = Column(JSONB, nullable=False)
+
+    # pending -> claimed -> done | failed (claimed jobs return to pending on retry)
+    status = Column(String(10), nullable=False, default='pending')
+    attempts = Column(Integer, nullable=False, default=0)
+    claimed_by = Column(String(100), nullable=True)
+    claimed_at = Column(DateTime, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    enqueued_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<ParseJob(id={self.id}, message_id={self.message_id}, status={self.status})>"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert model instance to dictionary."""
+        return {
+            'id': self.id,
+            'message_id': self.message_id,
+            'status': self.status,
+            'attempts': self.attempts,
+            'claimed_by': self.claimed_by,
+            'claimed_at': self.claimed_at.isoformat() if self.claimed_at else None,
+            'lease_expires_at': self.lease_expires_at.isoformat() if self.lease_expires_at else None,
+            'last_error': self.last_error,
+            'enqueued_at': self.enqueued_at.isoformat() if self.enqueued_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
 # Legacy model aliases for backward compatibility during migration
 SetupModel = TradeSetup
\ No newline at end of file
@@ -67,7 +67,7 @@ class ParsingService:
         """
         return self.listener.process_message_manually(message_data)
     
-    def parse_aplus_message(self, message_content: str, message_id: str, trading_day: Optional[date] = None, message_timestamp: Optional[datetime] = None) -> Dict[str, Any]:
+    def parse_aplus_message(self, message_content: str, message_id: str, trading_day: Optional[date] = None, message_timestamp: Optional[datetime] = None, correlation_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Parse an A+ scalp setups message with enhanced schema fields.
         
@@ -76,6 +76,7 @@ class ParsingService:
             message_id: Discord message ID
             trading_day: Trading day (defaults to extracted date or today)
             message_timestamp: Message timestamp for duplicate detection
+            correlation_id: Event correlation ID passed on to the setup.parsed events
             
         Returns:
             Parsing results with enhanced setup data
@@ -126,7 +127,8 @@ class ParsingService:
                     message_id=message_id,
                     parsed_setups=parsed_setups,  # New TradeSetup dataclass instances
                     trading_day=trading_day,
-                    ticker_bias_notes=ticker_bias_notes
+                    ticker_bias_notes=ticker_bias_notes,
+                    correlation_id=correlation_id
                 )
                 
                 logger.info(f"Stored {len(created_setups)} A+ setups and {len(created_levels)} levels from message {message_id}")
@@ -245,21 +247,8 @@ class ParsingService:
             if trading_day is None:
                 trading_day = date.today()
             
-            setups = self.store.get_active_setups_for_day(trading_day)
-            
-            # Filter by ticker if specified
-            if ticker:
-                setups = [setup for setup in setups if setup.ticker.upper() == ticker.upper()]
-            
-            # Convert to dict format with levels
-            result = []
-            for setup in setups:
-                setup_dict = setup.to_dict()
-                levels = self.store.get_levels_by_setup(setup.id)
-                setup_dict['levels'] = [level.to_dict() for level in levels]
-                result.append(setup_dict)
-            
-            return result
+            # Shared per-day snapshot: setups and levels are loaded once per change
+            return self.store.get_setup_snapshot(trading_day).to_dicts(ticker=ticker)
             
         except Exception as e:
             logger.error(f"Error getting active setups: {e}")
@@ -0,0 +1,175 @@
+"""
+Setup View Cache Module
+
+Caches serialized trading-day setup views for the parsing dashboard, keyed by
+(trading_day, ticker). Entries carry an ETag so polling clients can revalidate
+cheaply, and are dropped by the parsing store whenever setups for that day
+are written.
+"""
+import hashlib
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Safety net for writes made outside this process (seconds)
+DEFAULT_VIEW_TTL = 300
+DEFAULT_DAYS_TTL = 300
+
+
+@dataclass
+class CachedView:
+    """A serialized response body and its validator."""
+    body: bytes
+    etag: str
+    built_at: float
+
+
+def compute_etag(body: bytes) -> str:
+    """Compute a strong ETag for a response body."""
+    return hashlib.sha1(body).hexdigest()
+
+
+class SetupViewCache:
+    """
+    Thread-safe cache of serialized setup views and available trading days.
+
+    The available-days list is embedded in every view, so when a reload of
+    that list changes it all cached views are dropped as well.
+
+    Like ``SetupSnapshotStore``, invalidations move a per-day generation (or
+    a floor for every day) forward; a view or days list whose build started
+    before an invalidation is returned to its caller but not cached.
+    """
+
+    def __init__(self, view_ttl: float = DEFAULT_VIEW_TTL, days_ttl: float = DEFAULT_DAYS_TTL):
+        """
+        Initialize the cache.
+
+        Args:
+            view_ttl: Maximum age of a cached view in seconds
+            days_ttl: Maximum age of the cached available-days list in seconds
+        """
+        self.view_ttl = view_ttl
+        self.days_ttl = days_ttl
+        self._lock = threading.RLock()
+        self._views: Dict[Tuple[date, str], CachedView] = {}
+        self._days: Optional[List[date]] = None
+        self._days_loaded_at = 0.0
+        self._clock = itertools.count(1)
+        self._generations: Dict[date, int] = {}
+        self._floor = 0
+        # Moved by every invalidation, since any write may add or remove a day
+        self._days_generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _generation(self, trading_day: date) -> int:
+        """Get the generation of a trading day; call with the lock held."""
+        return max(self._generations.get(trading_day, 0), self._floor)
+
+    @staticmethod
+    def _key(trading_day: date, ticker: Optional[str]) -> Tuple[date, str]:
+        return trading_day, (ticker or '').upper()
+
+    def available_days(self, loader: Callable[[], List[date]]) -> List[date]:
+        """
+        Get the available trading days, reloading them when missing or expired.
+
+        Args:
+            loader: Callable returning the current list of trading days
+
+        Returns:
+            List[date]: Available trading days
+        """
+        with self._lock:
+            if self._days is not None and time.monotonic() - self._days_loaded_at < self.days_ttl:
+                return self._days
+            generation = self._days_generation
+
+        days = list(loader())
+        with self._lock:
+            if self._days is not None and days != self._days:
+                self._views.clear()
+            self._days = days
+            # A list loaded before an invalidation is reloaded on the next request
+            if self._days_generation == generation:
+                self._days_loaded_at = time.monotonic()
+        return days
+
+    def get_or_build(
+        self,
+        trading_day: date,
+        ticker: Optional[str],
+        builder: Callable[[], bytes]
+    ) -> CachedView:
+        """
+        Get the cached view for a day and ticker, building it on a miss.
+
+        Args:
+            trading_day: Trading day of the view
+            ticker: Optional ticker filter (case-insensitive)
+            builder: Callable returning the serialized response body
+
+        Returns:
+            CachedView: Cached body and ETag
+        """
+        key = self._key(trading_day, ticker)
+        with self._lock:
+            cached = self._views.get(key)
+            if cached and time.monotonic() - cached.built_at < self.view_ttl:
+                self.hits += 1
+                return cached
+            generation = self._generation(trading_day)
+
+        body = builder()
+        view = CachedView(body=body, etag=compute_etag(body), built_at=time.monotonic())
+        with self._lock:
+            self.misses += 1
+            # The setups changed while building; serve this body once but don't cache it
+            if self._generation(trading_day) == generation:
+                self._views[key] = view
+        return view
+
+    def invalidate(self, trading_day: Optional[date] = None) -> None:
+        """
+        Drop cached views for a trading day, or everything when no day is given.
+
+        The available-days list is always reloaded on the next request.
+
+        Args:
+            trading_day: Trading day whose setups changed
+        """
+        with self._lock:
+            if trading_day is None:
+                self._floor = next(self._clock)
+                self._views.clear()
+            else:
+                self._generations[trading_day] = next(self._clock)
+                for key in [key for key in self._views if key[0] == trading_day]:
+                    del self._views[key]
+            self._days_generation = next(self._clock)
+            self._days_loaded_at = 0.0
+        logger.debug(f"Invalidated setup views for {trading_day or 'all days'}")
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache counters."""
+        with self._lock:
+            return {'entries': len(self._views), 'hits': self.hits, 'misses': self.misses}
+
+
+# Global cache instance
+_setup_view_cache = None
+
+
+def get_setup_view_cache() -> SetupViewCache:
+    """Get the global setup view cache instance."""
+    global _setup_view_cache
+    if _setup_view_cache is None:
+        _setup_view_cache = SetupViewCache()
+    return _setup_view_cache
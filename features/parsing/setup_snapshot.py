@@ -0,0 +1,221 @@
+"""
+Setup Snapshot Module
+
+Keeps one immutable snapshot of the active setups (with their active levels)
+per trading day, indexed by ticker and direction. Every consumer of "active
+setups for day X" reads the same snapshot instead of running its own query
+and materializing ORM objects.
+
+Snapshots are versioned: the parsing store bumps a day's version whenever a
+setup for that day is stored, updated, deactivated or triggered, and the next
+read rebuilds it. Reads take no lock; a reader holding an older snapshot keeps
+a consistent (if outdated) view. Writes made by another process are picked up
+after DEFAULT_SNAPSHOT_TTL.
+"""
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Safety net for writes made outside this process (seconds)
+DEFAULT_SNAPSHOT_TTL = 300
+# Trading days kept in memory; the least recently built is dropped first
+MAX_SNAPSHOT_DAYS = 30
+
+SetupView = Mapping[str, Any]
+
+
+def _freeze(view: Dict[str, Any]) -> SetupView:
+    frozen = dict(view)
+    frozen['levels'] = tuple(MappingProxyType(dict(level)) for level in view.get('levels', ()))
+    return MappingProxyType(frozen)
+
+
+def _thaw(view: SetupView) -> Dict[str, Any]:
+    thawed = dict(view)
+    thawed['levels'] = [dict(level) for level in view['levels']]
+    return thawed
+
+
+@dataclass(frozen=True)
+class SetupSnapshot:
+    """Read-only active setups of one trading day."""
+    trading_day: date
+    version: int
+    built_at: float
+    # Newest first, as returned by ParsingStore.get_setup_views_for_day
+    setups: Tuple[SetupView, ...]
+    by_ticker: Mapping[str, Tuple[SetupView, ...]]
+    by_direction: Mapping[str, Tuple[SetupView, ...]]
+
+    @classmethod
+    def build(cls, trading_day: date, views: List[Dict[str, Any]], version: int = 0) -> 'SetupSnapshot':
+        """
+        Build a snapshot from setup view dictionaries.
+
+        Args:
+            trading_day: Trading day of the setups
+            views: Setup dictionaries, each with a 'levels' list
+            version: Version the snapshot was built at
+
+        Returns:
+            SetupSnapshot: Frozen snapshot with ticker and direction indexes
+        """
+        setups = tuple(_freeze(view) for view in views)
+        by_ticker: Dict[str, List[SetupView]] = {}
+        by_direction: Dict[str, List[SetupView]] = {}
+        for setup in setups:
+            by_ticker.setdefault((setup['ticker'] or '').upper(), []).append(setup)
+            by_direction.setdefault((setup['direction'] or '').lower(), []).append(setup)
+        return cls(
+            trading_day=trading_day,
+            version=version,
+            built_at=time.monotonic(),
+            setups=setups,
+            by_ticker=MappingProxyType({k: tuple(v) for k, v in by_ticker.items()}),
+            by_direction=MappingProxyType({k: tuple(v) for k, v in by_direction.items()}),
+        )
+
+    @property
+    def tickers(self) -> List[str]:
+        """Tickers with active setups, sorted."""
+        return sorted(self.by_ticker)
+
+    def select(self, ticker: Optional[str] = None, direction: Optional[str] = None) -> Tuple[SetupView, ...]:
+        """
+        Get the setups for a ticker and/or direction (case-insensitive).
+
+        Args:
+            ticker: Optional ticker filter
+            direction: Optional direction filter ('long' or 'short')
+
+        Returns:
+            Tuple of read-only setup views, newest first
+        """
+        if ticker:
+            setups = self.by_ticker.get(ticker.upper(), ())
+            if direction:
+                setups = tuple(s for s in setups if (s['direction'] or '').lower() == direction.lower())
+            return setups
+        if direction:
+            return self.by_direction.get(direction.lower(), ())
+        return self.setups
+
+    def to_dicts(self, ticker: Optional[str] = None, direction: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get mutable (JSON-serializable) copies of the selected setups."""
+        return [_thaw(setup) for setup in self.select(ticker, direction)]
+
+
+class SetupSnapshotStore:
+    """
+    Per-trading-day setup snapshots shared by every consumer in this process.
+
+    Versions come from one monotonic counter: ``invalidate(day)`` moves that
+    day forward and ``invalidate()`` moves every day forward. A snapshot is
+    current while its version equals its day's version, so a build that
+    races with a write is simply rebuilt on the next read.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_SNAPSHOT_TTL, max_days: int = MAX_SNAPSHOT_DAYS):
+        """
+        Initialize the store.
+
+        Args:
+            ttl: Maximum age of a snapshot in seconds
+            max_days: Trading days kept in memory
+        """
+        self.ttl = ttl
+        self.max_days = max_days
+        self._clock = itertools.count(1)
+        self._versions: Dict[date, int] = {}
+        self._floor = 0
+        self._snapshots: Dict[date, SetupSnapshot] = {}
+        # Serializes rebuilds; reads never take it and writers don't wait on it
+        self._build_lock = threading.Lock()
+        self._version_lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+
+    def version(self, trading_day: date) -> int:
+        """Get the current version of a trading day."""
+        return max(self._versions.get(trading_day, 0), self._floor)
+
+    def _is_current(self, snapshot: Optional[SetupSnapshot]) -> bool:
+        return (
+            snapshot is not None
+            and snapshot.version == self.version(snapshot.trading_day)
+            and time.monotonic() - snapshot.built_at < self.ttl
+        )
+
+    def get(self, trading_day: date, loader: Callable[[date], List[Dict[str, Any]]]) -> SetupSnapshot:
+        """
+        Get the snapshot for a trading day, rebuilding it when outdated.
+
+        Args:
+            trading_day: Trading day to get
+            loader: Callable returning the day's setup view dictionaries
+
+        Returns:
+            SetupSnapshot: Current snapshot
+        """
+        snapshot = self._snapshots.get(trading_day)
+        if self._is_current(snapshot):
+            self.hits += 1
+            return snapshot
+
+        with self._build_lock:
+            # Another thread may have rebuilt it while we waited
+            snapshot = self._snapshots.get(trading_day)
+            if self._is_current(snapshot):
+                self.hits += 1
+                return snapshot
+            version = self.version(trading_day)
+            snapshot = SetupSnapshot.build(trading_day, loader(trading_day), version)
+            snapshots = dict(self._snapshots)
+            snapshots.pop(trading_day, None)
+            snapshots[trading_day] = snapshot
+            while len(snapshots) > self.max_days:
+                del snapshots[next(iter(snapshots))]
+            self._snapshots = snapshots
+            self.builds += 1
+        logger.debug(f"Built setup snapshot for {trading_day} v{version} ({len(snapshot.setups)} setups)")
+        return snapshot
+
+    def invalidate(self, trading_day: Optional[date] = None) -> None:
+        """
+        Move a trading day (or every day) to a new version.
+
+        Args:
+            trading_day: Trading day whose setups changed
+        """
+        with self._version_lock:
+            if trading_day is None:
+                self._floor = next(self._clock)
+            else:
+                self._versions[trading_day] = next(self._clock)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get snapshot counters and the version of each cached day."""
+        return {
+            'days': {day.isoformat(): s.version for day, s in self._snapshots.items()},
+            'hits': self.hits,
+            'builds': self.builds
+        }
+
+
+# Global snapshot store
+_setup_snapshots = None
+
+
+def get_setup_snapshots() -> SetupSnapshotStore:
+    """Get the global setup snapshot store."""
+    global _setup_snapshots
+    if _setup_snapshots is None:
+        _setup_snapshots = SetupSnapshotStore()
+    return _setup_snapshots
@@ -9,10 +9,15 @@ from datetime import datetime, date
 from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import text
+from sqlalchemy import and_, func, text
 
 from common.db import db
+from common.statements import statements
+from common.events.publisher import publish_event
+from common.metrics import pipeline_metrics
 from .models import TradeSetup, ParsedLevel
+from .setup_cache import get_setup_view_cache
+from .setup_snapshot import SetupSnapshot, get_setup_snapshots
 from .aplus_parser import TradeSetup as ParsedTradeSetup
 from .setup_converter import convert_parsed_setup_to_model, create_levels_for_setup
 
@@ -21,6 +26,75 @@ logger = logging.getLogger(__name__)
 # Duplicate detection policy configuration
 DUPLICATE_POLICY = "replace"  # Options: "skip", "replace", "allow"
 
+# Hot statistics and duplicate queries, built once (see common.statements)
+DUPLICATE_TRADING_DAYS = statements.register('parsing.duplicate_trading_days', """
+    SELECT trading_day, COUNT(DISTINCT message_id) as msg_count
+    FROM trade_setups
+    GROUP BY trading_day
+    HAVING COUNT(DISTINCT message_id) > 1
+    ORDER BY trading_day DESC
+""")
+COUNT_DISCORD_MESSAGES = statements.register('parsing.count_discord_messages', "SELECT COUNT(*) FROM discord_messages")
+DUPLICATE_GROUP_COUNT = statements.register('parsing.duplicate_group_count', """
+    SELECT COUNT(*) as duplicate_count
+    FROM (
+        SELECT message_id, ticker, trading_day, COUNT(*) as cnt
+        FROM trade_setups
+        GROUP BY message_id, ticker, trading_day
+        HAVING COUNT(*) > 1
+    ) as duplicates
+""")
+TRADING_DAY_DISTRIBUTION = statements.register('parsing.trading_day_distribution', """
+    SELECT trading_day, COUNT(*) as setup_count
+    FROM trade_setups
+    WHERE trading_day IS NOT NULL
+    GROUP BY trading_day
+    ORDER BY trading_day DESC
+    LIMIT 10
+""")
+DUPLICATE_GROUPS = statements.register('parsing.duplicate_groups', """
+    SELECT message_id, ticker, trading_day, COUNT(*) as duplicate_count,
+           array_agg(id ORDER BY created_at ASC) as setup_ids
+    FROM trade_setups
+    GROUP BY message_id, ticker, trading_day
+    HAVING COUNT(*) > 1
+    ORDER BY duplicate_count DESC
+""")
+DELETE_SETUP_LEVELS = statements.register(
+    'parsing.delete_setup_levels', "DELETE FROM parsing_levels WHERE setup_id = :setup_id"
+)
+DELETE_SETUP = statements.register('parsing.delete_setup', "DELETE FROM trade_setups WHERE id = :setup_id")
+
+
+# Setup writes are announced here so other processes can refresh their snapshots
+SETUP_EVENTS_CHANNEL = 'parsing:setup'
+SETUP_EVENT_TYPES = frozenset({'setup.parsed', 'setups.changed'})
+
+
+def setups_changed(trading_day: Optional[date] = None) -> None:
+    """Drop cached views and move the setup snapshot of a trading day (or all days) forward."""
+    get_setup_view_cache().invalidate(trading_day)
+    get_setup_snapshots().invalidate(trading_day)
+
+
+def broadcast_setups_changed(trading_day: Optional[date], reason: str, **details: Any) -> None:
+    """Apply a committed setup change here and announce it to the other processes."""
+    setups_changed(trading_day)
+    publish_event(
+        event_type='setups.changed',
+        data={'trading_day': trading_day.isoformat() if trading_day else None, 'reason': reason, **details},
+        channel=SETUP_EVENTS_CHANNEL,
+        source='parsing_store'
+    )
+
+
+def handle_setup_event(event_type: str, data: Dict[str, Any]) -> None:
+    """Event handler that applies setup writes made by another process (e.g. a parse worker)."""
+    if event_type not in SETUP_EVENT_TYPES:
+        return
+    trading_day = data.get('trading_day')
+    setups_changed(date.fromisoformat(trading_day) if trading_day else None)
+
 
 # Global store instance
 _parsing_store = None
@@ -128,6 +202,7 @@ class ParsingStore:
             # Then delete the setups
             setups_deleted = self.session.query(TradeSetup).filter_by(trading_day=trading_day).delete()
             
+            setups_changed(trading_day)
             logger.info(f"[store] Deleted {setups_deleted} setups and {levels_deleted} levels for trading day {trading_day}")
             return setups_deleted
             
@@ -143,13 +218,7 @@ class ParsingStore:
         Returns:
             List of tuples (trading_day, message_count)
         """
-        result = self.session.execute(text("""
-            SELECT trading_day, COUNT(DISTINCT message_id) as msg_count
-            FROM trade_setups 
-            GROUP BY trading_day 
-            HAVING COUNT(DISTINCT message_id) > 1
-            ORDER BY trading_day DESC
-        """))
+        result = DUPLICATE_TRADING_DAYS.execute(self.session)
         
         return [(row.trading_day, row.msg_count) for row in result]
     
@@ -158,16 +227,21 @@ class ParsingStore:
         message_id: str,
         parsed_setups: List[ParsedTradeSetup], 
         trading_day: Optional[date] = None,
-        ticker_bias_notes: Optional[Dict[str, str]] = None
+        ticker_bias_notes: Optional[Dict[str, str]] = None,
+        correlation_id: Optional[str] = None
     ) -> Tuple[List[TradeSetup], List[ParsedLevel]]:
         """
         Store parsed setups and levels from a message using the refactored TradeSetup dataclass.
+
+        A setup.parsed event is published for each stored setup once committed,
+        whichever parser (generic or A+) produced it.
         
         Args:
             message_id: Discord message ID
             parsed_setups: List of TradeSetup dataclasses from the refactored parser
             trading_day: Trading day (defaults to today)
             ticker_bias_notes: Optional dict of bias notes per ticker
+            correlation_id: Event correlation ID for tracing
             
         Returns:
             Tuple of (created_setups, created_levels)
@@ -256,7 +330,14 @@ class ParsingStore:
             # Commit all changes
             logger.debug(f"[store] Committing {len(created_setups)} setups and {len(created_levels)} levels to database")
             self.session.commit()
+            for day in {setup.trading_day for setup in created_setups} or {trading_day}:
+                setups_changed(day)
+            pipeline_metrics.mark(message_id, 'setups_stored')
             logger.info(f"Successfully stored {len(created_setups)} setups and {len(created_levels)} levels")
+
+            for setup in created_setups:
+                setup_levels = [level for level in created_levels if level.setup_id == setup.id]
+                self._publish_setup_parsed(setup, setup_levels, correlation_id)
             
             return created_setups, created_levels
             
@@ -273,6 +354,57 @@ class ParsingStore:
             logger.error(f"Unexpected error storing parsed message: {e}")
             raise
     
+    def _publish_setup_parsed(self, setup: TradeSetup, levels: List[ParsedLevel], correlation_id: Optional[str] = None) -> None:
+        """
+        Emit SETUP_PARSED event for downstream consumers.
+        
+        Args:
+            setup: Stored TradeSetup instance
+            levels: Associated ParsedLevel instances
+            correlation_id: Event correlation ID for tracing
+        """
+        try:
+            event_data = {
+                'setup_id': setup.id,
+                'ticker': setup.ticker,
+                'label': setup.label,
+                'keywords': setup.keywords,
+                'direction': setup.direction,
+                'confidence_score': setup.confidence_score,
+                'trading_day': setup.trading_day.isoformat(),
+                'message_id': setup.message_id,
+                'levels_count': len(levels),
+                'levels': [
+                    {
+                        'id': level.id,
+                        'level_type': level.level_type,
+                        'trigger_price': float(level.trigger_price),
+                        'direction': level.direction,
+                        'strategy': level.strategy
+                    }
+                    for level in levels
+                ],
+                'metadata': {
+                    'parsed_at': datetime.utcnow().isoformat(),
+                    'parser_version': '2.0',
+                    'confidence_threshold': 0.5
+                }
+            }
+            
+            publish_event(
+                channel=SETUP_EVENTS_CHANNEL,
+                event_type='setup.parsed',
+                data=event_data,
+                source='parsing_store',
+                correlation_id=correlation_id
+            )
+            
+            pipeline_metrics.mark(setup.message_id, 'setup_published')
+            logger.debug(f"Emitted SETUP_PARSED event for setup {setup.id}")
+            
+        except Exception as e:
+            logger.error(f"Error emitting setup parsed event: {e}")
+    
     def _update_message_processed_status(self, message_id: str, is_processed: bool) -> None:
         """
         Update the is_processed status for a Discord message.
@@ -384,6 +516,84 @@ class ParsingStore:
             logger.error(f"Error querying levels by setup: {e}")
             return []
     
+    def get_setup_views_for_day(self, trading_day: date, ticker: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get active setups for a trading day with their active levels in one query.
+
+        Setups and levels are fetched with a single outer join, and the ticker
+        filter is applied in SQL rather than after loading the whole day.
+
+        Args:
+            trading_day: Trading day to load
+            ticker: Optional ticker filter (case-insensitive)
+
+        Returns:
+            List of setup dictionaries, newest first, each with a 'levels' list
+        """
+        try:
+            return self._load_setup_views(trading_day, ticker)
+        except SQLAlchemyError as e:
+            logger.error(f"Error querying setup views for day: {e}")
+            return []
+
+    def _load_setup_views(self, trading_day: date, ticker: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = self.session.query(TradeSetup, ParsedLevel).outerjoin(
+            ParsedLevel,
+            and_(ParsedLevel.setup_id == TradeSetup.id, ParsedLevel.active.is_(True))
+        ).filter(
+            TradeSetup.trading_day == trading_day,
+            TradeSetup.active.is_(True)
+        )
+        if ticker:
+            query = query.filter(func.upper(TradeSetup.ticker) == ticker.upper())
+        rows = query.order_by(
+            TradeSetup.created_at.desc(), TradeSetup.id, ParsedLevel.created_at
+        ).all()
+
+        views: Dict[str, Dict[str, Any]] = {}
+        for setup, level in rows:
+            view = views.get(setup.id)
+            if view is None:
+                view = {
+                    'id': setup.id,
+                    'message_id': setup.message_id,
+                    'ticker': setup.ticker,
+                    'trading_day': setup.trading_day.isoformat(),
+                    'index': setup.index,
+                    'trigger_level': float(setup.trigger_level) if setup.trigger_level else None,
+                    'target_prices': setup.target_prices,
+                    'direction': setup.direction,
+                    'label': setup.label,
+                    'keywords': setup.keywords,
+                    'emoji_hint': setup.emoji_hint,
+                    'raw_line': setup.raw_line,
+                    'setup_type': setup.setup_type,
+                    'profile_name': setup.profile_name,
+                    'bias_note': setup.bias_note,
+                    'active': setup.active,
+                    'confidence_score': setup.confidence_score,
+                    'created_at': setup.created_at.isoformat() if setup.created_at else None,
+                    'updated_at': setup.updated_at.isoformat() if setup.updated_at else None,
+                    'levels': []
+                }
+                views[setup.id] = view
+            if level is not None:
+                view['levels'].append(level.to_dict())
+        return list(views.values())
+    
+    def get_setup_snapshot(self, trading_day: Optional[date] = None) -> SetupSnapshot:
+        """
+        Get the shared snapshot of a trading day's active setups and levels.
+
+        Args:
+            trading_day: Trading day (defaults to today)
+
+        Returns:
+            SetupSnapshot: Read-only setups indexed by ticker and direction
+        """
+        # Query errors propagate rather than caching an empty day
+        return get_setup_snapshots().get(trading_day or date.today(), self._load_setup_views)
+
     def get_available_trading_days(self) -> List[date]:
         """Get list of distinct trading days that have active setups."""
         try:
@@ -404,6 +614,7 @@ class ParsingStore:
                 setup.confidence_score = new_confidence
                 setup.updated_at = datetime.utcnow()
                 self.session.commit()
+                broadcast_setups_changed(setup.trading_day, 'confidence_updated', setup_id=setup_id)
                 logger.info(f"Updated confidence for setup {setup_id} to {new_confidence}")
                 return True
             return False
@@ -427,6 +638,7 @@ class ParsingStore:
                     level.updated_at = datetime.utcnow()
                 
                 self.session.commit()
+                broadcast_setups_changed(setup.trading_day, 'deactivated', setup_id=setup_id)
                 logger.info(f"Deactivated setup {setup_id} and its {len(levels)} levels")
                 return True
             return False
@@ -443,6 +655,10 @@ class ParsingStore:
                 level.triggered = True
                 level.updated_at = datetime.utcnow()
                 self.session.commit()
+                broadcast_setups_changed(
+                    level.setup.trading_day if level.setup else None, 'level_triggered',
+                    setup_id=level.setup_id, level_id=level_id
+                )
                 logger.info(f"Triggered level {level_id}")
                 return True
             return False
@@ -484,33 +700,16 @@ class ParsingStore:
             setup_index_distribution = Counter(s.index for s in active_setups_query if s.index is not None)
             
             # Message processing effectiveness
-            total_discord_messages = self.session.execute(text("SELECT COUNT(*) FROM discord_messages")).scalar()
+            total_discord_messages = COUNT_DISCORD_MESSAGES.execute(self.session).scalar()
             unique_parsed_messages = self.session.query(TradeSetup.message_id).distinct().count()
             
             # Duplicate detection
-            duplicate_query = text("""
-                SELECT COUNT(*) as duplicate_count
-                FROM (
-                    SELECT message_id, ticker, trading_day, COUNT(*) as cnt
-                    FROM trade_setups 
-                    GROUP BY message_id, ticker, trading_day 
-                    HAVING COUNT(*) > 1
-                ) as duplicates
-            """)
-            duplicate_count = self.session.execute(duplicate_query).scalar() or 0
+            duplicate_count = DUPLICATE_GROUP_COUNT.execute(self.session).scalar() or 0
             
             # Trading day distribution
-            trading_day_query = text("""
-                SELECT trading_day, COUNT(*) as setup_count
-                FROM trade_setups 
-                WHERE trading_day IS NOT NULL
-                GROUP BY trading_day 
-                ORDER BY trading_day DESC 
-                LIMIT 10
-            """)
             trading_day_distribution = [
                 {'trading_day': row[0].isoformat() if row[0] else None, 'setup_count': row[1]}
-                for row in self.session.execute(trading_day_query).fetchall()
+                for row in TRADING_DAY_DISTRIBUTION.execute(self.session).fetchall()
             ]
             
             # Calculate processing rate
@@ -561,16 +760,7 @@ class ParsingStore:
         """
         try:
             # Find duplicate groups
-            duplicate_query = text("""
-                SELECT message_id, ticker, trading_day, COUNT(*) as duplicate_count, 
-                       array_agg(id ORDER BY created_at ASC) as setup_ids
-                FROM trade_setups 
-                GROUP BY message_id, ticker, trading_day 
-                HAVING COUNT(*) > 1
-                ORDER BY duplicate_count DESC
-            """)
-            
-            duplicate_groups = self.session.execute(duplicate_query).fetchall()
+            duplicate_groups = DUPLICATE_GROUPS.execute(self.session).fetchall()
             
             if dry_run:
                 total_duplicates = sum(row[3] - 1 for row in duplicate_groups)  # -1 because we keep first one
@@ -599,14 +789,13 @@ class ParsingStore:
                 
                 for setup_id in ids_to_remove:
                     # First remove associated levels
-                    self.session.execute(text("DELETE FROM parsing_levels WHERE setup_id = :setup_id"), 
-                                       {'setup_id': setup_id})
+                    DELETE_SETUP_LEVELS.execute(self.session, {'setup_id': setup_id})
                     # Then remove the setup
-                    self.session.execute(text("DELETE FROM trade_setups WHERE id = :setup_id"), 
-                                       {'setup_id': setup_id})
+                    DELETE_SETUP.execute(self.session, {'setup_id': setup_id})
                     removed_count += 1
             
             self.session.commit()
+            broadcast_setups_changed(None, 'duplicates_removed')
             logger.info(f"Cleanup complete: removed {removed_count} duplicate setups")
             
             return {
@@ -627,7 +816,7 @@ class ParsingStore:
     def get_audit_anomalies(self) -> Dict[str, Any]:
         """Get audit data for anomalies in trade setup dates and data quality."""
         try:
-            from common.timezone import get_central_trading_day
+            from common.timezone import get_central_trading_day, is_trading_day
             
             # Find setups on non-trading days (weekends)
             weekend_setups = []
@@ -674,7 +863,7 @@ class ParsingStore:
                 'anomaly_summary': {
                     'has_weekend_trading': len(weekend_setups) > 0,
                     'has_suspicious_volume': len(duplicate_messages) > 0,
-                    'today_is_trading_day': today.weekday() < 5  # Monday=0 to Friday=4
+                    'today_is_trading_day': is_trading_day()
                 }
             }
             
@@ -743,6 +932,7 @@ class ParsingStore:
             
             # Commit the transaction
             self.session.commit()
+            broadcast_setups_changed(None, 'cleared')
             
             logger.info(f"Successfully cleared {deleted_setups} trade setups and {deleted_levels} parsed levels")
             
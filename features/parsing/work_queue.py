@@ -0,0 +1,420 @@
+"""
+Parsing Work Queue
+
+Work-queue mode for horizontally scaled parse workers. Every parsing listener
+enqueues the messages it is notified about (idempotently, keyed by message
+ID); workers claim batches with ``SELECT ... FOR UPDATE SKIP LOCKED`` and hold
+a lease while they parse. A worker that dies simply lets its lease expire and
+the jobs are claimed again, and completions are fenced on the claiming worker
+so a late worker cannot overwrite a reclaimed job.
+
+Enable with ``PARSING_WORK_QUEUE=true`` (``launcher.py --scale parse=N`` sets
+it for its parse processes).
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from flask import current_app, has_app_context
+from sqlalchemy import and_, func, or_, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from common.db import db
+from common.metrics import LatencyHistogram
+from .models import ParseJob
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 10
+DEFAULT_LEASE_SECONDS = 60.0
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_POLL_INTERVAL = 2.0
+RETRY_DELAY_SECONDS = 5.0
+FINISHED_RETENTION_DAYS = 7
+PURGE_INTERVAL_SECONDS = 3600.0
+
+# Handler returns False (or raises) when a job should be retried
+JobHandler = Callable[[Dict[str, Any]], Any]
+
+
+def work_queue_enabled() -> bool:
+    """Check whether parsing runs in work-queue mode (PARSING_WORK_QUEUE)."""
+    return os.environ.get('PARSING_WORK_QUEUE', 'false').lower() in ('1', 'true', 'yes')
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class QueueMetrics:
+    """Claim latency and queue wait histograms for the workers in this process."""
+
+    def __init__(self):
+        # Round trip of one claim transaction
+        self.claim_latency = LatencyHistogram()
+        # Time a job waited between enqueue (or retry) and being claimed
+        self.queue_wait = LatencyHistogram()
+        self.counters = {'claimed': 0, 'completed': 0, 'retried': 0, 'failed': 0, 'lease_lost': 0}
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'claim_latency': self.claim_latency.snapshot(),
+            'queue_wait': self.queue_wait.snapshot(),
+            **self.counters
+        }
+
+    def render_prometheus(self) -> str:
+        """Render the histograms and counters in the Prometheus text format."""
+        lines = []
+        for name, histogram, help_text in (
+            ('parse_queue_claim_latency_seconds', self.claim_latency, 'Duration of one parse job claim transaction'),
+            ('parse_queue_wait_seconds', self.queue_wait, 'Time parse jobs waited before being claimed'),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} summary")
+            for q, seconds in histogram.quantiles((0.5, 0.95, 0.99)).items():
+                if seconds is not None:
+                    lines.append(f'{name}{{quantile="{q:g}"}} {seconds:.6f}')
+            lines.append(f"{name}_sum {histogram.total_us / 1_000_000:.6f}")
+            lines.append(f"{name}_count {histogram.count}")
+        lines.append("# HELP parse_queue_jobs_total Parse jobs by outcome in this process")
+        lines.append("# TYPE parse_queue_jobs_total counter")
+        for outcome, count in self.counters.items():
+            lines.append(f'parse_queue_jobs_total{{outcome="{outcome}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        self.__init__()
+
+
+# Global metrics for this process
+queue_metrics = QueueMetrics()
+
+
+class ParseWorkQueue:
+    """Database-backed parse job queue. Methods require an application context."""
+
+    def __init__(self, lease_seconds: float = DEFAULT_LEASE_SECONDS, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        """
+        Initialize the queue.
+
+        Args:
+            lease_seconds: How long a claim is valid before other workers may take the job
+            max_attempts: Claims per job before it is marked failed
+        """
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    def enqueue(self, message_id: str, payload: Dict[str, Any]) -> bool:
+        """
+        Add a message to the queue unless it is already queued.
+
+        Args:
+            message_id: Discord message ID
+            payload: Event data handed to the parse handler
+
+        Returns:
+            bool: True if a new job was created
+        """
+        dialect = postgresql if db.engine.dialect.name == 'postgresql' else sqlite
+        now = datetime.utcnow()
+        statement = dialect.insert(ParseJob).values(
+            message_id=str(message_id), payload=payload, status='pending', attempts=0,
+            enqueued_at=now, available_at=now
+        ).on_conflict_do_nothing(index_elements=['message_id'])
+        try:
+            result = db.session.execute(statement)
+            db.session.commit()
+        except Exception:
+            # Leave the session usable for the caller's retry
+            db.session.rollback()
+            raise
+        return result.rowcount > 0
+
+    def claim(self, worker_id: str, limit: int = DEFAULT_BATCH_SIZE, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Claim up to ``limit`` runnable jobs, skipping rows other workers hold locked.
+
+        Args:
+            worker_id: Claiming worker
+            limit: Maximum jobs to claim
+            now: Current UTC time (default: now)
+
+        Returns:
+            List of claimed jobs (id, message_id, payload, attempts)
+        """
+        now = now or datetime.utcnow()
+        started = time.perf_counter()
+        runnable = or_(
+            and_(ParseJob.status == 'pending', ParseJob.available_at <= now),
+            and_(ParseJob.status == 'claimed', ParseJob.lease_expires_at < now),
+        )
+        try:
+            rows = db.session.execute(
+                select(ParseJob.id, ParseJob.message_id, ParseJob.payload, ParseJob.attempts, ParseJob.available_at)
+                .where(runnable)
+                .order_by(ParseJob.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            ).all()
+            if rows:
+                db.session.execute(
+                    update(ParseJob)
+                    .where(ParseJob.id.in_([row.id for row in rows]))
+                    .values(status='claimed', claimed_by=worker_id, claimed_at=now,
+                            lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                            attempts=ParseJob.attempts + 1)
+                )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        finally:
+            queue_metrics.claim_latency.record(time.perf_counter() - started)
+
+        for row in rows:
+            queue_metrics.queue_wait.record(max(0.0, (now - row.available_at).total_seconds()))
+        queue_metrics.counters['claimed'] += len(rows)
+        return [
+            {'id': row.id, 'message_id': row.message_id, 'payload': row.payload, 'attempts': row.attempts + 1}
+            for row in rows
+        ]
+
+    def renew(self, worker_id: str, job_ids: List[int], now: Optional[datetime] = None) -> int:
+        """
+        Extend the lease on jobs this worker still holds.
+
+        Returns:
+            int: Number of leases extended
+        """
+        if not job_ids:
+            return 0
+        now = now or datetime.utcnow()
+        result = db.session.execute(
+            update(ParseJob)
+            .where(ParseJob.id.in_(job_ids), ParseJob.claimed_by == worker_id, ParseJob.status == 'claimed')
+            .values(lease_expires_at=now + timedelta(seconds=self.lease_seconds))
+        )
+        db.session.commit()
+        return result.rowcount
+
+    def complete(self, worker_id: str, job_id: int, now: Optional[datetime] = None) -> bool:
+        """
+        Mark a job done if this worker still holds it.
+
+        Returns:
+            bool: False if the lease was lost to another worker
+        """
+        result = db.session.execute(
+            update(ParseJob)
+            .where(ParseJob.id == job_id, ParseJob.claimed_by == worker_id, ParseJob.status == 'claimed')
+            .values(status='done', finished_at=now or datetime.utcnow(), lease_expires_at=None, last_error=None)
+        )
+        db.session.commit()
+        if result.rowcount:
+            queue_metrics.counters['completed'] += 1
+            return True
+        queue_metrics.counters['lease_lost'] += 1
+        logger.warning(f"Parse job {job_id} was reclaimed before {worker_id} completed it")
+        return False
+
+    def fail(self, worker_id: str, job: Dict[str, Any], error: str, now: Optional[datetime] = None) -> str:
+        """
+        Release a job after a failed attempt: back to pending with a delay, or failed for good.
+
+        Args:
+            worker_id: Worker that held the job
+            job: Claimed job
+            error: Error description
+            now: Current UTC time (default: now)
+
+        Returns:
+            str: New status ('pending', 'failed' or 'lost' if the lease had moved on)
+        """
+        now = now or datetime.utcnow()
+        exhausted = job['attempts'] >= self.max_attempts
+        status = 'failed' if exhausted else 'pending'
+        result = db.session.execute(
+            update(ParseJob)
+            .where(ParseJob.id == job['id'], ParseJob.claimed_by == worker_id, ParseJob.status == 'claimed')
+            .values(
+                status=status, last_error=error[:2000], lease_expires_at=None,
+                available_at=now + timedelta(seconds=RETRY_DELAY_SECONDS * job['attempts']),
+                finished_at=now if exhausted else None
+            )
+        )
+        db.session.commit()
+        if not result.rowcount:
+            queue_metrics.counters['lease_lost'] += 1
+            return 'lost'
+        queue_metrics.counters['failed' if exhausted else 'retried'] += 1
+        if exhausted:
+            logger.error(f"Parse job {job['id']} (message {job['message_id']}) failed after {job['attempts']} attempts: {error}")
+        return status
+
+    def purge_finished(self, before: datetime) -> int:
+        """Delete done and failed jobs finished before the cutoff."""
+        deleted = ParseJob.query.filter(
+            ParseJob.status.in_(('done', 'failed')), ParseJob.finished_at < before
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return deleted
+
+    def status(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Get queue depth, expired leases and recent claim wait across all workers.
+
+        Returns:
+            Dict with counts by status, oldest pending age and claim wait percentiles
+        """
+        now = now or datetime.utcnow()
+        counts = dict(db.session.query(ParseJob.status, func.count(ParseJob.id)).group_by(ParseJob.status).all())
+        expired = ParseJob.query.filter(ParseJob.status == 'claimed', ParseJob.lease_expires_at < now).count()
+        oldest = db.session.query(func.min(ParseJob.available_at)).filter(ParseJob.status == 'pending').scalar()
+        workers = db.session.query(ParseJob.claimed_by, func.count(ParseJob.id)).filter(
+            ParseJob.status == 'claimed').group_by(ParseJob.claimed_by).all()
+
+        status = {
+            'counts': {name: counts.get(name, 0) for name in ('pending', 'claimed', 'done', 'failed')},
+            'expired_leases': expired,
+            'oldest_pending_seconds': round((now - oldest).total_seconds(), 1) if oldest else None,
+            'claimed_by_worker': dict(workers),
+            'claim_wait_ms': None
+        }
+        if db.engine.dialect.name == 'postgresql':
+            row = db.session.execute(text("""
+                SELECT percentile_cont(0.5) WITHIN GROUP (ORDER BY wait) AS p50,
+                       percentile_cont(0.95) WITHIN GROUP (ORDER BY wait) AS p95,
+                       COUNT(*) AS count
+                FROM (
+                    SELECT EXTRACT(EPOCH FROM (claimed_at - enqueued_at)) * 1000 AS wait
+                    FROM parse_jobs WHERE claimed_at >= :since
+                ) waits
+            """), {'since': now - timedelta(hours=1)}).mappings().first()
+            if row and row['count']:
+                status['claim_wait_ms'] = {
+                    'count': row['count'],
+                    'p50': round(float(row['p50']), 1),
+                    'p95': round(float(row['p95']), 1)
+                }
+        return status
+
+
+class ParseWorker:
+    """Claims parse jobs in batches and runs them through a handler."""
+
+    def __init__(
+        self,
+        handler: JobHandler,
+        queue: Optional[ParseWorkQueue] = None,
+        worker_id: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        poll_interval: float = DEFAULT_POLL_INTERVAL
+    ):
+        """
+        Initialize the worker.
+
+        Args:
+            handler: handler(payload) for one job; returning False or raising retries the job
+            queue: Work queue (default: ParseWorkQueue with env lease settings)
+            worker_id: Identity recorded on claims (default: host:pid)
+            batch_size: Jobs claimed per transaction
+            poll_interval: Seconds between claims when the queue is empty
+        """
+        self.handler = handler
+        self.queue = queue or ParseWorkQueue(
+            lease_seconds=float(os.environ.get('PARSE_LEASE_SECONDS', DEFAULT_LEASE_SECONDS))
+        )
+        self.worker_id = worker_id or default_worker_id()
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.running = False
+        self._wakeup: Optional[asyncio.Event] = None
+        self._last_purge = 0.0
+
+    def wake(self) -> None:
+        """Claim again now instead of waiting for the poll interval (e.g. after enqueueing)."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def run_batch(self) -> int:
+        """
+        Claim and handle one batch.
+
+        Returns:
+            int: Number of jobs claimed
+        """
+        jobs = self.queue.claim(self.worker_id, self.batch_size)
+        claimed_at = time.monotonic()
+        for index, job in enumerate(jobs):
+            # Keep the rest of the batch leased while earlier jobs run long
+            if time.monotonic() - claimed_at > self.queue.lease_seconds / 2:
+                self.queue.renew(self.worker_id, [j['id'] for j in jobs[index:]])
+                claimed_at = time.monotonic()
+            try:
+                ok = self.handler(job['payload']) is not False
+                error = 'handler rejected job'
+            except Exception as e:
+                db.session.rollback()
+                ok, error = False, str(e)
+            if ok:
+                self.queue.complete(self.worker_id, job['id'])
+            else:
+                self.queue.fail(self.worker_id, job, error)
+        return len(jobs)
+
+    def _maybe_purge(self) -> None:
+        if time.monotonic() - self._last_purge < PURGE_INTERVAL_SECONDS:
+            return
+        self._last_purge = time.monotonic()
+        deleted = self.queue.purge_finished(datetime.utcnow() - timedelta(days=FINISHED_RETENTION_DAYS))
+        if deleted:
+            logger.info(f"Purged {deleted} finished parse jobs")
+
+    def _run_batch_in_thread(self, app) -> int:
+        # A fresh app context gives the worker thread its own session, removed on exit
+        with app.app_context():
+            claimed = self.run_batch()
+            self._maybe_purge()
+            return claimed
+
+    async def run(self) -> None:
+        """
+        Claim and handle jobs until stopped.
+
+        Batches do blocking database and parsing work, so they run in a thread
+        and the event loop stays free for the Discord bot and the listeners.
+        """
+        app = current_app._get_current_object() if has_app_context() else None
+        if app is None:
+            raise RuntimeError("ParseWorker.run needs a Flask application context")
+        self._wakeup = asyncio.Event()
+        self.running = True
+        logger.info(f"Parse worker {self.worker_id} started (batch {self.batch_size}, lease {self.queue.lease_seconds:.0f}s)")
+        while self.running:
+            self._wakeup.clear()
+            try:
+                claimed = await asyncio.to_thread(self._run_batch_in_thread, app)
+            except Exception as e:
+                logger.error(f"Parse worker {self.worker_id} error: {e}")
+                claimed = 0
+            if claimed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                # Full batch: yield to the listener before claiming the next one
+                await asyncio.sleep(0)
+        logger.info(f"Parse worker {self.worker_id} stopped")
+
+    def stop(self) -> None:
+        self.running = False
+        self.wake()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'worker_id': self.worker_id, 'running': self.running, **queue_metrics.snapshot()}
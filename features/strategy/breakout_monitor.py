@@ -14,6 +14,7 @@ from typing import Dict, List, Any, Optional, AsyncGenerator, Tuple, Set, Union
 from common.events.publisher import publish_event
 from common.events.constants import EventTypes, EventChannels
 from features.setups.enhanced_parser import Signal, extract_unique_levels
+from features.strategy.confirmation import BreakoutConfirmationEngine
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -215,16 +216,26 @@ async def monitor_signals(
         min_body_percent: Minimum candle body size as percentage
         volume_multiplier: Volume must be this multiple of average volume
     """
-    # Group signals by ticker for efficient processing
-    ticker_signals = {}
+    # Group breakout signals by ticker and load their triggers into the engine
+    engine = BreakoutConfirmationEngine(
+        avg_volume_periods=avg_volume_periods,
+        min_body_percent=min_body_percent,
+        volume_multiplier=volume_multiplier
+    )
+    signals_by_id: Dict[Any, Signal] = {}
+    ticker_levels: Dict[str, List[Tuple[Any, float]]] = {}
     for signal in signals:
+        if signal.type != "breakout":
+            continue
         ticker = signal.setup_id.split('-')[0] if isinstance(signal.setup_id, str) else "unknown"
-        if ticker not in ticker_signals:
-            ticker_signals[ticker] = []
-        ticker_signals[ticker].append(signal)
-
-    # Keep track of previous candles for each ticker to calculate volume averages
-    ticker_candles: Dict[str, List[Candle]] = {}
+        signals_by_id[signal.id] = signal
+        ticker_levels.setdefault(ticker, []).append((signal.id, signal.trigger))
+    for ticker, entries in ticker_levels.items():
+        engine.set_levels(ticker, entries)
+        for signal_id, _ in entries:
+            # Skip if already confirmed
+            if signal_id in _confirmed_signals:
+                engine.mark_confirmed(ticker, signal_id)
 
     # Process candles as they come in
     try:
@@ -238,69 +249,34 @@ async def monitor_signals(
             # Create a Candle object from the data
             candle = Candle(candle_data)
 
-            # Initialize candle list for this ticker if needed
-            if ticker not in ticker_candles:
-                ticker_candles[ticker] = []
-
-            # Add this candle to the history
-            ticker_candles[ticker].append(candle)
-
-            # Keep only the most recent 20 candles (more than we need for avg volume)
-            ticker_candles[ticker] = ticker_candles[ticker][-20:]
-
-            # Calculate average volume for this ticker
-            avg_volume = calculate_average_volume(
-                ticker_candles[ticker],
-                periods=avg_volume_periods
-            )
-
-            # Skip if no signals for this ticker
-            if ticker not in ticker_signals:
-                continue
-
-            # Check each signal for this ticker
-            for signal in ticker_signals[ticker]:
-                # Skip if already confirmed
-                if signal.id in _confirmed_signals:
-                    continue
-
-                # Skip non-breakout signals
-                if signal.type != "breakout":
-                    continue
-
-                # Check if this candle confirms the breakout
-                previous_candles = ticker_candles[ticker][:-1]  # All except current
-
-                if is_confirmed_breakout(
-                    candle=candle,
-                    signal=signal,
-                    avg_volume=avg_volume,
-                    previous_candles=previous_candles,
-                    min_body_percent=min_body_percent,
-                    volume_multiplier=volume_multiplier
-                ):
-                    # Mark as confirmed to avoid duplicate alerts
-                    _confirmed_signals.add(signal.id)
-
-                    # Log the confirmation
-                    logger.info(
-                        f"CONFIRMED BREAKOUT: {ticker} above {signal.trigger:.2f} "
-                        f"(close: {candle.close:.2f}, vol: {candle.volume:.0f} vs avg: {avg_volume:.0f})"
-                    )
-
-                    # Update the signal in place
-                    signal.confirmed = True
-                    signal.confirmed_at = datetime.now()
-                    signal.confirmation_details = {
-                        "price": candle.close,
-                        "volume": candle.volume,
-                        "avg_volume": avg_volume,
-                        "body_percent": candle.body_percent,
-                        "timestamp": candle.timestamp.isoformat() if isinstance(candle.timestamp, datetime) else candle.timestamp
-                    }
-
-                    # Publish confirmation event
-                    publish_confirmation_event(signal, candle, avg_volume)
+            # Push the candle and evaluate every trigger for this ticker at once
+            for signal_id in engine.update(ticker, candle):
+                signal = signals_by_id[signal_id]
+                avg_volume = engine.average_volume(ticker)
+
+                # Mark as confirmed to avoid duplicate alerts
+                _confirmed_signals.add(signal_id)
+                engine.mark_confirmed(ticker, signal_id)
+
+                # Log the confirmation
+                logger.info(
+                    f"CONFIRMED BREAKOUT: {ticker} above {signal.trigger:.2f} "
+                    f"(close: {candle.close:.2f}, vol: {candle.volume:.0f} vs avg: {avg_volume:.0f})"
+                )
+
+                # Update the signal in place
+                signal.confirmed = True
+                signal.confirmed_at = datetime.now()
+                signal.confirmation_details = {
+                    "price": candle.close,
+                    "volume": candle.volume,
+                    "avg_volume": avg_volume,
+                    "body_percent": candle.body_percent,
+                    "timestamp": candle.timestamp.isoformat() if isinstance(candle.timestamp, datetime) else candle.timestamp
+                }
+
+                # Publish confirmation event
+                publish_confirmation_event(signal, candle, avg_volume)
 
     except Exception as e:
         logger.error(f"Error in signal monitor: {e}")
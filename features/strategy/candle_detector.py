@@ -2,127 +2,228 @@
 Candle Detector Module
 
 This module implements candle-based signal detection for trading setups.
-It monitors candle closes and detects when price crosses trigger levels using
-PostgreSQL for event notification instead of Redis.
+It subscribes to bar-close notifications over PostgreSQL LISTEN/NOTIFY and
+detects when price crosses trigger or target levels. Active signals are kept
+per symbol in lists sorted by trigger and target price, so each closed bar only
+touches the signals it actually crosses. Resulting signal events are buffered
+and published in batches over a single connection.
 """
+import asyncio
+import bisect
+import itertools
 import logging
-import threading
-import time
 from datetime import datetime
-from typing import Dict, List, Set, Any, Optional
+from typing import Dict, List, Set, Any, Optional, Tuple
 
-from common.events.constants import EventChannels
-from common.events import publish_event, subscribe_to_events
-from features.market.historical_data import get_historical_data
-from common.db import db
-from common.db_models import CandleModel
+from common.async_runtime import runtime
+from common.events.constants import EventTypes
+from common.events.publisher import publish_event, listen_for_events, publish_event_batch_async
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
-# Thread control variables
-_detector_thread = None
-_thread_running = False
-_last_event_id = 0
+# Name of the listener task supervised on the shared async runtime
+TASK_NAME = 'candle-detector'
+
+# Delay before buffered signal events are flushed in one batch
+SIGNAL_FLUSH_INTERVAL = 0.05
+
+# Signal state change -> published event type
+SIGNAL_EVENT_TYPES = {
+    'trigger': EventTypes.SIGNAL_TRIGGERED,
+    'target_hit': EventTypes.SIGNAL_TARGET_HIT,
+    'completed': EventTypes.SIGNAL_COMPLETED,
+}
+
+# Sequence used to keep sort keys unique for signals at the same price
+_sequence = itertools.count()
+
+
+class SymbolSignalBook:
+    """
+    Active signals for one symbol, indexed by price.
+
+    Pending breakout and breakdown triggers and the unhit targets of triggered
+    signals each live in a list sorted by price. A closed bar resolves the
+    crossed entries with a bisect and a slice instead of scanning every signal.
+    """
+
+    def __init__(self):
+        self.signals: List[Dict[str, Any]] = []
+        self._breakout_triggers: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._breakdown_triggers: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._breakout_targets: List[Tuple[float, int, Dict[str, Any], Dict[str, Any]]] = []
+        self._breakdown_targets: List[Tuple[float, int, Dict[str, Any], Dict[str, Any]]] = []
+
+    def __len__(self) -> int:
+        return len(self.signals)
+
+    def add(self, signal: Dict[str, Any]) -> None:
+        """Track a signal and index it by its trigger or target prices."""
+        self.signals.append(signal)
+        self._index(signal)
+
+    def remove(self, signal_id: str) -> Optional[Dict[str, Any]]:
+        """Stop tracking a signal; returns it if found."""
+        for i, signal in enumerate(self.signals):
+            if str(signal.get('id')) == str(signal_id):
+                removed = self.signals.pop(i)
+                self._reindex()
+                return removed
+        return None
+
+    def _reindex(self) -> None:
+        self._breakout_triggers.clear()
+        self._breakdown_triggers.clear()
+        self._breakout_targets.clear()
+        self._breakdown_targets.clear()
+        for signal in self.signals:
+            self._index(signal)
+
+    def _index(self, signal: Dict[str, Any]) -> None:
+        category = signal.get('category', '')
+        status = signal.get('status', 'pending')
+
+        if status in ['pending', None]:
+            trigger_level = signal.get('trigger', {}).get('price', 0)
+            # Skip if no trigger level
+            if not trigger_level:
+                return
+            entry = (float(trigger_level), next(_sequence), signal)
+            if category == 'breakout':
+                bisect.insort(self._breakout_triggers, entry)
+            elif category == 'breakdown':
+                bisect.insort(self._breakdown_triggers, entry)
+        elif status == 'triggered':
+            self._index_targets(signal)
+
+    def _index_targets(self, signal: Dict[str, Any]) -> None:
+        category = signal.get('category', '')
+        hit_targets = signal.get('hit_targets', [])
+        book = self._breakout_targets if category == 'breakout' else (
+            self._breakdown_targets if category == 'breakdown' else None)
+        if book is None:
+            return
+        for target in signal.get('targets', []):
+            if target in hit_targets:
+                continue
+            bisect.insort(book, (float(target.get('price', 0)), next(_sequence), signal, target))
+
+    def on_close(self, close_price: float, high_price: float,
+                 low_price: float) -> List[Tuple[Dict[str, Any], str, float, Optional[Dict[str, Any]]]]:
+        """
+        Apply a closed bar to the book.
+
+        Targets of already-triggered signals are checked first, so a signal
+        triggered by this bar starts tracking targets from the next bar.
+
+        Args:
+            close_price: Bar close price
+            high_price: Bar high price
+            low_price: Bar low price
+
+        Returns:
+            List of (signal, event_type, price, target) state changes in order
+        """
+        changes = []
+        touched: List[Dict[str, Any]] = []
+
+        # Breakout targets hit when the high reaches them (lowest prices first)
+        idx = bisect.bisect_right(self._breakout_targets, (high_price, float('inf')))
+        hits, self._breakout_targets[:idx] = self._breakout_targets[:idx], []
+        for _, _, signal, target in hits:
+            signal.setdefault('hit_targets', []).append(target)
+            changes.append((signal, 'target_hit', high_price, target))
+            touched.append(signal)
+
+        # Breakdown targets hit when the low reaches them (highest prices first)
+        idx = bisect.bisect_left(self._breakdown_targets, (low_price, -1))
+        hits, self._breakdown_targets[idx:] = self._breakdown_targets[idx:], []
+        for _, _, signal, target in reversed(hits):
+            signal.setdefault('hit_targets', []).append(target)
+            changes.append((signal, 'target_hit', low_price, target))
+            touched.append(signal)
+
+        # Check if all targets hit
+        for signal in dict((id(s), s) for s in touched).values():
+            targets = signal.get('targets', [])
+            if targets and len(signal['hit_targets']) == len(targets):
+                _update_signal_status(signal, 'completed', close_price)
+                changes.append((signal, 'completed', close_price, None))
+
+        # Breakouts trigger when the close is above the trigger level
+        idx = bisect.bisect_left(self._breakout_triggers, (close_price, -1))
+        fired, self._breakout_triggers[:idx] = self._breakout_triggers[:idx], []
+
+        # Breakdowns trigger when the close is below the trigger level
+        idx = bisect.bisect_right(self._breakdown_triggers, (close_price, float('inf')))
+        fired_down, self._breakdown_triggers[idx:] = self._breakdown_triggers[idx:], []
+
+        for _, _, signal in fired + fired_down:
+            _update_signal_status(signal, 'triggered', close_price)
+            changes.append((signal, 'trigger', close_price, None))
+            self._index_targets(signal)
+
+        return changes
+
 
 # Store active trading signals
-_active_signals: Dict[str, List[Dict[str, Any]]] = {}
+_active_signals: Dict[str, SymbolSignalBook] = {}
+
+# Signal events waiting to be published in the next batch
+_pending_events: List[Dict[str, Any]] = []
+_flush_task: Optional[asyncio.Task] = None
+
 
 def init_candle_detector() -> bool:
     """
-    Initialize the candle detector.
+    Initialize the candle detector on the shared async runtime.
 
     Returns:
         bool: Success status
     """
-    global _detector_thread, _thread_running
-
     try:
-        # Check if detector thread is already running
-        if _detector_thread and _detector_thread.is_alive():
-            logger.info("Candle detector thread already running")
-            return True
-
-        # Start detector thread
-        _detector_thread = threading.Thread(
-            target=_candle_detector_thread,
-            daemon=True,
-            name="CandleDetectorThread"
-        )
-        _thread_running = True
-        _detector_thread.start()
-
-        # Wait a moment to ensure thread starts
-        time.sleep(0.1)
-
-        if _detector_thread.is_alive():
-            logger.info("Candle detector thread started successfully")
-            return True
-        else:
-            logger.error("Candle detector thread failed to start")
-            return False
+        task = runtime.supervise(TASK_NAME, _run_candle_listener)
+        logger.info(f"Candle detector supervised on the async runtime ({task.state})")
+        return True
     except Exception as e:
         logger.error(f"Error initializing candle detector: {e}")
         return False
 
-def _candle_detector_thread() -> None:
-    """Candle detector thread function."""
-    global _thread_running, _last_event_id
+async def _run_candle_listener() -> None:
+    """LISTEN for bar closes until the connection drops or the task is cancelled."""
+    try:
+        await listen_for_events(handle_candle_event, "events")
+    finally:
+        # Publish anything still buffered before the listener goes away
+        try:
+            await flush_signal_events()
+        except Exception as e:
+            logger.error(f"Error flushing signal events: {e}")
 
-    logger.info("Candle detector thread started")
+async def handle_candle_event(event_type: str, data: Dict[str, Any]) -> None:
+    """
+    Handle a bar-close notification from the event bus.
 
-    # Define channel for candle updates
-    candle_channel = "candles:all"
+    Args:
+        event_type: Event type from the NOTIFY payload
+        data: Candle data dictionary
+    """
+    # Only process closed candles
+    if event_type != EventTypes.CANDLE_CLOSED and not data.get('is_closed', False):
+        return
 
-    # Get the latest event ID to start polling from
     try:
-        from app import app
-        with app.app_context():
-            _last_event_id = get_latest_event_id()
-            logger.info(f"Starting candle detector polling from event ID: {_last_event_id}")
-    except Exception as e:
-        logger.warning(f"Error getting latest event ID: {e}")
-        _last_event_id = 0
-
-    while _thread_running:
-        try:
-            # Poll for candle update events from PostgreSQL
-            from app import app
-            with app.app_context():
-                events = poll_events([candle_channel], _last_event_id)
-
-                # Process any new events
-                for event in events:
-                    try:
-                        # Update the last event ID
-                        _last_event_id = max(_last_event_id, event.get('id', 0))
-
-                        # Get the data
-                        data = event.get('data', {})
-                        if not data:
-                            continue
-
-                        # Extract candle data
-                        symbol = payload.get('ticker')
-                        timeframe = payload.get('timeframe')
-                        is_closed = payload.get('is_closed', False)
-
-                        # Only process closed candles
-                        if not is_closed:
-                            continue
-
-                        # Process candle for signal detection
-                        _process_candle(symbol, timeframe, payload)
-                    except Exception as e:
-                        logger.error(f"Error processing candle event: {e}")
-
-            # Sleep briefly to avoid excessive database polling
-            time.sleep(0.5)
-        except Exception as e:
-            logger.error(f"Error in candle detector thread: {e}")
-            time.sleep(5)  # Sleep longer on error
+        symbol = data.get('ticker') or data.get('symbol')
+        timeframe = data.get('timeframe')
+        if not symbol:
+            return
 
-    logger.info("Candle detector thread stopped")
+        # Process candle for signal detection
+        _process_candle(symbol, timeframe, data)
+        _schedule_flush()
+    except Exception as e:
+        logger.error(f"Error processing candle event: {e}")
 
 def _process_candle(symbol: str, timeframe: str, candle_data: Dict[str, Any]) -> None:
     """
@@ -135,7 +236,8 @@ def _process_candle(symbol: str, timeframe: str, candle_data: Dict[str, Any]) ->
     """
     try:
         # Skip if we're not tracking any signals for this symbol
-        if symbol not in _active_signals:
+        book = _active_signals.get(symbol)
+        if not book:
             return
 
         # Get candle values
@@ -143,114 +245,16 @@ def _process_candle(symbol: str, timeframe: str, candle_data: Dict[str, Any]) ->
         high_price = float(candle_data.get('high', 0))
         low_price = float(candle_data.get('low', 0))
 
-        # Check each active signal for this symbol
-        for signal in _active_signals[symbol]:
-            # Get trigger level
-            trigger_level = signal.get('trigger', {}).get('price', 0)
-
-            # Skip if no trigger level
-            if not trigger_level:
-                continue
-
-            # Get signal direction (breakout/breakdown) and state
-            category = signal.get('category', '')
-            status = signal.get('status', 'pending')
-
-            # Skip if already triggered or completed
-            if status in ['triggered', 'completed']:
-                continue
-
-            # Check for breakout (price closes above trigger level)
-            if category == 'breakout' and close_price > trigger_level:
-                # Breakout signal confirmed by candle close
-                _update_signal_status(symbol, signal, 'triggered', close_price)
-
-                # Publish signal event
-                _publish_signal_event(symbol, signal, 'trigger', close_price)
-
-            # Check for breakdown (price closes below trigger level)
-            elif category == 'breakdown' and close_price < trigger_level:
-                # Breakdown signal confirmed by candle close
-                _update_signal_status(symbol, signal, 'triggered', close_price)
-
-                # Publish signal event
-                _publish_signal_event(symbol, signal, 'trigger', close_price)
-
-            # Check target levels for active signals
-            if status == 'triggered':
-                _check_target_levels(symbol, signal, close_price, high_price, low_price)
+        for signal, event_type, price, target in book.on_close(close_price, high_price, low_price):
+            _queue_signal_event(symbol, signal, event_type, price, target)
     except Exception as e:
         logger.error(f"Error processing candle for {symbol}: {e}")
 
-def _check_target_levels(
-    symbol: str, 
-    signal: Dict[str, Any], 
-    close_price: float, 
-    high_price: float, 
-    low_price: float
-) -> None:
-    """
-    Check if price has reached any target levels.
-
-    Args:
-        symbol: Ticker symbol
-        signal: Signal dictionary
-        close_price: Current close price
-        high_price: Current high price
-        low_price: Current low price
-    """
-    try:
-        # Get target levels
-        targets = signal.get('targets', [])
-        hit_targets = signal.get('hit_targets', [])
-        category = signal.get('category', '')
-
-        # Check each target
-        for target in targets:
-            # Skip if target already hit
-            if target in hit_targets:
-                continue
-
-            target_price = float(target.get('price', 0))
-
-            # Check for breakout target hit (price reaches target level)
-            if category == 'breakout' and high_price >= target_price:
-                # Target hit
-                hit_targets.append(target)
-
-                # Update signal
-                signal['hit_targets'] = hit_targets
-
-                # Publish target hit event
-                _publish_signal_event(symbol, signal, 'target_hit', high_price, target)
-
-            # Check for breakdown target hit (price reaches target level)
-            elif category == 'breakdown' and low_price <= target_price:
-                # Target hit
-                hit_targets.append(target)
-
-                # Update signal
-                signal['hit_targets'] = hit_targets
-
-                # Publish target hit event
-                _publish_signal_event(symbol, signal, 'target_hit', low_price, target)
-
-        # Check if all targets hit
-        if len(hit_targets) == len(targets) and targets:
-            # All targets hit, signal completed
-            _update_signal_status(symbol, signal, 'completed', close_price)
-
-            # Publish signal completed event
-            _publish_signal_event(symbol, signal, 'completed', close_price)
-    except Exception as e:
-        logger.error(f"Error checking target levels for {symbol}: {e}")
-
-def _update_signal_status(symbol: str, signal: Dict[str, Any], status: str, price: float) -> None:
+def _update_signal_status(signal: Dict[str, Any], status: str, price: float) -> None:
     """
     Update signal status.
 
     Args:
-        symbol: Ticker symbol
         signal: Signal dictionary
         status: New status
         price: Current price
@@ -260,15 +264,15 @@ def _update_signal_status(symbol: str, signal: Dict[str, Any], status: str, pric
     signal['last_price'] = price
     signal['last_update'] = datetime.now().isoformat()
 
-def _publish_signal_event(
-    symbol: str, 
-    signal: Dict[str, Any], 
-    event_type: str, 
+def _queue_signal_event(
+    symbol: str,
+    signal: Dict[str, Any],
+    event_type: str,
     price: float,
     target: Optional[Dict[str, Any]] = None
 ) -> None:
     """
-    Publish signal event to PostgreSQL event bus.
+    Buffer a signal event for the next batch publication.
 
     Args:
         symbol: Ticker symbol
@@ -277,33 +281,55 @@ def _publish_signal_event(
         price: Current price
         target: Target hit (if event_type is 'target_hit')
     """
-    try:
-        # Create event data
-        event_data = {
-            'ticker': symbol,
-            'signal_id': signal.get('id'),
-            'category': signal.get('category'),
-            'event_type': event_type,
-            'price': price,
-            'timestamp': datetime.now().isoformat()
-        }
-
-        # Add target information if provided
-        if target and event_type == 'target_hit':
-            event_data['target'] = target
+    # Create event data
+    event_data = {
+        'ticker': symbol,
+        'signal_id': signal.get('id'),
+        'category': signal.get('category'),
+        'event_type': event_type,
+        'price': price,
+        'timestamp': datetime.now().isoformat()
+    }
+
+    # Add target information if provided
+    if target and event_type == 'target_hit':
+        event_data['target'] = target
+
+    # Publish to symbol-specific channel and the general signals channel
+    for channel in (f"signals:{symbol}", "signals:all"):
+        _pending_events.append({
+            'event_type': SIGNAL_EVENT_TYPES[event_type],
+            'channel': channel,
+            'data': dict(event_data),
+        })
+
+def _schedule_flush() -> None:
+    """Schedule a batch flush on the running loop if events are waiting."""
+    global _flush_task
+    if _pending_events and _flush_task is None:
+        _flush_task = asyncio.get_running_loop().create_task(_flush_after_delay())
+
+async def _flush_after_delay() -> None:
+    await asyncio.sleep(SIGNAL_FLUSH_INTERVAL)
+    await flush_signal_events()
+
+async def flush_signal_events() -> int:
+    """
+    Publish all buffered signal events in one batch.
 
-        # Use app context for database operations
-        from app import app
-        with app.app_context():
-            # Publish to symbol-specific channel
-            publish_event(f"signals:{symbol}", event_type, event_data)
+    Returns:
+        int: Number of events published
+    """
+    global _pending_events, _flush_task
+    batch, _pending_events = _pending_events, []
+    _flush_task = None
+    if not batch:
+        return 0
 
-            # Also publish to general signals channel
-            publish_event("signals:all", event_type, event_data)
-
-        logger.info(f"Published signal {event_type} event for {symbol}")
-    except Exception as e:
-        logger.error(f"Error publishing signal event for {symbol}: {e}")
+    published = await publish_event_batch_async(batch, source='candle_detector')
+    if published:
+        logger.info(f"Published {published} signal events in one batch")
+    return published
 
 def add_signal(signal_data: Dict[str, Any]) -> bool:
     """
@@ -325,12 +351,12 @@ def add_signal(signal_data: Dict[str, Any]) -> bool:
             logger.error("Signal missing ticker symbol")
             return False
 
-        # Initialize signal list for this symbol if needed
+        # Initialize signal book for this symbol if needed
         if symbol not in _active_signals:
-            _active_signals[symbol] = []
+            _active_signals[symbol] = SymbolSignalBook()
 
-        # Add signal to list
-        _active_signals[symbol].append(signal_data)
+        # Add signal to the price-sorted book
+        _active_signals[symbol].add(signal_data)
 
         # Log signal added
         logger.info(f"Added signal for {symbol}: {signal_data.get('category')}")
@@ -367,10 +393,11 @@ def get_active_signals(symbol: Optional[str] = None) -> List[Dict[str, Any]]:
         List of signal dictionaries
     """
     if symbol:
-        return _active_signals.get(symbol, [])
+        book = _active_signals.get(symbol)
+        return book.signals if book else []
     else:
         # Flatten all signals into a single list
-        return [signal for signals in _active_signals.values() for signal in signals]
+        return [signal for book in _active_signals.values() for signal in book.signals]
 
 def remove_signal(signal_id: str) -> bool:
     """
@@ -384,32 +411,29 @@ def remove_signal(signal_id: str) -> bool:
     """
     try:
         # Look for signal in all symbols
-        for symbol, signals in _active_signals.items():
-            for i, signal in enumerate(signals):
-                if str(signal.get('id')) == str(signal_id):
-                    # Remove signal from list
-                    removed_signal = signals.pop(i)
-
-                    # Log signal removed
-                    logger.info(f"Removed signal {signal_id} for {symbol}")
-
-                    # Publish signal removed event
-                    event_data = {
-                        'ticker': symbol,
-                        'signal_id': signal_id,
-                        'category': removed_signal.get('category'),
-                        'event_type': 'removed',
-                        'timestamp': datetime.now().isoformat()
-                    }
-
-                    # Use app context for database operations
-                    from app import app
-                    with app.app_context():
-                        # Publish to PostgreSQL event bus
-                        publish_event(f"signals:{symbol}", "signal_removed", event_data)
-                        publish_event("signals:all", "signal_removed", event_data)
-
-                    return True
+        for symbol, book in _active_signals.items():
+            removed_signal = book.remove(signal_id)
+            if removed_signal is not None:
+                # Log signal removed
+                logger.info(f"Removed signal {signal_id} for {symbol}")
+
+                # Publish signal removed event
+                event_data = {
+                    'ticker': symbol,
+                    'signal_id': signal_id,
+                    'category': removed_signal.get('category'),
+                    'event_type': 'removed',
+                    'timestamp': datetime.now().isoformat()
+                }
+
+                # Use app context for database operations
+                from app import app
+                with app.app_context():
+                    # Publish to PostgreSQL event bus
+                    publish_event(f"signals:{symbol}", "signal_removed", event_data)
+                    publish_event("signals:all", "signal_removed", event_data)
+
+                return True
 
         logger.warning(f"Signal {signal_id} not found")
         return False
@@ -424,19 +448,10 @@ def shutdown() -> bool:
     Returns:
         bool: Success status
     """
-    global _thread_running, _detector_thread
-
     try:
-        # Signal thread to stop
-        _thread_running = False
-
-        # Wait for thread to stop (with timeout)
-        if _detector_thread and _detector_thread.is_alive():
-            _detector_thread.join(timeout=5.0)
-
-            if _detector_thread.is_alive():
-                logger.warning("Candle detector thread did not stop gracefully")
-                return False
+        if not runtime.cancel(TASK_NAME, timeout=5.0):
+            logger.warning("Candle detector did not stop gracefully")
+            return False
 
         logger.info("Candle detector shut down successfully")
         return True
@@ -451,6 +466,5 @@ def detector_running() -> bool:
     Returns:
         bool: True if the detector is running, False otherwise
     """
-    global _thread_running, _detector_thread
-
-    return _thread_running and _detector_thread is not None and _detector_thread.is_alive()
\ No newline at end of file
+    task = runtime.get_task(TASK_NAME)
+    return runtime.running and task is not None and task.alive
@@ -0,0 +1,355 @@
+"""
+Breakout Confirmation Engine
+
+Keeps per-ticker rolling OHLCV windows in fixed-size ring buffers with running
+volume sums, and evaluates every breakout level for a ticker at once against a
+NumPy array of levels. Per-candle cost is O(levels for the ticker) with no list
+rebuilds. The same rules can be applied in batch over historical candles for
+backtests via ``evaluate_history``.
+
+The confirmation rules mirror ``is_confirmed_breakout`` in ``monitor.py``:
+close above level, bullish body of at least ``min_body_percent``, inside market
+hours, and volume of at least ``volume_multiplier`` times the average volume of
+the last ``avg_volume_periods`` candles (current candle included).
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Constants for confirmation thresholds (kept in line with monitor.py)
+DEFAULT_MIN_BODY_PERCENT = 0.2  # Minimum candle body size as percentage
+DEFAULT_VOLUME_MULTIPLIER = 1.5  # Minimum volume relative to average
+DEFAULT_AVG_VOLUME_PERIODS = 5   # Number of periods for volume average
+
+# Market hours window as minutes of day (same bounds as is_market_hours)
+MARKET_OPEN_MINUTE = 9 * 60 + 30
+MARKET_CLOSE_MINUTE = 16 * 60
+
+# Column layout of the OHLCV ring buffer
+_OPEN, _HIGH, _LOW, _CLOSE, _VOLUME = range(5)
+
+
+class CandleWindow:
+    """Fixed-capacity OHLCV ring buffer with a running volume sum."""
+
+    __slots__ = ('capacity', '_data', '_head', '_count', '_volume_sum', 'last_timestamp')
+
+    def __init__(self, capacity: int = DEFAULT_AVG_VOLUME_PERIODS):
+        """
+        Initialize an empty window.
+
+        Args:
+            capacity: Number of most recent candles to retain
+        """
+        if capacity < 1:
+            raise ValueError("CandleWindow capacity must be at least 1")
+        self.capacity = capacity
+        self._data = np.zeros((capacity, 5), dtype=np.float64)
+        self._head = 0
+        self._count = 0
+        self._volume_sum = 0.0
+        self.last_timestamp: Optional[datetime] = None
+
+    def push(self, open_: float, high: float, low: float, close: float,
+             volume: float, timestamp: Optional[datetime] = None) -> None:
+        """
+        Append a candle, evicting the oldest one once the window is full.
+
+        Args:
+            open_: Open price
+            high: High price
+            low: Low price
+            close: Close price
+            volume: Candle volume
+            timestamp: Candle timestamp
+        """
+        slot = self._data[self._head]
+        if self._count == self.capacity:
+            self._volume_sum -= slot[_VOLUME]
+        else:
+            self._count += 1
+
+        slot[_OPEN] = open_
+        slot[_HIGH] = high
+        slot[_LOW] = low
+        slot[_CLOSE] = close
+        slot[_VOLUME] = volume
+        self._volume_sum += volume
+        self.last_timestamp = timestamp
+
+        self._head = (self._head + 1) % self.capacity
+        if self._head == 0:
+            # Re-anchor the running sum once per wrap to stop float drift
+            self._volume_sum = float(self._data[:self._count, _VOLUME].sum())
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def average_volume(self) -> float:
+        """
+        Get the average volume over the candles currently in the window.
+
+        Returns:
+            float: Average volume, 0 when the window is empty
+        """
+        if self._count == 0:
+            return 0
+        return self._volume_sum / self._count
+
+    def to_array(self) -> np.ndarray:
+        """
+        Get the retained candles oldest-first as an (n, 5) OHLCV array copy.
+
+        Returns:
+            np.ndarray: Ordered OHLCV rows
+        """
+        if self._count < self.capacity:
+            return self._data[:self._count].copy()
+        return np.roll(self._data, -self._head, axis=0)
+
+
+class _LevelBook:
+    """Breakout levels for one ticker stored as parallel arrays."""
+
+    __slots__ = ('keys', 'levels', 'confirmed', '_index')
+
+    def __init__(self, entries: Sequence[Tuple[Hashable, float]]):
+        self.keys: List[Hashable] = [key for key, _ in entries]
+        self.levels = np.array([float(level) for _, level in entries], dtype=np.float64)
+        self.confirmed = np.zeros(len(self.keys), dtype=bool)
+        self._index = {key: i for i, key in enumerate(self.keys)}
+
+    def mark_confirmed(self, key: Hashable) -> bool:
+        i = self._index.get(key)
+        if i is None:
+            return False
+        self.confirmed[i] = True
+        return True
+
+
+def _minute_of_day(timestamp: Any) -> Optional[int]:
+    if not isinstance(timestamp, datetime):
+        return None
+    return timestamp.hour * 60 + timestamp.minute
+
+
+class BreakoutConfirmationEngine:
+    """
+    Evaluates breakout levels for all tickers against incoming candles.
+
+    Levels are registered per ticker with an opaque key (setup id, signal id,
+    ...). ``update`` pushes one candle and returns the keys of the levels it
+    confirms; callers decide what to persist and publish, then call
+    ``mark_confirmed`` so those levels are skipped on later candles.
+    """
+
+    def __init__(
+        self,
+        avg_volume_periods: int = DEFAULT_AVG_VOLUME_PERIODS,
+        min_body_percent: float = DEFAULT_MIN_BODY_PERCENT,
+        volume_multiplier: float = DEFAULT_VOLUME_MULTIPLIER,
+        check_market_hours: bool = True
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            avg_volume_periods: Number of periods for volume average
+            min_body_percent: Minimum candle body size as percentage
+            volume_multiplier: Volume must be this multiple of average volume
+            check_market_hours: If True, only confirm during market hours
+        """
+        self.avg_volume_periods = avg_volume_periods
+        self.min_body_percent = min_body_percent
+        self.volume_multiplier = volume_multiplier
+        self.check_market_hours = check_market_hours
+        self._windows: Dict[str, CandleWindow] = {}
+        self._books: Dict[str, _LevelBook] = {}
+
+    # ------------------------------------------------------------------
+    # Level registration
+    # ------------------------------------------------------------------
+
+    def set_levels(self, ticker: str, entries: Iterable[Tuple[Hashable, float]]) -> None:
+        """
+        Replace the breakout levels tracked for a ticker.
+
+        Args:
+            ticker: Ticker symbol
+            entries: (key, level) pairs
+        """
+        entries = list(entries)
+        if entries:
+            self._books[ticker] = _LevelBook(entries)
+        else:
+            self._books.pop(ticker, None)
+
+    def clear_levels(self) -> None:
+        """Drop all registered levels (candle windows are kept)."""
+        self._books.clear()
+
+    def mark_confirmed(self, ticker: str, key: Hashable) -> bool:
+        """
+        Exclude a level from future evaluation.
+
+        Args:
+            ticker: Ticker symbol
+            key: Key the level was registered with
+
+        Returns:
+            bool: True if the level was found
+        """
+        book = self._books.get(ticker)
+        return book.mark_confirmed(key) if book else False
+
+    def has_levels(self, ticker: str) -> bool:
+        """Check whether any levels are registered for a ticker."""
+        return ticker in self._books
+
+    @property
+    def tickers(self) -> List[str]:
+        """Tickers with registered levels."""
+        return list(self._books)
+
+    # ------------------------------------------------------------------
+    # Streaming evaluation
+    # ------------------------------------------------------------------
+
+    def window(self, ticker: str) -> CandleWindow:
+        """Get (creating if needed) the candle window for a ticker."""
+        window = self._windows.get(ticker)
+        if window is None:
+            window = CandleWindow(self.avg_volume_periods)
+            self._windows[ticker] = window
+        return window
+
+    def average_volume(self, ticker: str) -> float:
+        """Get the current rolling average volume for a ticker."""
+        window = self._windows.get(ticker)
+        return window.average_volume if window else 0
+
+    def update(self, ticker: str, candle: Any) -> List[Hashable]:
+        """
+        Push a candle for a ticker and evaluate its unconfirmed levels.
+
+        Args:
+            ticker: Ticker symbol
+            candle: Object exposing open/high/low/close/volume/timestamp
+
+        Returns:
+            List of keys whose levels this candle confirms
+        """
+        window = self.window(ticker)
+        window.push(candle.open, candle.high, candle.low, candle.close,
+                    candle.volume, candle.timestamp)
+
+        book = self._books.get(ticker)
+        if book is None or not self._candle_qualifies(candle, window.average_volume):
+            return []
+
+        hits = np.flatnonzero((candle.close > book.levels) & ~book.confirmed)
+        return [book.keys[i] for i in hits]
+
+    def _candle_qualifies(self, candle: Any, avg_volume: float) -> bool:
+        """Level-independent confirmation checks for a single candle."""
+        if candle.close <= candle.open or candle.open == 0:
+            return False
+        body_percent = abs(candle.close - candle.open) / candle.open * 100
+        if body_percent < self.min_body_percent:
+            return False
+        if self.check_market_hours:
+            minute = _minute_of_day(candle.timestamp)
+            if minute is None or not MARKET_OPEN_MINUTE <= minute < MARKET_CLOSE_MINUTE:
+                return False
+        if avg_volume > 0 and candle.volume < avg_volume * self.volume_multiplier:
+            return False
+        return True
+
+    # ------------------------------------------------------------------
+    # Batch evaluation
+    # ------------------------------------------------------------------
+
+    def evaluate_history(
+        self,
+        candles: Sequence[Any],
+        levels: Sequence[Tuple[Hashable, float]]
+    ) -> Dict[Hashable, Optional[int]]:
+        """
+        Replay historical candles for one ticker against a set of levels.
+
+        Uses the same rules as ``update`` but computes them column-wise over the
+        whole series, so it does not touch the streaming windows.
+
+        Args:
+            candles: Candles oldest-first, exposing open/high/low/close/volume/timestamp
+            levels: (key, level) pairs
+
+        Returns:
+            Dict mapping each key to the index of its first confirming candle, or None
+        """
+        if not levels:
+            return {}
+        if not candles:
+            return {key: None for key, _ in levels}
+
+        ohlcv = np.array(
+            [(c.open, c.high, c.low, c.close, c.volume) for c in candles],
+            dtype=np.float64
+        )
+        minutes = np.array(
+            [m if (m := _minute_of_day(c.timestamp)) is not None else -1 for c in candles],
+            dtype=np.int64
+        )
+        qualifies = self.qualifying_mask(ohlcv, minutes)
+
+        level_values = np.array([float(level) for _, level in levels], dtype=np.float64)
+        crossed = (ohlcv[:, _CLOSE, None] > level_values[None, :]) & qualifies[:, None]
+        first = np.argmax(crossed, axis=0)
+        any_hit = crossed.any(axis=0)
+
+        return {
+            key: int(first[i]) if any_hit[i] else None
+            for i, (key, _) in enumerate(levels)
+        }
+
+    def qualifying_mask(self, ohlcv: np.ndarray, minutes: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Compute the level-independent confirmation mask for a candle series.
+
+        Args:
+            ohlcv: (n, 5) array of open/high/low/close/volume, oldest-first
+            minutes: Optional (n,) minutes-of-day array, -1 for unknown timestamps
+
+        Returns:
+            np.ndarray: Boolean mask, True where a candle could confirm a level
+        """
+        opens = ohlcv[:, _OPEN]
+        closes = ohlcv[:, _CLOSE]
+        volumes = ohlcv[:, _VOLUME]
+        n = len(volumes)
+
+        periods = self.avg_volume_periods
+        cumulative = np.concatenate(([0.0], np.cumsum(volumes)))
+        ends = np.arange(1, n + 1)
+        starts = np.maximum(ends - periods, 0)
+        avg_volume = (cumulative[ends] - cumulative[starts]) / (ends - starts)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            body_percent = np.where(opens != 0, np.abs(closes - opens) / opens * 100, 0.0)
+
+        mask = (closes > opens) & (opens != 0) & (body_percent >= self.min_body_percent)
+        mask &= ~((avg_volume > 0) & (volumes < avg_volume * self.volume_multiplier))
+
+        if self.check_market_hours:
+            if minutes is None:
+                raise ValueError("minutes are required when check_market_hours is enabled")
+            mask &= (minutes >= MARKET_OPEN_MINUTE) & (minutes < MARKET_CLOSE_MINUTE)
+
+        return mask
@@ -0,0 +1,37 @@
+"""
+Strategy Confirmation Models
+
+Persisted breakout confirmations written by the strategy monitor.
+
+Kept apart from ``features.strategy.models``, which redefines the legacy
+``signals`` table also mapped by ``features.setups.models`` and so cannot be
+imported alongside it.
+"""
+
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from common.db import db
+
+
+class SignalConfirmation(db.Model):
+    """One confirmed breakout of a trade setup."""
+    __tablename__ = 'signal_confirmations'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # Trade setup IDs are stored as strings whatever type the monitor was given
+    setup_id = Column(String(64), nullable=False, index=True)
+    confirmed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return f"<SignalConfirmation(setup_id={self.setup_id}, confirmed_at={self.confirmed_at})>"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert model instance to dictionary."""
+        return {
+            'id': self.id,
+            'setup_id': self.setup_id,
+            'confirmed_at': self.confirmed_at.isoformat() if self.confirmed_at else None
+        }
@@ -9,7 +9,6 @@ import logging
 import threading
 from typing import Dict, List, Optional, Any, Set, Tuple
 from datetime import datetime, timedelta
-from sqlalchemy import text
 
 from app import app, db
 from common.db_models import (
@@ -21,6 +20,7 @@ from features.market.client import (
 )
 from common.events.constants import EventChannels
 from common.events.publisher import publish_event, get_latest_events
+from common.statements import statements
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -32,6 +32,33 @@ active_triggers = {}  # symbol -> list of triggers
 symbols_processed = set()
 detector_symbols = set()
 
+# Active triggers with their signal, ticker setup and setup date
+ACTIVE_TRIGGERS = statements.register('strategy.active_triggers', """
+    SELECT
+        pt.id, pt.symbol, pt.comparison, pt.trigger_value,
+        s.id as signal_id, s.category, s.aggressiveness, s.targets,
+        ts.id as ticker_setup_id, ts.symbol as ticker_symbol,
+        setup.date as setup_date
+    FROM price_triggers pt
+    JOIN signals s ON pt.signal_id = s.id
+    JOIN ticker_setups ts ON s.ticker_setup_id = ts.id
+    JOIN setups setup ON ts.setup_id = setup.id
+    WHERE pt.active = TRUE
+    ORDER BY setup.date DESC
+""")
+MARK_TRIGGERED = statements.register('strategy.mark_trigger_triggered', """
+    UPDATE price_triggers
+    SET active = FALSE, triggered_at = NOW()
+    WHERE id = :trigger_id
+""")
+SIGNALS_WITHOUT_TRIGGERS = statements.register('strategy.signals_without_triggers', """
+    SELECT s.id, s.category, s.comparison, s.trigger_value, ts.symbol
+    FROM signals s
+    JOIN ticker_setups ts ON s.ticker_setup_id = ts.id
+    LEFT JOIN price_triggers pt ON pt.signal_id = s.id
+    WHERE pt.id IS NULL AND s.active = TRUE
+""")
+
 # Create blueprint for API routes
 from flask import Blueprint, request, jsonify
 strategy_routes = Blueprint('strategy', __name__)
@@ -109,25 +136,7 @@ def load_active_triggers():
 
         with app.app_context():
             # Query active price triggers with their signals and ticker details
-            triggers = db.session.execute(text("""
-                SELECT 
-                    pt.id, pt.symbol, pt.comparison, pt.trigger_value, 
-                    s.id as signal_id, s.category, s.aggressiveness, s.targets,
-                    ts.id as ticker_setup_id, ts.symbol as ticker_symbol, 
-                    setup.date as setup_date
-                FROM 
-                    price_triggers pt
-                JOIN 
-                    signals s ON pt.signal_id = s.id
-                JOIN 
-                    ticker_setups ts ON s.ticker_setup_id = ts.id
-                JOIN 
-                    setups setup ON ts.setup_id = setup.id
-                WHERE 
-                    pt.active = TRUE
-                ORDER BY 
-                    setup.date DESC
-            """)).fetchall()
+            triggers = ACTIVE_TRIGGERS.execute(db.session).fetchall()
 
             # Process triggers
             for trigger in triggers:
@@ -242,14 +251,7 @@ def mark_trigger_triggered(trigger_id: int):
     try:
         with app.app_context():
             # Update the trigger
-            db.session.execute(text("""
-                UPDATE price_triggers
-                SET 
-                    active = FALSE,
-                    triggered_at = NOW()
-                WHERE
-                    id = :trigger_id
-            """), {"trigger_id": trigger_id})
+            MARK_TRIGGERED.execute(db.session, {"trigger_id": trigger_id})
 
             db.session.commit()
 
@@ -371,25 +373,7 @@ def get_active_price_triggers() -> List[Dict[str, Any]]:
     try:
         with app.app_context():
             # Query active price triggers
-            triggers = db.session.execute(text("""
-                SELECT 
-                    pt.id, pt.symbol, pt.comparison, pt.trigger_value, 
-                    s.id as signal_id, s.category, s.aggressiveness, s.targets,
-                    ts.id as ticker_setup_id, ts.symbol as ticker_symbol, 
-                    setup.date as setup_date
-                FROM 
-                    price_triggers pt
-                JOIN 
-                    signals s ON pt.signal_id = s.id
-                JOIN 
-                    ticker_setups ts ON s.ticker_setup_id = ts.id
-                JOIN 
-                    setups setup ON ts.setup_id = setup.id
-                WHERE 
-                    pt.active = TRUE
-                ORDER BY 
-                    setup.date DESC
-            """)).fetchall()
+            triggers = ACTIVE_TRIGGERS.execute(db.session).fetchall()
 
             # Format results
             result = []
@@ -447,20 +431,7 @@ def generate_triggers_from_signals():
     try:
         with app.app_context():
             # Query signals without triggers
-            signals = db.session.execute(text("""
-                SELECT 
-                    s.id, s.category, s.comparison, s.trigger_value, 
-                    ts.symbol
-                FROM 
-                    signals s
-                JOIN 
-                    ticker_setups ts ON s.ticker_setup_id = ts.id
-                LEFT JOIN 
-                    price_triggers pt ON pt.signal_id = s.id
-                WHERE 
-                    pt.id IS NULL
-                    AND s.active = TRUE
-            """)).fetchall()
+            signals = SIGNALS_WITHOUT_TRIGGERS.execute(db.session).fetchall()
 
             triggers_created = 0
 
@@ -3,16 +3,26 @@ Strategy Monitor Module
 
 This module monitors for trade setup confirmations based on price and volume conditions.
 It focuses specifically on breakout confirmation using OHLCV candle data.
+
+In the market role, ``start_setup_monitor`` runs the monitor over the 5-minute
+bar closes published on the ``events`` channel and reloads the setups as the
+parsing feature stores them.
 """
 
 import logging
 import asyncio
-from datetime import datetime, time
+import threading
+from datetime import date, datetime, time
 from typing import Dict, List, Any, Optional, AsyncGenerator, Callable, Union, Tuple
 
-from common.events.publisher import publish_event, get_latest_events
-from common.events.constants import EventChannels
-from common.constants import SignalCategory
+from flask import current_app, has_app_context
+
+from common.async_runtime import runtime
+from common.events.publisher import listen_for_events, publish_event
+from common.events.constants import EventTypes
+from features.parsing.store import SETUP_EVENT_TYPES
+from features.strategy.confirmation import BreakoutConfirmationEngine
+from features.strategy.confirmation_models import SignalConfirmation
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -22,7 +32,10 @@ DEFAULT_MIN_BODY_PERCENT = 0.2  # Minimum candle body size as percentage
 DEFAULT_VOLUME_MULTIPLIER = 1.5  # Minimum volume relative to average
 DEFAULT_AVG_VOLUME_PERIODS = 5   # Number of periods for volume average
 
-from common.db_models import SignalConfirmation
+# Supervised task running the monitor in the market role, and the bars it evaluates
+SETUP_MONITOR_TASK = "setup-monitor"
+MONITOR_TIMEFRAME = '5Min'
+
 from common.db import db
 
 class Candle:
@@ -111,8 +124,8 @@ def is_market_hours(timestamp: datetime) -> bool:
     hour = timestamp.hour
     minute = timestamp.minute
 
-    # Check if time is between 9:30 AM and 4:00 PM
-    if hour < 9 or hour > 16:
+    # Check if time is between 9:30 AM and 4:00 PM (close exclusive)
+    if hour < 9 or hour >= 16:
         return False
     if hour == 9 and minute < 30:
         return False
@@ -198,12 +211,292 @@ def calculate_average_volume(candles: List[Candle], periods: int = DEFAULT_AVG_V
     return sum(c.volume for c in recent_candles) / len(recent_candles)
 
 
+# Event types that mean the set of trade setups may have changed
+SETUP_RELOAD_EVENT_TYPES = frozenset({
+    EventTypes.SETUP_CREATED,
+    EventTypes.SETUP_UPDATED,
+    EventTypes.SETUP_TRIGGERED,
+    EventTypes.SETUP_PARSED,
+    EventTypes.SETUP_SAVED,
+}) | SETUP_EVENT_TYPES
+
+
+class SetupIndex:
+    """
+    Breakout setups indexed by ticker, plus an in-memory set of confirmed setup IDs.
+
+    The confirmed set is warmed from ``SignalConfirmation`` for the indexed
+    setups and updated on each confirmation, so the candle loop never queries
+    the database to skip already-confirmed setups. Setup IDs are kept as
+    strings, as they are stored. ``request_reload`` (or ``handle_event``, see
+    ``follow_setup_changes``) marks the index stale; the monitor swaps in a
+    fresh setup list from ``loader`` before evaluating the next candle.
+    """
+
+    def __init__(
+        self,
+        engine: BreakoutConfirmationEngine,
+        loader: Optional[Callable[[], List[Dict[str, Any]]]] = None
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            engine: Confirmation engine that receives the per-ticker levels
+            loader: Optional callable returning the current setup dictionaries
+        """
+        self.engine = engine
+        self.loader = loader
+        self._setups_by_id: Dict[Any, Dict[str, Any]] = {}
+        self._setups_by_ticker: Dict[str, List[Dict[str, Any]]] = {}
+        self._confirmed_ids: set = set()
+        self._reload_requested = threading.Event()
+        self.loaded_at: Optional[datetime] = None
+
+    def load(self, setups: List[Dict[str, Any]]) -> None:
+        """
+        Replace the indexed setups and push their levels to the engine.
+
+        Args:
+            setups: List of setup dictionaries with ticker, level, type, etc.
+        """
+        setups_by_id: Dict[Any, Dict[str, Any]] = {}
+        setups_by_ticker: Dict[str, List[Dict[str, Any]]] = {}
+        for setup in setups:
+            # Skip if not a breakout setup
+            if not _is_breakout_setup_type(setup.get('type', '')):
+                continue
+            setups_by_id[setup.get('id')] = setup
+            setups_by_ticker.setdefault(setup.get('ticker'), []).append(setup)
+
+        self.engine.clear_levels()
+        for ticker, ticker_setups in setups_by_ticker.items():
+            self.engine.set_levels(ticker, [
+                (setup.get('id'), float(setup.get('level', 0))) for setup in ticker_setups
+            ])
+            for setup in ticker_setups:
+                if str(setup.get('id')) in self._confirmed_ids:
+                    self.engine.mark_confirmed(ticker, setup.get('id'))
+
+        self._setups_by_id = setups_by_id
+        self._setups_by_ticker = setups_by_ticker
+        self.loaded_at = datetime.now()
+        logger.info(f"Setup index loaded {len(setups_by_id)} breakout setups across {len(setups_by_ticker)} tickers")
+
+    def warm_confirmations(self) -> int:
+        """
+        Load which of the indexed setups are already confirmed, in a single query.
+
+        Returns:
+            int: Number of confirmed setup IDs known after warming
+        """
+        setup_ids = [str(setup_id) for setup_id in self._setups_by_id]
+        if setup_ids:
+            rows = db.session.query(SignalConfirmation.setup_id).filter(
+                SignalConfirmation.setup_id.in_(setup_ids)
+            ).all()
+            self._confirmed_ids.update(row[0] for row in rows)
+        for ticker, ticker_setups in self._setups_by_ticker.items():
+            for setup in ticker_setups:
+                if str(setup.get('id')) in self._confirmed_ids:
+                    self.engine.mark_confirmed(ticker, setup.get('id'))
+        return len(self._confirmed_ids)
+
+    def get(self, setup_id: Any) -> Optional[Dict[str, Any]]:
+        """Get an indexed setup by ID."""
+        return self._setups_by_id.get(setup_id)
+
+    def for_ticker(self, ticker: str) -> List[Dict[str, Any]]:
+        """Get the breakout setups indexed for a ticker."""
+        return self._setups_by_ticker.get(ticker, [])
+
+    def is_confirmed(self, setup_id: Any) -> bool:
+        """Check whether a setup has already been confirmed."""
+        return str(setup_id) in self._confirmed_ids
+
+    def mark_confirmed(self, ticker: str, setup_id: Any) -> None:
+        """Record a confirmation so the setup is skipped on later candles."""
+        self._confirmed_ids.add(str(setup_id))
+        self.engine.mark_confirmed(ticker, setup_id)
+
+    def request_reload(self) -> None:
+        """Mark the index stale; safe to call from any thread."""
+        self._reload_requested.set()
+
+    def handle_event(self, event_type: str, data: Dict[str, Any]) -> None:
+        """Event handler that requests a reload when trade setups change."""
+        if event_type in SETUP_RELOAD_EVENT_TYPES:
+            self.request_reload()
+
+    def reload_if_requested(self) -> bool:
+        """
+        Reload setups from the loader if a reload was requested.
+
+        Returns:
+            bool: True if the index was reloaded
+        """
+        if not self._reload_requested.is_set() or self.loader is None:
+            return False
+        self._reload_requested.clear()
+        try:
+            self.load(self.loader())
+        except Exception as e:
+            logger.error(f"Error reloading setup index: {e}")
+            return False
+        return True
+
+
+def setups_from_snapshot(trading_day: Optional[date] = None) -> List[Dict[str, Any]]:
+    """
+    Load the long setups of a trading day from the shared parsing snapshot.
+
+    Args:
+        trading_day: Trading day to load (defaults to the current one)
+
+    Returns:
+        List of setup dictionaries in the shape ``monitor_setups`` expects
+    """
+    from common.timezone import get_central_trading_day
+    from features.parsing.store import get_parsing_store
+
+    snapshot = get_parsing_store().get_setup_snapshot(trading_day or get_central_trading_day())
+    return [
+        {
+            'id': view['id'],
+            'ticker': view['ticker'],
+            'level': view['trigger_level'],
+            'type': view['label'] or view['setup_type'] or '',
+            'targets': list(view['target_prices'] or []),
+        }
+        # Only long setups can confirm as a breakout above their level
+        for view in snapshot.select(direction='long')
+        if view['trigger_level'] is not None
+    ]
+
+
+async def follow_setup_changes(setup_index: SetupIndex) -> None:
+    """
+    Request an index reload whenever the parsing feature stores or changes setups.
+
+    Args:
+        setup_index: Index to reload; its loader should read the setup snapshot
+    """
+    from features.parsing.store import handle_setup_event
+
+    def on_setup_event(event_type: str, data: Dict[str, Any]) -> None:
+        # Drop this process's stale snapshot first so the reload sees the new setups
+        handle_setup_event(event_type, data)
+        setup_index.handle_event(event_type, data)
+
+    await listen_for_events(on_setup_event, channel='parsing:setup')
+
+
+async def run_setup_monitor(
+    candle_stream: AsyncGenerator[Dict[str, Any], None],
+    loader: Callable[[], List[Dict[str, Any]]] = setups_from_snapshot,
+    avg_volume_periods: int = DEFAULT_AVG_VOLUME_PERIODS,
+    min_body_percent: float = DEFAULT_MIN_BODY_PERCENT,
+    volume_multiplier: float = DEFAULT_VOLUME_MULTIPLIER
+) -> None:
+    """
+    Monitor the current setups, reloading them as setup events arrive.
+
+    Args:
+        candle_stream: Async generator producing candle data
+        loader: Callable returning the current setup dictionaries
+        avg_volume_periods: Number of periods for volume average
+        min_body_percent: Minimum candle body size as percentage
+        volume_multiplier: Volume must be this multiple of average volume
+    """
+    setup_index = SetupIndex(BreakoutConfirmationEngine(
+        avg_volume_periods=avg_volume_periods,
+        min_body_percent=min_body_percent,
+        volume_multiplier=volume_multiplier
+    ), loader=loader)
+    follower = asyncio.create_task(follow_setup_changes(setup_index))
+    try:
+        await monitor_setups(loader(), candle_stream, setup_index=setup_index)
+    finally:
+        follower.cancel()
+
+
+def candle_from_bar(bar: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a market.candle.closed payload into the candle dictionary the monitor reads."""
+    return {
+        'ticker': bar.get('ticker') or bar.get('symbol'),
+        't': bar.get('timestamp'),
+        'o': bar.get('open'),
+        'h': bar.get('high'),
+        'l': bar.get('low'),
+        'c': bar.get('close'),
+        'v': bar.get('volume'),
+    }
+
+
+async def bar_closes(timeframe: str = MONITOR_TIMEFRAME) -> AsyncGenerator[Dict[str, Any], None]:
+    """
+    Stream the bar closes of a timeframe published on the events channel.
+
+    Ends when the listener connection drops, so a supervised monitor restarts.
+
+    Args:
+        timeframe: Bar timeframe to keep (e.g. '5Min')
+    """
+    candles: asyncio.Queue = asyncio.Queue()
+
+    def on_event(event_type: str, data: Dict[str, Any]) -> None:
+        if event_type == EventTypes.CANDLE_CLOSED and data.get('timeframe') == timeframe:
+            candles.put_nowait(candle_from_bar(data))
+
+    listener = asyncio.ensure_future(listen_for_events(on_event, "events"))
+    try:
+        while True:
+            next_candle = asyncio.ensure_future(candles.get())
+            done, _ = await asyncio.wait({next_candle, listener}, return_when=asyncio.FIRST_COMPLETED)
+            if next_candle not in done:
+                next_candle.cancel()
+                listener.result()
+                return
+            yield next_candle.result()
+    finally:
+        listener.cancel()
+
+
+def start_setup_monitor() -> bool:
+    """
+    Supervise the setup monitor over bar closes on the shared async runtime.
+
+    Call inside an app context; the monitor reads setups and stores
+    confirmations through the app's session.
+
+    Returns:
+        bool: Success status
+    """
+    if not has_app_context():
+        logger.error("Setup monitor needs an app context")
+        return False
+    app = current_app._get_current_object()
+
+    async def run() -> None:
+        with app.app_context():
+            await run_setup_monitor(bar_closes())
+
+    try:
+        task = runtime.supervise(SETUP_MONITOR_TASK, run)
+        logger.info(f"Setup monitor supervised on the async runtime ({task.state})")
+        return True
+    except Exception as e:
+        logger.error(f"Error starting setup monitor: {e}")
+        return False
+
+
 async def monitor_setups(
     setups: List[Dict[str, Any]],
     candle_stream: AsyncGenerator[Dict[str, Any], None],
     avg_volume_periods: int = DEFAULT_AVG_VOLUME_PERIODS,
     min_body_percent: float = DEFAULT_MIN_BODY_PERCENT,
-    volume_multiplier: float = DEFAULT_VOLUME_MULTIPLIER
+    volume_multiplier: float = DEFAULT_VOLUME_MULTIPLIER,
+    setup_index: Optional[SetupIndex] = None
 ) -> None:
     """
     Monitor trade setups against a stream of candle data.
@@ -214,9 +507,20 @@ async def monitor_setups(
         avg_volume_periods: Number of periods for volume average
         min_body_percent: Minimum candle body size as percentage
         volume_multiplier: Volume must be this multiple of average volume
+        setup_index: Optional pre-built index; pass one with a loader to
+            hot-reload setups via ``SetupIndex.request_reload`` (see
+            ``run_setup_monitor``)
     """
-    # Keep track of previous candles for each ticker to calculate volume averages
-    ticker_candles: Dict[str, List[Candle]] = {}
+    # Rolling per-ticker candle windows and breakout levels grouped by ticker
+    if setup_index is None:
+        setup_index = SetupIndex(BreakoutConfirmationEngine(
+            avg_volume_periods=avg_volume_periods,
+            min_body_percent=min_body_percent,
+            volume_multiplier=volume_multiplier
+        ))
+    setup_index.load(setups)
+    setup_index.warm_confirmations()
+    engine = setup_index.engine
 
     # Process candles as they come in
     try:
@@ -227,66 +531,36 @@ async def monitor_setups(
                 logger.warning(f"Received candle without ticker: {candle_data}")
                 continue
 
+            # Swap in changed setups before evaluating this candle
+            if setup_index.reload_if_requested():
+                setup_index.warm_confirmations()
+
             # Create a Candle object from the data
             candle = Candle(candle_data)
 
-            # Initialize candle list for this ticker if needed
-            if ticker not in ticker_candles:
-                ticker_candles[ticker] = []
-
-            # Add this candle to the history
-            ticker_candles[ticker].append(candle)
-
-            # Keep only the most recent 20 candles (more than we need for avg volume)
-            ticker_candles[ticker] = ticker_candles[ticker][-20:]
-
-            # Calculate average volume for this ticker
-            avg_volume = calculate_average_volume(
-                ticker_candles[ticker],
-                periods=avg_volume_periods
-            )
-
-            # Check each setup for this ticker
-            for setup in [s for s in setups if s.get('ticker') == ticker]:
-                setup_id = setup.get('id')
+            # Push the candle and evaluate every level for this ticker at once
+            for setup_id in engine.update(ticker, candle):
+                setup = setup_index.get(setup_id)
                 level = float(setup.get('level', 0))
-                setup_type = setup.get('type', '')
-
-                # Skip if not a breakout setup
-                if not _is_breakout_setup_type(setup_type):
-                    continue
-
-                # Check if already confirmed in database
-                if SignalConfirmation.query.filter_by(setup_id=setup_id).first():
-                    continue
-
-                # Check if this candle confirms the breakout
-                previous_candles = ticker_candles[ticker][:-1]  # All except current
-
-                if is_confirmed_breakout(
-                    candle=candle,
-                    level=level,
-                    avg_volume=avg_volume,
-                    previous_candles=previous_candles,
-                    min_body_percent=min_body_percent,
-                    volume_multiplier=volume_multiplier
-                ):
-                    # Store confirmation in database
-                    confirmation = SignalConfirmation(
-                        setup_id=setup_id,
-                        confirmed_at=datetime.now()
-                    )
-                    db.session.add(confirmation)
-                    db.session.commit()
-
-                    # Log the confirmation
-                    logger.info(
-                        f"CONFIRMED BREAKOUT: {ticker} above {level:.2f} "
-                        f"(close: {candle.close:.2f}, vol: {candle.volume:.0f} vs avg: {avg_volume:.0f})"
-                    )
-
-                    # Publish confirmation event
-                    _publish_confirmation_event(setup, candle)
+                setup_index.mark_confirmed(ticker, setup_id)
+
+                # Store confirmation in database
+                confirmation = SignalConfirmation(
+                    setup_id=str(setup_id),
+                    confirmed_at=datetime.now()
+                )
+                db.session.add(confirmation)
+                db.session.commit()
+
+                # Log the confirmation
+                avg_volume = engine.average_volume(ticker)
+                logger.info(
+                    f"CONFIRMED BREAKOUT: {ticker} above {level:.2f} "
+                    f"(close: {candle.close:.2f}, vol: {candle.volume:.0f} vs avg: {avg_volume:.0f})"
+                )
+
+                # Publish confirmation event
+                _publish_confirmation_event(setup, candle)
 
     except Exception as e:
         logger.error(f"Error in setup monitor: {e}")
@@ -346,8 +620,8 @@ def _publish_confirmation_event(setup: Dict[str, Any], candle: Candle) -> bool:
         'stop': setup.get('stop')
     }
 
-    # Publish to the event system
-    return publish_event(EventChannels.SIGNAL_TRIGGERED, event_data)
+    # Publish to the general signals channel, as the candle detector does
+    return publish_event(EventTypes.SIGNAL_TRIGGERED, event_data, channel='signals:all')
 
 
 def clear_confirmed_setups() -> None:
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Process Launcher
+
+Starts the application as one process per role so the Discord bot, parsing,
+tick processing and HTTP no longer compete for one GIL. Roles communicate
+only through the Postgres event bus (see common/process_roles.py).
+
+Examples:
+    python launcher.py                      # every role, one process each
+    python launcher.py web parse            # only these roles
+    python launcher.py --scale parse=4      # four parse workers sharing the work queue
+    python launcher.py --role parse         # one role in the foreground (containers)
+    python launcher.py --single             # everything in one process (development)
+
+The supervisor restarts a role that exits, backing off up to 30 seconds, and
+stops all roles on SIGINT/SIGTERM. The web role is served by gunicorn with one
+threaded worker (Socket.IO keeps its clients in that process); --single uses
+the Socket.IO development server.
+"""
+import argparse
+import logging
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from common.process_roles import ROLES, SCALABLE_ROLES
+
+logger = logging.getLogger(__name__)
+
+RESTART_BACKOFF_MAX = 30.0
+STOP_TIMEOUT = 10.0
+# A role that stays up this long gets its restart backoff reset
+STABLE_SECONDS = 60.0
+
+# Threads of the web role's gunicorn worker; each open Socket.IO connection holds one
+WEB_THREADS = int(os.environ.get('WEB_THREADS', '50'))
+
+# Environment for roles started as more than one process
+SCALE_ENV: Dict[str, Dict[str, str]] = {
+    'parse': {'PARSING_WORK_QUEUE': 'true'},
+}
+
+# Thread-based services per role: (module, function, kwargs)
+SERVICE_STEPS: Dict[str, List[Tuple[str, str, dict]]] = {
+    'market': [
+        ('features.market.feed', 'initialize_feed', {}),
+        ('features.market.price_monitor', 'init_price_monitor', {}),
+        ('features.market.historical_data', 'init_historical_data_provider', {}),
+        ('features.strategy.candle_detector', 'init_candle_detector', {}),
+        ('features.strategy.detector', 'start_detector', {}),
+        ('features.strategy.monitor', 'start_setup_monitor', {}),
+    ],
+    'execution': [
+        ('features.management.exit_rules', 'start_exit_rules_engine', {'event_driven': True}),
+        ('features.management.position_manager', 'start_position_update_thread', {}),
+        ('features.execution.options_trader', 'init_options_trader', {}),
+    ],
+}
+
+
+def _load_app(role: str):
+    # APP_ROLES must be set before app.py runs create_app() at import time
+    os.environ['APP_ROLES'] = role
+    if role != 'web':
+        # Workers serve no pages, so skip importing every blueprint
+        os.environ.setdefault('FEATURE_LOADING', 'lazy')
+    import app as web
+    return web
+
+
+def start_services(role: str) -> int:
+    """
+    Start the thread-based services of a role.
+
+    Args:
+        role: 'market' or 'execution'
+
+    Returns:
+        int: Number of services that started
+    """
+    import importlib
+
+    started = 0
+    for module_path, function, kwargs in SERVICE_STEPS[role]:
+        try:
+            result = getattr(importlib.import_module(module_path), function)(**kwargs)
+            if result is False:
+                logger.warning(f"[{role}] {module_path}.{function} did not start")
+                continue
+            started += 1
+            logger.info(f"[{role}] Started {module_path}.{function}")
+        except Exception as e:
+            logger.error(f"[{role}] Failed to start {module_path}.{function}: {e}")
+    return started
+
+
+def web_server_options(host: str, port: int) -> Dict[str, object]:
+    """
+    Gunicorn settings for the web role.
+
+    Socket.IO runs in threading mode without a message queue, so every client
+    has to reach the same process: one gthread worker, with threads for
+    concurrent requests and WebSocket connections.
+    """
+    return {
+        'bind': f"{host}:{port}",
+        'workers': 1,
+        'worker_class': 'gthread',
+        'threads': WEB_THREADS,
+        'graceful_timeout': STOP_TIMEOUT / 2,
+        'accesslog': '-',
+    }
+
+
+def serve_web(host: str, port: int) -> int:
+    """
+    Serve the web role through gunicorn until it stops.
+
+    The app is created in the worker, not the gunicorn master, so the threads
+    app.py starts (async runtime, metrics hub) live in the serving process.
+    """
+    from gunicorn.app.base import BaseApplication
+
+    class WebApplication(BaseApplication):
+        def load_config(self):
+            for key, value in web_server_options(host, port).items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return _load_app('web').app
+
+    WebApplication().run()
+    return 0
+
+
+def _wait_until_stopped() -> None:
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    try:
+        while not stopped.wait(1.0):
+            pass
+    except KeyboardInterrupt:
+        pass
+
+
+def run_role(role: str, host: str = '0.0.0.0', port: int = 5000) -> int:
+    """
+    Run one role in the current process until it stops.
+
+    Args:
+        role: Role name from ROLES
+        host: Bind address for the web role
+        port: Port for the web role
+
+    Returns:
+        int: Process exit code
+    """
+    logger.info(f"Role '{role}' starting (pid {os.getpid()})")
+    if role == 'web':
+        return serve_web(host, port)
+
+    web = _load_app(role)
+    app = web.app
+
+    # app.py already supervises the ingest/parse coroutines on the shared async runtime
+    if role in SERVICE_STEPS:
+        with app.app_context():
+            if not start_services(role):
+                logger.error(f"[{role}] No services started")
+                return 1
+    _wait_until_stopped()
+    from common.async_runtime import runtime
+    runtime.stop()
+    return 0
+
+
+def run_single(host: str = '0.0.0.0', port: int = 5000) -> int:
+    """
+    Run every role in this process, as in development.
+
+    app.py starts the bot, ingestion and parsing in-process for APP_ROLES=all;
+    market and execution services run as daemon threads next to them.
+    """
+    web = _load_app('all')
+    for role in SERVICE_STEPS:
+        start_services(role)
+    web.socketio.run(web.app, host=host, port=port, debug=True, use_reloader=False, log_output=True)
+    return 0
+
+
+class RoleProcess:
+    """One supervised role subprocess."""
+
+    def __init__(self, role: str, command: List[str], env: Optional[Dict[str, str]] = None, name: Optional[str] = None):
+        self.role = role
+        self.name = name or role
+        self.command = command
+        self.env = env
+        self.process: Optional[subprocess.Popen] = None
+        self.started_at = 0.0
+        self.restarts = 0
+        self.backoff = 1.0
+        self.restart_at: Optional[float] = None
+
+    def start(self) -> None:
+        self.process = subprocess.Popen(self.command, env={**os.environ, **self.env} if self.env else None)
+        self.started_at = time.monotonic()
+        self.restart_at = None
+        logger.info(f"Started role '{self.name}' (pid {self.process.pid})")
+
+    def poll(self, now: float) -> None:
+        """Schedule a restart after the process exits, and perform it when due."""
+        if self.restart_at is not None:
+            if now >= self.restart_at:
+                self.restarts += 1
+                self.start()
+            return
+        if self.process is None or self.process.poll() is None:
+            return
+
+        if now - self.started_at >= STABLE_SECONDS:
+            self.backoff = 1.0
+        logger.warning(
+            f"Role '{self.name}' exited with code {self.process.returncode}; restarting in {self.backoff:.0f}s"
+        )
+        self.restart_at = now + self.backoff
+        self.backoff = min(self.backoff * 2, RESTART_BACKOFF_MAX)
+
+    def stop(self) -> None:
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+
+    def wait(self, deadline: float) -> None:
+        if self.process is None:
+            return
+        try:
+            self.process.wait(timeout=max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Role '{self.name}' did not stop in time; killing it")
+            self.process.kill()
+            self.process.wait()
+
+
+class Supervisor:
+    """Starts one subprocess per role and keeps them running."""
+
+    def __init__(self, roles: List[str], extra_args: Optional[List[str]] = None,
+                 command_for: Optional[Callable[[str], List[str]]] = None,
+                 scale: Optional[Dict[str, int]] = None):
+        """
+        Initialize the supervisor.
+
+        Args:
+            roles: Roles to run
+            extra_args: Arguments passed through to every role process
+            command_for: Builds the command for a role (default: this launcher with --role)
+            scale: Process count per scalable role (default: 1)
+        """
+        command_for = command_for or (
+            lambda role: [sys.executable, os.path.abspath(__file__), '--role', role] + list(extra_args or [])
+        )
+        scale = scale or {}
+        self.processes = []
+        for role in roles:
+            count = scale.get(role, 1)
+            env = SCALE_ENV.get(role) if count > 1 else None
+            for index in range(count):
+                name = f"{role}-{index + 1}" if count > 1 else role
+                self.processes.append(RoleProcess(role, command_for(role), env=env, name=name))
+        self._stopping = threading.Event()
+
+    def stop(self, *_) -> None:
+        self._stopping.set()
+
+    def run(self, poll_interval: float = 1.0) -> int:
+        """Run until stopped by a signal. Returns the exit code."""
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        for process in self.processes:
+            process.start()
+        try:
+            while not self._stopping.wait(poll_interval):
+                now = time.monotonic()
+                for process in self.processes:
+                    process.poll(now)
+        finally:
+            logger.info("Stopping all roles")
+            for process in self.processes:
+                process.stop()
+            deadline = time.monotonic() + STOP_TIMEOUT
+            for process in self.processes:
+                process.wait(deadline)
+        return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Run the application as one process per role',
+        epilog='Roles: ' + '; '.join(f"{name} - {text}" for name, text in ROLES.items())
+    )
+    parser.add_argument('roles', nargs='*', metavar='ROLE', help='Roles to supervise (default: all)')
+    parser.add_argument('--role', choices=sorted(ROLES), help='Run a single role in the foreground')
+    parser.add_argument('--scale', action='append', default=[], metavar='ROLE=N',
+                        help=f"Run N processes of a role ({', '.join(sorted(SCALABLE_ROLES))})")
+    parser.add_argument('--single', action='store_true', help='Run every role in one process (development)')
+    parser.add_argument('--host', default='0.0.0.0', help='Bind address for the web role')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 5000)), help='Port for the web role')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format=f'%(asctime)s - [{args.role or "launcher"}] %(name)s - %(levelname)s - %(message)s'
+    )
+
+    unknown = sorted(set(args.roles) - set(ROLES))
+    if unknown:
+        parser.error(f"unknown roles: {', '.join(unknown)}")
+    scale = {}
+    for item in args.scale:
+        role, _, count = item.partition('=')
+        if role not in SCALABLE_ROLES or not count.isdigit() or int(count) < 1:
+            parser.error(f"--scale expects ROLE=N with ROLE in {', '.join(sorted(SCALABLE_ROLES))}, got {item!r}")
+        scale[role] = int(count)
+
+    if args.single:
+        return run_single(args.host, args.port)
+    if args.role:
+        return run_role(args.role, args.host, args.port)
+
+    roles = args.roles or list(ROLES)
+    return Supervisor(roles, ['--host', args.host, '--port', str(args.port)], scale=scale).run()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
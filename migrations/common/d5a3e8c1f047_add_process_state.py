@@ -0,0 +1,39 @@
+"""Add process_state for worker state shown by the web dashboards
+
+Revision ID: d5a3e8c1f047
+Revises: 7c2f9e4a1b68
+Create Date: 2026-10-19 00:52:09.614388
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a3e8c1f047'
+down_revision: Union[str, None] = '7c2f9e4a1b68'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'process_state',
+        sa.Column('instance', sa.String(length=255), nullable=False),
+        sa.Column('roles', sa.String(length=100), nullable=False),
+        sa.Column('hostname', sa.String(length=255), nullable=False),
+        sa.Column('pid', sa.Integer(), nullable=False),
+        sa.Column('state', sa.JSON(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('instance')
+    )
+    op.create_index('ix_process_state_updated_at', 'process_state', ['updated_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_process_state_updated_at', table_name='process_state')
+    op.drop_table('process_state')
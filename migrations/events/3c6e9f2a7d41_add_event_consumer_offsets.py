@@ -0,0 +1,36 @@
+"""Add durable consumer-group offsets over the events table
+
+Revision ID: 3c6e9f2a7d41
+Revises: e41c7b9a5d23
+Create Date: 2026-10-18 22:41:15.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c6e9f2a7d41'
+down_revision: Union[str, None] = 'e41c7b9a5d23'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'event_consumer_offsets',
+        sa.Column('consumer_group', sa.String(length=100), nullable=False),
+        sa.Column('last_event_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('events_handled', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('consumer_group')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('event_consumer_offsets')
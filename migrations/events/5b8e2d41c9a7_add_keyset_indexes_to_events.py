@@ -0,0 +1,41 @@
+"""Add composite keyset pagination indexes to events
+
+Revision ID: 5b8e2d41c9a7
+Revises: 1695769576fb
+Create Date: 2026-10-18 09:12:44.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e2d41c9a7'
+down_revision: Union[str, None] = '1695769576fb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build concurrently so the live event bus keeps accepting inserts
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_events_channel_id', 'events', ['channel', 'id'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_events_correlation_id_id', 'events', ['correlation_id', 'id'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_events_correlation_id_id', table_name='events',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_events_channel_id', table_name='events',
+                      postgresql_concurrently=True, if_exists=True)
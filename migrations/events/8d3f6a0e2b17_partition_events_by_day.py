@@ -0,0 +1,93 @@
+"""Partition events table by day on created_at
+
+Revision ID: 8d3f6a0e2b17
+Revises: 5b8e2d41c9a7
+Create Date: 2026-10-18 10:02:31.540917
+
+"""
+from datetime import datetime, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3f6a0e2b17'
+down_revision: Union[str, None] = '5b8e2d41c9a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match common.events.partitions
+RETENTION_DAYS = 90
+PREMAKE_DAYS = 7
+
+
+def _create_daily_partitions(first_day, last_day) -> None:
+    day = first_day
+    while day <= last_day:
+        upper = day + timedelta(days=1)
+        op.execute(
+            f"CREATE TABLE IF NOT EXISTS events_p{day.strftime('%Y%m%d')} PARTITION OF events "
+            f"FOR VALUES FROM ('{day.isoformat()} 00:00:00+00') TO ('{upper.isoformat()} 00:00:00+00')"
+        )
+        day = upper
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the old table aside; its columns, defaults and checks are cloned below
+    op.execute("ALTER TABLE events RENAME TO events_legacy")
+    op.execute("ALTER INDEX IF EXISTS events_pkey RENAME TO events_legacy_pkey")
+    op.execute("""
+        CREATE TABLE events (LIKE events_legacy INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+        PARTITION BY RANGE (created_at)
+    """)
+    # The partition key has to be part of the primary key; ids stay unique via the shared sequence
+    op.execute("ALTER TABLE events ADD PRIMARY KEY (id, created_at)")
+    op.execute("CREATE TABLE events_default PARTITION OF events DEFAULT")
+
+    # Daily partitions for the retention window plus the look-ahead window
+    today = datetime.utcnow().date()
+    first_day = today - timedelta(days=RETENTION_DAYS)
+    _create_daily_partitions(first_day, today + timedelta(days=PREMAKE_DAYS))
+
+    # Copy only rows still inside the retention window, starting at the first
+    # daily partition (UTC midnight) rather than the session's CURRENT_DATE
+    op.execute(f"""
+        INSERT INTO events
+        SELECT * FROM events_legacy
+        WHERE created_at >= '{first_day.isoformat()} 00:00:00+00'
+    """)
+
+    # Hand the id sequence to the new table before the old one goes away
+    op.execute("ALTER SEQUENCE events_id_seq OWNED BY events.id")
+    op.execute("DROP TABLE events_legacy")
+
+    # Indexes on the parent cascade to every partition
+    op.create_index('ix_events_event_type', 'events', ['event_type'])
+    op.create_index('ix_events_channel', 'events', ['channel'])
+    op.create_index('ix_events_correlation_id', 'events', ['correlation_id'])
+    op.create_index('ix_events_timestamp', 'events', ['timestamp'])
+    op.create_index('ix_events_channel_id', 'events', ['channel', 'id'])
+    op.create_index('ix_events_correlation_id_id', 'events', ['correlation_id', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE events RENAME TO events_partitioned")
+    op.execute("ALTER INDEX IF EXISTS events_pkey RENAME TO events_partitioned_pkey")
+    op.execute("""
+        CREATE TABLE events (LIKE events_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+    """)
+    op.execute("ALTER TABLE events ADD PRIMARY KEY (id)")
+    op.execute("INSERT INTO events SELECT * FROM events_partitioned")
+    op.execute("ALTER SEQUENCE events_id_seq OWNED BY events.id")
+    op.execute("DROP TABLE events_partitioned")
+
+    op.create_index('ix_events_event_type', 'events', ['event_type'])
+    op.create_index('ix_events_channel', 'events', ['channel'])
+    op.create_index('ix_events_correlation_id', 'events', ['correlation_id'])
+    op.create_index('ix_events_timestamp', 'events', ['timestamp'])
+    op.create_index('ix_events_channel_id', 'events', ['channel', 'id'])
+    op.create_index('ix_events_correlation_id_id', 'events', ['correlation_id', 'id'])
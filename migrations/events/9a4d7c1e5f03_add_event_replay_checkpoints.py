@@ -0,0 +1,41 @@
+"""Add event replay checkpoints
+
+Revision ID: 9a4d7c1e5f03
+Revises: 3c6e9f2a7d41
+Create Date: 2026-10-18 22:58:40.117264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4d7c1e5f03'
+down_revision: Union[str, None] = '3c6e9f2a7d41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'event_replay_checkpoints',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('last_event_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('events_processed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('events_failed', sa.Integer(), nullable=False, server_default='0'),
+        # JSON array of failed event IDs at or below last_event_id, retried on resume
+        sa.Column('failed_event_ids', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='running'),
+        sa.Column('filters', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('event_replay_checkpoints')
@@ -0,0 +1,39 @@
+"""Add event_dead_letters for events a consumer group gave up on
+
+Revision ID: a3f7c9e1d582
+Revises: d5a3e8c1f047
+Create Date: 2026-10-19 09:14:37.208516
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f7c9e1d582'
+down_revision: Union[str, None] = 'd5a3e8c1f047'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'event_dead_letters',
+        sa.Column('consumer_group', sa.String(length=100), nullable=False),
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('event_type', sa.String(length=100), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        # NULL until the replay engine re-drives the event successfully
+        sa.Column('redriven_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('consumer_group', 'event_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('event_dead_letters')
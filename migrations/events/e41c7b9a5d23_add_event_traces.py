@@ -0,0 +1,115 @@
+"""Add per-correlation event trace table maintained by trigger
+
+Revision ID: e41c7b9a5d23
+Revises: 8d3f6a0e2b17
+Create Date: 2026-10-18 11:24:07.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41c7b9a5d23'
+down_revision: Union[str, None] = '8d3f6a0e2b17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Event type -> pipeline stage; must match common.events.traces.TRACE_STAGES
+RECEIVED_TYPES = "('discord.message.new', 'discord.message_received', 'discord.message.received')"
+STORED_TYPES = "('message.stored', 'ingestion.message.stored')"
+PARSED_TYPES = "('parsing.completed', 'parsing.setup.parsed')"
+SETUP_CREATED_TYPES = "('setup.parsed', 'parsing.setup.saved', 'setup.created')"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'event_traces',
+        sa.Column('correlation_id', sa.String(length=36), nullable=False),
+        sa.Column('received_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('stored_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('parsed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('setup_created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('first_event_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_event_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('event_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_event_type', sa.String(length=100), nullable=True),
+        sa.PrimaryKeyConstraint('correlation_id')
+    )
+    op.create_index('ix_event_traces_first_event_at', 'event_traces', ['first_event_at'])
+
+    # One upsert per published event keeps the trace current without a second round trip
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION record_event_trace() RETURNS trigger AS $$
+        DECLARE
+            ts timestamptz := COALESCE(NEW.created_at, now());
+        BEGIN
+            IF NEW.correlation_id IS NULL THEN
+                RETURN NULL;
+            END IF;
+
+            INSERT INTO event_traces AS t (
+                correlation_id, received_at, stored_at, parsed_at, setup_created_at,
+                first_event_at, last_event_at, event_count, last_event_type
+            ) VALUES (
+                NEW.correlation_id,
+                CASE WHEN NEW.event_type IN {RECEIVED_TYPES} THEN ts END,
+                CASE WHEN NEW.event_type IN {STORED_TYPES} THEN ts END,
+                CASE WHEN NEW.event_type IN {PARSED_TYPES} THEN ts END,
+                CASE WHEN NEW.event_type IN {SETUP_CREATED_TYPES} THEN ts END,
+                ts, ts, 1, NEW.event_type
+            )
+            ON CONFLICT (correlation_id) DO UPDATE SET
+                received_at = LEAST(t.received_at, EXCLUDED.received_at),
+                stored_at = LEAST(t.stored_at, EXCLUDED.stored_at),
+                parsed_at = LEAST(t.parsed_at, EXCLUDED.parsed_at),
+                setup_created_at = LEAST(t.setup_created_at, EXCLUDED.setup_created_at),
+                first_event_at = LEAST(t.first_event_at, EXCLUDED.first_event_at),
+                last_event_at = GREATEST(t.last_event_at, EXCLUDED.last_event_at),
+                event_count = t.event_count + 1,
+                last_event_type = CASE
+                    WHEN EXCLUDED.last_event_at >= t.last_event_at THEN EXCLUDED.last_event_type
+                    ELSE t.last_event_type
+                END;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER events_record_trace
+        AFTER INSERT ON events
+        FOR EACH ROW EXECUTE FUNCTION record_event_trace()
+    """)
+
+    # Backfill traces for events already in the table
+    op.execute(f"""
+        INSERT INTO event_traces (
+            correlation_id, received_at, stored_at, parsed_at, setup_created_at,
+            first_event_at, last_event_at, event_count, last_event_type
+        )
+        SELECT
+            correlation_id,
+            MIN(created_at) FILTER (WHERE event_type IN {RECEIVED_TYPES}),
+            MIN(created_at) FILTER (WHERE event_type IN {STORED_TYPES}),
+            MIN(created_at) FILTER (WHERE event_type IN {PARSED_TYPES}),
+            MIN(created_at) FILTER (WHERE event_type IN {SETUP_CREATED_TYPES}),
+            MIN(created_at),
+            MAX(created_at),
+            COUNT(*),
+            (ARRAY_AGG(event_type ORDER BY created_at DESC, id DESC))[1]
+        FROM events
+        WHERE correlation_id IS NOT NULL
+        GROUP BY correlation_id
+        ON CONFLICT (correlation_id) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS events_record_trace ON events")
+    op.execute("DROP FUNCTION IF EXISTS record_event_trace()")
+    op.drop_index('ix_event_traces_first_event_at', table_name='event_traces')
+    op.drop_table('event_traces')
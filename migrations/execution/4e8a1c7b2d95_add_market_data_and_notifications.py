@@ -0,0 +1,61 @@
+"""Add market_data and notifications used by the exit rules engine
+
+Revision ID: 4e8a1c7b2d95
+Revises: b2e7d5a9c318
+Create Date: 2026-10-18 23:58:12.318406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e8a1c7b2d95'
+down_revision: Union[str, None] = 'b2e7d5a9c318'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    # Older deployments may have created these outside Alembic
+    if 'market_data' not in existing:
+        op.create_table(
+            'market_data',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('symbol', sa.String(length=16), nullable=False),
+            sa.Column('price', sa.Float(), nullable=False),
+            sa.Column('previous_close', sa.Float(), nullable=True),
+            sa.Column('volume', sa.BigInteger(), nullable=True),
+            sa.Column('timestamp', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_market_data_symbol_timestamp', 'market_data', ['symbol', 'timestamp'])
+
+    if 'notifications' not in existing:
+        op.create_table(
+            'notifications',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('type', sa.String(length=50), nullable=False),
+            sa.Column('title', sa.String(length=255), nullable=True),
+            sa.Column('message', sa.Text(), nullable=True),
+            sa.Column('meta_data', sa.Text(), nullable=True),
+            sa.Column('read', sa.Boolean(), nullable=False, server_default=sa.false()),
+            sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_notifications_type', 'notifications', ['type'])
+        op.create_index('ix_notifications_created_at', 'notifications', ['created_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notifications_created_at', table_name='notifications')
+    op.drop_index('ix_notifications_type', table_name='notifications')
+    op.drop_table('notifications')
+    op.drop_index('ix_market_data_symbol_timestamp', table_name='market_data')
+    op.drop_table('market_data')
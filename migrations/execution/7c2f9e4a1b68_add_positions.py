@@ -0,0 +1,54 @@
+"""Add positions mirrored from Alpaca
+
+Revision ID: 7c2f9e4a1b68
+Revises: 4e8a1c7b2d95
+Create Date: 2026-10-19 00:21:47.902135
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2f9e4a1b68'
+down_revision: Union[str, None] = '4e8a1c7b2d95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Older deployments may have created the table outside Alembic
+    if 'positions' in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    op.create_table(
+        'positions',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('symbol', sa.String(length=32), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('avg_entry_price', sa.Float(), nullable=True),
+        sa.Column('side', sa.String(length=10), nullable=False, server_default='long'),
+        sa.Column('market_value', sa.Float(), nullable=True),
+        sa.Column('cost_basis', sa.Float(), nullable=True),
+        sa.Column('unrealized_pl', sa.Float(), nullable=True),
+        sa.Column('unrealized_plpc', sa.Float(), nullable=True),
+        sa.Column('current_price', sa.Float(), nullable=True),
+        sa.Column('lastday_price', sa.Float(), nullable=True),
+        sa.Column('change_today', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('closed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_positions_symbol', 'positions', ['symbol'])
+    op.create_index('ix_positions_closed_at', 'positions', ['closed_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_positions_closed_at', table_name='positions')
+    op.drop_index('ix_positions_symbol', table_name='positions')
+    op.drop_table('positions')
@@ -0,0 +1,48 @@
+"""Add parse_jobs work queue for horizontally scaled parse workers
+
+Revision ID: 6f1b8e3d9c27
+Revises: 9a4d7c1e5f03
+Create Date: 2026-10-18 23:12:05.861930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f1b8e3d9c27'
+down_revision: Union[str, None] = '9a4d7c1e5f03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'parse_jobs',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('message_id', sa.String(length=64), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('status', sa.String(length=10), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('claimed_by', sa.String(length=100), nullable=True),
+        sa.Column('claimed_at', sa.DateTime(), nullable=True),
+        sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('enqueued_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('available_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('message_id')
+    )
+    # Claims scan pending/expired jobs in id order
+    op.create_index('ix_parse_jobs_status_id', 'parse_jobs', ['status', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_parse_jobs_status_id', table_name='parse_jobs')
+    op.drop_table('parse_jobs')
@@ -0,0 +1,36 @@
+"""Add signal_confirmations written by the strategy monitor
+
+Revision ID: b2e7d5a9c318
+Revises: 6f1b8e3d9c27
+Create Date: 2026-10-18 23:34:52.204716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2e7d5a9c318'
+down_revision: Union[str, None] = '6f1b8e3d9c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'signal_confirmations',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('setup_id', sa.String(length=64), nullable=False),
+        sa.Column('confirmed_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_signal_confirmations_setup_id', 'signal_confirmations', ['setup_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_signal_confirmations_setup_id', table_name='signal_confirmations')
+    op.drop_table('signal_confirmations')
@@ -0,0 +1,73 @@
+/**
+ * Metrics hub client
+ *
+ * Subscribes to server-pushed dashboard payloads over Socket.IO (see
+ * common/metrics/hub.py). The server sends a full snapshot on subscribe and
+ * then only the top-level keys that changed; this client merges them and
+ * hands the complete payload to the page callback.
+ *
+ * Requires the Socket.IO client script (io) to be loaded first.
+ */
+const MetricsHub = (function () {
+  let socket = null;
+  const handlers = {};
+  const payloads = {};
+
+  function connect() {
+    if (socket) return socket;
+    socket = io();
+
+    // Re-subscribe after reconnects; rooms do not survive a new session
+    socket.on('connect', function () {
+      Object.keys(handlers).forEach(function (topic) {
+        socket.emit('metrics_subscribe', { topic: topic });
+      });
+    });
+
+    socket.on('metrics_snapshot', function (message) {
+      payloads[message.topic] = message.payload || {};
+      notify(message.topic);
+    });
+
+    socket.on('metrics_update', function (message) {
+      const payload = Object.assign({}, payloads[message.topic] || {}, message.changed);
+      (message.removed || []).forEach(function (key) { delete payload[key]; });
+      payloads[message.topic] = payload;
+      notify(message.topic);
+    });
+
+    socket.on('metrics_error', function (message) {
+      console.warn('Metrics hub error for topic', message.topic, message.error);
+    });
+
+    return socket;
+  }
+
+  function notify(topic) {
+    (handlers[topic] || []).forEach(function (handler) {
+      try {
+        handler(payloads[topic], topic);
+      } catch (error) {
+        console.error('Metrics handler failed for topic', topic, error);
+      }
+    });
+  }
+
+  /**
+   * Subscribe to a metrics topic
+   * @param {string} topic - Topic name, e.g. 'discord', 'ingestion', 'parsing', 'events'
+   * @param {function(Object, string)} handler - Called with the full payload on every change
+   */
+  function subscribe(topic, handler) {
+    const firstHandler = !handlers[topic];
+    handlers[topic] = (handlers[topic] || []).concat([handler]);
+    const active = connect();
+    if (firstHandler && active.connected) {
+      active.emit('metrics_subscribe', { topic: topic });
+    } else if (payloads[topic]) {
+      handler(payloads[topic], topic);
+    }
+  }
+
+  return { subscribe: subscribe };
+})();
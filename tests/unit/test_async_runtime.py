@@ -0,0 +1,130 @@
+"""
+Tests for the shared async runtime.
+
+Covers the thread-safe bridge from sync code, restart policies, per-task
+health and shutdown.
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from common.async_runtime import ALWAYS, NEVER, ON_FAILURE, AsyncRuntime
+from common.events import publisher
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestAsyncRuntime(unittest.TestCase):
+    """Test cases for running and supervising coroutines on one loop."""
+
+    def setUp(self):
+        self.runtime = AsyncRuntime(name='test-runtime')
+
+    def tearDown(self):
+        self.runtime.stop(timeout=5)
+
+    def test_run_executes_on_the_runtime_thread(self):
+        async def where():
+            return threading.current_thread().name
+
+        self.assertEqual(self.runtime.run(where(), timeout=5), 'test-runtime')
+        loop = self.runtime.start()
+        self.assertIs(self.runtime.start(), loop)
+
+    def test_run_from_the_runtime_loop_is_rejected(self):
+        async def nested():
+            inner = asyncio.sleep(0)
+            with self.assertRaises(RuntimeError):
+                self.runtime.run(inner)
+            return True
+
+        self.assertTrue(self.runtime.run(nested(), timeout=5))
+
+    def test_failing_task_restarts_with_health(self):
+        calls = []
+
+        async def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise ConnectionError('listener dropped')
+            await asyncio.Event().wait()
+
+        task = self.runtime.supervise('listener', flaky, restart=ALWAYS, backoff=0.01)
+        self.assertTrue(wait_for(lambda: task.restarts == 2 and task.state == 'running'))
+
+        health = self.runtime.health()
+        self.assertTrue(health['running'])
+        self.assertEqual(health['tasks']['listener']['restarts'], 2)
+        self.assertEqual(health['tasks']['listener']['last_error'], 'ConnectionError: listener dropped')
+
+    def test_restart_policies(self):
+        async def done():
+            return None
+
+        async def broken():
+            raise ValueError('bad config')
+
+        finished = self.runtime.supervise('once', done, restart=ON_FAILURE)
+        failed = self.runtime.supervise('broken', broken, restart=NEVER)
+
+        self.assertTrue(wait_for(lambda: finished.state == 'finished' and failed.state == 'failed'))
+        self.assertEqual((finished.restarts, failed.restarts), (0, 0))
+        with self.assertRaises(ValueError):
+            self.runtime.supervise('bad', done, restart='sometimes')
+
+    def test_supervise_is_idempotent_and_cancel_stops_the_task(self):
+        started = []
+
+        async def service():
+            started.append(1)
+            await asyncio.Event().wait()
+
+        task = self.runtime.supervise('service', service)
+        self.assertIs(self.runtime.supervise('service', service), task)
+        self.assertTrue(wait_for(lambda: task.state == 'running'))
+
+        self.assertTrue(self.runtime.cancel('service', timeout=5))
+        self.assertEqual(task.state, 'stopped')
+        self.assertEqual(len(started), 1)
+
+    def test_stop_cancels_services_and_ends_the_thread(self):
+        cleaned_up = threading.Event()
+
+        async def service():
+            try:
+                await asyncio.Event().wait()
+            finally:
+                cleaned_up.set()
+
+        task = self.runtime.supervise('service', service)
+        self.assertTrue(wait_for(lambda: task.state == 'running'))
+        self.runtime.stop(timeout=5)
+
+        self.assertTrue(cleaned_up.is_set())
+        self.assertFalse(self.runtime.running)
+        self.assertEqual(task.state, 'stopped')
+
+    def test_publish_event_outside_flask_uses_the_runtime(self):
+        seen = {}
+
+        async def fake_publish(*args):
+            seen['thread'] = threading.current_thread().name
+            return True
+
+        with patch.object(publisher, 'runtime', self.runtime), \
+                patch.object(publisher, 'publish_event_async', AsyncMock(side_effect=fake_publish)):
+            self.assertTrue(publisher.publish_event('test.event', {'a': 1}))
+
+        self.assertEqual(seen['thread'], 'test-runtime')
+
+
+if __name__ == '__main__':
+    unittest.main()
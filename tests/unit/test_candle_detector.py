@@ -0,0 +1,194 @@
+"""
+Tests for the push-based candle detector.
+
+Covers the price-sorted signal book, batching of signal events and the
+bar-close feed from the historical data provider, which also records each
+closed bar in market_data.
+"""
+
+import asyncio
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+from flask import Flask
+
+from common.db import db
+from features.market import historical_data
+from features.market.models import MarketDataModel
+from features.strategy import candle_detector
+from features.strategy.candle_detector import SymbolSignalBook
+
+
+def make_signal(signal_id, category, trigger, targets=()):
+    return {
+        'id': signal_id,
+        'ticker': 'SPY',
+        'category': category,
+        'status': 'pending',
+        'trigger': {'price': trigger},
+        'targets': [{'price': price} for price in targets],
+    }
+
+
+class TestSymbolSignalBook(unittest.TestCase):
+    """Test cases for trigger and target resolution."""
+
+    def test_breakout_triggers_only_below_close(self):
+        book = SymbolSignalBook()
+        for signal_id, trigger in [(1, 101.0), (2, 100.0), (3, 103.0)]:
+            book.add(make_signal(signal_id, 'breakout', trigger))
+
+        changes = book.on_close(101.0, 101.5, 100.5)
+        self.assertEqual([(s['id'], kind) for s, kind, _, _ in changes], [(2, 'trigger')])
+
+        changes = book.on_close(104.0, 104.5, 101.0)
+        self.assertEqual(sorted(s['id'] for s, _, _, _ in changes), [1, 3])
+        self.assertEqual(book.on_close(110.0, 111.0, 109.0), [])
+
+    def test_breakdown_triggers_above_close(self):
+        book = SymbolSignalBook()
+        book.add(make_signal(1, 'breakdown', 99.0))
+        book.add(make_signal(2, 'breakdown', 97.0))
+
+        changes = book.on_close(98.0, 99.5, 97.5)
+        self.assertEqual([s['id'] for s, _, _, _ in changes], [1])
+
+    def test_targets_tracked_from_next_bar_until_completed(self):
+        book = SymbolSignalBook()
+        signal = make_signal(1, 'breakout', 100.0, targets=(102.0, 104.0))
+        book.add(signal)
+
+        # Triggering bar reaches the first target, which only counts from the next bar
+        changes = book.on_close(101.0, 102.5, 99.5)
+        self.assertEqual([kind for _, kind, _, _ in changes], ['trigger'])
+
+        changes = book.on_close(102.0, 102.5, 101.0)
+        self.assertEqual([kind for _, kind, _, _ in changes], ['target_hit'])
+
+        changes = book.on_close(104.5, 105.0, 103.0)
+        self.assertEqual([kind for _, kind, _, _ in changes], ['target_hit', 'completed'])
+        self.assertEqual(signal['status'], 'completed')
+
+    def test_remove_drops_signal_from_index(self):
+        book = SymbolSignalBook()
+        book.add(make_signal(1, 'breakout', 100.0))
+        book.add(make_signal(2, 'breakout', 100.0))
+
+        self.assertIsNotNone(book.remove('1'))
+        self.assertIsNone(book.remove('99'))
+        changes = book.on_close(101.0, 101.5, 100.0)
+        self.assertEqual([s['id'] for s, _, _, _ in changes], [2])
+
+
+class TestSignalEventBatching(unittest.TestCase):
+    """Test cases for batched signal publication."""
+
+    def setUp(self):
+        candle_detector._active_signals.clear()
+        candle_detector._pending_events.clear()
+        candle_detector._flush_task = None
+
+    def test_closed_bar_events_are_published_in_one_batch(self):
+        book = SymbolSignalBook()
+        book.add(make_signal(1, 'breakout', 100.0))
+        book.add(make_signal(2, 'breakout', 100.5))
+        candle_detector._active_signals['SPY'] = book
+
+        async def run():
+            with patch.object(candle_detector, 'SIGNAL_FLUSH_INTERVAL', 0), \
+                    patch.object(candle_detector, 'publish_event_batch_async',
+                                 new=AsyncMock(return_value=4)) as mock_batch:
+                await candle_detector.handle_candle_event('market.price.update', {'ticker': 'SPY', 'close': 101})
+                await candle_detector.handle_candle_event(
+                    'market.candle.closed', {'ticker': 'SPY', 'close': 101, 'high': 101.5, 'low': 99.5}
+                )
+                await candle_detector._flush_task
+                return mock_batch
+
+        mock_batch = asyncio.run(run())
+        mock_batch.assert_awaited_once()
+        batch = mock_batch.await_args.args[0]
+        self.assertEqual(len(batch), 4)
+        self.assertEqual({event['channel'] for event in batch}, {'signals:SPY', 'signals:all'})
+        self.assertTrue(all(event['event_type'] == 'signal.triggered' for event in batch))
+
+
+
+class TestBarCloseFeed(unittest.TestCase):
+    """End-to-end: polled bars become bar-close events that trigger signals."""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        MarketDataModel.__table__.create(db.engine)
+
+        candle_detector._active_signals.clear()
+        candle_detector._pending_events.clear()
+        candle_detector._flush_task = None
+        historical_data._last_closed.clear()
+        self.bars = [
+            {'timestamp': '2025-05-21T14:25:00+00:00', 'open': 99.0, 'high': 99.8, 'low': 98.9, 'close': 99.5, 'volume': 900},
+            {'timestamp': '2025-05-21T14:30:00+00:00', 'open': 99.5, 'high': 101.5, 'low': 99.4, 'close': 101.0, 'volume': 1500},
+            # Still forming at 14:36
+            {'timestamp': '2025-05-21T14:35:00+00:00', 'open': 101.0, 'high': 103.0, 'low': 100.9, 'close': 102.8, 'volume': 400},
+        ]
+        self.published = []
+
+    def tearDown(self):
+        db.session.remove()
+        self.ctx.pop()
+
+    def poll(self, minute):
+        now = datetime(2025, 5, 21, 14, minute, tzinfo=timezone.utc)
+        publish = lambda **event: self.published.append(event) or True
+        with patch.object(historical_data, 'get_bars', return_value=self.bars), \
+                patch.object(historical_data, 'publish_event', side_effect=publish):
+            return historical_data._update_candles(['SPY'], '5Min', 12, now=now)
+
+    def test_closed_bars_are_published_once(self):
+        self.assertEqual(self.poll(36), 1)
+        self.assertEqual(self.poll(38), 0)
+        self.assertEqual(self.poll(40), 1)
+
+        self.assertEqual([e['data']['timestamp'] for e in self.published], [
+            '2025-05-21T14:30:00+00:00', '2025-05-21T14:35:00+00:00'
+        ])
+        self.assertEqual({(e['event_type'], e['channel']) for e in self.published}, {('market.candle.closed', 'events')})
+
+    def test_closed_bars_are_recorded_at_their_close(self):
+        self.poll(36)
+        self.poll(40)
+
+        rows = MarketDataModel.query.order_by(MarketDataModel.timestamp).all()
+        self.assertEqual([(row.symbol, row.price, row.timestamp) for row in rows], [
+            ('SPY', 101.0, datetime(2025, 5, 21, 14, 35)),
+            ('SPY', 102.8, datetime(2025, 5, 21, 14, 40)),
+        ])
+
+    def test_bar_close_triggers_signal(self):
+        book = SymbolSignalBook()
+        book.add(make_signal(1, 'breakout', 100.0))
+        candle_detector._active_signals['SPY'] = book
+        self.poll(36)
+
+        async def run():
+            with patch.object(candle_detector, 'SIGNAL_FLUSH_INTERVAL', 0), \
+                    patch.object(candle_detector, 'publish_event_batch_async',
+                                 new=AsyncMock(return_value=2)) as mock_batch:
+                for event in self.published:
+                    await candle_detector.handle_candle_event(event['event_type'], event['data'])
+                await candle_detector._flush_task
+                return mock_batch
+
+        batch = asyncio.run(run()).await_args.args[0]
+        self.assertEqual({event['event_type'] for event in batch}, {'signal.triggered'})
+        self.assertEqual(batch[0]['data']['price'], 101.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+"""
+Tests for connection pool profiles and pool metrics.
+
+Covers combining role profiles, the engine and asyncpg options built from
+them, per-transaction timeout overrides, and checkout wait/holder tracking
+on a real (sqlite) engine.
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, exc, text
+
+from common.db.pool import (
+    EXPORT_STATEMENT_TIMEOUT_MS, POOL_PROFILES, InstrumentedQueuePool, asyncpg_pool_options, engine_options,
+    export_timeouts, pool_metrics, pool_profile
+)
+
+
+class TestPoolProfiles(unittest.TestCase):
+    """Test cases for per-role pool budgets."""
+
+    def test_roles_in_one_process_share_a_budget(self):
+        profile = pool_profile(['web', 'parse'])
+        web, parse = POOL_PROFILES['web'], POOL_PROFILES['parse']
+
+        self.assertEqual(profile.pool_size, web.pool_size + parse.pool_size)
+        self.assertEqual(profile.max_overflow, web.max_overflow + parse.max_overflow)
+        self.assertEqual(profile.statement_timeout_ms, max(web.statement_timeout_ms, parse.statement_timeout_ms))
+
+    def test_environment_overrides_the_profile(self):
+        with patch.dict(os.environ, {'DB_POOL_SIZE': '2', 'DB_STATEMENT_TIMEOUT_MS': '5000'}):
+            profile = pool_profile(['market'])
+        self.assertEqual((profile.pool_size, profile.statement_timeout_ms), (2, 5000))
+        self.assertEqual(profile.max_overflow, POOL_PROFILES['market'].max_overflow)
+
+    def test_unknown_roles_are_rejected(self):
+        with self.assertRaises(ValueError):
+            pool_profile(['tick'])
+
+    def test_engine_options_only_size_postgres_pools(self):
+        profile = pool_profile(['web'])
+
+        sqlite = engine_options('sqlite://', profile)
+        self.assertNotIn('pool_size', sqlite)
+        self.assertTrue(sqlite['pool_pre_ping'])
+
+        postgres = engine_options('postgresql://localhost/trading', profile)
+        self.assertIs(postgres['poolclass'], InstrumentedQueuePool)
+        self.assertEqual(postgres['pool_size'], profile.pool_size)
+        self.assertIn('-c statement_timeout=15000', postgres['connect_args']['options'])
+
+        async_options = asyncpg_pool_options(profile)
+        self.assertEqual(async_options['server_settings']['idle_in_transaction_session_timeout'], '60000')
+
+
+
+class FakeSession:
+    """Records the statements executed against a given dialect."""
+
+    def __init__(self, dialect):
+        self.dialect = dialect
+        self.statements = []
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=SimpleNamespace(name=self.dialect))
+
+    def execute(self, statement):
+        self.statements.append(str(statement))
+
+
+class TestTransactionTimeouts(unittest.TestCase):
+    """Test cases for the per-transaction export limits."""
+
+    def test_export_limits_are_set_for_the_transaction_only(self):
+        session = FakeSession('postgresql')
+
+        self.assertTrue(export_timeouts(session))
+        self.assertEqual(session.statements, [
+            f"SET LOCAL statement_timeout = {EXPORT_STATEMENT_TIMEOUT_MS}",
+            "SET LOCAL idle_in_transaction_session_timeout = 300000",
+        ])
+        self.assertGreater(EXPORT_STATEMENT_TIMEOUT_MS, POOL_PROFILES['web'].statement_timeout_ms)
+
+    def test_environment_overrides_and_other_dialects(self):
+        session = FakeSession('postgresql')
+        with patch.dict(os.environ, {'DB_EXPORT_STATEMENT_TIMEOUT_MS': '0'}):
+            export_timeouts(session)
+        self.assertEqual(session.statements[0], "SET LOCAL statement_timeout = 0")
+
+        sqlite = FakeSession('sqlite')
+        self.assertFalse(export_timeouts(sqlite))
+        self.assertEqual(sqlite.statements, [])
+
+
+class TestPoolMetrics(unittest.TestCase):
+    """Test cases for checkout waits, timeouts and holders."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.engine = create_engine(
+            f"sqlite:///{self.tmpdir.name}/pool.db",
+            poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05
+        )
+        pool_metrics.instrument(self.engine, pool_profile(['web']))
+        pool_metrics.reset()
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def test_exhausted_pool_reports_holder_and_timeout(self):
+        held = threading.Event()
+        release = threading.Event()
+
+        def hold_connection():
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                held.set()
+                release.wait(5)
+
+        holder = threading.Thread(target=hold_connection, name='exit-rules')
+        holder.start()
+        try:
+            self.assertTrue(held.wait(5))
+            with self.assertRaises(exc.TimeoutError):
+                self.engine.connect()
+
+            snapshot = pool_metrics.snapshot()
+            self.assertEqual(snapshot['pool']['checked_out'], 1)
+            self.assertEqual(snapshot['holders']['exit-rules']['connections'], 1)
+            self.assertEqual(snapshot['timeouts'], 1)
+            self.assertEqual(snapshot['wait']['count'], 2)
+            self.assertIn('db_pool_checked_out 1', pool_metrics.render_prometheus())
+        finally:
+            release.set()
+            holder.join(5)
+
+        self.assertEqual(pool_metrics.snapshot()['holders'], {})
+        self.assertEqual(pool_metrics.max_checked_out, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
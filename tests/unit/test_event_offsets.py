@@ -0,0 +1,199 @@
+"""
+Tests for durable event consumers.
+
+Covers gap handling on the event ID sequence, offset advancement with
+at-least-once handler retries, dead letters (and holding the offset when they
+cannot be written), and the parsing listener reporting failures back to its
+consumer.
+"""
+
+import asyncio
+import json
+import unittest
+from datetime import datetime
+
+from common.events.offsets import DurableConsumer, contiguous_prefix
+from features.parsing.listener import ParsingListener
+
+
+class FakeConnection:
+    """In-memory stand-in for the asyncpg calls the consumer makes."""
+
+    def __init__(self, events, dead_letters_fail=False):
+        self.events = events
+        self.saved = []
+        self.dead_letters = []
+        self.dead_letters_fail = dead_letters_fail
+
+    async def fetch(self, sql, offset, limit):
+        return [e for e in self.events if e['id'] > offset][:limit]
+
+    async def fetchval(self, sql, *args):
+        return max((e['id'] for e in self.events), default=None)
+
+    async def execute(self, sql, *args):
+        if 'event_dead_letters' in sql:
+            if self.dead_letters_fail:
+                raise ConnectionError('database unavailable')
+            self.dead_letters.append(args)
+        else:
+            self.saved.append(args)
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        pool = self
+
+        class _Acquire:
+            async def __aenter__(self):
+                return pool.conn
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Acquire()
+
+
+def make_event(event_id, event_type='discord.message.new'):
+    return {
+        'id': event_id,
+        'event_type': event_type,
+        'channel': 'events',
+        'data': json.dumps({'message_id': str(event_id)}),
+        'correlation_id': None,
+        'created_at': datetime(2026, 10, 18, 14, 30),
+    }
+
+
+class TestContiguousPrefix(unittest.TestCase):
+    """Test cases for gap detection."""
+
+    def test_holds_recent_gap_then_skips_it(self):
+        gaps = {}
+        self.assertEqual(contiguous_prefix([11, 12, 14, 15], 10, gaps, now=100.0, gap_timeout=5), 2)
+        self.assertEqual(gaps, {13: 100.0})
+
+        # Still pending a moment later, treated as permanent after the timeout
+        self.assertEqual(contiguous_prefix([14, 15], 12, gaps, now=103.0, gap_timeout=5), 0)
+        self.assertEqual(contiguous_prefix([14, 15], 12, gaps, now=105.5, gap_timeout=5), 2)
+
+    def test_no_gap_consumes_everything(self):
+        self.assertEqual(contiguous_prefix([5, 6, 7], 4, {}, now=0.0, gap_timeout=5), 3)
+        self.assertEqual(contiguous_prefix([], 4, {}, now=0.0, gap_timeout=5), 0)
+
+
+class TestDurableConsumer(unittest.TestCase):
+    """Test cases for catching up from a stored offset."""
+
+    def run_drain(self, consumer, events, offset):
+        conn = FakeConnection(events)
+        consumer.offset = offset
+        consumer.running = True
+        held = asyncio.run(consumer.drain(FakePool(conn)))
+        return held, conn
+
+    def test_catch_up_filters_and_advances_offset_per_batch(self):
+        seen = []
+        consumer = DurableConsumer(
+            'ingestion', lambda event_type, data: seen.append(data['message_id']),
+            event_types=['discord.message.new'], batch_size=2
+        )
+        events = [make_event(1), make_event(2, 'parsing.completed'), make_event(3), make_event(4)]
+
+        held, conn = self.run_drain(consumer, events, offset=0)
+
+        self.assertFalse(held)
+        self.assertEqual(seen, ['1', '3', '4'])
+        self.assertEqual(conn.saved, [('ingestion', 2, 1), ('ingestion', 4, 2)])
+        stats = consumer.get_stats()
+        self.assertEqual((stats['offset'], stats['lag_events'], stats['events_skipped']), (4, 0, 1))
+
+    def test_failed_event_is_retried_then_dead_lettered(self):
+        attempts = []
+
+        async def handler(event_type, data):
+            attempts.append(data['message_id'])
+            return data['message_id'] != '2'
+
+        consumer = DurableConsumer('parsing', handler, max_attempts=2, retry_delay=0)
+        held, conn = self.run_drain(consumer, [make_event(1), make_event(2), make_event(3)], offset=0)
+
+        self.assertEqual(attempts, ['1', '2', '2', '3'])
+        self.assertEqual(consumer.stats['dead_lettered'], 1)
+        self.assertEqual(conn.dead_letters, [('parsing', 2, 'discord.message.new', 'handler rejected the event', 2)])
+        self.assertEqual(conn.saved[-1][1], 3)
+
+    def test_offset_holds_when_the_dead_letter_cannot_be_written(self):
+        def handler(event_type, data):
+            if data['message_id'] == '2':
+                raise ConnectionError('database unavailable')
+
+        consumer = DurableConsumer('parsing', handler, max_attempts=2, retry_delay=0)
+        conn = FakeConnection([make_event(1), make_event(2), make_event(3)], dead_letters_fail=True)
+        consumer.offset, consumer.running = 0, True
+        with self.assertRaises(ConnectionError):
+            asyncio.run(consumer.drain(FakePool(conn)))
+
+        # Event 1 is saved, event 2 is retried on the next drain
+        self.assertEqual(conn.saved, [('parsing', 1, 1)])
+        self.assertEqual(consumer.offset, 1)
+        self.assertEqual(consumer.stats['dead_lettered'], 0)
+        self.assertEqual(consumer.get_stats()['held_event_id'], 2)
+
+    def test_stops_at_pending_gap(self):
+        consumer = DurableConsumer('ingestion', lambda event_type, data: None, gap_timeout=60)
+        held, conn = self.run_drain(consumer, [make_event(5), make_event(6), make_event(8)], offset=4)
+
+        self.assertTrue(held)
+        self.assertEqual(consumer.offset, 6)
+
+
+class TestParsingListenerDelivery(unittest.TestCase):
+    """Test cases for parse failures holding the parsing group's offset."""
+
+    def test_failed_parse_is_retried_before_the_offset_moves(self):
+        listener = ParsingListener()
+        results = iter([False, True])
+        handled = []
+
+        def handle_message_stored(event_data):
+            handled.append(event_data['data']['message_id'])
+            return next(results)
+
+        listener._handle_message_stored = handle_message_stored
+        consumer = DurableConsumer(
+            'parsing', listener._handle_event, event_types=['discord.message_received'], retry_delay=0
+        )
+        event = make_event(1, 'discord.message_received')
+        event['data'] = json.dumps({'message': {'message_id': '1', 'content': 'A+ Scalp Trade Setups'}})
+        conn = FakeConnection([event])
+        consumer.offset, consumer.running = 0, True
+
+        asyncio.run(consumer.drain(FakePool(conn)))
+
+        self.assertEqual(handled, ['1', '1'])
+        self.assertEqual((consumer.stats['events_failed'], consumer.stats['dead_lettered']), (1, 0))
+        self.assertEqual(conn.saved, [('parsing', 1, 1)])
+
+    def test_failed_enqueue_reaches_the_consumer(self):
+        listener = ParsingListener()
+
+        class FailingQueue:
+            def enqueue(self, message_id, payload):
+                raise ConnectionError('database unavailable')
+
+        class Worker:
+            queue = FailingQueue()
+
+        listener.worker = Worker()
+        with self.assertRaises(ConnectionError):
+            asyncio.run(listener._handle_event(
+                'discord.message_received', {'message': {'message_id': '1', 'content': 'A+'}}
+            ))
+
+
+if __name__ == '__main__':
+    unittest.main()
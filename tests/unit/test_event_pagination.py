@@ -0,0 +1,106 @@
+"""
+Tests for keyset-paginated event queries.
+
+Covers continuation tokens, forward and backward paging, and streaming a
+range of events page by page, including the dictionary helpers in
+common.events.consumer.
+"""
+
+import unittest
+
+from flask import Flask
+
+from common.db import db
+from common.events.consumer import get_events_by_channel, get_latest_events, poll_events
+from common.events.models import Event
+from common.events.query_service import (
+    CURSOR_AFTER,
+    EventQueryService,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+class TestEventCursor(unittest.TestCase):
+    """Test cases for continuation tokens."""
+
+    def test_round_trip(self):
+        token = encode_cursor(12345, CURSOR_AFTER)
+        self.assertNotIn('12345', token)
+        self.assertEqual(decode_cursor(token), (12345, CURSOR_AFTER))
+
+    def test_rejects_malformed_tokens(self):
+        for token in ('not-a-cursor', encode_cursor(1, CURSOR_AFTER)[:-2] + '!!'):
+            with self.assertRaises(ValueError):
+                decode_cursor(token)
+
+
+class TestEventPagination(unittest.TestCase):
+    """Test cases for paging through the events table."""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        db.init_app(self.app)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        Event.__table__.create(db.engine)
+
+        for i in range(1, 11):
+            db.session.add(Event(
+                event_type='discord.message_received',
+                channel='events' if i % 2 else 'other',
+                data='{}',
+                correlation_id=f'corr-{i % 3}'
+            ))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        Event.__table__.drop(db.engine)
+        self.app_context.pop()
+
+    def test_backward_pages_follow_cursor(self):
+        first = EventQueryService.get_events_page(limit=4)
+        self.assertEqual([e.id for e in first['events']], [10, 9, 8, 7])
+        self.assertTrue(first['has_more'])
+
+        second = EventQueryService.get_events_page(cursor=first['next_cursor'], limit=4)
+        third = EventQueryService.get_events_page(cursor=second['next_cursor'], limit=4)
+        self.assertEqual([e.id for e in second['events']], [6, 5, 4, 3])
+        self.assertEqual([e.id for e in third['events']], [2, 1])
+        self.assertIsNone(third['next_cursor'])
+
+    def test_forward_cursor_resumes_after_last_seen(self):
+        page = EventQueryService.get_events_page(channel='events', after_id=0, limit=3)
+        self.assertEqual([e.id for e in page['events']], [1, 3, 5])
+
+        page = EventQueryService.get_events_page(channel='events', cursor=page['next_cursor'], limit=3)
+        self.assertEqual([e.id for e in page['events']], [7, 9])
+        self.assertFalse(page['has_more'])
+
+        # An empty poll keeps the same position
+        empty = EventQueryService.get_events_page(channel='events', cursor=page['next_cursor'])
+        self.assertEqual(empty['events'], [])
+        self.assertEqual(decode_cursor(empty['next_cursor']), (9, CURSOR_AFTER))
+
+    def test_iter_events_streams_bounded_range(self):
+        ids = [e.id for e in EventQueryService.iter_events(after_id=2, before_id=9, page_size=2)]
+        self.assertEqual(ids, [3, 4, 5, 6, 7, 8])
+
+        ids = [e.id for e in EventQueryService.iter_events(correlation_id='corr-1', page_size=2)]
+        self.assertEqual(ids, [1, 4, 7, 10])
+
+    def test_consumer_helpers_page_by_id(self):
+        latest = get_latest_events(limit=3)
+        self.assertEqual([e['id'] for e in latest], [10, 9, 8])
+        self.assertEqual(latest[0]['payload'], '{}')
+
+        self.assertEqual([e['id'] for e in get_events_by_channel('other', limit=2)], [10, 8])
+        self.assertEqual([e['id'] for e in get_events_by_channel('events', after_id=5)], [7, 9])
+        self.assertEqual([e['id'] for e in poll_events(['events', 'other'], after_id=7, limit=2)], [8, 9])
+        self.assertEqual(poll_events([]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+"""
+Tests for event partition naming, retention selection and maintenance.
+
+Maintenance runs against a recording stand-in for the session, since the
+partition DDL needs PostgreSQL.
+"""
+
+import unittest
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from common.events import partitions
+from common.events.partitions import (
+    EventPartitionManager,
+    create_partition_sql,
+    expired_partitions,
+    partition_day,
+    partition_name,
+)
+
+
+class RecordingSession:
+    """Records executed SQL and answers the catalog and default-partition queries."""
+
+    def __init__(self, attached, default_days, fail_on=None):
+        self.attached = list(attached)
+        self.default_days = dict(default_days)
+        self.fail_on = fail_on
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def execute(self, statement, params=None):
+        sql = ' '.join(str(statement).split())
+        self.statements.append((sql, params or {}))
+        if self.fail_on and self.fail_on in sql:
+            raise RuntimeError(f"failed: {self.fail_on}")
+        if 'FROM pg_inherits' in sql:
+            return [(name,) for name in self.attached]
+        if sql.startswith("SELECT (created_at AT TIME ZONE 'UTC')::date"):
+            return [SimpleNamespace(day=day, row_count=rows) for day, rows in sorted(self.default_days.items())]
+        if sql.startswith('DELETE FROM events_default'):
+            return SimpleNamespace(rowcount=sum(self.default_days.values()))
+        return SimpleNamespace(rowcount=0)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def ddl(self):
+        return [sql for sql, _ in self.statements if not sql.startswith('SELECT')]
+
+
+class TestEventPartitions(unittest.TestCase):
+    """Test cases for daily event partitions."""
+
+    def test_name_round_trip(self):
+        day = date(2026, 3, 9)
+        self.assertEqual(partition_name(day), 'events_p20260309')
+        self.assertEqual(partition_day('events_p20260309'), day)
+        self.assertIsNone(partition_day('events_default'))
+
+    def test_partition_ddl_covers_one_utc_day(self):
+        sql = create_partition_sql(date(2026, 2, 28))
+        self.assertIn('events_p20260228 PARTITION OF events', sql)
+        self.assertIn("FROM ('2026-02-28 00:00:00+00') TO ('2026-03-01 00:00:00+00')", sql)
+
+    def test_expired_partitions_respect_retention(self):
+        names = [
+            'events_default',
+            'events_p20261010',
+            'events_p20260720',
+            'events_p20260719',
+            'events_p20260601',
+        ]
+        # 90 days before 2026-10-18 is 2026-07-20, which is still retained
+        self.assertEqual(
+            expired_partitions(names, date(2026, 10, 18), 90),
+            ['events_p20260601', 'events_p20260719']
+        )
+
+
+class TestPartitionMaintenance(unittest.TestCase):
+    """Test cases for pre-creating, rescuing and expiring partitions."""
+
+    today = date(2026, 10, 18)
+
+    def run_with(self, session, method, *args):
+        with patch.object(partitions, 'db', SimpleNamespace(session=session)):
+            return getattr(EventPartitionManager(retention_days=90, premake_days=2), method)(*args)
+
+    def test_creates_missing_days_of_the_look_ahead_window(self):
+        session = RecordingSession(['events_default', 'events_p20261018'], {})
+
+        created = self.run_with(session, 'ensure_partitions', self.today)
+
+        self.assertEqual(created, ['events_p20261019', 'events_p20261020'])
+        self.assertTrue(all('PARTITION OF events' in sql for sql in session.ddl()))
+        self.assertEqual(session.commits, 2)
+
+    def test_rows_in_the_default_partition_are_moved_before_attaching(self):
+        # A missed window left yesterday's events in the default partition
+        session = RecordingSession(['events_default', 'events_p20261018', 'events_p20261019', 'events_p20261020'], {
+            date(2026, 10, 17): 12, date(2026, 6, 1): 3,
+        })
+
+        created = self.run_with(session, 'ensure_partitions', self.today)
+
+        self.assertEqual(created, ['events_p20261017'])
+        create, move, attach = session.ddl()
+        self.assertEqual(create, 'CREATE TABLE events_p20261017 (LIKE events INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+        self.assertIn('DELETE FROM events_default WHERE created_at >= :lower AND created_at < :upper', move)
+        self.assertIn('INSERT INTO events_p20261017 SELECT * FROM moved', move)
+        self.assertEqual(session.statements[-2][1], {
+            'lower': '2026-10-17 00:00:00+00', 'upper': '2026-10-18 00:00:00+00'
+        })
+        self.assertEqual(attach, (
+            "ALTER TABLE events ATTACH PARTITION events_p20261017 "
+            "FOR VALUES FROM ('2026-10-17 00:00:00+00') TO ('2026-10-18 00:00:00+00')"
+        ))
+
+    def test_maintenance_reports_default_rows_and_purges_expired_ones(self):
+        session = RecordingSession(
+            ['events_default', 'events_p20260701', 'events_p20261018', 'events_p20261019', 'events_p20261020'],
+            {date(2026, 6, 1): 3}
+        )
+
+        with self.assertLogs('common.events.partitions', 'WARNING'):
+            result = self.run_with(session, 'run_maintenance', self.today)
+
+        self.assertEqual(result, {
+            'created': [], 'dropped': ['events_p20260701'], 'default_rows': 3, 'default_rows_deleted': 3
+        })
+        purge_sql, purge_params = session.statements[-1]
+        self.assertEqual(purge_sql, 'DELETE FROM events_default WHERE created_at < :cutoff')
+        self.assertEqual(purge_params, {'cutoff': '2026-07-20 00:00:00+00'})
+
+    def test_failed_maintenance_rolls_back(self):
+        session = RecordingSession(['events_default'], {}, fail_on='PARTITION OF')
+
+        with self.assertRaises(RuntimeError):
+            self.run_with(session, 'run_maintenance', self.today)
+        self.assertEqual(session.rollbacks, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
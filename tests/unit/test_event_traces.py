@@ -0,0 +1,88 @@
+"""
+Tests for materialized pipeline traces.
+
+Covers per-trace stage latencies and bulk lookup of traces by correlation ID.
+"""
+
+import unittest
+from datetime import datetime, timedelta
+
+from flask import Flask
+
+from common.db import db
+from common.events.models import EventTrace
+from common.events.traces import get_traces, serialize_trace, trace_latencies
+
+
+def make_trace(correlation_id, start, stages):
+    """Build a trace whose stages happen ``stages[name]`` seconds after ``start``."""
+    times = {f"{name}_at": start + timedelta(seconds=offset) for name, offset in stages.items()}
+    return EventTrace(
+        correlation_id=correlation_id,
+        first_event_at=start,
+        last_event_at=max(times.values(), default=start),
+        event_count=len(stages),
+        **times
+    )
+
+
+class TestTraceLatencies(unittest.TestCase):
+    """Test cases for per-trace latency calculation."""
+
+    def test_completed_trace(self):
+        trace = make_trace('a', datetime(2025, 6, 2, 14, 0), {
+            'received': 0, 'stored': 0.5, 'parsed': 2, 'setup_created': 2.25
+        })
+        latencies = trace_latencies(trace)
+
+        self.assertEqual(latencies['received_to_stored'], 500)
+        self.assertEqual(latencies['stored_to_parsed'], 1500)
+        self.assertEqual(latencies['parsed_to_setup_created'], 250)
+        self.assertEqual(latencies['received_to_setup_created'], 2250)
+        self.assertEqual(serialize_trace(trace)['status'], 'completed')
+
+    def test_missing_stages_have_no_latency(self):
+        trace = make_trace('b', datetime(2025, 6, 2, 14, 0), {'received': 0, 'stored': 1})
+        latencies = trace_latencies(trace)
+        data = serialize_trace(trace)
+
+        self.assertEqual(latencies['received_to_stored'], 1000)
+        self.assertIsNone(latencies['stored_to_parsed'])
+        self.assertIsNone(latencies['received_to_setup_created'])
+        self.assertEqual(data['status'], 'in_progress')
+        self.assertEqual(data['completed_stages'], ['received', 'stored'])
+
+
+class TestTraceLookup(unittest.TestCase):
+    """Test cases for bulk trace lookup."""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        EventTrace.__table__.create(db.engine)
+
+        start = datetime(2025, 6, 2, 14, 0)
+        for i in range(5):
+            db.session.add(make_trace(f"corr-{i}", start + timedelta(minutes=i), {'received': 0, 'stored': 1}))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        EventTrace.__table__.drop(db.engine)
+        self.ctx.pop()
+
+    def test_returns_requested_traces_only(self):
+        traces = get_traces(['corr-1', 'corr-3', 'missing', 'corr-1'])
+
+        self.assertEqual(set(traces), {'corr-1', 'corr-3'})
+        self.assertEqual(traces['corr-3']['latencies_ms']['received_to_stored'], 1000)
+
+    def test_empty_request_skips_query(self):
+        self.assertEqual(get_traces([]), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,222 @@
+"""
+Tests for the exit rules engine.
+
+Covers the pushed-price cache, the latest-row-per-symbol fallbacks (run
+against sqlite, where DISTINCT ON is replaced by ordering), batched exit
+notifications and the bar-close listener the engine registers.
+"""
+
+import sys
+import unittest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from flask import Flask
+from sqlalchemy import text
+
+from common.db import db
+from common.events.constants import EventTypes
+from features.management import exit_rules
+from features.management.exit_rules import (
+    PRICE_LISTENER_TASK,
+    BiasFlipRule,
+    ExitRulesEngine,
+    SignalTargetRule,
+)
+from features.market.models import MarketDataModel
+from features.notifications.models import NotificationModel
+
+STRATEGY_TABLES = [
+    "CREATE TABLE ticker_setups (id INTEGER PRIMARY KEY, symbol VARCHAR(10))",
+    "CREATE TABLE signals (id INTEGER PRIMARY KEY, ticker_setup_id INTEGER, targets JSON, created_at DATETIME)",
+    "CREATE TABLE biases (id INTEGER PRIMARY KEY, ticker_setup_id INTEGER, created_at DATETIME)",
+    "CREATE TABLE bias_flips (id INTEGER PRIMARY KEY, bias_id INTEGER, direction VARCHAR(10), price_level FLOAT)",
+]
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """Runs each test in an app context bound to an in-memory database."""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        MarketDataModel.__table__.create(db.engine)
+        NotificationModel.__table__.create(db.engine)
+        for ddl in STRATEGY_TABLES:
+            db.session.execute(text(ddl))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        self.ctx.pop()
+
+
+class TestMarketData(DatabaseTestCase):
+    """Test cases for pushed prices and the market_data fallback."""
+
+    def setUp(self):
+        super().setUp()
+        self.engine = ExitRulesEngine(price_cache_ttl=60)
+        now = datetime.utcnow()
+        db.session.add_all([
+            MarketDataModel(symbol='SPY', price=500.0, timestamp=now - timedelta(minutes=2)),
+            MarketDataModel(symbol='SPY', price=502.5, timestamp=now - timedelta(minutes=1)),
+            MarketDataModel(symbol='QQQ', price=430.0, timestamp=now - timedelta(minutes=3)),
+        ])
+        db.session.commit()
+
+    def test_fallback_keeps_the_latest_row_per_symbol(self):
+        market_data = self.engine.load_market_data(['QQQ', 'SPY', 'AAPL'])
+
+        self.assertEqual({symbol: data['price'] for symbol, data in market_data.items()},
+                         {'SPY': 502.5, 'QQQ': 430.0})
+
+    def test_fresh_pushed_price_wins_over_the_database(self):
+        self.engine.notify_price_update('SPY', 505.0)
+
+        market_data = self.engine.load_market_data(['SPY', 'QQQ'])
+
+        self.assertEqual(market_data['SPY']['price'], 505.0)
+        self.assertEqual(market_data['QQQ']['price'], 430.0)
+
+    def test_stale_pushed_price_falls_back_to_the_database(self):
+        with patch.object(exit_rules.time, 'monotonic', return_value=1000.0):
+            self.engine.notify_price_update('SPY', 505.0)
+        with patch.object(exit_rules.time, 'monotonic', return_value=1061.0):
+            market_data = self.engine.load_market_data(['SPY'])
+
+        self.assertEqual(market_data['SPY']['price'], 502.5)
+
+
+def bar_close(ticker, close, timeframe='1Min'):
+    """Build a market.candle.closed payload as the historical data provider publishes it."""
+    return {'ticker': ticker, 'timeframe': timeframe, 'close': close, 'is_closed': True}
+
+
+class TestPriceEvents(unittest.TestCase):
+    """Test cases for bar closes fed through handle_event."""
+
+    def setUp(self):
+        self.engine = ExitRulesEngine()
+
+    def test_one_minute_bar_close_refreshes_the_cache(self):
+        self.engine.handle_event(EventTypes.CANDLE_CLOSED, bar_close('QQQ', 431.5))
+
+        self.assertEqual(self.engine._price_cache['QQQ']['price'], 431.5)
+
+    def test_other_events_and_timeframes_are_ignored(self):
+        self.engine.handle_event(EventTypes.SIGNAL_TRIGGERED, {'symbol': 'SPY', 'price': 501.0})
+        self.engine.handle_event(EventTypes.CANDLE_CLOSED, bar_close('SPY', 480.0, timeframe='1Day'))
+
+        self.assertEqual(self.engine._price_cache, {})
+
+    def test_bar_close_wakes_the_loop_only_in_event_driven_mode(self):
+        self.engine.handle_event(EventTypes.CANDLE_CLOSED, bar_close('SPY', 501.0))
+        self.assertFalse(self.engine._wakeup.is_set())
+
+        self.engine.event_driven = True
+        self.engine.handle_event(EventTypes.CANDLE_CLOSED, bar_close('SPY', 502.0))
+        self.assertTrue(self.engine._wakeup.is_set())
+
+    def test_event_driven_start_registers_the_price_listener(self):
+        with patch.object(exit_rules, 'runtime') as runtime, \
+                patch.object(self.engine, 'run_exit_rules_job'):
+            self.engine.start(event_driven=True)
+            self.engine.stop()
+
+        runtime.supervise.assert_called_once_with(PRICE_LISTENER_TASK, self.engine._listen_for_prices)
+        runtime.cancel.assert_called_once_with(PRICE_LISTENER_TASK)
+
+    def test_interval_start_also_registers_the_price_listener(self):
+        with patch.object(exit_rules, 'runtime') as runtime, \
+                patch.object(self.engine, 'run_exit_rules_job'):
+            self.engine.start()
+            self.engine.stop()
+
+        runtime.supervise.assert_called_once_with(PRICE_LISTENER_TASK, self.engine._listen_for_prices)
+        runtime.cancel.assert_called_once_with(PRICE_LISTENER_TASK)
+
+
+class TestStrategyRules(DatabaseTestCase):
+    """Test cases for the signal target and bias flip rules."""
+
+    def setUp(self):
+        super().setUp()
+        now = datetime.utcnow()
+        db.session.execute(text("INSERT INTO ticker_setups (id, symbol) VALUES (1, 'SPY'), (2, 'SPY'), (3, 'QQQ')"))
+        db.session.execute(text(
+            "INSERT INTO signals (ticker_setup_id, targets, created_at) VALUES "
+            "(1, '[510.0]', :old), (2, '[505.0, 508.0]', :new), (3, '[440.0]', :new)"
+        ), {'old': now - timedelta(hours=2), 'new': now})
+        db.session.execute(text(
+            "INSERT INTO biases (id, ticker_setup_id, created_at) VALUES (1, 1, :old), (2, 2, :new)"
+        ), {'old': now - timedelta(hours=2), 'new': now})
+        db.session.execute(text(
+            "INSERT INTO bias_flips (bias_id, direction, price_level) VALUES (1, 'BULLISH', 520.0), (2, 'BEARISH', 495.0)"
+        ))
+        db.session.commit()
+
+    def test_prepared_signal_targets_use_the_latest_signal(self):
+        rule = SignalTargetRule()
+        rule.prepare(['SPY', 'QQQ'])
+
+        should_exit, reason = rule.should_exit({'symbol': 'SPY 05/17 500C', 'side': 'long'}, {'price': 506.0})
+
+        self.assertTrue(should_exit)
+        self.assertIn('505.00', reason)
+        self.assertEqual(rule.should_exit({'symbol': 'QQQ', 'side': 'long'}, {'price': 435.0}), (False, ""))
+
+    def test_unprepared_rule_queries_a_single_underlying(self):
+        rule = SignalTargetRule()
+
+        self.assertTrue(rule.should_exit({'symbol': 'QQQ', 'side': 'long'}, {'price': 441.0})[0])
+
+    def test_bias_flip_reads_the_latest_flip_level(self):
+        rule = BiasFlipRule()
+        rule.prepare(['SPY'])
+
+        should_exit, reason = rule.should_exit({'symbol': 'SPY', 'side': 'long'}, {'price': 494.0})
+        self.assertTrue(should_exit)
+        self.assertEqual(reason, "Bias flipped bearish below 495.00")
+        # The older bullish flip is superseded
+        self.assertFalse(rule.should_exit({'symbol': 'SPY', 'side': 'short'}, {'price': 521.0})[0])
+
+
+class TestProcessExits(DatabaseTestCase):
+    """Test cases for closing positions and recording exits."""
+
+    def test_exit_notifications_are_committed_together(self):
+        positions = [
+            {'symbol': 'SPY', 'side': 'long', 'unrealized_plpc': 25.0, 'unrealized_pl': 250.0},
+            {'symbol': 'QQQ', 'side': 'long', 'unrealized_plpc': -15.0, 'unrealized_pl': -150.0},
+            {'symbol': 'IWM', 'side': 'long', 'unrealized_plpc': 2.0, 'unrealized_pl': 20.0},
+        ]
+        position_manager = SimpleNamespace(
+            get_all_positions=lambda: positions,
+            close_position=MagicMock(return_value={'success': True, 'message': ''})
+        )
+        engine = ExitRulesEngine()
+        for symbol in ('SPY', 'QQQ', 'IWM'):
+            engine.notify_price_update(symbol, 100.0)
+
+        with patch.dict(sys.modules, {'features.management.position_manager': position_manager}), \
+                patch.object(exit_rules, 'publish_event') as publish, \
+                patch.object(db.session, 'commit', wraps=db.session.commit) as commit:
+            exits = engine.process_exits()
+
+        self.assertEqual(exits, 2)
+        self.assertEqual(commit.call_count, 1)
+        self.assertEqual(
+            sorted(n.title for n in NotificationModel.query.all()),
+            ['Automatic Exit: QQQ', 'Automatic Exit: SPY']
+        )
+        self.assertEqual([c.args[0] for c in publish.call_args_list], ['position_exits', 'position_exits'])
+
+
+if __name__ == '__main__':
+    unittest.main()
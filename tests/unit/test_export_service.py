@@ -0,0 +1,83 @@
+"""
+Tests for the streaming export encoders.
+
+Covers JSON, NDJSON and CSV encoding of message records and the optional
+Parquet writer.
+"""
+
+import csv
+import importlib.util
+import io
+import json
+import unittest
+
+from features.export.service import EXPORT_COLUMNS, iter_csv, iter_json_array, iter_ndjson, write_parquet
+
+
+def make_record(record_id, content='AAPL breakout above 190', embeds=None):
+    record = {name: None for name in EXPORT_COLUMNS}
+    record.update({
+        'id': record_id,
+        'message_id': str(1000 + record_id),
+        'channel_id': '42',
+        'author_id': '7',
+        'content': content,
+        'timestamp': '2025-05-21T14:30:00+00:00',
+        'is_forwarded': False,
+        'is_processed': True,
+        'has_embeds': bool(embeds),
+        'has_attachments': False,
+        'embed_data': embeds,
+    })
+    return record
+
+
+class TestExportEncoders(unittest.TestCase):
+    """Test cases for the streaming text encoders."""
+
+    def setUp(self):
+        self.records = [
+            make_record(1),
+            make_record(2, content='line one\nline two, "quoted"', embeds=[{'title': 'Setups'}]),
+            make_record(3),
+        ]
+
+    def test_json_array_round_trips(self):
+        document = ''.join(iter_json_array(iter(self.records)))
+        self.assertEqual(json.loads(document), self.records)
+        self.assertEqual(json.loads(''.join(iter_json_array([]))), [])
+
+    def test_ndjson_emits_one_line_per_record(self):
+        lines = list(iter_ndjson(iter(self.records)))
+        self.assertEqual(len(lines), 3)
+        self.assertEqual([json.loads(line) for line in lines], self.records)
+
+    def test_csv_chunks_and_flattens_json_columns(self):
+        chunks = list(iter_csv(iter(self.records), chunk_size=2))
+        self.assertEqual(len(chunks), 2)
+
+        rows = list(csv.DictReader(io.StringIO(''.join(chunks))))
+        self.assertEqual([row['id'] for row in rows], ['1', '2', '3'])
+        self.assertEqual(rows[1]['content'], 'line one\nline two, "quoted"')
+        self.assertEqual(json.loads(rows[1]['embed_data']), [{'title': 'Setups'}])
+        self.assertEqual(rows[0]['embed_data'], '')
+
+    @unittest.skipIf(importlib.util.find_spec('pyarrow') is not None, 'pyarrow is installed')
+    def test_parquet_requires_pyarrow(self):
+        with self.assertRaises(RuntimeError):
+            write_parquet(iter(self.records), io.BytesIO())
+
+    @unittest.skipIf(importlib.util.find_spec('pyarrow') is None, 'pyarrow is not installed')
+    def test_parquet_writes_row_group_per_chunk(self):
+        import pyarrow.parquet as pq
+
+        target = io.BytesIO()
+        self.assertEqual(write_parquet(iter(self.records), target, chunk_size=2), 3)
+        target.seek(0)
+        parquet_file = pq.ParquetFile(target)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 2)
+        self.assertEqual(parquet_file.read().column('id').to_pylist(), [1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Tests for process-wide ingestion counters.
+
+Covers seeding from one aggregate query, updates on insert and
+reconciliation against the database.
+"""
+
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from flask import Flask
+
+from common.db import db
+from features.ingestion.counters import IngestionCounters
+from features.ingestion.models import DiscordMessageModel
+
+
+def add_message(message_id, created_at):
+    db.session.add(DiscordMessageModel(
+        message_id=str(message_id),
+        channel_id='1',
+        author_id='1',
+        content='A+ Scalp Trade Setups',
+        timestamp=created_at,
+        created_at=created_at
+    ))
+
+
+class TestIngestionCounters(unittest.TestCase):
+    """Test cases for seeded and reconciled counters."""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        DiscordMessageModel.__table__.create(db.engine)
+
+        now = datetime.now(timezone.utc)
+        add_message(1, now - timedelta(days=3))
+        add_message(2, now - timedelta(days=2))
+        add_message(3, now)
+        db.session.commit()
+        self.counters = IngestionCounters(reconcile_seconds=3600)
+
+    def tearDown(self):
+        db.session.remove()
+        DiscordMessageModel.__table__.drop(db.engine)
+        self.ctx.pop()
+
+    def test_seeds_once_from_aggregate(self):
+        snapshot = self.counters.snapshot()
+        self.assertEqual(snapshot['total_stored'], 3)
+        self.assertEqual(snapshot['stored_today'], 1)
+        self.assertIsNotNone(snapshot['last_stored_at'])
+
+        # Rows added behind the counters' back are not seen until reconciliation
+        add_message(4, datetime.now(timezone.utc))
+        db.session.commit()
+        self.assertEqual(self.counters.snapshot()['total_stored'], 3)
+
+    def test_inserts_update_counters(self):
+        self.counters.seed()
+        self.counters.record_stored()
+        self.counters.record_validation_failure()
+
+        snapshot = self.counters.snapshot()
+        self.assertEqual(snapshot['total_stored'], 4)
+        self.assertEqual(snapshot['stored_today'], 2)
+        self.assertEqual(snapshot['stored_since_start'], 1)
+        self.assertEqual(snapshot['validation_failures'], 1)
+
+    def test_reconcile_corrects_drift(self):
+        self.counters.seed()
+        self.counters.record_stored()  # counted, but never committed
+        self.counters.seed()
+
+        self.assertEqual(self.counters.total_stored, 3)
+        self.assertEqual(self.counters.last_drift, -1)
+        self.assertEqual(self.counters.reconciliations, 1)
+
+    def test_processing_times_and_queue_depth(self):
+        self.counters.enqueue(3)
+        self.counters.dequeue()
+        for seconds in (0.010, 0.020, 0.030):
+            self.counters.record_processing(seconds)
+
+        snapshot = self.counters.snapshot()
+        self.assertEqual(snapshot['queue_depth'], 2)
+        self.assertEqual(snapshot['processing_count'], 3)
+        self.assertAlmostEqual(snapshot['avg_processing_time_ms'], 20, delta=0.01)
+        self.assertGreaterEqual(snapshot['p95_processing_time_ms'], 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
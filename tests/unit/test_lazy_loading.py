@@ -0,0 +1,144 @@
+"""
+Tests for lazy feature loading.
+
+Covers the static route manifest, placeholder blueprints that import their
+module on first request, and the cold-start import budget of app.py.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+
+from flask import Flask, url_for
+
+from common.lazy_loading import (
+    BASE_DIR, ManifestError, build_route_manifest, describe_blueprint,
+    load_route_manifest, register_lazy_blueprints
+)
+
+# Cold start of `import app` with FEATURE_LOADING=lazy, in milliseconds
+IMPORT_TIME_BUDGET_MS = float(os.environ.get('IMPORT_TIME_BUDGET_MS', '1500'))
+HEAVY_MODULES = ('alpaca', 'pandas', 'numpy', 'scipy', 'discord')
+
+DEMO_SOURCE = textwrap.dedent('''
+    from flask import Blueprint, jsonify
+
+    demo_bp = Blueprint('demo', __name__, url_prefix='/demo')
+
+    @demo_bp.route('/', methods=['GET'])
+    def overview():
+        return 'overview'
+
+    @demo_bp.route('/items/<int:item_id>', methods=['get', 'delete'])
+    def item(item_id):
+        return jsonify({'id': item_id})
+
+    @demo_bp.post('/refresh', endpoint='refresh_all')
+    def refresh():
+        return 'refreshed'
+''')
+
+
+class TestRouteManifest(unittest.TestCase):
+    """Test cases for building the manifest from source."""
+
+    def test_checked_in_manifest_is_current(self):
+        self.assertEqual(
+            load_route_manifest(), build_route_manifest(),
+            "features/route_manifest.json is stale; run `python -m common.lazy_loading`"
+        )
+
+    def test_describe_blueprint_reads_routes(self):
+        entry = describe_blueprint(DEMO_SOURCE, 'demo_module', 'demo_bp')
+
+        self.assertEqual(entry['blueprint'], 'demo')
+        self.assertEqual(entry['url_prefix'], '/demo')
+        self.assertTrue(entry['lazy'])
+        self.assertEqual(entry['routes'], [
+            {'rule': '/', 'endpoint': 'overview', 'methods': ['GET']},
+            {'rule': '/items/<int:item_id>', 'endpoint': 'item', 'methods': ['DELETE', 'GET']},
+            {'rule': '/refresh', 'endpoint': 'refresh_all', 'methods': ['POST']},
+        ])
+
+    def test_blueprint_hooks_force_eager_loading(self):
+        source = DEMO_SOURCE + "\n@demo_bp.before_request\ndef check():\n    pass\n"
+        self.assertFalse(describe_blueprint(source, 'demo_module', 'demo_bp')['lazy'])
+
+    def test_non_literal_rule_is_rejected(self):
+        source = DEMO_SOURCE + "\nRULE = '/x'\n\n@demo_bp.route(RULE)\ndef dynamic():\n    pass\n"
+        with self.assertRaises(ManifestError):
+            describe_blueprint(source, 'demo_module', 'demo_bp')
+
+
+class TestLazyRegistration(unittest.TestCase):
+    """Test cases for placeholder blueprints and first-request imports."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.module = 'lazy_demo_routes'
+        with open(os.path.join(self.tmp.name, f'{self.module}.py'), 'w') as f:
+            f.write(DEMO_SOURCE)
+        sys.path.insert(0, self.tmp.name)
+
+        entry = describe_blueprint(DEMO_SOURCE, self.module, 'demo_bp')
+        self.manifest = {'blueprints': [{'name': 'demo', **entry}]}
+        self.app = Flask(__name__)
+        self.app.testing = True
+
+    def tearDown(self):
+        sys.path.remove(self.tmp.name)
+        sys.modules.pop(self.module, None)
+        self.tmp.cleanup()
+
+    def test_module_is_imported_on_first_request(self):
+        self.assertEqual(register_lazy_blueprints(self.app, self.manifest), ['demo'])
+        self.assertNotIn(self.module, sys.modules)
+
+        with self.app.test_request_context():
+            self.assertEqual(url_for('demo.item', item_id=3), '/demo/items/3')
+
+        client = self.app.test_client()
+        self.assertEqual(client.get('/demo/').get_data(as_text=True), 'overview')
+        self.assertIn(self.module, sys.modules)
+        self.assertEqual(client.get('/demo/items/7').get_json(), {'id': 7})
+        self.assertEqual(client.post('/demo/refresh').status_code, 200)
+        self.assertEqual(client.post('/demo/items/7').status_code, 405)
+
+    def test_eager_entries_are_imported_at_registration(self):
+        self.manifest['blueprints'][0]['lazy'] = False
+        register_lazy_blueprints(self.app, self.manifest)
+        self.assertIn(self.module, sys.modules)
+        self.assertEqual(self.app.test_client().get('/demo/').status_code, 200)
+
+
+class TestColdStartBudget(unittest.TestCase):
+    """Import-time profile of app.py in lazy mode."""
+
+    def test_lazy_cold_start_within_budget(self):
+        env = {key: value for key, value in os.environ.items() if key != 'DISCORD_BOT_TOKEN'}
+        env.update({'DATABASE_URL': 'sqlite://', 'FEATURE_LOADING': 'lazy'})
+        check = f"import app, sys; print('HEAVY=' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', check],
+            cwd=BASE_DIR, env=env, capture_output=True, text=True, timeout=120
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+
+        heavy = [line for line in result.stdout.splitlines() if line.startswith('HEAVY=')]
+        self.assertEqual(heavy, ['HEAVY='], "heavy modules imported at startup")
+
+        # "import time: self [us] | cumulative | app" is the whole cold start
+        cumulative_us = None
+        for line in result.stderr.splitlines():
+            if line.startswith('import time:') and line.rstrip().endswith('| app'):
+                cumulative_us = int(line.split('|')[1])
+        self.assertIsNotNone(cumulative_us, "no -X importtime entry for app")
+        self.assertLess(cumulative_us / 1000, IMPORT_TIME_BUDGET_MS,
+                        f"cold start took {cumulative_us / 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    unittest.main()
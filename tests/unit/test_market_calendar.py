@@ -0,0 +1,105 @@
+"""
+Tests for the cached market calendar.
+
+Covers the NYSE holiday and early-close rules, open/next-open/next-close
+lookups around session boundaries, trading-day mapping and source fallback.
+"""
+
+import unittest
+from datetime import date, datetime, time
+from unittest.mock import patch
+
+import pytz
+
+from common import market_calendar as calendar_module
+from common.market_calendar import EASTERN, MarketCalendar, Session, nyse_holidays, nyse_sessions
+
+
+def eastern(*args):
+    return EASTERN.localize(datetime(*args))
+
+
+class TestNyseRules(unittest.TestCase):
+    """Test cases for the rule-based NYSE calendar."""
+
+    def test_holidays_match_the_published_calendar(self):
+        self.assertEqual(nyse_holidays(2026), [
+            date(2026, 1, 1), date(2026, 1, 19), date(2026, 2, 16), date(2026, 4, 3), date(2026, 5, 25),
+            date(2026, 6, 19), date(2026, 7, 3), date(2026, 9, 7), date(2026, 11, 26), date(2026, 12, 25),
+        ])
+        # New Year's Day 2022 fell on a Saturday and was not observed
+        self.assertNotIn(date(2021, 12, 31), nyse_holidays(2021) + nyse_holidays(2022))
+
+    def test_early_closes(self):
+        early = [s.day for s in nyse_sessions(2025) if s.early_close]
+        self.assertEqual(early, [date(2025, 7, 3), date(2025, 11, 28), date(2025, 12, 24)])
+
+        day_after_thanksgiving = next(s for s in nyse_sessions(2025) if s.day == date(2025, 11, 28))
+        self.assertEqual(day_after_thanksgiving.close, eastern(2025, 11, 28, 13, 0))
+
+
+class TestMarketCalendar(unittest.TestCase):
+    """Test cases for lookups from the cached session tables."""
+
+    def setUp(self):
+        self.calendar = MarketCalendar(source=None)
+
+    def test_is_open_and_next_boundaries(self):
+        # Wednesday before Thanksgiving 2025, mid-session
+        now = eastern(2025, 11, 26, 15, 0)
+        self.assertTrue(self.calendar.is_open(now))
+        self.assertEqual(self.calendar.next_close(now), eastern(2025, 11, 26, 16, 0))
+        # Thanksgiving is skipped and Friday closes early
+        self.assertEqual(self.calendar.next_open(now), eastern(2025, 11, 28, 9, 30))
+        self.assertEqual(self.calendar.next_close(eastern(2025, 11, 28, 9, 0)), eastern(2025, 11, 28, 13, 0))
+        self.assertFalse(self.calendar.is_open(eastern(2025, 11, 28, 13, 0)))
+
+        # Naive datetimes are UTC: 14:29 UTC is 09:29 EST
+        self.assertFalse(self.calendar.is_open(datetime(2025, 12, 1, 14, 29)))
+        self.assertTrue(self.calendar.is_open(datetime(2025, 12, 1, 14, 30)))
+
+    def test_next_open_crosses_the_year(self):
+        self.assertEqual(self.calendar.next_open(eastern(2025, 12, 31, 17, 0)), eastern(2026, 1, 2, 9, 30))
+        self.assertEqual(list(self.calendar.stats()), ['2025', '2026'])
+
+    def test_trading_day_maps_closed_days_to_the_previous_session(self):
+        self.assertEqual(self.calendar.trading_day(eastern(2026, 1, 5, 8, 0)), date(2026, 1, 5))
+        self.assertEqual(self.calendar.trading_day(eastern(2026, 1, 4, 12, 0)), date(2026, 1, 2))
+        self.assertEqual(self.calendar.trading_day(eastern(2026, 1, 1, 12, 0)), date(2025, 12, 31))
+
+        clock = self.calendar.clock(eastern(2026, 1, 4, 12, 0))
+        self.assertFalse(clock['is_open'])
+        self.assertEqual(clock['next_open'], eastern(2026, 1, 5, 9, 30).astimezone(pytz.UTC).isoformat())
+
+    def test_source_sessions_replace_the_rules_and_failures_are_retried(self):
+        # An unscheduled closure the rules cannot know about
+        closed = date(2025, 1, 9)
+        source_sessions = [s for s in nyse_sessions(2025) if s.day != closed]
+        calendar = MarketCalendar(source=lambda year: source_sessions)
+        self.assertFalse(calendar.is_trading_day(closed))
+        self.assertEqual(calendar.stats()['2025']['source'], 'source')
+
+        calls = []
+
+        def failing(year):
+            calls.append(year)
+            raise ConnectionError('calendar endpoint down')
+
+        calendar = MarketCalendar(source=failing)
+        self.assertTrue(calendar.is_trading_day(closed))
+        calendar.is_trading_day(date(2025, 1, 10))
+        self.assertEqual((calls, calendar.stats()['2025']['source']), ([2025], 'fallback'))
+
+        with patch.object(calendar_module, 'SOURCE_RETRY_SECONDS', 0):
+            calendar.is_trading_day(closed)
+        self.assertEqual(calls, [2025, 2025])
+
+    def test_session_from_eastern_wall_clock(self):
+        session = Session.at(date(2025, 7, 3), time(9, 30), time(13, 0))
+        self.assertTrue(session.early_close)
+        self.assertEqual(session.open.tzinfo, pytz.UTC)
+        self.assertEqual(session.open.hour, 13)
+
+
+if __name__ == '__main__':
+    unittest.main()
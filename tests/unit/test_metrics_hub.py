@@ -0,0 +1,92 @@
+"""
+Tests for the Socket.IO dashboard metrics hub.
+
+Covers payload diffing, shared builds across subscribers and interval-based
+pushes.
+"""
+
+import unittest
+
+from common.metrics.hub import MetricsHub, diff_payload, room_for
+
+
+class FakeSocketIO:
+    """Records emits instead of sending them."""
+
+    def __init__(self):
+        self.emitted = []
+
+    def emit(self, event, data, to=None):
+        self.emitted.append((event, data, to))
+
+
+class TestDiffPayload(unittest.TestCase):
+    """Test cases for top-level payload diffs."""
+
+    def test_changed_and_removed_keys(self):
+        diff = diff_payload({'a': 1, 'b': {'x': 1}, 'c': 3}, {'a': 1, 'b': {'x': 2}, 'd': 4})
+        self.assertEqual(diff['changed'], {'b': {'x': 2}, 'd': 4})
+        self.assertEqual(diff['removed'], ['c'])
+
+    def test_first_payload_is_all_changed(self):
+        self.assertEqual(diff_payload(None, {'a': 1})['changed'], {'a': 1})
+
+
+class TestMetricsHub(unittest.TestCase):
+    """Test cases for building and pushing topic payloads."""
+
+    def setUp(self):
+        self.builds = 0
+        self.value = 0
+        self.hub = MetricsHub()
+        self.hub._socketio = FakeSocketIO()
+        self.hub._task_started = True  # never start the background loop in tests
+        self.hub.register('counts', self._build, interval=10)
+
+    def _build(self):
+        self.builds += 1
+        return {'value': self.value, 'static': 'same'}
+
+    def test_subscribers_share_one_build(self):
+        for sid in ('tab-1', 'tab-2', 'tab-3'):
+            self.assertEqual(self.hub.subscribe(sid, 'counts'), {'value': 0, 'static': 'same'})
+        self.assertEqual(self.builds, 1)
+        self.assertIsNone(self.hub.subscribe('tab-4', 'unknown'))
+
+    def test_tick_pushes_only_changes_once_per_interval(self):
+        self.hub.subscribe('tab-1', 'counts')
+        self.hub.subscribe('tab-2', 'counts')
+        built_at = self.hub._topics['counts'].built_at
+
+        self.assertEqual(self.hub.tick(built_at + 1), [])
+        self.value = 5
+        pushed = self.hub.tick(built_at + 11)
+
+        self.assertEqual(self.builds, 2)
+        self.assertEqual(pushed, [('counts', {'changed': {'value': 5}, 'removed': []})])
+        self.assertEqual(self.hub._socketio.emitted, [
+            ('metrics_update', {'topic': 'counts', 'changed': {'value': 5}, 'removed': []}, room_for('counts'))
+        ])
+
+    def test_notify_changed_skips_interval(self):
+        self.hub.subscribe('tab-1', 'counts')
+        self.value = 1
+        self.hub.notify_changed('counts')
+        self.assertEqual(len(self.hub.tick(self.hub._topics['counts'].built_at)), 1)
+
+    def test_topics_without_subscribers_are_not_built(self):
+        self.hub.subscribe('tab-1', 'counts')
+        self.hub.unsubscribe('tab-1')
+        self.hub.notify_changed('counts')
+        self.hub.tick()
+        self.assertEqual(self.builds, 1)
+
+    def test_builder_errors_keep_previous_payload(self):
+        self.hub.subscribe('tab-1', 'counts')
+        self.hub.register('broken', lambda: 1 / 0)
+        self.assertIsNone(self.hub.subscribe('tab-1', 'broken'))
+        self.assertEqual(self.hub.stats['build_errors'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
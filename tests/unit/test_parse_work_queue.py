@@ -0,0 +1,136 @@
+"""
+Tests for the parsing work queue.
+
+Covers idempotent enqueueing, lease-based claiming, fencing of completions
+after a lease moved to another worker, retries and the worker loop.
+"""
+
+import asyncio
+import threading
+import unittest
+from datetime import datetime, timedelta
+
+from flask import Flask
+
+from common.db import db
+from features.parsing.models import ParseJob
+from features.parsing.work_queue import ParseWorker, ParseWorkQueue, queue_metrics
+
+
+class TestParseWorkQueue(unittest.TestCase):
+    """Test cases for claiming, completing and retrying parse jobs."""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        ParseJob.__table__.create(db.engine)
+        queue_metrics.reset()
+
+        self.queue = ParseWorkQueue(lease_seconds=30, max_attempts=2)
+        for i in range(5):
+            self.queue.enqueue(f"m{i}", {'data': {'message_id': f"m{i}", 'content': 'A+ Scalp Trade Setups'}})
+        self.later = datetime.utcnow() + timedelta(seconds=1)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_enqueue_is_idempotent(self):
+        self.assertFalse(self.queue.enqueue('m0', {'data': {}}))
+        self.assertEqual(ParseJob.query.count(), 5)
+
+    def test_workers_claim_disjoint_batches(self):
+        first = self.queue.claim('worker-a', limit=3, now=self.later)
+        second = self.queue.claim('worker-b', limit=3, now=self.later)
+
+        self.assertEqual([job['message_id'] for job in first], ['m0', 'm1', 'm2'])
+        self.assertEqual([job['message_id'] for job in second], ['m3', 'm4'])
+        self.assertEqual(self.queue.claim('worker-c', now=self.later), [])
+        self.assertEqual(first[0]['payload']['data']['message_id'], 'm0')
+        self.assertEqual(queue_metrics.claim_latency.count, 3)
+        self.assertEqual(queue_metrics.counters['claimed'], 5)
+
+    def test_expired_lease_is_reclaimed_and_late_completion_fenced(self):
+        job = self.queue.claim('worker-a', limit=1, now=self.later)[0]
+        after_lease = self.later + timedelta(seconds=31)
+
+        reclaimed = self.queue.claim('worker-b', limit=1, now=after_lease)
+        self.assertEqual(reclaimed[0]['id'], job['id'])
+        self.assertEqual(reclaimed[0]['attempts'], 2)
+
+        self.assertFalse(self.queue.complete('worker-a', job['id']))
+        self.assertTrue(self.queue.complete('worker-b', job['id']))
+        self.assertEqual(db.session.get(ParseJob, job['id']).status, 'done')
+        self.assertEqual(queue_metrics.counters['lease_lost'], 1)
+
+    def test_renew_extends_lease(self):
+        job = self.queue.claim('worker-a', limit=1, now=self.later)[0]
+        self.assertEqual(self.queue.renew('worker-a', [job['id']], now=self.later + timedelta(seconds=20)), 1)
+        self.assertEqual(self.queue.renew('worker-b', [job['id']]), 0)
+
+        # The renewed lease runs until later + 50s, so worker-b skips the job
+        reclaimed = self.queue.claim('worker-b', limit=5, now=self.later + timedelta(seconds=31))
+        self.assertNotIn(job['id'], [j['id'] for j in reclaimed])
+
+    def test_failed_job_retries_then_fails(self):
+        job = self.queue.claim('worker-a', limit=1, now=self.later)[0]
+        self.assertEqual(self.queue.fail('worker-a', job, 'boom', now=self.later), 'pending')
+
+        # Not runnable until the retry delay passes
+        self.assertNotIn(job['id'], [j['id'] for j in self.queue.claim('worker-a', limit=5, now=self.later)])
+        retry = self.queue.claim('worker-b', limit=1, now=self.later + timedelta(seconds=10))[0]
+        self.assertEqual(retry['id'], job['id'])
+
+        self.assertEqual(self.queue.fail('worker-b', retry, 'boom again'), 'failed')
+        failed = db.session.get(ParseJob, job['id'])
+        self.assertEqual((failed.status, failed.last_error), ('failed', 'boom again'))
+
+    def test_status_reports_counts_and_expired_leases(self):
+        self.queue.claim('worker-a', limit=2, now=self.later)
+        status = self.queue.status(now=self.later + timedelta(seconds=31))
+
+        self.assertEqual(status['counts'], {'pending': 3, 'claimed': 2, 'done': 0, 'failed': 0})
+        self.assertEqual(status['expired_leases'], 2)
+        self.assertEqual(status['claimed_by_worker'], {'worker-a': 2})
+
+    def test_worker_completes_or_retries_each_job(self):
+        outcomes = {'m0': True, 'm1': False, 'm2': None}
+
+        def handler(payload):
+            message_id = payload['data']['message_id']
+            if message_id == 'm3':
+                raise RuntimeError('parser crashed')
+            return outcomes.get(message_id, True)
+
+        worker = ParseWorker(handler, queue=self.queue, worker_id='worker-a', batch_size=10)
+        self.assertEqual(worker.run_batch(), 5)
+
+        statuses = {job.message_id: job.status for job in ParseJob.query.all()}
+        self.assertEqual(statuses, {'m0': 'done', 'm1': 'pending', 'm2': 'done', 'm3': 'pending', 'm4': 'done'})
+        self.assertEqual(ParseJob.query.filter_by(message_id='m3').one().last_error, 'parser crashed')
+        self.assertIn('parse_queue_claim_latency_seconds_count 1', queue_metrics.render_prometheus())
+
+    def test_worker_runs_batches_off_the_event_loop(self):
+        worker = ParseWorker(lambda payload: True, queue=self.queue, worker_id='worker-a', batch_size=10)
+        loop_thread = threading.get_ident()
+        batches = []
+
+        def run_batch():
+            batches.append((threading.get_ident(), db.session.registry()))
+            worker.stop()
+            return 0
+
+        worker.run_batch = run_batch
+        asyncio.run(worker.run())
+
+        batch_thread, session = batches[0]
+        self.assertNotEqual(batch_thread, loop_thread)
+        self.assertIsNot(session, db.session.registry())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Tests for in-process pipeline latency metrics.
+
+Covers histogram bucketing and quantiles, per-hop latency recording, the
+stage handoff between processes and the Prometheus exposition.
+"""
+
+import unittest
+
+from common.metrics.histogram import (
+    NUM_BUCKETS,
+    LatencyHistogram,
+    bucket_index,
+    bucket_lower_bound,
+)
+from common.metrics.pipeline import END_TO_END, PipelineMetrics
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """Test cases for the log-linear histogram."""
+
+    def test_buckets_are_contiguous(self):
+        for value in range(0, 50000, 7):
+            index = bucket_index(value)
+            self.assertLessEqual(bucket_lower_bound(index), value)
+            self.assertLess(value, bucket_lower_bound(index + 1))
+
+    def test_huge_values_are_clamped(self):
+        self.assertEqual(bucket_index(2 ** 60), NUM_BUCKETS - 1)
+
+    def test_quantiles_within_bucket_precision(self):
+        histogram = LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.record(ms / 1000)
+
+        quantiles = histogram.quantiles((0.5, 0.99))
+        self.assertAlmostEqual(quantiles[0.5], 0.5, delta=0.5 / 8)
+        self.assertAlmostEqual(quantiles[0.99], 0.99, delta=0.99 / 8)
+        self.assertEqual(histogram.snapshot()['max_ms'], 1000.0)
+
+    def test_empty_histogram(self):
+        self.assertIsNone(LatencyHistogram().quantile(0.5))
+
+
+class TestPipelineMetrics(unittest.TestCase):
+    """Test cases for per-hop pipeline latencies."""
+
+    def setUp(self):
+        self.metrics = PipelineMetrics(max_in_flight=3)
+
+    def test_records_hop_from_closest_earlier_stage(self):
+        self.metrics.mark('m1', 'discord_received', at=100.0)
+        self.metrics.mark('m1', 'message_stored', at=100.25)
+        self.metrics.mark('m1', 'setups_stored', at=101.0)
+
+        hops = self.metrics.snapshot()['hops']
+        self.assertEqual(hops['discord_received->message_stored']['count'], 1)
+        self.assertEqual(hops['message_stored->setups_stored']['count'], 1)
+        self.assertAlmostEqual(hops[END_TO_END]['max_ms'], 1000, delta=1)
+
+    def test_repeated_stage_keeps_first_time(self):
+        self.metrics.mark('m1', 'discord_received', at=100.0)
+        self.metrics.mark('m1', 'message_stored', at=101.0)
+        self.metrics.mark('m1', 'message_stored', at=105.0)
+
+        hop = self.metrics.snapshot()['hops']['discord_received->message_stored']
+        self.assertEqual(hop['count'], 1)
+
+    def test_unknown_stage_and_eviction(self):
+        self.metrics.mark('m0', 'not_a_stage')
+        for i in range(5):
+            self.metrics.mark(f"m{i}", 'discord_received')
+
+        self.assertEqual(self.metrics.snapshot()['in_flight'], 3)
+
+    def test_prometheus_output(self):
+        self.metrics.mark('m1', 'parse_started', at=10.0)
+        self.metrics.mark('m1', 'setups_stored', at=10.5)
+
+        output = self.metrics.render_prometheus()
+        self.assertIn('# TYPE pipeline_hop_latency_seconds summary', output)
+        self.assertIn('pipeline_hop_latency_seconds_count{hop="parse_started->setups_stored"} 1', output)
+        self.assertIn('quantile="0.5"', output)
+
+    def test_handoff_carries_stages_to_the_next_process(self):
+        bot = PipelineMetrics()
+        bot.mark('m1', 'discord_received', at=100.0)
+        bot.mark('m1', 'message_stored', at=100.25)
+        stages = bot.handoff('m1')
+
+        parser = PipelineMetrics()
+        parser.adopt('m1', stages)
+        parser.mark('m1', 'parse_started', at=100.5)
+
+        self.assertEqual(bot.snapshot()['in_flight'], 0)
+        hops = parser.snapshot()['hops']
+        self.assertEqual(list(hops), ['message_stored->parse_started'])
+        self.assertAlmostEqual(hops['message_stored->parse_started']['max_ms'], 250, delta=1)
+
+    def test_handoff_can_keep_tracking(self):
+        self.metrics.mark('m1', 'discord_received', at=100.0)
+
+        self.assertEqual(self.metrics.handoff('m1', keep=True), {'discord_received': 100.0})
+        self.assertEqual(self.metrics.snapshot()['in_flight'], 1)
+        self.assertEqual(self.metrics.handoff('unknown'), {})
+
+    def test_other_processes_are_rendered_with_a_process_label(self):
+        worker = PipelineMetrics()
+        worker.mark('m1', 'parse_started', at=10.0)
+        worker.mark('m1', 'setups_stored', at=10.5)
+
+        output = self.metrics.render_prometheus(others=[('parse@host:42', worker.export())])
+        self.assertIn(
+            'pipeline_hop_latency_seconds_count{process="parse@host:42",hop="parse_started->setups_stored"} 1',
+            output
+        )
+        self.assertEqual(output.count('# TYPE pipeline_hop_latency_seconds summary'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
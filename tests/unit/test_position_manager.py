@@ -0,0 +1,125 @@
+"""
+Tests for the position manager.
+
+Covers the diff-based Alpaca sync and the trade-event refreshes of the
+position snapshot.
+"""
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from flask import Flask
+
+from common.db import db
+from common.events.constants import EventTypes
+from features.management import position_manager
+from features.management.models import PositionModel
+from features.management.position_manager import (
+    TRADE_LISTENER_TASK,
+    PositionSnapshotService,
+    start_position_update_thread,
+    sync_positions_from_alpaca,
+)
+from features.notifications.models import NotificationModel
+
+
+def alpaca_position(symbol, qty=10, current_price=100.0, unrealized_pl=50.0):
+    """Build an object shaped like an Alpaca position."""
+    return SimpleNamespace(
+        symbol=symbol, qty=str(qty), side='long', avg_entry_price='95.0',
+        market_value=str(qty * current_price), cost_basis=str(qty * 95.0),
+        unrealized_pl=str(unrealized_pl), unrealized_plpc='5.26',
+        current_price=str(current_price), lastday_price='98.0', change_today='0.02'
+    )
+
+
+class TestSyncPositions(unittest.TestCase):
+    """Test cases for syncing Alpaca positions into the database."""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        PositionModel.__table__.create(db.engine)
+        NotificationModel.__table__.create(db.engine)
+
+        self.assertEqual(sync_positions_from_alpaca([alpaca_position('SPY'), alpaca_position('QQQ')]), 2)
+
+    def tearDown(self):
+        db.session.remove()
+        self.ctx.pop()
+
+    def open_positions(self):
+        return {p.symbol: p for p in PositionModel.query.filter_by(closed_at=None).all()}
+
+    def test_new_positions_are_inserted_with_a_notification(self):
+        self.assertEqual(sorted(self.open_positions()), ['QQQ', 'SPY'])
+        self.assertEqual(
+            sorted(n.title for n in NotificationModel.query.all()),
+            ['New Position: QQQ', 'New Position: SPY']
+        )
+
+    def test_unchanged_positions_are_not_written(self):
+        with patch.object(db.session, 'commit', wraps=db.session.commit) as commit:
+            writes = sync_positions_from_alpaca([alpaca_position('SPY'), alpaca_position('QQQ')])
+
+        self.assertEqual(writes, 0)
+        commit.assert_not_called()
+
+    def test_only_changed_positions_are_updated(self):
+        updated_at = {symbol: p.updated_at for symbol, p in self.open_positions().items()}
+
+        writes = sync_positions_from_alpaca([
+            alpaca_position('SPY', current_price=101.0, unrealized_pl=60.0),
+            alpaca_position('QQQ')
+        ])
+
+        positions = self.open_positions()
+        self.assertEqual(writes, 1)
+        self.assertEqual(positions['SPY'].current_price, 101.0)
+        self.assertNotEqual(positions['SPY'].updated_at, updated_at['SPY'])
+        self.assertEqual(positions['QQQ'].updated_at, updated_at['QQQ'])
+
+    def test_positions_gone_from_alpaca_are_closed(self):
+        writes = sync_positions_from_alpaca([alpaca_position('SPY')])
+
+        self.assertEqual(writes, 1)
+        self.assertEqual(sorted(self.open_positions()), ['SPY'])
+        closed = PositionModel.query.filter_by(symbol='QQQ').one()
+        self.assertIsNotNone(closed.closed_at)
+        self.assertEqual(
+            NotificationModel.query.filter_by(title='Position Closed: QQQ').one().message,
+            'Position closed: 10 QQQ with P&L: $50.00 (5.26%)'
+        )
+
+
+class TestSnapshotRefreshEvents(unittest.TestCase):
+    """Test cases for refreshing the snapshot on trade events."""
+
+    def test_trade_events_request_a_refresh(self):
+        for event_type in (EventTypes.TRADE_FILLED, 'trade:executed', 'position_exits'):
+            service = PositionSnapshotService()
+            service.handle_event(event_type, {'symbol': 'SPY'})
+            self.assertTrue(service._refresh_requested.is_set(), event_type)
+
+    def test_other_events_are_ignored(self):
+        service = PositionSnapshotService()
+        service.handle_event(EventTypes.CANDLE_CLOSED, {'ticker': 'SPY'})
+
+        self.assertFalse(service._refresh_requested.is_set())
+
+    def test_update_thread_registers_the_trade_listener(self):
+        with patch.object(position_manager, 'runtime') as runtime, \
+                patch.object(position_manager.position_snapshot, 'start') as start:
+            start_position_update_thread()
+
+        runtime.supervise.assert_called_once_with(TRADE_LISTENER_TASK, position_manager._listen_for_trade_events)
+        start.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+Tests for process roles and the role launcher.
+
+Covers APP_ROLES parsing, the web role's server settings and the
+supervisor's restart backoff.
+"""
+
+import os
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+from common.process_roles import ROLES, active_roles, parse_roles, role_enabled
+from launcher import RESTART_BACKOFF_MAX, RoleProcess, Supervisor, web_server_options
+
+
+class TestProcessRoles(unittest.TestCase):
+    """Test cases for APP_ROLES parsing."""
+
+    def test_default_is_every_role(self):
+        self.assertEqual(parse_roles(None), frozenset(ROLES))
+        self.assertEqual(parse_roles(''), frozenset(ROLES))
+        self.assertEqual(parse_roles('all'), frozenset(ROLES))
+
+    def test_role_list(self):
+        self.assertEqual(parse_roles('web, Parse'), frozenset({'web', 'parse'}))
+
+    def test_unknown_role_is_rejected(self):
+        with self.assertRaises(ValueError):
+            parse_roles('web,tick')
+
+    def test_role_enabled_reads_environment(self):
+        with patch.dict(os.environ, {'APP_ROLES': 'parse'}):
+            self.assertEqual(active_roles(), frozenset({'parse'}))
+            self.assertTrue(role_enabled('parse'))
+            self.assertFalse(role_enabled('ingest'))
+
+    def test_web_role_runs_one_threaded_gunicorn_worker(self):
+        options = web_server_options('0.0.0.0', 5000)
+
+        self.assertEqual(options['bind'], '0.0.0.0:5000')
+        self.assertEqual((options['workers'], options['worker_class']), (1, 'gthread'))
+        self.assertGreater(options['threads'], 1)
+
+
+def wait_for_exit(role_process):
+    deadline = time.monotonic() + 10
+    while role_process.process.poll() is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestSupervisor(unittest.TestCase):
+    """Test cases for restarting role processes."""
+
+    def test_crashed_role_restarts_with_backoff(self):
+        role = RoleProcess('parse', [sys.executable, '-c', 'import sys; sys.exit(3)'])
+        role.start()
+        wait_for_exit(role)
+
+        now = time.monotonic()
+        role.poll(now)
+        self.assertEqual(role.restart_at, now + 1.0)
+        role.poll(now + 0.5)
+        self.assertEqual(role.restarts, 0)
+
+        role.poll(now + 1.0)
+        self.assertEqual(role.restarts, 1)
+        wait_for_exit(role)
+        role.poll(now + 1.0)
+        self.assertEqual(role.restart_at, now + 3.0)
+        role.restart_at = None
+
+        role.backoff = RESTART_BACKOFF_MAX
+        role.poll(now + 2.0)
+        self.assertEqual(role.backoff, RESTART_BACKOFF_MAX)
+
+    def test_running_role_is_left_alone(self):
+        role = RoleProcess('web', [sys.executable, '-c', 'import time; time.sleep(30)'])
+        role.start()
+        try:
+            role.poll(time.monotonic())
+            self.assertIsNone(role.restart_at)
+        finally:
+            role.stop()
+            role.wait(time.monotonic() + 5)
+        self.assertIsNotNone(role.process.returncode)
+
+    def test_supervisor_builds_one_process_per_role(self):
+        supervisor = Supervisor(['web', 'parse'], ['--port', '5001'])
+        commands = {p.role: p.command for p in supervisor.processes}
+
+        self.assertEqual(set(commands), {'web', 'parse'})
+        self.assertEqual(commands['parse'][-4:], ['--role', 'parse', '--port', '5001'])
+
+    def test_scaled_role_runs_queue_workers(self):
+        supervisor = Supervisor(['web', 'parse'], [], scale={'parse': 2})
+        processes = {p.name: p for p in supervisor.processes}
+
+        self.assertEqual(set(processes), {'web', 'parse-1', 'parse-2'})
+        self.assertEqual(processes['parse-2'].env, {'PARSING_WORK_QUEUE': 'true'})
+        self.assertFalse(processes['web'].env)
+
+
+if __name__ == '__main__':
+    unittest.main()
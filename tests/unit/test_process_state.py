@@ -0,0 +1,135 @@
+"""
+Tests for the state worker processes publish for the web process.
+
+Covers publishing and reading process_state rows (run against sqlite), and
+the Discord metrics and ingestion counters served from the published state.
+"""
+
+import os
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from flask import Flask
+
+from common.db import db
+from common.metrics import process_state as process_state_module
+from common.metrics.models import ProcessStateModel
+from common.metrics.process_state import ProcessStateReporter, instance_name, process_state
+from features.discord_bot.api import collect_discord_metrics, discord_api_bp
+from features.ingestion.counters import current_ingestion_counters
+
+
+class ProcessStateTestCase(unittest.TestCase):
+    """Runs each test in an app context bound to an in-memory database."""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        ProcessStateModel.__table__.create(db.engine)
+
+    def tearDown(self):
+        db.session.remove()
+        self.ctx.pop()
+
+    def publish_as(self, instance, sections, reporter=None):
+        """Publish sections as another process."""
+        reporter = reporter or ProcessStateReporter()
+        for section, builder in sections.items():
+            reporter.register(section, builder)
+        roles = instance.split('@')[0]
+        with patch.object(process_state_module, 'instance_name', return_value=instance), \
+                patch.dict(os.environ, {'APP_ROLES': roles}):
+            self.assertTrue(reporter.publish())
+        return reporter
+
+
+class TestProcessStateReporter(ProcessStateTestCase):
+    """Test cases for publishing and reading process state."""
+
+    def test_read_returns_other_processes_newest_first(self):
+        self.publish_as('parse@host:1', {'pipeline': lambda: {'in_flight': 1}})
+        self.publish_as('parse@host:2', {'pipeline': lambda: {'in_flight': 2}})
+        self.publish_as('market@host:3', {'profiling': lambda: {'armed': {}}})
+
+        published = process_state.read('pipeline')
+
+        self.assertEqual([p['instance'] for p in published], ['parse@host:2', 'parse@host:1'])
+        self.assertEqual(published[0]['state'], {'in_flight': 2})
+        self.assertEqual(published[0]['roles'], ['parse'])
+
+    def test_publishing_again_updates_the_row(self):
+        reporter = self.publish_as('ingest@host:1', {'ingestion': lambda: {'stored_today': 1}})
+        self.publish_as('ingest@host:1', {'ingestion': lambda: {'stored_today': 2}}, reporter)
+
+        self.assertEqual(ProcessStateModel.query.count(), 1)
+        self.assertEqual(process_state.latest('ingestion')['state'], {'stored_today': 2})
+
+    def test_own_and_stale_rows_are_ignored(self):
+        db.session.add(ProcessStateModel(
+            instance=instance_name(), roles='web', hostname='host', pid=1,
+            state={'discord': {'connected': True}}, updated_at=datetime.utcnow()
+        ))
+        db.session.add(ProcessStateModel(
+            instance='ingest@host:2', roles='ingest', hostname='host', pid=2,
+            state={'discord': {'connected': True}}, updated_at=datetime.utcnow() - timedelta(minutes=5)
+        ))
+        db.session.commit()
+
+        self.assertEqual(process_state.read('discord'), [])
+        self.assertIsNone(process_state.latest('discord'))
+
+    def test_failing_and_empty_builders_are_skipped(self):
+        def broken():
+            raise RuntimeError('bot gone')
+
+        reporter = ProcessStateReporter()
+        reporter.register('discord', broken)
+        reporter.register('profiling', lambda: None)
+        reporter.register('ingestion', lambda: {'stored_today': 3})
+
+        self.assertEqual(reporter.build(), {'ingestion': {'stored_today': 3}})
+
+
+class TestPublishedStateFallbacks(ProcessStateTestCase):
+    """Test cases for endpoints served from another process's state."""
+
+    def setUp(self):
+        super().setUp()
+        self.app.register_blueprint(discord_api_bp)
+        self.publish_as('ingest@host:7', {
+            'discord': lambda: {'connected': True, 'live_messages_today': 4, 'user': 'bot#0001'},
+            'ingestion': lambda: {'stored_today': 9, 'total_stored': 120}
+        })
+
+    def test_discord_metrics_come_from_the_ingest_process(self):
+        metrics = collect_discord_metrics()
+
+        self.assertEqual(metrics['live_messages_today'], 4)
+        self.assertEqual(metrics['process'], 'ingest@host:7')
+        self.assertIn('reported_at', metrics)
+
+    def test_discord_endpoints_without_a_local_bot(self):
+        client = self.app.test_client()
+
+        status = client.get('/api/discord/status')
+        self.assertEqual(status.status_code, 200)
+        self.assertEqual(status.get_json()['status'], 'connected')
+
+        sync = client.post('/api/discord/sync-history', json={})
+        self.assertEqual(sync.status_code, 503)
+        self.assertIn('ingest@host:7', sync.get_json()['error'])
+
+    def test_web_process_reads_the_published_ingestion_counters(self):
+        with patch.dict(os.environ, {'APP_ROLES': 'web'}):
+            counters = current_ingestion_counters()
+
+        self.assertEqual(counters, {'stored_today': 9, 'total_stored': 120})
+
+
+if __name__ == '__main__':
+    unittest.main()
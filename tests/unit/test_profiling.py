@@ -0,0 +1,99 @@
+"""
+Tests for on-demand sampling profiler hooks.
+
+Covers arming windows, the disabled fast path and folded-stack output.
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+
+from common.profiling import ARM_EVENT, DISARM_EVENT, Profiler, fold_stack, profiled, profiler
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestProfiler(unittest.TestCase):
+    """Test cases for profiling windows and output."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.original_dir = profiler.output_dir
+        profiler.output_dir = self.tmp.name
+        profiler.disarm()
+
+    def tearDown(self):
+        profiler.disarm()
+        profiler.output_dir = self.original_dir
+        self.tmp.cleanup()
+
+    def test_disarmed_calls_write_nothing(self):
+        @profiled('test.disarmed')
+        def work():
+            busy(0.02)
+            return 'done'
+
+        self.assertEqual(work(), 'done')
+        self.assertEqual(os.listdir(self.tmp.name), [])
+        self.assertIn('test.disarmed', profiler.status()['targets'])
+
+    def test_armed_call_writes_folded_stacks(self):
+        @profiled('test.armed')
+        def work():
+            busy(0.05)
+
+        profiler.arm('test.armed', seconds=10, max_calls=1)
+        work()
+        work()
+
+        files = os.listdir(self.tmp.name)
+        self.assertEqual(len(files), 1)
+        with open(os.path.join(self.tmp.name, files[0])) as f:
+            line = f.readline().strip()
+        stack, count = line.rsplit(' ', 1)
+        self.assertIn('busy (test_profiling.py:', stack)
+        self.assertGreater(int(count), 0)
+        self.assertNotIn('test.armed', profiler.armed())
+
+    def test_async_functions_are_supported(self):
+        @profiled('test.async')
+        async def work():
+            busy(0.03)
+            return 42
+
+        profiler.arm('test.async', seconds=10, max_calls=1)
+        self.assertEqual(asyncio.run(work()), 42)
+        self.assertEqual(len(os.listdir(self.tmp.name)), 1)
+
+    def test_expired_window_is_dropped(self):
+        local = Profiler(output_dir=self.tmp.name)
+        local.arm('target', seconds=-1)
+        self.assertFalse(local.should_profile('target'))
+        self.assertEqual(local.armed(), {})
+
+    def test_arm_and_disarm_events_from_another_process(self):
+        local = Profiler(output_dir=self.tmp.name)
+        local.handle_event(ARM_EVENT, {'target': 'target', 'seconds': 30, 'max_calls': 2})
+        self.assertEqual(local.armed()['target']['remaining'], 2)
+
+        local.handle_event('profiling.unknown', {'target': 'target'})
+        self.assertTrue(local.should_profile('target'))
+
+        local.handle_event(DISARM_EVENT, {'target': 'target'})
+        self.assertEqual(local.armed(), {})
+
+    def test_fold_stack_orders_root_first(self):
+        import sys
+        frames = fold_stack(sys._getframe()).split(';')
+        self.assertTrue(frames[-1].startswith('test_fold_stack_orders_root_first (test_profiling.py:'))
+        self.assertGreater(len(frames), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
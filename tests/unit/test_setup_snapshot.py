@@ -0,0 +1,171 @@
+"""
+Tests for per-trading-day setup snapshots.
+
+Covers the ticker/direction indexes, read-only views, version-based rebuilds
+and invalidation from the parsing store on a sqlite database.
+"""
+
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+from flask import Flask
+
+from common.db import db
+from features.parsing.aplus_parser import TradeSetup as ParsedTradeSetup
+from features.parsing.models import TradeSetup
+from features.parsing.setup_snapshot import SetupSnapshot, SetupSnapshotStore, get_setup_snapshots
+from features.parsing.store import ParsingStore, handle_setup_event
+
+
+def view(setup_id, ticker, direction):
+    return {'id': setup_id, 'ticker': ticker, 'direction': direction, 'levels': [{'id': 1, 'trigger_price': 100.0}]}
+
+
+class TestSetupSnapshot(unittest.TestCase):
+    """Test cases for building and sharing snapshots."""
+
+    def setUp(self):
+        self.day = date(2025, 5, 21)
+        self.store = SetupSnapshotStore()
+        self.loads = []
+
+    def loader(self, views):
+        def load(trading_day):
+            self.loads.append(trading_day)
+            return views
+        return load
+
+    def test_snapshot_is_indexed_and_read_only(self):
+        snapshot = SetupSnapshot.build(self.day, [
+            view('a', 'SPY', 'long'), view('b', 'spy', 'short'), view('c', 'NVDA', 'long')
+        ])
+
+        self.assertEqual(snapshot.tickers, ['NVDA', 'SPY'])
+        self.assertEqual([s['id'] for s in snapshot.select(ticker='Spy')], ['a', 'b'])
+        self.assertEqual([s['id'] for s in snapshot.select(direction='LONG')], ['a', 'c'])
+        self.assertEqual([s['id'] for s in snapshot.select('SPY', 'short')], ['b'])
+        with self.assertRaises(TypeError):
+            snapshot.setups[0]['ticker'] = 'QQQ'
+
+        copies = snapshot.to_dicts(ticker='NVDA')
+        copies[0]['levels'].append({})
+        self.assertEqual(len(snapshot.select(ticker='NVDA')[0]['levels']), 1)
+
+    def test_snapshot_is_shared_until_its_day_changes(self):
+        other_day = date(2025, 5, 22)
+        first = self.store.get(self.day, self.loader([view('a', 'SPY', 'long')]))
+        self.assertIs(self.store.get(self.day, self.loader([])), first)
+        self.store.get(other_day, self.loader([]))
+
+        self.store.invalidate(other_day)
+        self.assertIs(self.store.get(self.day, self.loader([])), first)
+
+        self.store.invalidate(self.day)
+        rebuilt = self.store.get(self.day, self.loader([]))
+        self.assertGreater(rebuilt.version, first.version)
+        self.assertEqual(rebuilt.setups, ())
+        # The old snapshot is untouched for readers still holding it
+        self.assertEqual(len(first.setups), 1)
+
+        self.store.invalidate()
+        self.store.get(self.day, self.loader([]))
+        self.assertEqual(self.loads, [self.day, other_day, self.day, self.day])
+
+    def test_write_during_build_forces_another_rebuild(self):
+        def racing_load(trading_day):
+            self.store.invalidate(trading_day)
+            return [view('a', 'SPY', 'long')]
+
+        stale = self.store.get(self.day, racing_load)
+        fresh = self.store.get(self.day, self.loader([]))
+
+        self.assertIsNot(fresh, stale)
+        self.assertIs(self.store.get(self.day, self.loader([])), fresh)
+        self.assertEqual(self.store.stats()['builds'], 2)
+
+
+class TestParsingStoreSnapshot(unittest.TestCase):
+    """Test cases for snapshot invalidation by parsing store writes."""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.day = date(2025, 5, 21)
+        for i, (ticker, direction) in enumerate([('SPY', 'long'), ('NVDA', 'short')]):
+            db.session.add(TradeSetup(
+                id=f"setup_{i}", message_id='1', ticker=ticker, trading_day=self.day, index=1,
+                trigger_level=100 + i, target_prices=[101], direction=direction, raw_line='line'
+            ))
+        db.session.commit()
+        get_setup_snapshots().invalidate()
+        patcher = patch('features.parsing.store.publish_event')
+        self.publish_event = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_deactivating_a_setup_rebuilds_its_day(self):
+        store = ParsingStore()
+        snapshot = store.get_setup_snapshot(self.day)
+        self.assertEqual(snapshot.tickers, ['NVDA', 'SPY'])
+        self.assertIs(store.get_setup_snapshot(self.day), snapshot)
+
+        self.assertTrue(store.deactivate_setup('setup_0'))
+
+        rebuilt = store.get_setup_snapshot(self.day)
+        self.assertEqual(rebuilt.tickers, ['NVDA'])
+        self.assertEqual(rebuilt.select(direction='short')[0]['trigger_level'], 101.0)
+
+    def test_deactivation_is_broadcast_to_other_processes(self):
+        self.assertTrue(ParsingStore().deactivate_setup('setup_0'))
+
+        self.publish_event.assert_called_once_with(
+            event_type='setups.changed',
+            data={'trading_day': '2025-05-21', 'reason': 'deactivated', 'setup_id': 'setup_0'},
+            channel='parsing:setup',
+            source='parsing_store'
+        )
+
+    def test_stored_setups_are_published_whichever_parser_produced_them(self):
+        parsed = ParsedTradeSetup(
+            id='20250521_TSLA_Setup_1', ticker='TSLA', trading_day=self.day, index=1, trigger_level=250.0,
+            target_prices=[255.0], direction='long', label='AggressiveBreakout', keywords=['breakout'],
+            emoji_hint=None, raw_line='TSLA above 250'
+        )
+
+        created, _ = ParsingStore().store_parsed_message('2', [parsed], self.day, correlation_id='corr-1')
+
+        self.assertEqual([s.id for s in created], ['20250521_TSLA_Setup_1'])
+        kwargs = self.publish_event.call_args.kwargs
+        self.assertEqual((kwargs['event_type'], kwargs['channel']), ('setup.parsed', 'parsing:setup'))
+        self.assertEqual(kwargs['data']['setup_id'], '20250521_TSLA_Setup_1')
+        self.assertEqual(kwargs['data']['trading_day'], '2025-05-21')
+        self.assertEqual(kwargs['correlation_id'], 'corr-1')
+
+    def test_setups_parsed_elsewhere_move_the_day_forward(self):
+        snapshots = get_setup_snapshots()
+        version = snapshots.version(self.day)
+
+        handle_setup_event('setup.parsed', {'trading_day': self.day.isoformat()})
+        self.assertGreater(snapshots.version(self.day), version)
+
+        version = snapshots.version(self.day)
+        handle_setup_event('setups.changed', {'trading_day': self.day.isoformat(), 'reason': 'level_triggered'})
+        self.assertGreater(snapshots.version(self.day), version)
+
+        version = snapshots.version(self.day)
+        handle_setup_event('message.stored', {'trading_day': self.day.isoformat()})
+        self.assertEqual(snapshots.version(self.day), version)
+
+
+if __name__ == '__main__':
+    unittest.main()
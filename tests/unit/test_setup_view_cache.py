@@ -0,0 +1,110 @@
+"""
+Tests for the parsing dashboard setup view cache.
+
+Covers per-day invalidation, ETag stability, available-days reloads and
+builds that race with an invalidation.
+"""
+
+import unittest
+from datetime import date
+
+from features.parsing.setup_cache import SetupViewCache
+
+
+class TestSetupViewCache(unittest.TestCase):
+    """Test cases for cached setup views."""
+
+    def setUp(self):
+        self.cache = SetupViewCache()
+        self.builds = []
+
+    def builder(self, body):
+        def build():
+            self.builds.append(body)
+            return body
+        return build
+
+    def test_views_are_cached_per_day_and_ticker(self):
+        day = date(2025, 5, 21)
+        first = self.cache.get_or_build(day, 'spy', self.builder(b'{"a": 1}'))
+        again = self.cache.get_or_build(day, 'SPY', self.builder(b'{"a": 2}'))
+        other = self.cache.get_or_build(day, None, self.builder(b'{"b": 1}'))
+
+        self.assertIs(first, again)
+        self.assertNotEqual(first.etag, other.etag)
+        self.assertEqual(self.builds, [b'{"a": 1}', b'{"b": 1}'])
+        self.assertEqual(self.cache.stats(), {'entries': 2, 'hits': 1, 'misses': 2})
+
+    def test_invalidate_only_drops_that_day(self):
+        monday, tuesday = date(2025, 5, 19), date(2025, 5, 20)
+        self.cache.get_or_build(monday, None, self.builder(b'1'))
+        self.cache.get_or_build(tuesday, None, self.builder(b'2'))
+
+        self.cache.invalidate(monday)
+        self.cache.get_or_build(monday, None, self.builder(b'3'))
+        self.cache.get_or_build(tuesday, None, self.builder(b'4'))
+        self.assertEqual(self.builds, [b'1', b'2', b'3'])
+
+        self.cache.invalidate()
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+    def test_changed_available_days_drop_all_views(self):
+        day = date(2025, 5, 21)
+        self.assertEqual(self.cache.available_days(lambda: [day]), [day])
+        self.cache.get_or_build(day, None, self.builder(b'1'))
+
+        # Cached list is served without calling the loader again
+        self.assertEqual(self.cache.available_days(lambda: []), [day])
+
+        # An unchanged reload keeps views, a changed one drops them
+        self.cache.invalidate(date(2025, 5, 20))
+        self.cache.available_days(lambda: [day])
+        self.assertEqual(self.cache.stats()['entries'], 1)
+
+        self.cache.invalidate(date(2025, 5, 22))
+        self.cache.available_days(lambda: [date(2025, 5, 22), day])
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+    def test_view_built_across_an_invalidation_is_not_cached(self):
+        day = date(2025, 5, 21)
+
+        def racing_build():
+            # A setup write lands while the stale body is being built
+            self.cache.invalidate(day)
+            return b'stale'
+
+        stale = self.cache.get_or_build(day, None, racing_build)
+        fresh = self.cache.get_or_build(day, None, self.builder(b'fresh'))
+
+        self.assertEqual(stale.body, b'stale')
+        self.assertEqual(fresh.body, b'fresh')
+        self.assertEqual(self.cache.get_or_build(day, None, self.builder(b'again')), fresh)
+
+    def test_other_days_and_global_invalidation_during_build(self):
+        monday, tuesday = date(2025, 5, 19), date(2025, 5, 20)
+
+        def build_during(invalidate):
+            def build():
+                invalidate()
+                return b'body'
+            return build
+
+        self.cache.get_or_build(monday, None, build_during(lambda: self.cache.invalidate(tuesday)))
+        self.assertEqual(self.cache.stats()['entries'], 1)
+
+        self.cache.get_or_build(tuesday, None, build_during(lambda: self.cache.invalidate()))
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+    def test_days_loaded_across_an_invalidation_are_reloaded(self):
+        day = date(2025, 5, 21)
+
+        def racing_load():
+            self.cache.invalidate(day)
+            return []
+
+        self.assertEqual(self.cache.available_days(racing_load), [])
+        self.assertEqual(self.cache.available_days(lambda: [day]), [day])
+
+
+if __name__ == '__main__':
+    unittest.main()
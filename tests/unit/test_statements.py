@@ -0,0 +1,85 @@
+"""
+Tests for the statement registry.
+
+Covers registering named statements once, rejecting conflicting SQL, and
+executing registered statements with latency tracking on sqlite, and that
+the modules registering statements import on their own.
+"""
+
+import asyncio
+import subprocess
+import sys
+import unittest
+
+from flask import Flask
+
+from common.db import db
+from common.statements import StatementRegistry
+
+
+class TestStatementRegistry(unittest.TestCase):
+    """Test cases for registering and executing hot statements."""
+
+    def setUp(self):
+        self.registry = StatementRegistry()
+
+    def test_register_returns_one_statement_per_name(self):
+        statement = self.registry.register('parsing.count', "SELECT COUNT(*) FROM trade_setups")
+
+        self.assertIs(self.registry.register('parsing.count', "SELECT COUNT(*) FROM trade_setups"), statement)
+        self.assertIs(self.registry.get('parsing.count'), statement)
+        with self.assertRaises(ValueError):
+            self.registry.register('parsing.count', "SELECT 1")
+        with self.assertRaises(ValueError):
+            self.registry.register_async('parsing.count', "SELECT COUNT(*) FROM trade_setups")
+
+    def test_statement_executes_with_bind_parameters(self):
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(app)
+        statement = self.registry.register('test.add', "SELECT :a + :b AS total")
+
+        with app.app_context():
+            clause = statement.clause
+            self.assertEqual(statement.execute(db.session, {'a': 2, 'b': 3}).scalar(), 5)
+            self.assertEqual(statement.execute(db.session, {'a': 1, 'b': 1}).scalar(), 2)
+
+        self.assertIs(statement.clause, clause)
+        snapshot = self.registry.snapshot()
+        self.assertEqual(list(snapshot), ['test.add'])
+        self.assertEqual(snapshot['test.add']['count'], 2)
+
+        self.registry.reset()
+        self.assertEqual(self.registry.snapshot(), {})
+
+    def test_async_statement_passes_its_sql_to_the_connection(self):
+        calls = []
+
+        class Connection:
+            async def fetchval(self, sql, *args):
+                calls.append((sql, args))
+                return 1
+
+        statement = self.registry.register_async('events.notify', "SELECT pg_notify($1, $2)")
+        result = asyncio.run(statement.fetchval(Connection(), 'events', '{}'))
+
+        self.assertEqual(result, 1)
+        self.assertEqual(calls, [("SELECT pg_notify($1, $2)", ('events', '{}'))])
+        self.assertEqual(statement.latency.count, 1)
+
+
+class TestStatementImports(unittest.TestCase):
+    """Test cases for importing statement users in a fresh interpreter."""
+
+    def test_publisher_imports_first(self):
+        # common.db imports common.events, so the registry must not live under common.db
+        for module in ('common.events.publisher', 'common.events', 'features.parsing.store'):
+            result = subprocess.run(
+                [sys.executable, '-c', f"import {module}"], capture_output=True, text=True, timeout=60
+            )
+            self.assertEqual(result.returncode, 0, f"{module}: {result.stderr}")
+
+
+if __name__ == '__main__':
+    unittest.main()
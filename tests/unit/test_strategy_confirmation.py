@@ -0,0 +1,111 @@
+"""
+Tests for the breakout confirmation engine.
+
+Covers the ring-buffer volume window, streaming evaluation of many levels per
+ticker, and batch evaluation over historical candles.
+"""
+
+import unittest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from features.strategy.confirmation import BreakoutConfirmationEngine, CandleWindow
+
+
+def make_candle(minute, o, c, v, hour=10):
+    """Build a lightweight candle with the attributes the engine reads."""
+    return SimpleNamespace(
+        timestamp=datetime(2025, 5, 21, hour, minute, tzinfo=timezone.utc),
+        open=o, high=max(o, c) + 0.5, low=min(o, c) - 0.5, close=c, volume=v
+    )
+
+
+class TestCandleWindow(unittest.TestCase):
+    """Test cases for the OHLCV ring buffer."""
+
+    def test_running_average_matches_recent_candles(self):
+        window = CandleWindow(capacity=3)
+        self.assertEqual(window.average_volume, 0)
+
+        volumes = [10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 70.0]
+        for i, volume in enumerate(volumes):
+            window.push(1, 1, 1, 1, volume)
+            recent = volumes[max(0, i - 2):i + 1]
+            self.assertAlmostEqual(window.average_volume, sum(recent) / len(recent))
+
+        self.assertEqual(len(window), 3)
+        self.assertEqual(list(window.to_array()[:, 4]), [50.0, 60.0, 70.0])
+
+    def test_rejects_empty_capacity(self):
+        with self.assertRaises(ValueError):
+            CandleWindow(capacity=0)
+
+
+class TestBreakoutConfirmationEngine(unittest.TestCase):
+    """Test cases for streaming and batch breakout confirmation."""
+
+    def setUp(self):
+        self.history = [
+            make_candle(25, 99.0, 100.0, 10000),
+            make_candle(30, 100.0, 100.8, 8000),
+            make_candle(35, 100.8, 101.0, 7000),
+            make_candle(40, 101.0, 101.2, 9000),
+            make_candle(45, 101.6, 105.5, 25000),
+        ]
+        self.levels = [(1, 102.0), (2, 106.0), (3, 103.0)]
+
+    def test_update_confirms_all_levels_below_close(self):
+        engine = BreakoutConfirmationEngine()
+        engine.set_levels('SPY', self.levels)
+
+        confirmed = []
+        for candle in self.history:
+            confirmed.append(engine.update('SPY', candle))
+
+        self.assertEqual(confirmed[:4], [[], [], [], []])
+        self.assertEqual(sorted(confirmed[4]), [1, 3])
+
+    def test_mark_confirmed_excludes_level(self):
+        engine = BreakoutConfirmationEngine()
+        engine.set_levels('SPY', self.levels)
+        for candle in self.history[:-1]:
+            engine.update('SPY', candle)
+
+        self.assertTrue(engine.mark_confirmed('SPY', 1))
+        self.assertFalse(engine.mark_confirmed('SPY', 99))
+        self.assertEqual(engine.update('SPY', self.history[-1]), [3])
+
+    def test_volume_and_market_hours_filters(self):
+        engine = BreakoutConfirmationEngine(volume_multiplier=3.0)
+        engine.set_levels('SPY', self.levels)
+        for candle in self.history:
+            result = engine.update('SPY', candle)
+        self.assertEqual(result, [])
+
+        engine = BreakoutConfirmationEngine()
+        engine.set_levels('SPY', self.levels)
+        self.assertEqual(engine.update('SPY', make_candle(0, 101.6, 105.5, 25000, hour=8)), [])
+
+    def test_other_tickers_are_ignored(self):
+        engine = BreakoutConfirmationEngine()
+        engine.set_levels('SPY', self.levels)
+        self.assertEqual(engine.update('AAPL', self.history[-1]), [])
+        self.assertEqual(engine.tickers, ['SPY'])
+
+    def test_evaluate_history_matches_streaming(self):
+        engine = BreakoutConfirmationEngine()
+        first_hits = engine.evaluate_history(self.history, self.levels)
+        self.assertEqual(first_hits, {1: 4, 2: None, 3: 4})
+
+        streaming = BreakoutConfirmationEngine()
+        streaming.set_levels('SPY', self.levels)
+        seen = {}
+        for index, candle in enumerate(self.history):
+            for key in streaming.update('SPY', candle):
+                seen.setdefault(key, index)
+                streaming.mark_confirmed('SPY', key)
+        self.assertEqual({k: v for k, v in first_hits.items() if v is not None}, seen)
+
+
+if __name__ == '__main__':
+    unittest.main()
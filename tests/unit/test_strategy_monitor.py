@@ -1,28 +1,50 @@
 """
 Tests for the strategy monitor module.
 
-This tests the breakout confirmation logic and event publishing.
+This tests the breakout confirmation logic, event publishing and the bar-close
+stream the market role runs the monitor on.
 """
 
+import asyncio
 import unittest
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from unittest.mock import patch, MagicMock
 
+from flask import Flask
+
+from common.db import db
+from features.strategy import monitor
+from features.strategy.confirmation_models import SignalConfirmation
 from features.strategy.monitor import (
+    SETUP_MONITOR_TASK,
+    bar_closes,
+    start_setup_monitor,
     Candle,
     is_confirmed_breakout,
     calculate_average_volume,
     is_market_hours,
     monitor_setups,
-    clear_confirmed_setups
+    clear_confirmed_setups,
+    setups_from_snapshot,
+    SetupIndex
 )
+from features.strategy.confirmation import BreakoutConfirmationEngine
+from features.parsing.setup_snapshot import SetupSnapshot
 
 
-class TestStrategyMonitor(unittest.TestCase):
+class TestStrategyMonitor(unittest.IsolatedAsyncioTestCase):
     """Test cases for the strategy monitor module."""
 
     def setUp(self):
         """Set up test fixtures."""
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        SignalConfirmation.__table__.create(db.engine)
+
         # Clear confirmed setups tracking before each test
         clear_confirmed_setups()
         
@@ -233,12 +255,153 @@ class TestStrategyMonitor(unittest.TestCase):
         
         # Check the event data
         args, kwargs = mock_publish_event.call_args
-        channel, event_data = args
+        event_type, event_data = args
+        self.assertEqual((event_type, kwargs['channel']), ('signal.triggered', 'signals:all'))
         
         self.assertEqual(event_data['ticker'], 'SPY')
         self.assertEqual(event_data['setup_id'], 1)
         self.assertEqual(event_data['level'], 102.0)
         self.assertAlmostEqual(event_data['confirmation']['price'], 105.5)
+        self.assertEqual([c.setup_id for c in SignalConfirmation.query.all()], ['1'])
+
+    def candle_messages(self, candles, ticker='SPY'):
+        return [
+            {'ticker': ticker, 't': c.timestamp, 'o': c.open, 'h': c.high, 'l': c.low, 'c': c.close, 'v': c.volume}
+            for c in candles
+        ]
+
+    def test_warm_confirmations_only_loads_indexed_setups(self):
+        db.session.add_all([SignalConfirmation(setup_id='1'), SignalConfirmation(setup_id='99')])
+        db.session.commit()
+        index = SetupIndex(BreakoutConfirmationEngine())
+        index.load([{'id': 1, 'ticker': 'SPY', 'level': 102.0, 'type': 'Aggressive Breakout Above'}])
+
+        self.assertEqual(index.warm_confirmations(), 1)
+        self.assertTrue(index.is_confirmed(1))
+        self.assertFalse(index.is_confirmed(99))
+
+    @patch('features.strategy.monitor.publish_event')
+    async def test_monitor_picks_up_setups_parsed_mid_stream(self, mock_publish_event):
+        new_setup = {'id': 5, 'ticker': 'SPY', 'level': 102.0, 'type': 'Aggressive Breakout Above'}
+        index = SetupIndex(BreakoutConfirmationEngine(), loader=lambda: [new_setup])
+        messages = self.candle_messages(self.previous_candles + [self.breakout_candle])
+
+        async def candle_stream():
+            for message in messages[:-1]:
+                yield message
+            # A parse worker stored a new setup while candles were streaming
+            index.handle_event('setup.parsed', {'ticker': 'SPY'})
+            yield messages[-1]
+
+        await monitor_setups([], candle_stream(), setup_index=index)
+
+        self.assertEqual(mock_publish_event.call_args[0][1]['setup_id'], 5)
+        self.assertEqual([c.setup_id for c in SignalConfirmation.query.all()], ['5'])
+
+    def tearDown(self):
+        db.session.remove()
+        SignalConfirmation.__table__.drop(db.engine)
+        self.ctx.pop()
+
+
+class TestSetupIndex(unittest.TestCase):
+    """Test cases for the per-ticker setup index."""
+
+    def setUp(self):
+        self.setups = [
+            {'id': 1, 'ticker': 'SPY', 'level': 102.0, 'type': 'Aggressive Breakout Above'},
+            {'id': 2, 'ticker': 'SPY', 'level': 99.0, 'type': 'Bounce Zone'},
+            {'id': 3, 'ticker': 'AAPL', 'level': 100.0, 'type': 'Conservative Breakout Above'},
+        ]
+
+    def test_load_indexes_breakout_setups_by_ticker(self):
+        index = SetupIndex(BreakoutConfirmationEngine())
+        index.load(self.setups)
+
+        self.assertEqual([s['id'] for s in index.for_ticker('SPY')], [1])
+        self.assertEqual([s['id'] for s in index.for_ticker('AAPL')], [3])
+        self.assertIsNone(index.get(2))
+
+    def test_reload_on_setup_event(self):
+        loader = MagicMock(return_value=self.setups[:1])
+        index = SetupIndex(BreakoutConfirmationEngine(), loader=loader)
+        index.load(self.setups)
+
+        self.assertFalse(index.reload_if_requested())
+        index.handle_event('market.price.update', {})
+        self.assertFalse(index.reload_if_requested())
+
+        index.handle_event('setup.created', {})
+        self.assertTrue(index.reload_if_requested())
+        self.assertEqual(index.for_ticker('AAPL'), [])
+        loader.assert_called_once()
+
+    def test_confirmed_ids_survive_reload(self):
+        index = SetupIndex(BreakoutConfirmationEngine(), loader=lambda: self.setups)
+        index.load(self.setups)
+        index.mark_confirmed('SPY', 1)
+
+        index.request_reload()
+        index.reload_if_requested()
+        self.assertTrue(index.is_confirmed(1))
+        self.assertFalse(index.is_confirmed(3))
+
+    @patch('features.parsing.store.get_parsing_store')
+    def test_setups_from_snapshot_maps_long_setups(self, get_parsing_store):
+        def view(setup_id, direction, trigger_level):
+            return {
+                'id': setup_id, 'ticker': 'SPY', 'direction': direction, 'trigger_level': trigger_level,
+                'label': 'Breakout', 'setup_type': None, 'target_prices': [105.0], 'levels': []
+            }
+        snapshot = SetupSnapshot.build(date(2026, 10, 16), [
+            view(1, 'long', 102.0), view(2, 'short', 99.0), view(3, 'long', None)
+        ])
+        get_parsing_store.return_value.get_setup_snapshot.return_value = snapshot
+
+        self.assertEqual(setups_from_snapshot(date(2026, 10, 16)), [
+            {'id': 1, 'ticker': 'SPY', 'level': 102.0, 'type': 'Breakout', 'targets': [105.0]}
+        ])
+        get_parsing_store.return_value.get_setup_snapshot.assert_called_once_with(date(2026, 10, 16))
+
+
+class TestBarCloseStream(unittest.TestCase):
+    """Test cases for running the monitor on published bar closes."""
+
+    def test_stream_yields_bar_closes_of_the_monitored_timeframe(self):
+        bars = [
+            ('market.candle.closed', {'ticker': 'SPY', 'timeframe': '1Min', 'close': 100.0}),
+            ('market.candle.closed', {'ticker': 'SPY', 'timeframe': '5Min', 'timestamp': '2026-10-16T14:30:00+00:00',
+                                      'open': 100.0, 'high': 103.0, 'low': 99.5, 'close': 102.5, 'volume': 1500}),
+            ('market.price.update', {'ticker': 'SPY', 'timeframe': '5Min', 'close': 101.0}),
+        ]
+
+        async def listen(handler, channel):
+            self.assertEqual(channel, 'events')
+            for event_type, data in bars:
+                handler(event_type, data)
+
+        async def collect():
+            with patch.object(monitor, 'listen_for_events', side_effect=listen):
+                return [candle async for candle in bar_closes('5Min')]
+
+        candles = asyncio.run(collect())
+
+        self.assertEqual(candles, [{
+            'ticker': 'SPY', 't': '2026-10-16T14:30:00+00:00',
+            'o': 100.0, 'h': 103.0, 'l': 99.5, 'c': 102.5, 'v': 1500
+        }])
+
+    def test_start_supervises_the_monitor(self):
+        app = Flask(__name__)
+        with app.app_context(), patch.object(monitor, 'runtime') as runtime:
+            self.assertTrue(start_setup_monitor())
+
+        self.assertEqual(runtime.supervise.call_args.args[0], SETUP_MONITOR_TASK)
+
+    def test_start_needs_an_app_context(self):
+        with patch.object(monitor, 'runtime') as runtime:
+            self.assertFalse(start_setup_monitor())
+        runtime.supervise.assert_not_called()
 
 
 if __name__ == '__main__':